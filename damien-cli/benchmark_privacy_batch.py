@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+PrivacyGuardian Batch Protection Benchmark
+
+Protects N synthetic emails (default 10,000) three ways and reports
+emails/second:
+
+- per-email: ``await guardian.protect_email(email)`` in a loop, which checks
+  consent and writes an audit record for every email
+- batch (serial): ``await guardian.protect_emails(emails, max_workers=1)``
+- batch (pool): ``await guardian.protect_emails(emails)`` with detection in a
+  process pool of ``--workers`` processes
+
+Each run audits to its own JSONL file, so the audit cost is included. The
+batch paths must produce the same sanitized emails as the per-email path
+(deterministic tokens make this comparable); the benchmark checks this.
+
+Usage:
+    cd damien-cli
+    poetry run python benchmark_privacy_batch.py
+    poetry run python benchmark_privacy_batch.py --emails 10000 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from damien_cli.features.ai_intelligence.llm_integration.privacy.audit import ComplianceAuditLogger
+from damien_cli.features.ai_intelligence.llm_integration.privacy.consent import DataProcessingPurpose
+from damien_cli.features.ai_intelligence.llm_integration.privacy.guardian import PrivacyGuardian
+
+BODY = """Hi {name},
+
+Following up on invoice {i}: please confirm the wire to account 12345678{d:03d}
+(routing 021000021). You can reach me at {name}.{i}@example.com or (555) 123-{d:04d}.
+
+The quarterly planning meeting covers budgets, hiring and roadmap priorities.
+Regards,
+Accounts team
+"""
+
+
+def synthetic_emails(count: int, users: int):
+    names = ["alice", "bob", "carol", "dave", "erin", "frank"]
+    return [
+        {
+            "id": f"email_{i}",
+            "user_id": f"user_{i % users}",
+            "subject": f"Invoice {i} from {names[i % len(names)]}@example.com",
+            "body": BODY.format(name=names[i % len(names)], i=i, d=i % 1000),
+            "snippet": f"Following up on invoice {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def make_guardian(directory: str, label: str, users: int) -> PrivacyGuardian:
+    guardian = PrivacyGuardian(token_secret="benchmark-secret")
+    guardian.audit_logger = ComplianceAuditLogger(log_file_path=os.path.join(directory, f"{label}.jsonl"))
+    for user in range(users):
+        guardian.consent_manager.grant_consent(f"user_{user}", DataProcessingPurpose.EMAIL_ANALYSIS)
+    return guardian
+
+
+async def per_email(guardian: PrivacyGuardian, emails):
+    return [await guardian.protect_email(email) for email in emails]
+
+
+def timed(label: str, guardian: PrivacyGuardian, run, emails):
+    guardian.pii_detector.cache.clear()  # Every path starts cold
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    guardian.audit_logger.flush()
+    elapsed = time.perf_counter() - started
+    print(f"   {label:<16}{elapsed:>9.2f}s{len(emails) / elapsed:>12,.0f} emails/s")
+    return [email for email, _ in results]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=10000, help="Synthetic emails to protect")
+    parser.add_argument("--users", type=int, default=5, help="Distinct users (consent lookups)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Detection pool size")
+    args = parser.parse_args()
+
+    emails = synthetic_emails(args.emails, args.users)
+    directory = tempfile.mkdtemp(prefix="bench_privacy_batch_")
+    print(f"🔐 Protecting {args.emails:,} synthetic emails ({os.cpu_count()} CPUs, pool of {args.workers})")
+
+    guardian = make_guardian(directory, "per_email", args.users)
+    expected = timed("per-email", guardian, lambda: per_email(guardian, emails), emails)
+
+    guardian = make_guardian(directory, "batch_serial", args.users)
+    serial = timed("batch (serial)", guardian, lambda: guardian.protect_emails(emails, max_workers=1), emails)
+
+    guardian = make_guardian(directory, "batch_pool", args.users)
+    pooled = timed("batch (pool)", guardian, lambda: guardian.protect_emails(emails, max_workers=args.workers), emails)
+    guardian.close()
+
+    if serial != expected or pooled != expected:
+        print("   ❌ batch results differ from per-email protection")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
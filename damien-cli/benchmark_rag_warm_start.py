@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+RAGEngine Cold Start / First Query Benchmark
+
+Measures, in fresh processes, how long a RAGEngine takes from `import` to
+answering its first query against a persisted NumPy index:
+
+- blocking: `await engine.initialize()` before serving (the old startup path)
+- background: `engine.start_warmup()` at startup, then the first keyword and
+  semantic queries as they would arrive from MCP tool calls
+
+Also compares reading the embedding dimension from model metadata with the
+trial encode it replaces.
+
+Usage:
+    cd damien-cli
+    poetry run python benchmark_rag_warm_start.py --chunks 100000
+    poetry run python benchmark_rag_warm_start.py --chunks 100000 --random-model
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+def build_index(directory: Path, chunks: int, dimension: int) -> None:
+    """Persist a vector index and matching keyword index as RAGEngine lays them out"""
+    from damien_cli.features.ai_intelligence.llm_integration.processing.keyword_index import BM25Index
+    from damien_cli.features.ai_intelligence.llm_integration.processing.vector_index import NumpyVectorIndex
+
+    rng = np.random.default_rng(0)
+    index = NumpyVectorIndex(directory=str(directory / "vectors"))
+    keyword_index = BM25Index(directory / "keyword_index.json")
+    for start in range(0, chunks, 10000):
+        end = min(start + 10000, chunks)
+        ids = [f"email_{i // 3}_chunk_{i % 3}" for i in range(start, end)]
+        documents = [f"meeting notes {i} quarterly budget review" for i in range(start, end)]
+        index.upsert(
+            embeddings=rng.normal(size=(end - start, dimension)).astype(np.float32),
+            documents=documents,
+            metadatas=[{"email_id": f"email_{i // 3}", "subject": f"Report {i}"} for i in range(start, end)],
+            ids=ids
+        )
+        for chunk_id, document in zip(ids, documents):
+            keyword_index.add(chunk_id, document)
+    index.persist()
+    keyword_index.save()
+
+
+async def measure_in_child(mode: str, directory: Path, model: str) -> dict:
+    timings = {}
+    started = time.perf_counter()
+    from damien_cli.features.ai_intelligence.llm_integration.processing.rag import (
+        RAGConfig, RAGEngine, SearchType, VectorStore
+    )
+    timings['import_ms'] = (time.perf_counter() - started) * 1000
+
+    engine = RAGEngine(config=RAGConfig(
+        vector_store=VectorStore.NUMPY,
+        embedding_model=model,
+        numpy_persist_directory=str(directory / "vectors"),
+        manifest_path=str(directory / "index_manifest.json"),
+        similarity_threshold=0.0,
+        enable_caching=False
+    ))
+
+    if mode == "blocking":
+        step = time.perf_counter()
+        await engine.initialize()
+        timings['startup_blocked_ms'] = (time.perf_counter() - step) * 1000
+    else:
+        step = time.perf_counter()
+        engine.start_warmup()
+        timings['startup_blocked_ms'] = (time.perf_counter() - step) * 1000
+        await asyncio.sleep(0)  # let the index open, as a server would between requests
+        step = time.perf_counter()
+        await engine.search("quarterly budget", search_type=SearchType.KEYWORD, limit=5)
+        timings['first_keyword_query_ms'] = (time.perf_counter() - step) * 1000
+
+    step = time.perf_counter()
+    await engine.search("quarterly budget", search_type=SearchType.SEMANTIC, limit=5)
+    timings['first_semantic_query_ms'] = (time.perf_counter() - step) * 1000
+    timings['ready_after_import_ms'] = (time.perf_counter() - started) * 1000 - timings['import_ms']
+    timings['engine_warmup_ms'] = engine.warmup_timings.get('total_ms', 0.0)
+    return timings
+
+
+def dimension_lookup_comparison(model_name: str) -> dict:
+    from damien_cli.features.ai_intelligence.llm_integration.processing.rag import load_embedding_model
+
+    model, dimension = load_embedding_model(model_name)
+    step = time.perf_counter()
+    model.get_sentence_embedding_dimension()
+    metadata_ms = (time.perf_counter() - step) * 1000
+    step = time.perf_counter()
+    len(model.encode(["test"])[0])
+    encode_ms = (time.perf_counter() - step) * 1000
+    return {'dimension': dimension, 'metadata_ms': metadata_ms, 'trial_encode_ms': encode_ms}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=100000, help="Chunks in the persisted index")
+    parser.add_argument("--random-model", action="store_true", help="Use a locally built random MiniLM-shaped encoder")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "DIRECTORY", "MODEL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, directory, model = args.child
+        print(json.dumps(asyncio.run(measure_in_child(mode, Path(directory), model))))
+        return 0
+
+    workspace = Path(tempfile.mkdtemp(prefix="bench_warm_start_"))
+    model = args.model
+    if args.random_model:
+        from benchmark_rag_indexing import build_random_minilm
+        (workspace / "minilm_parts").mkdir()
+        build_random_minilm(workspace / "minilm_parts").save(str(workspace / "minilm"))
+        model = str(workspace / "minilm")
+
+    print(f"📦 Building a {args.chunks:,}-chunk persisted index...")
+    build_index(workspace, args.chunks, 384)
+
+    print(f"\n⏱️  Cold start to first query ({args.chunks:,} chunks, fresh process per run)")
+    for mode in ("blocking", "background"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", mode, str(workspace), model],
+            capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        print(f"   {mode}:")
+        for key, value in json.loads(output).items():
+            print(f"      {key:<26}{value:>10.1f}")
+
+    comparison = dimension_lookup_comparison(model)
+    print(f"\n📐 Embedding dimension {comparison['dimension']}: "
+          f"model metadata {comparison['metadata_ms']:.3f}ms vs trial encode {comparison['trial_encode_ms']:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
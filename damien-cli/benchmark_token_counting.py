@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Token Counting Benchmark
+
+Counts tokens for N synthetic emails (default 1,000) with the shared
+TokenCounter and reports latency per 1,000 emails for:
+
+- exact (cold): ``count()`` per email on an empty cache, one encode each
+- exact batch (cold): ``count_many()`` over all emails, one tiktoken batch
+- exact (memoized): ``count()`` again, every email a cache hit
+- approximate: ``count(..., approximate=True)`` from the characters-per-token
+  ratio calibrated on the exact counts, no encoding at all
+
+The approximate mode's mean and worst relative error against the exact
+counts is printed alongside, since it is only meant for routing and cost
+estimates.
+
+Usage:
+    cd damien-cli
+    poetry run python benchmark_token_counting.py
+    poetry run python benchmark_token_counting.py --emails 5000 --model gpt-4
+"""
+
+import argparse
+import sys
+import time
+
+from damien_cli.features.ai_intelligence.llm_integration.utils import TokenCounter
+
+PARAGRAPHS = [
+    "Following up on invoice {i}: the wire to account 12345678 cleared this morning.",
+    "The quarterly planning meeting covers budgets, hiring and roadmap priorities for Q{q}.",
+    "Could you review the attached contract draft before Thursday? Legal flagged clause {i}.",
+    "Reminder: the offsite is moving to building {q}, room 4{q}0. Lunch will be provided.",
+    "Thanks for the quick turnaround on ticket #{i}; the customer confirmed the fix works.",
+]
+
+
+def synthetic_emails(count: int):
+    emails = []
+    for i in range(count):
+        paragraphs = [PARAGRAPHS[(i + k) % len(PARAGRAPHS)].format(i=i, q=i % 4 + 1) for k in range(1 + i % 12)]
+        emails.append(f"Subject: Update {i}\n\nHi team,\n\n" + "\n\n".join(paragraphs) + "\n\nBest,\nOps")
+    return emails
+
+
+def timed(label: str, run, emails):
+    started = time.perf_counter()
+    counts = run()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"   {label:<22}{elapsed_ms * 1000 / len(emails):>10.2f} ms / 1,000 emails")
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=1000, help="Synthetic emails to count")
+    parser.add_argument("--model", default="gpt-3.5-turbo", help="Model or encoding name")
+    args = parser.parse_args()
+
+    emails = synthetic_emails(args.emails)
+    print(f"🔢 Counting tokens for {args.emails:,} synthetic emails ({args.model})")
+    TokenCounter()._get_encoding(args.model)  # Load the encoding outside the timings
+
+    counter = TokenCounter()
+    exact = timed("exact (cold)", lambda: [counter.count(e, args.model) for e in emails], emails)
+
+    batch_counter = TokenCounter()
+    batched = timed("exact batch (cold)", lambda: batch_counter.count_many(emails, args.model), emails)
+    timed("exact (memoized)", lambda: [counter.count(e, args.model) for e in emails], emails)
+    approximate = timed("approximate", lambda: [counter.count(e, args.model, approximate=True) for e in emails], emails)
+
+    errors = [abs(a - e) / e for a, e in zip(approximate, exact) if e]
+    print(f"   approximation error: mean {sum(errors) / len(errors):.1%}, worst {max(errors):.1%} "
+          f"({counter.chars_per_token:.2f} chars/token)")
+
+    if batched != exact:
+        print("   ❌ batched counts differ from per-email counts")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Vector Store Latency / Recall Benchmark
+
+Compares RAGEngine vector backends on synthetic clustered embeddings:
+NumpyVectorIndex in exact and IVF mode, exact mode over float16 and int8
+quantized storage, and ChromaDB when it is installed. Reports build time,
+p50/p95 single-query latency, stored vector size and recall@k against exact
+float32 brute-force neighbours.
+
+Usage:
+    cd damien-cli
+    poetry run python benchmark_vector_store.py --sizes 10000 100000 1000000
+    poetry run python benchmark_vector_store.py --sizes 100000 --ivf-probes 16
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from damien_cli.features.ai_intelligence.llm_integration.processing.vector_index import NumpyVectorIndex
+
+try:
+    import chromadb
+    CHROMADB_AVAILABLE = True
+except ImportError:
+    CHROMADB_AVAILABLE = False
+
+
+def make_embeddings(count: int, dimension: int, seed: int = 0) -> np.ndarray:
+    """Unit vectors drawn around random topic centres, like sentence embeddings"""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(max(1, count // 500), dimension)).astype(np.float32)
+    vectors = np.empty((count, dimension), dtype=np.float32)
+    for start in range(0, count, 100000):
+        end = min(start + 100000, count)
+        topics = rng.integers(0, len(centres), end - start)
+        vectors[start:end] = centres[topics] + rng.normal(scale=0.6, size=(end - start, dimension))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def insert_batches(collection, vectors: np.ndarray, batch_size: int = 5000) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(vectors), batch_size):
+        end = min(start + batch_size, len(vectors))
+        collection.upsert(
+            embeddings=vectors[start:end] if isinstance(collection, NumpyVectorIndex) else vectors[start:end].tolist(),
+            documents=[f"chunk {i}" for i in range(start, end)],
+            metadatas=[{"email_id": f"email_{i // 3}"} for i in range(start, end)],
+            ids=[f"c{i}" for i in range(start, end)]
+        )
+    return time.perf_counter() - started
+
+
+def measure(collection, queries: np.ndarray, truth, k: int):
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        result = collection.query(query_embeddings=[query.tolist()], n_results=k, include=['distances'])
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits += len(set(result['ids'][0]) & expected)
+    return np.percentile(latencies, 50), np.percentile(latencies, 95), hits / (len(queries) * k)
+
+
+def run_size(size: int, args) -> None:
+    vectors = make_embeddings(size, args.dimension)
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(0, size, args.queries)] + rng.normal(
+        scale=0.05, size=(args.queries, args.dimension)
+    ).astype(np.float32)
+
+    truth = []
+    for query in queries:
+        scores = vectors @ (query / np.linalg.norm(query))
+        truth.append({f"c{i}" for i in np.argpartition(-scores, args.k)[:args.k]})
+
+    print(f"\n📊 {size:,} chunks x {args.dimension} dims, {args.queries} queries, recall@{args.k}")
+    print(f"   {'backend':<22}{'build s':>10}{'p50 ms':>10}{'p95 ms':>10}{'vec MB':>10}{'recall':>10}")
+
+    backends = [
+        ("numpy exact", lambda d: NumpyVectorIndex(directory=d)),
+        ("numpy exact float16", lambda d: NumpyVectorIndex(directory=d, quantization="float16")),
+        ("numpy exact int8", lambda d: NumpyVectorIndex(directory=d, quantization="int8")),
+        (f"numpy ivf ({args.ivf_probes} probes)",
+         lambda d: NumpyVectorIndex(directory=d, mode="ivf", ivf_probes=args.ivf_probes, ivf_min_rows=0)),
+    ]
+    if CHROMADB_AVAILABLE:
+        backends.append(("chromadb (hnsw)", lambda d: chromadb.PersistentClient(path=d).get_or_create_collection(
+            name="bench", metadata={"hnsw:space": "cosine"}
+        )))
+
+    for name, factory in backends:
+        with tempfile.TemporaryDirectory(prefix="bench_vectors_") as directory:
+            collection = factory(directory)
+            build_seconds = insert_batches(collection, vectors)
+            if isinstance(collection, NumpyVectorIndex):
+                started = time.perf_counter()
+                if collection.mode == "ivf":
+                    collection.train_ivf()
+                collection.persist()
+                build_seconds += time.perf_counter() - started
+            p50, p95, recall = measure(collection, queries, truth, args.k)
+            vector_mb = (
+                collection.get_stats()['vector_bytes'] if isinstance(collection, NumpyVectorIndex)
+                else size * args.dimension * 4
+            ) / (1024 * 1024)
+            print(f"   {name:<22}{build_seconds:>10.1f}{p50:>10.2f}{p95:>10.2f}{vector_mb:>10.1f}{recall:>10.3f}")
+            del collection
+
+    if not CHROMADB_AVAILABLE:
+        print("   (chromadb not installed; skipped)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--ivf-probes", type=int, default=8)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run_size(size, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
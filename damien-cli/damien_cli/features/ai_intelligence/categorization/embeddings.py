@@ -17,14 +17,22 @@ except ImportError:
 
 from damien_cli.core.config import DATA_DIR
 from ..models import EmailEmbedding
+from ..utils.quantization import dequantize, quantize, storage_dtype
 
 logger = logging.getLogger(__name__)
 
 class EmailEmbeddingGenerator:
-    """Generates and caches embeddings for emails using sentence transformers"""
+    """Generates and caches embeddings for emails using sentence transformers
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    With ``quantization`` set to "float16" or "int8" the on-disk cache stores
+    compressed vectors; every returned embedding is float32 and has been
+    through the same round trip, so cached and fresh results agree.
+    """
+    
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", quantization: str = "none"):
+        storage_dtype(quantization)  # Validates the mode
         self.model_name = model_name
+        self.quantization = quantization
         self.model = None  # Lazy loading
         self.cache_dir = Path(DATA_DIR) / "ai_intelligence" / "embeddings_cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -72,6 +80,7 @@ class EmailEmbeddingGenerator:
                 embedding = self._create_mock_embedding(text)
             else:
                 embedding = self.model.encode(text, convert_to_numpy=True)
+            embedding = self._round_trip(embedding)
             
             # Cache the result
             self._save_to_cache(cache_key, embedding)
@@ -120,6 +129,8 @@ class EmailEmbeddingGenerator:
                         show_progress_bar=len(texts) > 10
                     )
                 
+                batch_embeddings = self._round_trip(batch_embeddings)
+                
                 # Fill in the embeddings and cache them
                 for i, (email, index) in enumerate(emails_to_process):
                     embedding = batch_embeddings[i]
@@ -230,6 +241,13 @@ class EmailEmbeddingGenerator:
         content = f"{email_data.get('from_sender', '')}{email_data.get('subject', '')}{email_data.get('snippet', '')}"
         return hashlib.md5(content.encode()).hexdigest()
     
+    def _round_trip(self, embeddings: np.ndarray) -> np.ndarray:
+        """Pass embeddings through the cache's storage format"""
+        
+        if self.quantization == "none":
+            return embeddings
+        return dequantize(*quantize(embeddings, self.quantization))
+    
     def _load_from_cache(self, cache_key: str) -> Optional[np.ndarray]:
         """Load embedding from cache"""
         
@@ -237,7 +255,11 @@ class EmailEmbeddingGenerator:
         if cache_file.exists():
             try:
                 with open(cache_file, "rb") as f:
-                    return pickle.load(f)
+                    cached = pickle.load(f)
+                # Quantized entries are stored as a dict of codes and scale
+                if isinstance(cached, dict):
+                    return dequantize(cached["codes"], cached["scale"])
+                return cached
             except Exception as e:
                 logger.warning(f"Error loading cached embedding {cache_key}: {str(e)}")
                 # Remove corrupted cache file
@@ -249,6 +271,9 @@ class EmailEmbeddingGenerator:
         """Save embedding to cache"""
         
         cache_file = self.cache_dir / f"{cache_key}.pkl"
+        if self.quantization != "none":
+            codes, scale = quantize(embedding, self.quantization)
+            embedding = {"quantization": self.quantization, "codes": codes, "scale": scale}
         try:
             with open(cache_file, "wb") as f:
                 pickle.dump(embedding, f)
@@ -278,6 +303,7 @@ class EmailEmbeddingGenerator:
                 "cache_directory": str(self.cache_dir),
                 "model_name": self.model_name,
                 "embedding_dimension": self.embedding_dim,
+                "quantization": self.quantization,
                 "using_real_model": SENTENCE_TRANSFORMERS_AVAILABLE and self.model != "mock"
             }
         except Exception as e:
@@ -1,8 +1,9 @@
 """Gmail-specific email analyzer that fetches and processes real email data"""
 
 import asyncio
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, AsyncIterator
 from datetime import datetime, timedelta
+from pathlib import Path
 import logging
 from tqdm import tqdm
 import time
@@ -10,12 +11,14 @@ import time
 from damien_cli.core_api import gmail_api_service
 from damien_cli.features.ai_intelligence.models import (
     EmailAnalysisResult, EmailPattern, CategorySuggestion, 
-    EmailFeatures, EmailSignature, PerformanceMetrics,
+    EmailFeatures, EmailSignature, PerformanceMetrics, BatchProcessingResult,
     ProcessingStatus, PatternCharacteristics, PatternType
 )
 from .embeddings import EmailEmbeddingGenerator
 from .patterns import EmailPatternDetector
-from ..utils.batch_processor import BatchEmailProcessor
+from .incremental import IncrementalPatternState
+from .streaming import StreamingPatternSummary
+from ..utils.batch_processor import BatchEmailProcessor, MemoryPeakTracker
 from ..utils.confidence_scorer import ConfidenceScorer
 
 logger = logging.getLogger(__name__)
@@ -77,7 +80,13 @@ class GmailEmailAnalyzer:
             patterns = self.pattern_detector.detect_patterns(
                 enriched_emails, embeddings_array
             )
+            detector_report = self.pattern_detector.get_detector_report()
             logger.info(f"✅ Detected {len(patterns)} patterns")
+            if detector_report['dominant_detector']:
+                logger.info(
+                    f"   ⏱️  Slowest detector: {detector_report['dominant_detector']} "
+                    f"({detector_report['dominant_share']:.0%} of {detector_report['total_detector_ms']:.0f}ms)"
+                )
             
             # Step 5: Filter patterns by confidence
             high_confidence_patterns = [
@@ -88,13 +97,14 @@ class GmailEmailAnalyzer:
             # Step 6: Generate category suggestions
             print("💡 Generating rule suggestions...")
             suggestions = self._generate_category_suggestions(
-                high_confidence_patterns, enriched_emails
+                high_confidence_patterns, len(enriched_emails)
             )
             logger.info(f"✅ Generated {len(suggestions)} suggestions")
             
             # Step 7: Create comprehensive summary
             print("📊 Creating analysis summary...")
             summary = self._create_analysis_summary(enriched_emails, patterns, suggestions)
+            summary['detector_timings'] = detector_report
             
             # Step 8: Calculate performance metrics
             end_time = datetime.now()
@@ -145,29 +155,265 @@ class GmailEmailAnalyzer:
             logger.error(f"❌ Error during inbox analysis: {str(e)}")
             raise
     
-    async def _fetch_emails(
-        self, 
-        max_emails: int, 
-        days_back: int, 
-        query_filter: Optional[str] = None
-    ) -> List[Dict]:
-        """Fetch emails from Gmail API with enhanced error handling"""
+    async def analyze_inbox_incremental(
+        self,
+        days_back: int = 30,
+        min_confidence: float = 0.7,
+        query_filter: Optional[str] = None,
+        max_new_emails: int = 1000,
+        full_rebuild: bool = False,
+        state_path: Optional[Path] = None
+    ) -> EmailAnalysisResult:
+        """Analyze the inbox by applying only new mail to persisted pattern state.
+        
+        The first run (or ``full_rebuild=True``, or a change of ``days_back`` /
+        ``query_filter``) fetches the whole window; later runs fetch messages
+        received since the last sync and age out days that left the window.
+        Every page of the query is consumed, ``max_new_emails`` at a time, so
+        the sync cursor only advances past mail that was actually ingested.
+        """
+        
+        start_time = datetime.now()
+        operation_name = f"Incremental Gmail Analysis ({days_back} days)"
+        
+        state = None if full_rebuild else IncrementalPatternState.load(state_path)
+        if state and (state.days_back != days_back or state.query_filter != query_filter):
+            logger.info("Analysis window or filter changed, rebuilding pattern state")
+            state = None
+        if state is None:
+            state = IncrementalPatternState(days_back=days_back, query_filter=query_filter)
         
+        try:
+            sync_started = time.time()
+            added = 0
+            failed_total = 0
+            async for new_emails, failed_count in self._iter_email_windows(
+                None, days_back, query_filter,
+                window_size=max_new_emails,
+                since_timestamp=state.last_sync_timestamp
+            ):
+                added += state.ingest(new_emails)
+                failed_total += failed_count
+            if failed_total > 0:
+                logger.warning(f"⚠️ Failed to process {failed_total} emails")
+            aged_out = state.expire(sync_started)
+            state.last_sync_timestamp = sync_started
+            state.save(state_path)
+            logger.info(f"✅ Pattern state updated: +{added} new, -{aged_out} aged out, {state.total_emails} in window")
+            
+            if state.total_emails == 0:
+                return self._create_empty_result(start_time, operation_name)
+            
+            patterns = self.pattern_detector.detect_patterns_from_state(state)
+            high_confidence_patterns = [p for p in patterns if p.confidence >= min_confidence]
+            suggestions = self._generate_category_suggestions(
+                high_confidence_patterns, state.total_emails
+            )
+            summary = self._summarize_counts(
+                state.total_emails,
+                dict(state.totals.counts['sender']),
+                dict(state.totals.counts['label']),
+                patterns,
+                suggestions
+            )
+            summary['new_emails_applied'] = added
+            summary['emails_aged_out'] = aged_out
+            
+            performance_metrics = PerformanceMetrics(
+                operation_name=operation_name,
+                start_time=start_time,
+                end_time=datetime.now(),
+                items_processed=added
+            )
+            
+            return EmailAnalysisResult(
+                total_emails_analyzed=state.total_emails,
+                analysis_scope={
+                    'days_back': days_back,
+                    'query_filter': query_filter,
+                    'incremental': True,
+                    'date_range': {
+                        'start': (datetime.now() - timedelta(days=days_back)).isoformat(),
+                        'end': datetime.now().isoformat()
+                    }
+                },
+                patterns_detected=high_confidence_patterns,
+                category_suggestions=suggestions,
+                processing_performance=performance_metrics,
+                summary_statistics=summary,
+                data_sources=['gmail_api', 'pattern_state'],
+                analysis_parameters={
+                    'min_confidence': min_confidence,
+                    'full_rebuild': full_rebuild
+                },
+                model_versions={
+                    'analyzer_version': '2.0.0'
+                }
+            )
+            
+        except Exception as e:
+            logger.error(f"❌ Error during incremental inbox analysis: {str(e)}")
+            raise
+    
+    async def analyze_inbox_streaming(
+        self,
+        max_emails: int = 10000,
+        days_back: int = 30,
+        min_confidence: float = 0.7,
+        query_filter: Optional[str] = None,
+        window_size: int = 200
+    ) -> EmailAnalysisResult:
+        """Analyze a large mailbox in fixed-size windows with bounded memory.
+        
+        Each window is fetched, enriched and folded into a
+        StreamingPatternSummary, then dropped; only the summary survives
+        between windows, so peak memory depends on ``window_size`` rather
+        than ``max_emails``. The summary's detectors are count-based, so no
+        embeddings are computed.
+        """
+        
+        start_time = datetime.now()
+        operation_name = f"Streaming Gmail Analysis ({max_emails} emails, {days_back} days)"
+        memory_tracker = MemoryPeakTracker().start()
+        
+        summary = StreamingPatternSummary(min_pattern_size=self.pattern_detector.min_pattern_size)
+        windows = 0
+        failed_count = 0
+        
+        try:
+            async for window, window_failed in self._iter_email_windows(
+                max_emails, days_back, query_filter, window_size
+            ):
+                windows += 1
+                failed_count += window_failed
+                enriched = self._enrich_emails_with_features(window, show_progress=False)
+                summary.add_emails(enriched)
+                memory_tracker.sample()
+                logger.debug(f"Window {windows}: {summary.total} emails summarized, peak {memory_tracker.peak_mb:.1f} MB")
+            
+            logger.info(f"✅ Streamed {summary.total} emails in {windows} windows")
+            
+            if summary.total == 0:
+                memory_tracker.stop()
+                return self._create_empty_result(start_time, operation_name)
+            
+            patterns = self.pattern_detector.detect_patterns_from_state(summary)
+            high_confidence_patterns = [p for p in patterns if p.confidence >= min_confidence]
+            suggestions = self._generate_category_suggestions(
+                high_confidence_patterns, summary.total
+            )
+            snapshot = summary.totals
+            summary_statistics = self._summarize_counts(
+                summary.total,
+                dict(snapshot.counts['sender']),
+                dict(snapshot.counts['label']),
+                patterns,
+                suggestions
+            )
+            summary_statistics['sketch_stats'] = summary.get_stats()
+            
+            end_time = datetime.now()
+            peak_memory_mb = memory_tracker.stop()
+            processing_time = (end_time - start_time).total_seconds()
+            
+            batch_result = BatchProcessingResult(
+                total_items=summary.total + failed_count,
+                processed_successfully=summary.total,
+                failed_items=failed_count,
+                skipped_items=0,
+                processing_time_seconds=processing_time,
+                throughput_per_second=summary.total / processing_time if processing_time > 0 else 0.0,
+                peak_memory_usage_mb=peak_memory_mb,
+                average_cpu_usage_percent=0.0,
+                embeddings_generated=0,
+                patterns_discovered=len(patterns),
+                suggestions_created=len(suggestions),
+                batch_size=window_size,
+                parallel_workers=1,
+                retry_attempts=0,
+                metadata={'windows': windows}
+            )
+            
+            performance_metrics = PerformanceMetrics(
+                operation_name=operation_name,
+                start_time=start_time,
+                end_time=end_time,
+                memory_usage_mb=peak_memory_mb,
+                items_processed=summary.total,
+                errors_encountered=failed_count
+            )
+            
+            logger.info(f"🎉 Streaming analysis complete, peak traced memory {peak_memory_mb:.1f} MB")
+            
+            return EmailAnalysisResult(
+                total_emails_analyzed=summary.total,
+                analysis_scope={
+                    'max_emails': max_emails,
+                    'days_back': days_back,
+                    'query_filter': query_filter,
+                    'streaming': True,
+                    'date_range': {
+                        'start': (datetime.now() - timedelta(days=days_back)).isoformat(),
+                        'end': datetime.now().isoformat()
+                    }
+                },
+                patterns_detected=high_confidence_patterns,
+                category_suggestions=suggestions,
+                processing_performance=performance_metrics,
+                batch_results=[batch_result],
+                summary_statistics=summary_statistics,
+                data_sources=['gmail_api'],
+                analysis_parameters={
+                    'min_confidence': min_confidence,
+                    'window_size': window_size
+                },
+                model_versions={
+                    'analyzer_version': '2.0.0'
+                }
+            )
+            
+        except Exception as e:
+            memory_tracker.stop()
+            logger.error(f"❌ Error during streaming inbox analysis: {str(e)}")
+            raise
+    
+    def _ensure_gmail_service(self):
         if not self.gmail_service:
             from damien_cli.core_api.gmail_api_service import get_authenticated_service
             self.gmail_service = get_authenticated_service()
+    
+    def _build_query(
+        self,
+        days_back: int,
+        query_filter: Optional[str] = None,
+        since_timestamp: Optional[float] = None
+    ) -> str:
+        """Build the Gmail search query for an analysis window"""
         
-        # Calculate date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days_back)
-        
-        # Build Gmail query
-        query_parts = [f"after:{start_date.strftime('%Y/%m/%d')}"]
+        # An explicit timestamp narrows the search to new mail only
+        if since_timestamp:
+            query_parts = [f"after:{int(since_timestamp)}"]
+        else:
+            start_date = datetime.now() - timedelta(days=days_back)
+            query_parts = [f"after:{start_date.strftime('%Y/%m/%d')}"]
         
         if query_filter:
             query_parts.append(query_filter)
         
-        query = " ".join(query_parts)
+        return " ".join(query_parts)
+    
+    async def _fetch_emails(
+        self, 
+        max_emails: int, 
+        days_back: int, 
+        query_filter: Optional[str] = None,
+        since_timestamp: Optional[float] = None
+    ) -> List[Dict]:
+        """Fetch emails from Gmail API with enhanced error handling"""
+        
+        self._ensure_gmail_service()
+        
+        query = self._build_query(days_back, query_filter, since_timestamp)
         logger.debug(f"Gmail query: {query}")
         
         try:
@@ -186,33 +432,7 @@ class GmailEmailAnalyzer:
                 logger.warning("No emails found matching criteria")
                 return []
             
-            # Fetch detailed information for each email with progress bar
-            emails = []
-            failed_count = 0
-            
-            for i, msg_id in enumerate(tqdm(message_ids, desc="📧 Fetching email details")):
-                try:
-                    email_details = gmail_api_service.get_message_details(
-                        self.gmail_service,
-                        message_id=msg_id,
-                        format='metadata'
-                    )
-                    
-                    # Process email response
-                    processed_email = self._process_email_response(email_details)
-                    if processed_email:
-                        emails.append(processed_email)
-                    else:
-                        failed_count += 1
-                        
-                    # Rate limiting - small delay every 10 emails
-                    if (i + 1) % 10 == 0:
-                        await asyncio.sleep(0.1)
-                        
-                except Exception as e:
-                    logger.warning(f"⚠️ Error fetching email {msg_id}: {str(e)}")
-                    failed_count += 1
-                    continue
+            emails, failed_count = await self._fetch_message_details(message_ids)
             
             if failed_count > 0:
                 logger.warning(f"⚠️ Failed to process {failed_count} emails")
@@ -224,6 +444,88 @@ class GmailEmailAnalyzer:
             logger.error(f"❌ Error fetching emails from Gmail: {str(e)}")
             raise
     
+    async def _fetch_message_details(
+        self,
+        message_ids: List[str],
+        show_progress: bool = True
+    ) -> Tuple[List[Dict], int]:
+        """Fetch and process message metadata, returning (emails, failed_count)"""
+        
+        emails = []
+        failed_count = 0
+        
+        for i, msg_id in enumerate(tqdm(message_ids, desc="📧 Fetching email details", disable=not show_progress)):
+            try:
+                email_details = gmail_api_service.get_message_details(
+                    self.gmail_service,
+                    message_id=msg_id,
+                    format='metadata'
+                )
+                
+                # Process email response
+                processed_email = self._process_email_response(email_details)
+                if processed_email:
+                    emails.append(processed_email)
+                else:
+                    failed_count += 1
+                    
+                # Rate limiting - small delay every 10 emails
+                if (i + 1) % 10 == 0:
+                    await asyncio.sleep(0.1)
+                    
+            except Exception as e:
+                logger.warning(f"⚠️ Error fetching email {msg_id}: {str(e)}")
+                failed_count += 1
+                continue
+        
+        return emails, failed_count
+    
+    async def _iter_email_windows(
+        self,
+        max_emails: Optional[int],
+        days_back: int,
+        query_filter: Optional[str] = None,
+        window_size: int = 200,
+        since_timestamp: Optional[float] = None
+    ) -> AsyncIterator[Tuple[List[Dict], int]]:
+        """Yield (emails, failed_count) windows, paging through message IDs lazily
+        
+        ``max_emails=None`` pages until the query is exhausted.
+        """
+        
+        self._ensure_gmail_service()
+        
+        query = self._build_query(days_back, query_filter, since_timestamp)
+        logger.debug(f"Gmail query: {query}")
+        
+        page_token = None
+        pending_ids: List[str] = []
+        remaining = max_emails
+        
+        while remaining is None or remaining > 0:
+            response = gmail_api_service.list_messages(
+                self.gmail_service,
+                query_string=query,
+                max_results=500 if remaining is None else min(remaining, 500),
+                page_token=page_token
+            )
+            page_ids = [msg['id'] for msg in response.get('messages', [])]
+            if remaining is not None:
+                page_ids = page_ids[:remaining]
+                remaining -= len(page_ids)
+            pending_ids.extend(page_ids)
+            page_token = response.get('nextPageToken')
+            
+            while len(pending_ids) >= window_size or (pending_ids and not page_token):
+                window_ids, pending_ids = pending_ids[:window_size], pending_ids[window_size:]
+                yield await self._fetch_message_details(window_ids, show_progress=False)
+            
+            if not page_token or not page_ids:
+                break
+        
+        if pending_ids:
+            yield await self._fetch_message_details(pending_ids, show_progress=False)
+    
     def _process_email_response(self, email_details: Dict) -> Optional[Dict]:
         """Process Gmail API response into standardized format with error handling"""
         
@@ -313,12 +615,12 @@ class GmailEmailAnalyzer:
             logger.debug(f"Error checking attachments: {str(e)}")
             return False
     
-    def _enrich_emails_with_features(self, emails: List[Dict]) -> List[Dict]:
+    def _enrich_emails_with_features(self, emails: List[Dict], show_progress: bool = True) -> List[Dict]:
         """Enrich emails with extracted features and signatures"""
         
         enriched_emails = []
         
-        for email in tqdm(emails, desc="🔍 Extracting features"):
+        for email in tqdm(emails, desc="🔍 Extracting features", disable=not show_progress):
             try:
                 # Extract comprehensive features
                 features = EmailFeatures.extract_from_email(email)
@@ -343,7 +645,7 @@ class GmailEmailAnalyzer:
     def _generate_category_suggestions(
         self, 
         patterns: List[EmailPattern], 
-        emails: List[Dict]
+        total_emails: int
     ) -> List[CategorySuggestion]:
         """Generate actionable category suggestions from patterns"""
         
@@ -352,7 +654,7 @@ class GmailEmailAnalyzer:
         for pattern in patterns:
             try:
                 # Convert pattern to category suggestion
-                suggestion = self._pattern_to_suggestion(pattern, emails)
+                suggestion = self._pattern_to_suggestion(pattern, total_emails)
                 if suggestion:
                     suggestions.append(suggestion)
                     
@@ -362,7 +664,7 @@ class GmailEmailAnalyzer:
         
         # Sort by business value and confidence
         suggestions.sort(
-            key=lambda x: (x.confidence * 0.7 + (x.email_count / len(emails)) * 0.3), 
+            key=lambda x: (x.confidence * 0.7 + (x.email_count / total_emails) * 0.3), 
             reverse=True
         )
         
@@ -371,23 +673,23 @@ class GmailEmailAnalyzer:
     def _pattern_to_suggestion(
         self, 
         pattern: EmailPattern, 
-        emails: List[Dict]
+        total_emails: int
     ) -> Optional[CategorySuggestion]:
         """Convert a pattern into an actionable rule suggestion"""
         
         try:
             if pattern.pattern_type == PatternType.SENDER:
-                return self._create_sender_suggestion(pattern, emails)
+                return self._create_sender_suggestion(pattern, total_emails)
             elif pattern.pattern_type == PatternType.SUBJECT:
-                return self._create_subject_suggestion(pattern, emails)
+                return self._create_subject_suggestion(pattern, total_emails)
             elif pattern.pattern_type == PatternType.CLUSTER:
-                return self._create_cluster_suggestion(pattern, emails)
+                return self._create_cluster_suggestion(pattern, total_emails)
             elif pattern.pattern_type == PatternType.TIME:
-                return self._create_time_suggestion(pattern, emails)
+                return self._create_time_suggestion(pattern, total_emails)
             elif pattern.pattern_type == PatternType.LABEL:
-                return self._create_label_suggestion(pattern, emails)
+                return self._create_label_suggestion(pattern, total_emails)
             else:
-                return self._create_generic_suggestion(pattern, emails)
+                return self._create_generic_suggestion(pattern, total_emails)
                 
         except Exception as e:
             logger.warning(f"⚠️ Error creating suggestion from pattern: {str(e)}")
@@ -396,7 +698,7 @@ class GmailEmailAnalyzer:
     def _create_sender_suggestion(
         self, 
         pattern: EmailPattern, 
-        emails: List[Dict]
+        total_emails: int
     ) -> CategorySuggestion:
         """Create suggestion for sender-based pattern"""
         
@@ -436,7 +738,7 @@ class GmailEmailAnalyzer:
             category_name=category_name,
             description=description,
             email_count=pattern.email_count,
-            affected_email_percentage=(pattern.email_count / len(emails)) * 100,
+            affected_email_percentage=(pattern.email_count / total_emails) * 100,
             confidence=pattern.confidence,
             rule_conditions=conditions,
             rule_actions=actions,
@@ -448,7 +750,7 @@ class GmailEmailAnalyzer:
     def _create_subject_suggestion(
         self, 
         pattern: EmailPattern, 
-        emails: List[Dict]
+        total_emails: int
     ) -> CategorySuggestion:
         """Create suggestion for subject-based pattern"""
         
@@ -477,7 +779,7 @@ class GmailEmailAnalyzer:
             category_name=f"Auto-organize {primary_keyword.title()}",
             description=f"Organize emails with '{primary_keyword}' in subject",
             email_count=pattern.email_count,
-            affected_email_percentage=(pattern.email_count / len(emails)) * 100,
+            affected_email_percentage=(pattern.email_count / total_emails) * 100,
             confidence=pattern.confidence,
             rule_conditions=conditions,
             rule_actions=actions,
@@ -488,7 +790,7 @@ class GmailEmailAnalyzer:
     def _create_cluster_suggestion(
         self, 
         pattern: EmailPattern, 
-        emails: List[Dict]
+        total_emails: int
     ) -> CategorySuggestion:
         """Create suggestion for cluster-based pattern"""
         
@@ -516,7 +818,7 @@ class GmailEmailAnalyzer:
             category_name=f"Group: {theme}",
             description=f"Group similar emails about {theme}",
             email_count=pattern.email_count,
-            affected_email_percentage=(pattern.email_count / len(emails)) * 100,
+            affected_email_percentage=(pattern.email_count / total_emails) * 100,
             confidence=pattern.confidence * 0.8,
             rule_conditions=conditions,
             rule_actions=actions,
@@ -527,7 +829,7 @@ class GmailEmailAnalyzer:
     def _create_time_suggestion(
         self, 
         pattern: EmailPattern, 
-        emails: List[Dict]
+        total_emails: int
     ) -> CategorySuggestion:
         """Create suggestion for time-based pattern"""
         
@@ -552,7 +854,7 @@ class GmailEmailAnalyzer:
             category_name=f"Scheduled: {time_pattern}",
             description=f"Handle {time_pattern} emails automatically",
             email_count=pattern.email_count,
-            affected_email_percentage=(pattern.email_count / len(emails)) * 100,
+            affected_email_percentage=(pattern.email_count / total_emails) * 100,
             confidence=pattern.confidence * 0.9,
             rule_conditions=conditions,
             rule_actions=actions,
@@ -563,7 +865,7 @@ class GmailEmailAnalyzer:
     def _create_label_suggestion(
         self, 
         pattern: EmailPattern, 
-        emails: List[Dict]
+        total_emails: int
     ) -> CategorySuggestion:
         """Create suggestion for label-based pattern"""
         
@@ -591,7 +893,7 @@ class GmailEmailAnalyzer:
             category_name=f"Organize {label}",
             description=f"Better organize emails with {label} label",
             email_count=pattern.email_count,
-            affected_email_percentage=(pattern.email_count / len(emails)) * 100,
+            affected_email_percentage=(pattern.email_count / total_emails) * 100,
             confidence=pattern.confidence,
             rule_conditions=conditions,
             rule_actions=actions,
@@ -602,7 +904,7 @@ class GmailEmailAnalyzer:
     def _create_generic_suggestion(
         self, 
         pattern: EmailPattern, 
-        emails: List[Dict]
+        total_emails: int
     ) -> CategorySuggestion:
         """Create generic suggestion for unknown pattern types"""
         
@@ -628,7 +930,7 @@ class GmailEmailAnalyzer:
             category_name=f"Pattern: {pattern.pattern_name}",
             description=f"Detected pattern: {pattern.description}",
             email_count=pattern.email_count,
-            affected_email_percentage=(pattern.email_count / len(emails)) * 100,
+            affected_email_percentage=(pattern.email_count / total_emails) * 100,
             confidence=pattern.confidence * 0.7,
             rule_conditions=conditions,
             rule_actions=actions,
@@ -644,10 +946,6 @@ class GmailEmailAnalyzer:
     ) -> Dict[str, Any]:
         """Create comprehensive analysis summary"""
         
-        # Calculate basic statistics
-        total_emails = len(emails)
-        unique_senders = len(set(email['from_sender'] for email in emails))
-        
         # Categorize by labels
         label_distribution = {}
         for email in emails:
@@ -655,18 +953,33 @@ class GmailEmailAnalyzer:
             for label in labels:
                 label_distribution[label] = label_distribution.get(label, 0) + 1
         
-        # Top senders
+        # Sender volumes
         sender_counts = {}
         for email in emails:
             sender = email['from_sender']
             sender_counts[sender] = sender_counts.get(sender, 0) + 1
         
+        return self._summarize_counts(
+            len(emails), sender_counts, label_distribution, patterns, suggestions
+        )
+    
+    def _summarize_counts(
+        self,
+        total_emails: int,
+        sender_counts: Dict[str, int],
+        label_distribution: Dict[str, int],
+        patterns: List[EmailPattern],
+        suggestions: List[CategorySuggestion]
+    ) -> Dict[str, Any]:
+        """Build the analysis summary from precomputed sender and label counts"""
+        
+        unique_senders = len(sender_counts)
         top_senders = sorted(sender_counts.items(), key=lambda x: x[1], reverse=True)[:10]
         
         # Pattern type distribution
         pattern_type_dist = {}
         for pattern in patterns:
-            ptype = pattern.pattern_type.value
+            ptype = pattern.pattern_type
             pattern_type_dist[ptype] = pattern_type_dist.get(ptype, 0) + 1
         
         # Business metrics
@@ -687,7 +1000,7 @@ class GmailEmailAnalyzer:
             'estimated_time_savings_hours': time_savings,
             'automation_rate_percent': (potential_automation / max(total_emails, 1)) * 100,
             'analysis_date': datetime.now().isoformat(),
-            'data_quality_score': min(1.0, len(emails) / 100),  # Based on sample size
+            'data_quality_score': min(1.0, total_emails / 100),  # Based on sample size
         }
     
     def _create_empty_result(self, start_time: datetime, operation_name: str) -> EmailAnalysisResult:
@@ -0,0 +1,293 @@
+"""Persistent, incrementally updated pattern statistics for Gmail analysis"""
+
+import json
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+from damien_cli.core.config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+
+NEWSLETTER_KEYWORDS = ['newsletter', 'digest', 'weekly', 'monthly', 'update']
+RECEIPT_KEYWORDS = ['receipt', 'order', 'invoice', 'purchase', 'payment']
+SHOPPING_KEYWORDS = ['order', 'receipt', 'purchase', 'shipped']
+LARGE_EMAIL_BYTES = 100000
+MAX_EXAMPLES_PER_KEY = 3
+
+# Dimensions tracked per bucket; each maps a key to an email count
+COUNT_DIMENSIONS = (
+    'sender',             # from_sender -> emails
+    'sender_attachments', # from_sender -> emails with attachments
+    'sender_shopping',    # from_sender -> emails with shopping keywords in subject
+    'subject',            # 'newsletter' / 'receipt' -> emails
+    'label',              # label id -> emails (all labels, incl. INBOX/UNREAD)
+    'weekday',            # '0'..'6' -> timestamped emails
+    'flag',               # 'has_attachments' / 'large_size' -> emails
+)
+
+
+def _day_ordinal(timestamp: Optional[float]) -> int:
+    """Map a unix timestamp to the local-calendar day ordinal used for bucketing"""
+    if not timestamp:
+        timestamp = time.time()
+    return datetime.fromtimestamp(timestamp).date().toordinal()
+
+
+def extract_pattern_keys(email: Dict) -> Tuple[Dict[str, List[str]], List[str], bool]:
+    """Return the per-dimension keys, subject tokens and timestamp flag for an email"""
+
+    keys: Dict[str, List[str]] = {dim: [] for dim in COUNT_DIMENSIONS}
+    tokens: List[str] = []
+    timestamped = False
+
+    sender = email.get('from_sender', '')
+    subject_lower = email.get('subject', '').lower()
+    has_attachments = email.get('has_attachments', False)
+
+    if sender:
+        keys['sender'].append(sender)
+        if has_attachments:
+            keys['sender_attachments'].append(sender)
+        if any(keyword in subject_lower for keyword in SHOPPING_KEYWORDS):
+            keys['sender_shopping'].append(sender)
+        tokens = re.findall(r'\b\w{3,}\b', subject_lower)
+
+    if any(keyword in subject_lower for keyword in NEWSLETTER_KEYWORDS):
+        keys['subject'].append('newsletter')
+    if any(keyword in subject_lower for keyword in RECEIPT_KEYWORDS):
+        keys['subject'].append('receipt')
+
+    keys['label'].extend(email.get('label_names', []))
+
+    received_timestamp = email.get('received_timestamp')
+    if received_timestamp:
+        try:
+            keys['weekday'].append(str(datetime.fromtimestamp(received_timestamp).weekday()))
+            timestamped = True
+        except (ValueError, OSError, OverflowError, TypeError):
+            pass
+
+    if has_attachments:
+        keys['flag'].append('has_attachments')
+    if email.get('size_estimate', 0) > LARGE_EMAIL_BYTES:
+        keys['flag'].append('large_size')
+
+    return keys, tokens, timestamped
+
+
+@dataclass
+class PatternBucket:
+    """Pattern counters for all emails received on a single day"""
+
+    total: int = 0
+    timestamped: int = 0
+    message_ids: Set[str] = field(default_factory=set)
+    counts: Dict[str, Counter] = field(
+        default_factory=lambda: {dim: Counter() for dim in COUNT_DIMENSIONS}
+    )
+    sender_tokens: Dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    examples: Dict[str, Dict[str, List[str]]] = field(
+        default_factory=lambda: {dim: defaultdict(list) for dim in COUNT_DIMENSIONS}
+    )
+
+    def add_email(self, email: Dict) -> None:
+        """Fold a single processed email into this bucket"""
+
+        email_id = email.get('id', '')
+        self.total += 1
+        if email_id:
+            self.message_ids.add(email_id)
+
+        keys, tokens, timestamped = extract_pattern_keys(email)
+        sender = email.get('from_sender', '')
+        if sender:
+            self.sender_tokens[sender].update(tokens)
+        if timestamped:
+            self.timestamped += 1
+
+        for dim, dim_keys in keys.items():
+            for key in dim_keys:
+                self.counts[dim][key] += 1
+                dim_examples = self.examples[dim][key]
+                if email_id and len(dim_examples) < MAX_EXAMPLES_PER_KEY:
+                    dim_examples.append(email_id)
+
+    def apply(self, other: 'PatternBucket', sign: int = 1) -> None:
+        """Add (sign=1) or subtract (sign=-1) another bucket's counters"""
+
+        self.total += sign * other.total
+        self.timestamped += sign * other.timestamped
+
+        for dim, counter in other.counts.items():
+            target = self.counts[dim]
+            for key, value in counter.items():
+                target[key] += sign * value
+                if target[key] <= 0:
+                    del target[key]
+
+        for sender, tokens in other.sender_tokens.items():
+            target = self.sender_tokens[sender]
+            for token, value in tokens.items():
+                target[token] += sign * value
+                if target[token] <= 0:
+                    del target[token]
+            if not target:
+                del self.sender_tokens[sender]
+
+    def to_dict(self) -> Dict:
+        return {
+            'total': self.total,
+            'timestamped': self.timestamped,
+            'message_ids': sorted(self.message_ids),
+            'counts': {dim: dict(counter) for dim, counter in self.counts.items()},
+            'sender_tokens': {sender: dict(tokens) for sender, tokens in self.sender_tokens.items()},
+            'examples': {dim: dict(keys) for dim, keys in self.examples.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PatternBucket':
+        bucket = cls(
+            total=data.get('total', 0),
+            timestamped=data.get('timestamped', 0),
+            message_ids=set(data.get('message_ids', [])),
+        )
+        for dim, counter in data.get('counts', {}).items():
+            bucket.counts[dim] = Counter(counter)
+        for sender, tokens in data.get('sender_tokens', {}).items():
+            bucket.sender_tokens[sender] = Counter(tokens)
+        for dim, keys in data.get('examples', {}).items():
+            bucket.examples[dim] = defaultdict(list, {k: list(v) for k, v in keys.items()})
+        return bucket
+
+
+class IncrementalPatternState:
+    """Day-bucketed pattern statistics that are updated with new mail only.
+
+    Running totals are kept alongside the per-day buckets so that ingesting new
+    messages and aging out old days are both O(delta); pattern detection then
+    reads the totals instead of rescanning the whole analysis window.
+    """
+
+    def __init__(self, days_back: int = 30, query_filter: Optional[str] = None):
+        self.days_back = days_back
+        self.query_filter = query_filter
+        self.last_sync_timestamp: Optional[float] = None
+        self.buckets: Dict[int, PatternBucket] = {}
+        self.totals = PatternBucket()
+        self._seen_ids: Set[str] = set()
+
+    @staticmethod
+    def default_path() -> Path:
+        return Path(DATA_DIR) / "ai_intelligence" / "pattern_state.json"
+
+    @property
+    def total_emails(self) -> int:
+        return self.totals.total
+
+    def ingest(self, emails: Iterable[Dict]) -> int:
+        """Add new emails to their day buckets, skipping already-seen IDs"""
+
+        added = 0
+        for email in emails:
+            email_id = email.get('id', '')
+            if email_id and email_id in self._seen_ids:
+                continue
+
+            delta = PatternBucket()
+            delta.add_email(email)
+
+            day = _day_ordinal(email.get('received_timestamp'))
+            bucket = self.buckets.get(day)
+            if bucket is None:
+                bucket = self.buckets[day] = PatternBucket()
+            bucket.add_email(email)
+            self.totals.apply(delta)
+
+            if email_id:
+                self._seen_ids.add(email_id)
+            added += 1
+
+        return added
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Subtract and drop day buckets that fell out of the analysis window"""
+
+        cutoff = _day_ordinal(now) - self.days_back
+        expired_days = [day for day in self.buckets if day < cutoff]
+
+        removed = 0
+        for day in expired_days:
+            bucket = self.buckets.pop(day)
+            self.totals.apply(bucket, sign=-1)
+            self._seen_ids.difference_update(bucket.message_ids)
+            removed += bucket.total
+
+        if removed:
+            logger.debug(f"Aged out {removed} emails from {len(expired_days)} day buckets")
+        return removed
+
+    def examples_for(self, dimension: str, key: str, limit: int = MAX_EXAMPLES_PER_KEY) -> List[str]:
+        """Collect example message IDs for a key, newest day first"""
+
+        examples: List[str] = []
+        for day in sorted(self.buckets, reverse=True):
+            examples.extend(self.buckets[day].examples[dimension].get(key, []))
+            if len(examples) >= limit:
+                break
+        return examples[:limit]
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': STATE_VERSION,
+            'days_back': self.days_back,
+            'query_filter': self.query_filter,
+            'last_sync_timestamp': self.last_sync_timestamp,
+            'buckets': {
+                date.fromordinal(day).isoformat(): bucket.to_dict()
+                for day, bucket in sorted(self.buckets.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'IncrementalPatternState':
+        state = cls(days_back=data.get('days_back', 30), query_filter=data.get('query_filter'))
+        state.last_sync_timestamp = data.get('last_sync_timestamp')
+        for day_str, bucket_data in data.get('buckets', {}).items():
+            day = date.fromisoformat(day_str).toordinal()
+            bucket = PatternBucket.from_dict(bucket_data)
+            state.buckets[day] = bucket
+            state.totals.apply(bucket)
+            state._seen_ids.update(bucket.message_ids)
+        return state
+
+    def save(self, path: Optional[Path] = None) -> None:
+        path = Path(path) if path else self.default_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> Optional['IncrementalPatternState']:
+        path = Path(path) if path else cls.default_path()
+        if not path.exists():
+            return None
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get('version') != STATE_VERSION:
+                logger.info("Pattern state version changed, ignoring persisted state")
+                return None
+            return cls.from_dict(data)
+        except Exception as e:
+            logger.warning(f"Error loading pattern state from {path}: {str(e)}")
+            return None
@@ -2,71 +2,63 @@
 
 import numpy as np
 from collections import defaultdict, Counter
-from typing import List, Dict, Tuple, Set, Optional
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, List, Dict, Tuple, Set, Optional
+import os
 import re
+import time
 from datetime import datetime, timedelta
 import logging
 
-from ..models import EmailPattern, PatternType, PatternCharacteristics
+from ..models import EmailPattern, PatternType, PatternCharacteristics, PerformanceMetrics
+from .sketches import heavy_hitters
 
 logger = logging.getLogger(__name__)
 
 class EmailPatternDetector:
     """Detects various patterns in email collections using basic algorithms"""
     
-    def __init__(self):
+    def __init__(self, parallel_min_emails: int = 5000, max_workers: Optional[int] = None):
         self.min_pattern_size = 3  # Minimum emails to form a pattern
         self.min_confidence = 0.6  # Minimum confidence threshold
+        # Below this size process start-up costs more than the detectors do
+        self.parallel_min_emails = parallel_min_emails
+        # Senders above len(emails) / capacity are always found exactly
+        self.heavy_hitter_capacity = 10000
+        self.max_workers = max_workers
+        self.last_detector_metrics: List[PerformanceMetrics] = []
         
     def detect_patterns(self, emails: List[Dict], embeddings: np.ndarray) -> List[EmailPattern]:
-        """Detect comprehensive patterns in email data"""
+        """Detect comprehensive patterns in email data.
+
+        Runs every detector in PATTERN_DETECTORS over column-projected rows,
+        in a process pool once the batch reaches ``parallel_min_emails``.
+        Per-detector timings are kept in ``last_detector_metrics``.
+        """
+        
+        self.last_detector_metrics = []
         
         if len(emails) < self.min_pattern_size:
             logger.warning(f"Not enough emails ({len(emails)}) to detect patterns")
             return []
         
-        patterns = []
-        
         try:
-            # 1. Sender-based patterns (most reliable)
-            try:
-                sender_patterns = self._detect_sender_patterns(emails)
-                patterns.extend(sender_patterns)
-                logger.debug(f"Detected {len(sender_patterns)} sender patterns")
-            except Exception as e:
-                logger.warning(f"Error in sender pattern detection: {str(e)}")
-            
-            # 2. Subject line patterns  
-            try:
-                subject_patterns = self._detect_subject_patterns(emails)
-                patterns.extend(subject_patterns)
-                logger.debug(f"Detected {len(subject_patterns)} subject patterns")
-            except Exception as e:
-                logger.warning(f"Error in subject pattern detection: {str(e)}")
+            specs = list(PATTERN_DETECTORS.values())
+            columns = build_feature_columns(emails, specs)
+            settings = self._detector_settings()
             
-            # 3. Label patterns
-            try:
-                label_patterns = self._detect_label_patterns(emails)
-                patterns.extend(label_patterns)
-                logger.debug(f"Detected {len(label_patterns)} label patterns")
-            except Exception as e:
-                logger.warning(f"Error in label pattern detection: {str(e)}")
+            results = None
+            if len(specs) > 1 and len(emails) >= self.parallel_min_emails:
+                results = self._run_detectors_in_pool(specs, settings, columns)
+            if results is None:
+                results = [run_pattern_detector(spec, settings, columns) for spec in specs]
             
-            # 4. Time-based patterns (basic)
-            try:
-                time_patterns = self._detect_time_patterns(emails)
-                patterns.extend(time_patterns)
-                logger.debug(f"Detected {len(time_patterns)} time patterns")
-            except Exception as e:
-                logger.warning(f"Error in time pattern detection: {str(e)}")
-            
-            # 5. Size/attachment patterns
-            try:
-                attachment_patterns = self._detect_attachment_patterns(emails)
-                patterns.extend(attachment_patterns)
-                logger.debug(f"Detected {len(attachment_patterns)} attachment patterns")
-            except Exception as e:
-                logger.warning(f"Error in attachment pattern detection: {str(e)}")
+            patterns = []
+            for spec, (detector_patterns, metrics) in zip(specs, results):
+                patterns.extend(detector_patterns)
+                self.last_detector_metrics.append(metrics)
+                logger.debug(f"Detected {len(detector_patterns)} {spec.name} patterns in {metrics.duration_ms:.1f}ms")
             
             # Filter by confidence and remove duplicates
             try:
@@ -83,24 +75,218 @@ class EmailPatternDetector:
             logger.error(f"Error detecting patterns: {str(e)}", exc_info=True)
             return []
     
+    def _detector_settings(self) -> Dict[str, Any]:
+        """Thresholds copied onto the detector instance each spec runs with"""
+        return {
+            'min_pattern_size': self.min_pattern_size,
+            'min_confidence': self.min_confidence,
+            'heavy_hitter_capacity': self.heavy_hitter_capacity
+        }
+    
+    def _run_detectors_in_pool(self, specs, settings, columns) -> Optional[List[Tuple[List[EmailPattern], PerformanceMetrics]]]:
+        """Run detectors concurrently; returns None if the pool is unavailable"""
+        
+        max_workers = self.max_workers or min(len(specs), os.cpu_count() or 1)
+        try:
+            # Columns go to each worker once through the initializer (inherited
+            # without copying under fork) rather than with every task
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_detector_worker,
+                initargs=(columns,)
+            ) as pool:
+                futures = [pool.submit(_run_detector_in_worker, spec, settings) for spec in specs]
+                return [future.result() for future in futures]
+        except Exception as e:
+            logger.warning(f"Parallel pattern detection unavailable, running serially: {str(e)}")
+            return None
+    
+    def get_detector_report(self) -> Dict[str, Any]:
+        """Summarize the last run's per-detector timings and the dominant detector"""
+        
+        detectors = {}
+        for metrics in self.last_detector_metrics:
+            name = metrics.operation_name.split(':', 1)[-1]
+            detectors[name] = {
+                'duration_ms': round(metrics.duration_ms or 0.0, 3),
+                'rows_scanned': metrics.items_processed,
+                'patterns_emitted': metrics.items_emitted,
+                'errors': metrics.errors_encountered
+            }
+        
+        total_ms = sum(d['duration_ms'] for d in detectors.values())
+        dominant = max(detectors, key=lambda name: detectors[name]['duration_ms']) if detectors else None
+        return {
+            'detectors': detectors,
+            'total_detector_ms': round(total_ms, 3),
+            'dominant_detector': dominant,
+            'dominant_share': detectors[dominant]['duration_ms'] / total_ms if dominant and total_ms > 0 else 0.0
+        }
+    
+    def detect_patterns_from_state(self, state) -> List[EmailPattern]:
+        """Detect patterns from an IncrementalPatternState's running totals.
+
+        Mirrors detect_patterns for the sender, subject, label, time and
+        attachment detectors without touching individual emails.
+        """
+
+        totals = state.totals
+        total_emails = totals.total
+
+        if total_emails < self.min_pattern_size:
+            logger.warning(f"Not enough emails ({total_emails}) to detect patterns")
+            return []
+
+        counts = totals.counts
+        patterns = []
+
+        def build(pattern_type, name, description, count, confidence, characteristics, dimension, key):
+            return EmailPattern(
+                pattern_type=pattern_type,
+                pattern_name=name,
+                description=description,
+                email_count=count,
+                total_email_universe=total_emails,
+                prevalence_rate=count / total_emails,
+                confidence=confidence,
+                characteristics=characteristics,
+                example_email_ids=state.examples_for(dimension, key)
+            )
+
+        # 1. Sender-based patterns
+        for sender, email_count in counts['sender'].items():
+            if email_count < self.min_pattern_size:
+                continue
+            try:
+                token_counts = totals.sender_tokens.get(sender, Counter())
+                common_words = [
+                    word for word, count in token_counts.most_common(10) if count >= 2
+                ]
+                sender_type, confidence = self._classify_sender_type(
+                    sender, counts['sender_shopping'].get(sender, 0) > 0
+                )
+                characteristics = PatternCharacteristics(
+                    primary_feature=sender,
+                    secondary_features=common_words[:3],
+                    statistical_measures={
+                        'email_count': email_count,
+                        'attachment_rate': counts['sender_attachments'].get(sender, 0) / email_count,
+                        'prevalence': email_count / total_emails
+                    },
+                    sender_domain=sender.split('@')[-1] if '@' in sender else sender,
+                    sender_type=sender_type,
+                    common_keywords=common_words
+                )
+                patterns.append(build(
+                    PatternType.SENDER, f"High Volume Sender: {sender}",
+                    f"{sender_type} sender with {email_count} emails",
+                    email_count, confidence, characteristics, 'sender', sender
+                ))
+            except Exception as e:
+                logger.warning(f"Error analyzing sender {sender}: {str(e)}")
+
+        # 2. Subject line patterns
+        subject_specs = [
+            ('newsletter', "Newsletter Emails", "Emails with newsletter-like subjects ({} found)",
+             ['newsletter', 'digest', 'weekly', 'monthly'], 0.85),
+            ('receipt', "Receipt/Order Emails", "Emails about purchases and orders ({} found)",
+             ['receipt', 'order', 'invoice', 'purchase'], 0.8),
+        ]
+        for key, name, description, keywords, confidence in subject_specs:
+            count = counts['subject'].get(key, 0)
+            if count >= self.min_pattern_size:
+                characteristics = PatternCharacteristics(
+                    primary_feature=key,
+                    common_keywords=keywords,
+                    statistical_measures={'pattern_strength': count / total_emails}
+                )
+                patterns.append(build(
+                    PatternType.SUBJECT, name, description.format(count),
+                    count, confidence, characteristics, 'subject', key
+                ))
+
+        # 3. Label patterns
+        for label, count in counts['label'].items():
+            if label in ['INBOX', 'UNREAD'] or count < self.min_pattern_size:
+                continue
+            characteristics = PatternCharacteristics(
+                primary_feature=label,
+                statistical_measures={'prevalence': count / total_emails}
+            )
+            patterns.append(build(
+                PatternType.LABEL, f"Label: {label}",
+                f"Emails with {label} label ({count} emails)",
+                count, 0.8, characteristics, 'label', label
+            ))
+
+        # 4. Time-based patterns
+        timestamped = totals.timestamped
+        if timestamped >= self.min_pattern_size:
+            day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+            for weekday_key, count in counts['weekday'].items():
+                if count < timestamped * 0.3:
+                    continue
+                weekday = int(weekday_key)
+                characteristics = PatternCharacteristics(
+                    primary_feature=day_names[weekday],
+                    time_pattern_type='weekly',
+                    peak_days=[weekday],
+                    statistical_measures={'day_concentration': count / timestamped}
+                )
+                patterns.append(build(
+                    PatternType.TIME, f"{day_names[weekday]} Pattern",
+                    f"Many emails received on {day_names[weekday]} ({count} emails)",
+                    count, 0.7, characteristics, 'weekday', weekday_key
+                ))
+
+        # 5. Size/attachment patterns
+        attachment_count = counts['flag'].get('has_attachments', 0)
+        if attachment_count >= self.min_pattern_size:
+            characteristics = PatternCharacteristics(
+                primary_feature="has_attachments",
+                statistical_measures={'attachment_rate': attachment_count / total_emails}
+            )
+            patterns.append(build(
+                PatternType.ATTACHMENT, "Emails with Attachments",
+                f"Emails containing attachments ({attachment_count} found)",
+                attachment_count, 0.75, characteristics, 'flag', 'has_attachments'
+            ))
+
+        large_count = counts['flag'].get('large_size', 0)
+        if large_count >= self.min_pattern_size:
+            characteristics = PatternCharacteristics(
+                primary_feature="large_size",
+                statistical_measures={'large_email_rate': large_count / total_emails}
+            )
+            patterns.append(build(
+                PatternType.SIZE, "Large Emails",
+                f"Large emails (>100KB) - {large_count} found",
+                large_count, 0.7, characteristics, 'flag', 'large_size'
+            ))
+
+        patterns = self._filter_and_dedupe_patterns(patterns)
+        logger.info(f"Detected {len(patterns)} email patterns from incremental state")
+        return patterns
+
     def _detect_sender_patterns(self, emails: List[Dict]) -> List[EmailPattern]:
         """Detect patterns based on email senders"""
         
         patterns = []
-        sender_groups = defaultdict(list)
         
-        # Group emails by sender
-        for email in emails:
-            sender = email.get('from_sender', '')
-            if sender:
-                sender_groups[sender].append(email)
+        # Only senders that can reach min_pattern_size are grouped; the
+        # long tail is counted in a fixed-size heavy-hitter summary
+        sender_groups = heavy_hitters(
+            emails,
+            lambda email: email.get('from_sender', '') or None,
+            self.min_pattern_size,
+            capacity=self.heavy_hitter_capacity
+        )
         
         # Analyze each sender group
         for sender, sender_emails in sender_groups.items():
-            if len(sender_emails) >= self.min_pattern_size:
-                pattern = self._analyze_sender_group(sender, sender_emails, len(emails))
-                if pattern:
-                    patterns.append(pattern)
+            pattern = self._analyze_sender_group(sender, sender_emails, len(emails))
+            if pattern:
+                patterns.append(pattern)
         
         return patterns
     
@@ -167,8 +353,16 @@ class EmailPatternDetector:
     def _classify_sender(self, sender: str, subjects: List[str]) -> Tuple[str, float]:
         """Classify sender type and determine confidence"""
         
-        sender_lower = sender.lower()
         all_subjects = ' '.join(subjects).lower()
+        has_shopping_subjects = any(
+            keyword in all_subjects for keyword in ['order', 'receipt', 'purchase', 'shipped']
+        )
+        return self._classify_sender_type(sender, has_shopping_subjects)
+    
+    def _classify_sender_type(self, sender: str, has_shopping_subjects: bool) -> Tuple[str, float]:
+        """Classify sender type from the sender string and a shopping-subject flag"""
+        
+        sender_lower = sender.lower()
         
         # Newsletter patterns
         if any(keyword in sender_lower for keyword in ['newsletter', 'digest', 'weekly', 'monthly']):
@@ -179,7 +373,7 @@ class EmailPatternDetector:
             return "Notification", 0.85
         
         # Shopping patterns
-        if any(keyword in all_subjects for keyword in ['order', 'receipt', 'purchase', 'shipped']):
+        if has_shopping_subjects:
             return "Shopping", 0.8
         
         # Social media patterns
@@ -432,3 +626,124 @@ class EmailPatternDetector:
                 deduped.append(pattern)
         
         return deduped[:15]  # Return top 15 patterns
+
+
+# ============================================================================
+# DETECTOR REGISTRY
+# ============================================================================
+
+@dataclass(frozen=True)
+class PatternDetectorSpec:
+    """A registered detector and the email fields it reads"""
+    
+    name: str
+    columns: Tuple[str, ...]
+    func: Callable[[EmailPatternDetector, List[Dict]], List[EmailPattern]]
+
+
+PATTERN_DETECTORS: Dict[str, PatternDetectorSpec] = {}
+
+# Fallbacks for missing fields, matching the detectors' own email.get defaults
+COLUMN_DEFAULTS = {
+    'id': '',
+    'from_sender': '',
+    'subject': '',
+    'label_names': [],
+    'received_timestamp': None,
+    'has_attachments': False,
+    'size_estimate': 0,
+}
+
+
+def register_pattern_detector(name: str, columns: Tuple[str, ...], func: Optional[Callable] = None):
+    """Register a detector under ``name``; usable directly or as a decorator.
+
+    ``func(detector, rows)`` receives rows holding only ``columns`` and must
+    be a module-level function (or class attribute) so it can be pickled to
+    pool workers.
+    """
+    
+    def decorator(detector_func: Callable) -> Callable:
+        PATTERN_DETECTORS[name] = PatternDetectorSpec(name, tuple(columns), detector_func)
+        return detector_func
+    
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def build_feature_columns(emails: List[Dict], specs: List[PatternDetectorSpec]) -> Dict[str, tuple]:
+    """Extract each column needed by ``specs`` once, as an immutable sequence"""
+    
+    needed = []
+    for spec in specs:
+        needed.extend(column for column in spec.columns if column not in needed)
+    return {
+        column: tuple(email.get(column, COLUMN_DEFAULTS.get(column)) for email in emails)
+        for column in needed
+    }
+
+
+def run_pattern_detector(
+    spec: PatternDetectorSpec,
+    settings: Dict[str, Any],
+    columns: Dict[str, tuple]
+) -> Tuple[List[EmailPattern], PerformanceMetrics]:
+    """Run one detector over its projected columns and time it"""
+    
+    detector = EmailPatternDetector()
+    for name, value in settings.items():
+        setattr(detector, name, value)
+    
+    start_time = datetime.now()
+    started = time.perf_counter()
+    patterns: List[EmailPattern] = []
+    errors = 0
+    rows: List[Dict] = []
+    
+    try:
+        rows = [
+            dict(zip(spec.columns, values))
+            for values in zip(*(columns[column] for column in spec.columns))
+        ]
+        patterns = spec.func(detector, rows) or []
+    except Exception as e:
+        logger.warning(f"Error in {spec.name} pattern detection: {str(e)}")
+        errors = 1
+    
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    metrics = PerformanceMetrics(
+        operation_name=f"pattern_detector:{spec.name}",
+        start_time=start_time,
+        end_time=datetime.now(),
+        items_processed=len(rows),
+        items_emitted=len(patterns),
+        errors_encountered=errors
+    )
+    # perf_counter is finer-grained than the datetime difference
+    metrics.duration_ms = elapsed_ms
+    return patterns, metrics
+
+
+_worker_columns: Dict[str, tuple] = {}
+
+
+def _init_detector_worker(columns: Dict[str, tuple]) -> None:
+    global _worker_columns
+    _worker_columns = columns
+
+
+def _run_detector_in_worker(spec: PatternDetectorSpec, settings: Dict[str, Any]):
+    return run_pattern_detector(spec, settings, _worker_columns)
+
+
+register_pattern_detector('sender', ('id', 'from_sender', 'subject', 'has_attachments'),
+                          EmailPatternDetector._detect_sender_patterns)
+register_pattern_detector('subject', ('id', 'subject'),
+                          EmailPatternDetector._detect_subject_patterns)
+register_pattern_detector('label', ('id', 'label_names'),
+                          EmailPatternDetector._detect_label_patterns)
+register_pattern_detector('time', ('id', 'received_timestamp'),
+                          EmailPatternDetector._detect_time_patterns)
+register_pattern_detector('attachment', ('id', 'has_attachments', 'size_estimate'),
+                          EmailPatternDetector._detect_attachment_patterns)
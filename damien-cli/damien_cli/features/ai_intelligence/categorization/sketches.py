@@ -0,0 +1,216 @@
+"""Mergeable, fixed-size summaries for streaming email statistics"""
+
+import hashlib
+import heapq
+import random
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+T = TypeVar('T')
+
+
+class CountMinSketch:
+    """Count-Min sketch: approximate frequency counts in fixed memory.
+
+    Estimates never undercount; with ``width = ceil(e / epsilon)`` and
+    ``depth = ceil(ln(1 / delta))`` they overcount by at most
+    ``epsilon * total`` with probability ``1 - delta``. Sketches built with the
+    same width, depth and seed can be merged by adding their tables.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4, seed: int = 0):
+        if depth > 16:
+            raise ValueError("Count-Min sketch depth is limited to 16 rows")
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.total = 0
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self._rows = np.arange(depth)
+        self._hash_key = f"cms:{seed}".encode()
+
+    def _indexes(self, key: str) -> np.ndarray:
+        # One keyed blake2b digest supplies an independent 32-bit hash per row
+        digest = hashlib.blake2b(
+            key.encode('utf-8'), digest_size=4 * self.depth, key=self._hash_key
+        ).digest()
+        return np.frombuffer(digest, dtype='<u4') % self.width
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Add ``count`` occurrences of ``key`` and return its new estimate"""
+        indexes = self._indexes(key)
+        rows = self._rows
+        self.table[rows, indexes] += count
+        self.total += count
+        return int(self.table[rows, indexes].min())
+
+    def estimate(self, key: str) -> int:
+        return int(self.table[self._rows, self._indexes(key)].min())
+
+    def merge(self, other: 'CountMinSketch') -> None:
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Can only merge Count-Min sketches with identical width, depth and seed")
+        self.table += other.table
+        self.total += other.total
+
+    @property
+    def memory_bytes(self) -> int:
+        return int(self.table.nbytes)
+
+
+class ReservoirSample(Generic[T]):
+    """Uniform random sample of at most ``capacity`` items from a stream"""
+
+    def __init__(self, capacity: int = 3, rng: Optional[random.Random] = None):
+        self.capacity = capacity
+        self.items: List[T] = []
+        self.seen = 0
+        # Many small reservoirs can share one generator instead of each
+        # carrying its own Mersenne Twister state
+        self._rng = rng or random.Random()
+
+    def add(self, item: T) -> None:
+        self.seen += 1
+        if len(self.items) < self.capacity:
+            self.items.append(item)
+        else:
+            slot = self._rng.randrange(self.seen)
+            if slot < self.capacity:
+                self.items[slot] = item
+
+    def extend(self, items: Iterable[T]) -> None:
+        for item in items:
+            self.add(item)
+
+    def merge(self, other: 'ReservoirSample[T]') -> None:
+        """Combine two reservoirs, weighting each side by the items it has seen"""
+        total_seen = self.seen + other.seen
+        if total_seen == 0:
+            return
+        pool_self, pool_other = list(self.items), list(other.items)
+        merged: List[T] = []
+        while len(merged) < self.capacity and (pool_self or pool_other):
+            take_self = pool_self and (
+                not pool_other or self._rng.random() < self.seen / total_seen
+            )
+            pool = pool_self if take_self else pool_other
+            merged.append(pool.pop(self._rng.randrange(len(pool))))
+        self.items = merged
+        self.seen = total_seen
+
+
+class SpaceSaving:
+    """SpaceSaving heavy-hitter summary over at most ``capacity`` keys.
+
+    Every key whose true frequency exceeds ``total / capacity`` is guaranteed
+    to be monitored. Each monitored count is an upper bound that overcounts
+    by at most its recorded error, so ``count - error`` is a lower bound.
+    Keys can carry a small reservoir of example items.
+    """
+
+    def __init__(self, capacity: int = 1024, example_capacity: int = 0, rng: Optional[random.Random] = None):
+        if capacity < 1:
+            raise ValueError("SpaceSaving capacity must be at least 1")
+        self.capacity = capacity
+        self.example_capacity = example_capacity
+        self.total = 0
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self.examples: Dict[Hashable, ReservoirSample] = {}
+        # Min-heap of (count, key) with stale entries skipped lazily on eviction
+        self._heap: List[Tuple[int, Hashable]] = []
+        self._rng = rng or random.Random(0)
+
+    def add(self, key: Hashable, item: Any = None, count: int = 1) -> int:
+        """Count ``key`` (optionally sampling ``item`` as an example); returns its estimate"""
+        self.total += count
+        if key in self.counts:
+            self.counts[key] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = count
+            self.errors[key] = 0
+        else:
+            floor = self._evict_min()
+            self.counts[key] = floor + count
+            self.errors[key] = floor
+
+        estimate = self.counts[key]
+        heapq.heappush(self._heap, (estimate, key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(value, k) for k, value in self.counts.items()]
+            heapq.heapify(self._heap)
+
+        if self.example_capacity and item is not None:
+            sample = self.examples.get(key)
+            if sample is None:
+                sample = self.examples[key] = ReservoirSample(self.example_capacity, rng=self._rng)
+            sample.add(item)
+        return estimate
+
+    def _evict_min(self) -> int:
+        while True:
+            value, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == value:
+                del self.counts[key]
+                del self.errors[key]
+                self.examples.pop(key, None)
+                return value
+
+    def estimate(self, key: Hashable) -> int:
+        return self.counts.get(key, 0)
+
+    def candidates(self, min_count: int) -> Dict[Hashable, int]:
+        """Keys that may reach ``min_count`` (a superset of the true heavy hitters)"""
+        return {key: value for key, value in self.counts.items() if value >= min_count}
+
+    def guaranteed(self, min_count: int) -> Dict[Hashable, int]:
+        """Keys certain to reach ``min_count``, with their lower-bound counts"""
+        return {
+            key: value - self.errors[key]
+            for key, value in self.counts.items()
+            if value - self.errors[key] >= min_count
+        }
+
+    def examples_for(self, key: Hashable) -> List[Any]:
+        sample = self.examples.get(key)
+        return list(sample.items) if sample else []
+
+
+def heavy_hitters(
+    items: Iterable[T],
+    key_func: Callable[[T], Optional[Hashable]],
+    min_count: int,
+    capacity: int = 10000
+) -> Dict[Hashable, List[T]]:
+    """Group only the keys that occur at least ``min_count`` times.
+
+    A SpaceSaving pass over ``items`` (which must be re-iterable) proposes
+    candidates in bounded memory; a second pass recounts them exactly and
+    collects their items, so the result has no false positives. Every key
+    with frequency above ``len(items) / capacity`` is found.
+    """
+
+    summary = SpaceSaving(capacity)
+    for item in items:
+        key = key_func(item)
+        if key is not None:
+            summary.add(key)
+
+    candidates = summary.candidates(min_count)
+    groups: Dict[Hashable, List[T]] = {}
+    if candidates:
+        for item in items:
+            key = key_func(item)
+            if key in candidates:
+                groups.setdefault(key, []).append(item)
+    return {key: group for key, group in groups.items() if len(group) >= min_count}
+
+
+def top_keys(estimates: Dict[str, int], limit: int) -> Dict[str, int]:
+    """Keep the ``limit`` keys with the highest estimates"""
+    if len(estimates) <= limit:
+        return estimates
+    ranked = sorted(estimates.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return dict(ranked)
+
@@ -0,0 +1,173 @@
+"""Bounded-memory pattern statistics for streaming mailbox analysis"""
+
+import random
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+import logging
+
+from .incremental import COUNT_DIMENSIONS, MAX_EXAMPLES_PER_KEY, PatternBucket, extract_pattern_keys
+from .sketches import CountMinSketch, ReservoirSample, top_keys
+
+logger = logging.getLogger(__name__)
+
+# Unbounded per-sender dimensions go through Count-Min sketches; the rest
+# (subject categories, labels, weekdays, flags) have small fixed key sets.
+SKETCHED_DIMENSIONS = ('sender', 'sender_attachments', 'sender_shopping')
+EXACT_DIMENSIONS = tuple(dim for dim in COUNT_DIMENSIONS if dim not in SKETCHED_DIMENSIONS)
+
+
+class StreamingPatternSummary:
+    """Mergeable pattern summary whose size does not grow with the mailbox.
+
+    Sender and subject-token frequencies live in Count-Min sketches. Only
+    senders whose estimate reaches ``min_pattern_size`` are kept as named
+    candidates (at most ``max_candidates``), each with a bounded token list
+    and a reservoir of example message IDs. Exposes the same ``totals`` /
+    ``examples_for`` interface as IncrementalPatternState, so
+    EmailPatternDetector.detect_patterns_from_state works on either.
+    """
+
+    def __init__(
+        self,
+        min_pattern_size: int = 3,
+        max_candidates: int = 2000,
+        max_tokens_per_sender: int = 32,
+        sketch_width: int = 4096,
+        sketch_depth: int = 4,
+        seed: int = 0
+    ):
+        self.min_pattern_size = min_pattern_size
+        self.max_candidates = max_candidates
+        self.max_tokens_per_sender = max_tokens_per_sender
+        self.seed = seed
+
+        self.total = 0
+        self.timestamped = 0
+        self.sketches = {
+            dim: CountMinSketch(sketch_width, sketch_depth, seed) for dim in SKETCHED_DIMENSIONS
+        }
+        self.token_sketch = CountMinSketch(sketch_width * 4, sketch_depth, seed)
+        self.exact_counts: Dict[str, Counter] = {dim: Counter() for dim in EXACT_DIMENSIONS}
+
+        self.candidates: Dict[str, int] = {}
+        self.candidate_tokens: Dict[str, Dict[str, int]] = {}
+        self.examples: Dict[Tuple[str, str], ReservoirSample] = {}
+        self._rng = random.Random(seed)
+
+    def _reservoir(self, dimension: str, key: str) -> ReservoirSample:
+        sample = self.examples.get((dimension, key))
+        if sample is None:
+            sample = self.examples[(dimension, key)] = ReservoirSample(
+                MAX_EXAMPLES_PER_KEY, rng=self._rng
+            )
+        return sample
+
+    def add_email(self, email: Dict) -> None:
+        """Fold one processed email into the summary"""
+
+        keys, tokens, timestamped = extract_pattern_keys(email)
+        email_id = email.get('id', '')
+        self.total += 1
+        if timestamped:
+            self.timestamped += 1
+
+        for dim in SKETCHED_DIMENSIONS:
+            for key in keys[dim]:
+                estimate = self.sketches[dim].add(key)
+                if dim == 'sender' and estimate >= self.min_pattern_size:
+                    self.candidates[key] = estimate
+
+        sender = email.get('from_sender', '')
+        is_candidate = sender in self.candidates
+        for token in tokens:
+            token_estimate = self.token_sketch.add(f"{sender}\x1f{token}")
+            if is_candidate:
+                self.candidate_tokens.setdefault(sender, {})[token] = token_estimate
+        if is_candidate and email_id:
+            self._reservoir('sender', sender).add(email_id)
+
+        for dim in EXACT_DIMENSIONS:
+            for key in keys[dim]:
+                self.exact_counts[dim][key] += 1
+                if email_id:
+                    self._reservoir(dim, key).add(email_id)
+
+    def add_emails(self, emails: Iterable[Dict]) -> None:
+        for email in emails:
+            self.add_email(email)
+        self._prune()
+
+    def merge(self, other: 'StreamingPatternSummary') -> None:
+        """Merge a summary built with the same sketch parameters"""
+
+        self.total += other.total
+        self.timestamped += other.timestamped
+        for dim in SKETCHED_DIMENSIONS:
+            self.sketches[dim].merge(other.sketches[dim])
+        self.token_sketch.merge(other.token_sketch)
+        for dim in EXACT_DIMENSIONS:
+            self.exact_counts[dim].update(other.exact_counts[dim])
+
+        sender_sketch = self.sketches['sender']
+        for sender in set(self.candidates) | set(other.candidates):
+            self.candidates[sender] = sender_sketch.estimate(sender)
+        for sender, tokens in other.candidate_tokens.items():
+            merged_tokens = self.candidate_tokens.setdefault(sender, {})
+            for token in set(merged_tokens) | set(tokens):
+                merged_tokens[token] = self.token_sketch.estimate(f"{sender}\x1f{token}")
+        for key, sample in other.examples.items():
+            if key in self.examples:
+                self.examples[key].merge(sample)
+            else:
+                self.examples[key] = sample
+
+        self._prune()
+
+    def _prune(self) -> None:
+        """Drop the weakest candidates and tokens once the bounds are exceeded"""
+
+        if len(self.candidates) > self.max_candidates:
+            self.candidates = top_keys(self.candidates, self.max_candidates)
+            for sender in list(self.candidate_tokens):
+                if sender not in self.candidates:
+                    del self.candidate_tokens[sender]
+            for dim, key in list(self.examples):
+                if dim == 'sender' and key not in self.candidates:
+                    del self.examples[(dim, key)]
+
+        for sender, tokens in self.candidate_tokens.items():
+            if len(tokens) > self.max_tokens_per_sender:
+                self.candidate_tokens[sender] = top_keys(tokens, self.max_tokens_per_sender)
+
+    @property
+    def totals(self) -> PatternBucket:
+        """Snapshot of the summary as a PatternBucket of candidate estimates"""
+
+        snapshot = PatternBucket(total=self.total, timestamped=self.timestamped)
+        for sender in self.candidates:
+            sender_estimate = self.sketches['sender'].estimate(sender)
+            snapshot.counts['sender'][sender] = sender_estimate
+            for dim in ('sender_attachments', 'sender_shopping'):
+                # A sub-count can never exceed the sender's own volume
+                estimate = min(self.sketches[dim].estimate(sender), sender_estimate)
+                if estimate > 0:
+                    snapshot.counts[dim][sender] = estimate
+            tokens = self.candidate_tokens.get(sender)
+            if tokens:
+                snapshot.sender_tokens[sender] = Counter(tokens)
+        for dim in EXACT_DIMENSIONS:
+            snapshot.counts[dim] = Counter(self.exact_counts[dim])
+        return snapshot
+
+    def examples_for(self, dimension: str, key: str, limit: int = MAX_EXAMPLES_PER_KEY) -> List[str]:
+        sample = self.examples.get((dimension, key))
+        return list(sample.items[:limit]) if sample else []
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'emails_summarized': self.total,
+            'candidate_senders': len(self.candidates),
+            'tracked_tokens': sum(len(tokens) for tokens in self.candidate_tokens.values()),
+            'example_reservoirs': len(self.examples),
+            'sketch_bytes': sum(s.memory_bytes for s in self.sketches.values()) + self.token_sketch.memory_bytes,
+        }
@@ -199,10 +199,10 @@ def suggest_rules(ctx, limit: int, min_confidence: float, days: int, max_emails:
             
             if suggestion.rule_actions:
                 action = suggestion.rule_actions[0]
-                if action.action_type.value == "label":
+                if action.action_type == "label":
                     label_name = action.parameters.get("label_name", "New Label")
                     click.echo(f"      THEN apply label: {label_name}")
-                elif action.action_type.value == "archive":
+                elif action.action_type == "archive":
                     click.echo(f"      THEN archive email")
             
             click.echo("")
@@ -234,10 +234,18 @@ def suggest_rules(ctx, limit: int, min_confidence: float, days: int, max_emails:
 @click.option("--query", type=str, help="Custom Gmail query")
 @click.option("--min-confidence", type=float, default=0.7, help="Minimum confidence threshold")
 @click.option("--output-format", type=click.Choice(["human", "json"]), default="human", help="Output format")
+@click.option("--incremental", is_flag=True, help="Update persisted pattern state with new emails only")
+@click.option("--rebuild", is_flag=True, help="With --incremental, discard persisted state and rebuild the window")
+@click.option("--streaming", is_flag=True, help="Analyze in fixed-size windows with bounded memory (large mailboxes)")
 @click.pass_context
-def analyze_emails(ctx, days: int, max_emails: int, query: Optional[str], min_confidence: float, output_format: str):
+def analyze_emails(ctx, days: int, max_emails: int, query: Optional[str], min_confidence: float, output_format: str, incremental: bool, rebuild: bool, streaming: bool):
     """Analyze Gmail emails and suggest intelligent categorization rules"""
     
+    if rebuild and not incremental:
+        raise click.UsageError("--rebuild only applies with --incremental")
+    if incremental and streaming:
+        raise click.UsageError("--incremental and --streaming cannot be combined")
+    
     try:
         import asyncio
         from .categorization.gmail_analyzer import GmailEmailAnalyzer
@@ -254,6 +262,21 @@ def analyze_emails(ctx, days: int, max_emails: int, query: Optional[str], min_co
         
         # Run the analysis
         def run_analysis():
+            if incremental:
+                return asyncio.run(analyzer.analyze_inbox_incremental(
+                    days_back=days,
+                    min_confidence=min_confidence,
+                    query_filter=query,
+                    max_new_emails=max_emails,
+                    full_rebuild=rebuild
+                ))
+            if streaming:
+                return asyncio.run(analyzer.analyze_inbox_streaming(
+                    max_emails=max_emails,
+                    days_back=days,
+                    min_confidence=min_confidence,
+                    query_filter=query
+                ))
             return asyncio.run(analyzer.analyze_inbox(
                 max_emails=max_emails,
                 days_back=days,
@@ -274,7 +297,7 @@ def analyze_emails(ctx, days: int, max_emails: int, query: Optional[str], min_co
                 },
                 "patterns": [
                     {
-                        "type": pattern.pattern_type.value,
+                        "type": pattern.pattern_type,
                         "name": pattern.pattern_name,
                         "email_count": pattern.email_count,
                         "confidence": pattern.confidence,
@@ -294,7 +317,8 @@ def analyze_emails(ctx, days: int, max_emails: int, query: Optional[str], min_co
                 ],
                 "performance": {
                     "duration_seconds": results.processing_performance.duration_ms / 1000,
-                    "items_processed": results.processing_performance.items_processed
+                    "items_processed": results.processing_performance.items_processed,
+                    "detector_timings": results.summary_statistics.get('detector_timings')
                 }
             }
             click.echo(json.dumps(output, indent=2))
@@ -312,7 +336,7 @@ def analyze_emails(ctx, days: int, max_emails: int, query: Optional[str], min_co
             click.echo("\n🔍 Top Email Patterns Detected:")
             for i, pattern in enumerate(results.patterns_detected[:5], 1):
                 click.echo(f"\n{i}. {pattern.pattern_name}")
-                click.echo(f"   Type: {pattern.pattern_type.value.title()}")
+                click.echo(f"   Type: {pattern.pattern_type.title()}")
                 click.echo(f"   Emails: {pattern.email_count}")
                 click.echo(f"   Confidence: {pattern.confidence:.0%}")
                 click.echo(f"   Description: {pattern.description}")
@@ -334,13 +358,13 @@ def analyze_emails(ctx, days: int, max_emails: int, query: Optional[str], min_co
                 
                 if suggestion.rule_actions:
                     action = suggestion.rule_actions[0]
-                    if action.action_type.value == "label":
+                    if action.action_type == "label":
                         label_name = action.parameters.get("label_name", "New Label")
                         click.echo(f"     → Apply label: {label_name}")
-                    elif action.action_type.value == "archive":
+                    elif action.action_type == "archive":
                         click.echo(f"     → Archive email")
                     else:
-                        click.echo(f"     → Action: {action.action_type.value}")
+                        click.echo(f"     → Action: {action.action_type}")
         
         # Summary statistics
         if results.summary_statistics:
@@ -350,6 +374,12 @@ def analyze_emails(ctx, days: int, max_emails: int, query: Optional[str], min_co
             click.echo(f"   • High confidence patterns: {stats.get('high_confidence_patterns', 'N/A')}")
             click.echo(f"   • Potential automation rate: {stats.get('automation_rate_percent', 0):.1f}%")
             click.echo(f"   • Estimated time savings: {stats.get('estimated_time_savings_hours', 0):.1f} hours")
+            detector_timings = stats.get('detector_timings') or {}
+            if detector_timings.get('dominant_detector'):
+                click.echo(
+                    f"   • Slowest pattern detector: {detector_timings['dominant_detector']} "
+                    f"({detector_timings['dominant_share']:.0%} of detection time)"
+                )
         
         # Offer to create rules
         if results.category_suggestions and click.confirm("\n🤔 Would you like to create rules from these suggestions?"):
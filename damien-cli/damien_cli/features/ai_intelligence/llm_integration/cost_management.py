@@ -13,9 +13,10 @@ except ImportError:
     LLMProvider = Any
 
 try:
-    from .utils import TokenCounter
+    from .utils import SHARED_TOKEN_COUNTER, TokenCounter
 except ImportError:
     TokenCounter = Any
+    SHARED_TOKEN_COUNTER = None
 
 
 class CostEstimator:
@@ -36,8 +37,10 @@ class CostEstimator:
         'local': (0.0, 0.0) # Assuming local models have no direct API cost
     }
 
-    def __init__(self, token_counter: Optional[TokenCounter] = None):
-        self.token_counter = token_counter if token_counter else TokenCounter()
+    def __init__(self, token_counter: Optional[TokenCounter] = None, approximate_tokens: bool = False):
+        self.token_counter = token_counter if token_counter else SHARED_TOKEN_COUNTER
+        # Estimate input tokens from text length instead of encoding the prompt
+        self.approximate_tokens = approximate_tokens
 
     def estimate_llm_cost(self, llm_request: LLMRequest) -> float:
         """
@@ -55,7 +58,7 @@ class CostEstimator:
         if system_prompt_text:
             input_text = f"{system_prompt_text}\n{prompt_text}" # Simplistic combination
 
-        input_tokens = self.token_counter.count(input_text, model_name=model_name)
+        input_tokens = self.token_counter.count(input_text, model_name=model_name, approximate=self.approximate_tokens)
         
         # Approximate output tokens. This is a very rough guess.
         # A better approach might involve statistical analysis or a small pre-flight request.
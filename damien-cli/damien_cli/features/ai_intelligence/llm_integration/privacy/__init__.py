@@ -3,10 +3,11 @@
 from .guardian import PrivacyGuardian
 from .detector import PIIDetector, PIIEntity
 from .tokenizer import ReversibleTokenizer
+from .vault import TokenVault
 from .audit import ComplianceAuditLogger
 from .consent import ConsentManager
 
 __all__ = [
     'PrivacyGuardian', 'PIIDetector', 'PIIEntity',
-    'ReversibleTokenizer', 'ComplianceAuditLogger', 'ConsentManager'
+    'ReversibleTokenizer', 'TokenVault', 'ComplianceAuditLogger', 'ConsentManager'
 ]
\ No newline at end of file
@@ -16,20 +16,334 @@ Example:
     ...     status="SUCCESS"
     ... )
 
+File logging is buffered: log_event only queues the record, and a
+background BufferedAuditWriter serializes queued records, appends them in
+batches, fsyncs periodically and rotates the file by size and by UTC date
+(``audit.jsonl`` -> ``audit.20250101T000000000000.jsonl``). When the queue
+stays full the caller writes its record through to the file itself, so a
+burst is slowed to disk speed rather than losing audit records, and
+pending records are flushed on close() and at interpreter exit.
+
+generate_compliance_report streams the active and rotated JSONL files line
+by line, skipping rotated files that closed before the requested period, so
+reports over large audit histories run in constant memory.
+
 Note:
     In a production environment, this logger would integrate with secure,
     persistent logging systems (e.g., ELK stack, Splunk, or a dedicated
-    audit database). The current implementation provides a basic structure
-    and console logging for development purposes.
+    audit database).
     Key features from architectural spec to be developed:
     - Immutable audit logs
-    - Compliance report generation
     - Real-time alerting integration
     - Data lineage tracking
 """
+import atexit
 import datetime
 import json
-from typing import Dict, Any, Optional, List
+import logging
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROTATION_STAMP_FORMAT = "%Y%m%dT%H%M%S%f"
+
+
+def _as_naive_utc(moment: datetime.datetime) -> datetime.datetime:
+    """Audit timestamps are naive UTC; bring an aware datetime to the same footing."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+class BufferedAuditWriter:
+    """
+    Appends audit records to a JSONL file from a background thread.
+
+    Records are queued by submit() and written in batches of up to
+    ``batch_size``, at least every ``flush_interval`` seconds, with an fsync
+    at most every ``fsync_interval`` seconds (and always on flush/close).
+    Before a batch is written the file is rotated if it has reached
+    ``max_bytes`` or was started on an earlier UTC day. A record that finds
+    the queue full for ``put_timeout`` seconds is written synchronously by
+    the submitting thread instead. If a batch write fails, the file is
+    reopened and the batch's records are appended one at a time; only those
+    that still fail are lost.
+
+    Attributes:
+        path (Path): The active log file
+        written (int): Records written so far
+        written_through (int): Records the submitting thread wrote because the queue was full
+        dropped (int): Records lost because every attempt to write them failed
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        path: str,
+        max_queue: int = 10000,
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+        fsync_interval: float = 5.0,
+        max_bytes: int = 50 * 1024 * 1024,
+        rotate_daily: bool = True,
+        put_timeout: float = 1.0
+    ):
+        """
+        Args:
+            path: Active log file; rotated files are written next to it.
+            max_queue: Records that may wait for the writer thread.
+            batch_size: Most records written per batch.
+            flush_interval: Longest a queued record waits to be written (seconds).
+            fsync_interval: Least time between fsyncs (seconds).
+            max_bytes: Size at which the active file is rotated.
+            rotate_daily: Also rotate when the UTC date changes.
+            put_timeout: How long submit() waits for room in a full queue
+                before writing the record itself.
+        """
+        self.path = Path(path)
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.put_timeout = put_timeout
+
+        self.written = 0
+        self.written_through = 0
+        self.dropped = 0
+        self.batches = 0
+        self.fsyncs = 0
+        self.rotations = 0
+        self.write_errors = 0
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Serializes file writes between the writer thread and write-through
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._closed = False
+        self._dropped_at_flush = 0
+
+    # Producer side
+
+    def _ensure_started(self) -> queue.Queue:
+        """Start the writer thread on first use (again in a forked child)."""
+        if self._thread is not None and self._pid == os.getpid():
+            return self._queue
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.max_queue)
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+        return self._queue
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        Queues a record for writing.
+
+        If the queue stays full for ``put_timeout`` seconds the record is
+        written through from the calling thread, which therefore waits on the
+        disk: the backpressure falls on the producer, not on the audit trail.
+
+        Returns:
+            bool: False only if the record could not be written at all.
+        """
+        if self._closed:
+            raise RuntimeError("Audit writer is closed")
+        records = self._ensure_started()
+        try:
+            records.put(record, timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            return self._write_through(record)
+
+    def _write_through(self, record: Dict[str, Any]) -> bool:
+        """Appends and fsyncs one record from the calling thread."""
+        with self._write_lock:
+            if not self._append_synced(record, "Audit queue full and write-through"):
+                return False
+            self.written_through += 1
+        return True
+
+    def _append_synced(self, record: Dict[str, Any], context: str) -> bool:
+        """Appends and fsyncs one record on its own handle; the caller holds _write_lock."""
+        try:
+            line = json.dumps(record) + "\n"
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line)
+                handle.flush()
+                os.fsync(handle.fileno())
+        except (OSError, TypeError, ValueError) as e:
+            self.write_errors += 1
+            self.dropped += 1
+            logger.error(f"{context} to {self.path} failed, audit record lost: {e}")
+            return False
+        self.written += 1
+        return True
+
+    @property
+    def backlog(self) -> int:
+        """Records queued but not yet written."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Writes and fsyncs everything queued so far.
+
+        Returns:
+            bool: False on timeout, or if a record was lost since the previous flush.
+        """
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            if not done.wait(timeout):
+                return False
+        with self._lock:
+            lost = self.dropped > self._dropped_at_flush
+            self._dropped_at_flush = self.dropped
+        return not lost
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Flushes pending records and stops the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+
+    # Writer thread
+
+    def _run(self) -> None:
+        handle = None
+        opened_on: Optional[datetime.date] = None
+        last_fsync = time.monotonic()
+        while True:
+            batch: List[Dict[str, Any]] = []
+            waiters: List[threading.Event] = []
+            stop = False
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+            while item is not None:
+                if item is self._STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            with self._write_lock:
+                if batch:
+                    try:
+                        handle, opened_on = self._write_batch(handle, opened_on, batch)
+                    except (OSError, TypeError, ValueError) as e:
+                        self.write_errors += 1
+                        logger.error(f"Error writing {len(batch)} audit records to {self.path}, "
+                                     f"retrying one at a time: {e}")
+                        # The handle may be closed (rotated but not reopened) or
+                        # broken; reopen on the next batch. A partly written
+                        # batch can duplicate records, which beats losing them.
+                        if handle is not None:
+                            try:
+                                handle.close()
+                            except OSError:
+                                pass
+                        handle = None
+                        for record in batch:
+                            self._append_synced(record, "Audit record retry")
+
+                if handle is not None and (waiters or stop or time.monotonic() - last_fsync >= self.fsync_interval):
+                    try:
+                        handle.flush()
+                        os.fsync(handle.fileno())
+                        self.fsyncs += 1
+                    except OSError as e:
+                        logger.error(f"Error syncing audit log {self.path}: {e}")
+                    last_fsync = time.monotonic()
+
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                if handle is not None:
+                    handle.close()
+                return
+
+    def _write_batch(self, handle, opened_on, batch):
+        today = datetime.datetime.utcnow().date()
+        if handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists():
+                opened_on = datetime.datetime.utcfromtimestamp(self.path.stat().st_mtime).date()
+        if self.path.exists() and (
+            self.path.stat().st_size >= self.max_bytes or (self.rotate_daily and opened_on is not None and opened_on != today)
+        ):
+            if handle is not None:
+                handle.close()
+                handle = None
+            self._rotate()
+        if handle is None:
+            handle = open(self.path, "a", encoding="utf-8")
+            opened_on = opened_on if self.path.stat().st_size else today
+
+        handle.write("".join(json.dumps(record) + "\n" for record in batch))
+        handle.flush()
+        self.written += len(batch)
+        self.batches += 1
+        return handle, opened_on
+
+    def _rotate(self) -> None:
+        stamp = datetime.datetime.utcnow().strftime(ROTATION_STAMP_FORMAT)
+        os.replace(self.path, self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}"))
+        self.rotations += 1
+
+    def log_files(self) -> List[Tuple[Path, Optional[datetime.datetime]]]:
+        """Rotated files oldest first, then the active file, each with the time it was closed."""
+        rotated = []
+        for candidate in self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}"):
+            stamp = candidate.name[len(self.path.stem) + 1:len(candidate.name) - len(self.path.suffix)]
+            try:
+                rotated.append((candidate, datetime.datetime.strptime(stamp, ROTATION_STAMP_FORMAT)))
+            except ValueError:
+                continue
+        rotated.sort(key=lambda item: item[1])
+        if self.path.exists():
+            rotated.append((self.path, None))
+        return rotated
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "backlog": self.backlog,
+            "max_queue": self.max_queue,
+            "written": self.written,
+            "written_through": self.written_through,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "fsyncs": self.fsyncs,
+            "rotations": self.rotations,
+            "write_errors": self.write_errors,
+        }
+
 
 class ComplianceAuditLogger:
     """
@@ -42,24 +356,34 @@ class ComplianceAuditLogger:
     Future enhancements will include:
     - Integration with external logging services.
     - Support for different log levels and formats.
-    - Automated log rotation and archiving.
     - Cryptographic signing of log entries for immutability.
     """
 
-    def __init__(self, log_file_path: Optional[str] = None, log_to_console: bool = False):
+    def __init__(
+        self,
+        log_file_path: Optional[str] = None,
+        log_to_console: bool = False,
+        buffered: bool = True,
+        **writer_options: Any
+    ):
         """
         Initializes the ComplianceAuditLogger.
 
         Args:
-            log_file_path (Optional[str]): Path to the log file. If None, logs might
-                                           only go to console or a default location.
-                                           For now, primarily supports console logging.
+            log_file_path (Optional[str]): Path to the JSONL log file. If None, events
+                                           only go to the console (if enabled).
             log_to_console (bool): If True, logs will also be printed to the console.
                                    Defaults to False.
+            buffered (bool): Write the file through a BufferedAuditWriter (default)
+                             rather than opening it once per event.
+            **writer_options: BufferedAuditWriter settings (max_queue, batch_size,
+                              flush_interval, fsync_interval, max_bytes, ...).
         """
         self.log_file_path = log_file_path
         self.log_to_console = log_to_console
-        # In a real system, you might initialize a connection to a logging service here.
+        self.writer: Optional[BufferedAuditWriter] = None
+        if log_file_path and buffered:
+            self.writer = BufferedAuditWriter(log_file_path, **writer_options)
 
     def _format_log_entry(
         self,
@@ -113,20 +437,27 @@ class ComplianceAuditLogger:
             details (Optional[Dict[str, Any]]): Event-specific details.
             status (str): Status of the event.
             component (str): The system component that generated the log.
+
+        Returns:
+            bool: False if the event could not be written to the audit file;
+                  True otherwise.
         """
         log_entry = self._format_log_entry(event_type, user_id, details, status, component)
-        log_json_str = json.dumps(log_entry)
 
         if self.log_to_console:
-            print(f"AUDIT_LOG: {log_json_str}")
+            print(f"AUDIT_LOG: {json.dumps(log_entry)}")
+
+        if self.writer is not None:
+            return self.writer.submit(log_entry)
 
         if self.log_file_path:
             try:
                 with open(self.log_file_path, "a") as log_file:
-                    log_file.write(log_json_str + "\n")
+                    log_file.write(json.dumps(log_entry) + "\n")
             except IOError as e:
                 print(f"Error writing to audit log file {self.log_file_path}: {e}")
-                # Fallback or alternative error handling might be needed here
+                return False
+        return True
 
     def log_protection_event(self, email_id: str, actions: List[str], metadata: Dict[str, Any], user_id: Optional[str] = None):
         """
@@ -143,24 +474,193 @@ class ComplianceAuditLogger:
             "actions_taken": actions,
             **metadata # Spread the metadata dictionary into details
         }
-        self.log_event(
+        return self.log_event(
             event_type="PRIVACY_PROTECTION_EVENT",
             user_id=user_id,
             details=details,
             status="SUCCESS" # Assuming success if this is called, can be parameterized
         )
 
-    # Placeholder for future methods
+    def log_protection_batch_event(
+        self,
+        batch_id: str,
+        actions: List[str],
+        email_summaries: List[Dict[str, Any]],
+        metadata: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None
+    ) -> bool:
+        """
+        Logs one record for a batch of protected emails, as used by PrivacyGuardian.protect_emails.
+
+        Args:
+            batch_id (str): Identifier of the batch.
+            actions (List[str]): Protection actions applied to the batch.
+            email_summaries (List[Dict[str, Any]]): One dict per email with at least
+                                                    'email_id'; kept in the record so
+                                                    get_email_audit_trail() can find it.
+            metadata (Optional[Dict[str, Any]]): Additional batch-level metadata.
+            user_id (Optional[str]): User associated with the processing.
+        """
+        details = {
+            "batch_id": batch_id,
+            "actions_taken": actions,
+            "email_count": len(email_summaries),
+            "total_pii_detected": sum(summary.get("total_pii_detected", 0) for summary in email_summaries),
+            "total_tokens_created": sum(summary.get("total_tokens_created", 0) for summary in email_summaries),
+            **(metadata or {}),
+            "emails": email_summaries,
+        }
+        return self.log_event(
+            event_type="PRIVACY_PROTECTION_BATCH_EVENT",
+            user_id=user_id,
+            details=details,
+            status="SUCCESS"
+        )
+
+    def get_email_audit_trail(self, email_id: str) -> List[Dict[str, Any]]:
+        """
+        Protection records for one email, from single-email and batch events alike.
+
+        Batch records contribute the email's own summary, merged with the
+        batch's timestamp, event type and batch id.
+        """
+        self.flush()
+        trail = []
+        for entry in self._iter_entries(None):
+            if not entry:
+                continue
+            details = entry.get("details") or {}
+            if details.get("email_id") == email_id:
+                trail.append(entry)
+            elif entry.get("event_type") == "PRIVACY_PROTECTION_BATCH_EVENT":
+                for summary in details.get("emails", []):
+                    if summary.get("email_id") == email_id:
+                        trail.append({
+                            **{key: value for key, value in entry.items() if key != "details"},
+                            "details": {"batch_id": details.get("batch_id"), "actions_taken": details.get("actions_taken"), **summary},
+                        })
+        return trail
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until every event logged so far is on disk; False on timeout or a lost event."""
+        return self.writer.flush(timeout) if self.writer is not None else True
+
+    def close(self) -> None:
+        """Flushes pending events and stops the background writer."""
+        if self.writer is not None:
+            self.writer.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Audit writer statistics (queue backlog, dropped records, batches, rotations)."""
+        if self.writer is None:
+            return {"buffered": False, "path": self.log_file_path}
+        return {"buffered": True, **self.writer.get_stats()}
+
+    def _log_files(self) -> List[Tuple[Path, Optional[datetime.datetime]]]:
+        if self.writer is not None:
+            return self.writer.log_files()
+        if self.log_file_path and Path(self.log_file_path).exists():
+            return [(Path(self.log_file_path), None)]
+        return []
+
+    def _iter_entries(self, period_start: Optional[datetime.datetime]) -> Iterator[Optional[Dict[str, Any]]]:
+        """Log entries, oldest file first; None for lines that do not parse."""
+        for path, closed_at in self._log_files():
+            if period_start is not None and closed_at is not None and closed_at < period_start:
+                continue  # Rotated before the period began
+            with open(path, "r", encoding="utf-8") as log_file:
+                for line in log_file:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        yield None
+
     def generate_compliance_report(self, period_start: datetime.datetime, period_end: datetime.datetime) -> Dict[str, Any]:
         """
         Generates a compliance report for a given period.
-        (Placeholder - to be implemented)
 
-        This would involve querying and aggregating log data.
+        Streams the active and rotated log files once, aggregating the events
+        whose timestamp falls in [period_start, period_end]. Pending buffered
+        events are flushed first so the report includes them.
+
+        Args:
+            period_start (datetime.datetime): Start of the period (naive UTC or aware).
+            period_end (datetime.datetime): End of the period (naive UTC or aware).
+
+        Returns:
+            Dict[str, Any]: Event counts by type, status and component, users,
+                            privacy protection totals, consent denials and failures.
         """
-        # This is a very basic placeholder. Real implementation would parse logs.
-        print(f"Generating compliance report from {period_start} to {period_end} (Not implemented yet).")
-        return {"report_status": "Not Implemented", "period_start": str(period_start), "period_end": str(period_end)}
+        self.flush()
+        start, end = _as_naive_utc(period_start), _as_naive_utc(period_end)
+
+        events_by_type: Counter = Counter()
+        events_by_status: Counter = Counter()
+        events_by_component: Counter = Counter()
+        users = set()
+        emails_protected = set()
+        pii_detected = 0
+        tokens_created = 0
+        consent_denied = 0
+        failures: List[Dict[str, Any]] = []
+        malformed = 0
+        first_event = last_event = None
+
+        for entry in self._iter_entries(start):
+            try:
+                timestamp = datetime.datetime.fromisoformat(entry["timestamp"].rstrip("Z"))
+            except (TypeError, KeyError, ValueError, AttributeError):
+                malformed += 1
+                continue
+            if not start <= timestamp <= end:
+                continue
+
+            details = entry.get("details") or {}
+            events_by_type[entry.get("event_type", "UNKNOWN")] += 1
+            events_by_status[entry.get("status", "UNKNOWN")] += 1
+            events_by_component[entry.get("component", "UNKNOWN")] += 1
+            users.add(entry.get("user_id", "SYSTEM"))
+            first_event = timestamp if first_event is None else min(first_event, timestamp)
+            last_event = timestamp if last_event is None else max(last_event, timestamp)
+
+            if entry.get("event_type") == "PRIVACY_PROTECTION_EVENT":
+                email_details = [details]
+            elif entry.get("event_type") == "PRIVACY_PROTECTION_BATCH_EVENT":
+                email_details = details.get("emails", [])
+            else:
+                email_details = []
+            for email in email_details:
+                if "email_id" in email:
+                    emails_protected.add(email["email_id"])
+                pii_detected += int(email.get("total_pii_detected", 0) or 0)
+                tokens_created += int(email.get("total_tokens_created", 0) or 0)
+                if email.get("consent_for_email_analysis") is False:
+                    consent_denied += 1
+            if entry.get("status") == "FAILURE" and len(failures) < 100:
+                failures.append(entry)
+
+        return {
+            "report_status": "OK",
+            "period_start": str(period_start),
+            "period_end": str(period_end),
+            "total_events": sum(events_by_type.values()),
+            "events_by_type": dict(events_by_type),
+            "events_by_status": dict(events_by_status),
+            "events_by_component": dict(events_by_component),
+            "unique_users": len(users),
+            "emails_protected": len(emails_protected),
+            "pii_entities_detected": pii_detected,
+            "tokens_created": tokens_created,
+            "consent_denied_events": consent_denied,
+            "failure_count": events_by_status.get("FAILURE", 0),
+            "failures_sample": failures,
+            "first_event": first_event.isoformat() + "Z" if first_event else None,
+            "last_event": last_event.isoformat() + "Z" if last_event else None,
+            "malformed_lines": malformed,
+            "files_scanned": [str(path) for path, closed_at in self._log_files() if closed_at is None or closed_at >= start],
+        }
 
     def setup_realtime_alerting(self, alert_rules: Dict[str, Any]):
         """
@@ -177,16 +677,16 @@ if __name__ == '__main__':
     # Example Usage
     # Using a temporary file for this example
     temp_log_file = "temp_audit_log.jsonl"
-    logger = ComplianceAuditLogger(log_file_path=temp_log_file, log_to_console=True)
+    audit_logger = ComplianceAuditLogger(log_file_path=temp_log_file, log_to_console=True)
 
-    logger.log_event(
+    audit_logger.log_event(
         event_type="SYSTEM_STARTUP",
         details={"version": "1.0.0", "mode": "development"},
         status="INFO",
         component="Application"
     )
 
-    logger.log_event(
+    audit_logger.log_event(
         event_type="USER_LOGIN",
         user_id="testuser@example.com",
         details={"ip_address": "192.168.1.100", "auth_method": "password"},
@@ -194,19 +694,20 @@ if __name__ == '__main__':
         component="AuthService"
     )
 
-    logger.log_protection_event(
+    audit_logger.log_protection_event(
         email_id="email_abc_123",
         actions=["PII_DETECTED", "EMAIL_TOKENIZED", "PHONE_MASKED"],
         metadata={"pii_types": ["EMAIL_ADDRESS", "PHONE_NUMBER"], "tokens_created": 5},
         user_id="data_processor_01"
     )
 
-    logger.log_event(
+    audit_logger.log_event(
         event_type="DATA_ACCESS_REQUEST",
         user_id="auditor@example.com",
         details={"resource_id": "report_xyz", "access_level": "read-only"},
         status="FAILURE",
         component="AccessControl"
     )
+    audit_logger.close()
     
     print(f"\nAudit logs should be in console and in '{temp_log_file}' (if file writing worked).")
\ No newline at end of file
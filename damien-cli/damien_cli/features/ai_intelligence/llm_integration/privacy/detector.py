@@ -38,10 +38,21 @@ Performance:
     - Processes large texts in <1 second
     - Balanced precision vs recall for enterprise applications
     - Configurable confidence thresholds per PII type
+    - Linear-time scanning: PII_PATTERNS are compiled into a PIIPatternEngine
+      that replaces the ``(?=.*keyword)`` context lookaheads with keyword
+      positions located once per document, and skips patterns whose
+      required characters (digits, ``@``, ``:``) do not occur in the text
+    - Memoized results: detections are cached by content hash in a bounded
+      LRU shared by every detector in the process, so the guardian, the
+      chunker and the batch processor scan a given text only once
 """
 
-from typing import List, NamedTuple, Dict, Any, Optional
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import AbstractSet, Hashable, Iterator, List, NamedTuple, Dict, Any, Optional, Pattern, Tuple
+import hashlib
 import re
+import threading
 # spaCy and Transformers imports will be added as functionality is built
 # import spacy
 # from transformers import pipeline
@@ -168,6 +179,303 @@ PII_PATTERNS = {
     ),
 }
 
+# A context lookahead inside a PII pattern, e.g. (?=.*passport) or
+# (?=.*(?:routing|aba|rtn)): the keyword must follow later on the same line
+CONTEXT_LOOKAHEAD = re.compile(r"\(\?=\.\*(\(\?:[^()]*\)|[^()]*)\)")
+
+# Literal prefilters: every alternative of these patterns needs at least one
+# of the characters, so a document without any of them skips the pattern
+DIGITS = "0123456789"
+PATTERN_PREFILTERS = {
+    "EMAIL_ADDRESS": "@",
+    "PHONE_NUMBER": DIGITS,
+    "US_SSN": DIGITS,
+    "CREDIT_CARD_NUMBER": DIGITS,
+    "IBAN": DIGITS,
+    "PASSPORT_NUMBER": DIGITS,
+    "DRIVERS_LICENSE": DIGITS,
+    "IP_ADDRESS": DIGITS + ":",
+    "BANK_ROUTING_NUMBER": DIGITS,
+    "BANK_ACCOUNT_NUMBER": DIGITS,
+    "TAX_ID": DIGITS,
+    "MEDICAL_RECORD_NUMBER": DIGITS,
+    "CRYPTO_ADDRESS": DIGITS,
+}
+
+# Regexes used per match by validation and confidence scoring
+FORMATTED_PHONE = re.compile(r'\(\d{3}\)\s?\d{3}-\d{4}')
+CARD_SEPARATORS = re.compile(r'[-\s]')
+ANY_LETTER = re.compile(r'[A-Za-z]')
+SSN_WITH_LETTER_SUFFIX = re.compile(r'\d{3}-\d{2}-\d{4}[A-Za-z]')
+
+
+class CompiledPIIPattern(NamedTuple):
+    """
+    One PII_PATTERNS entry prepared for linear-time scanning.
+
+    Attributes:
+        pii_type (str): The PII type the pattern detects.
+        candidates (Pattern): The pattern with each context lookahead replaced
+            by an empty named group marking which alternative matched.
+        fallback (Pattern): The pattern with its context alternatives disabled,
+            used where no context keyword can follow.
+        contexts (Tuple[Tuple[str, Pattern, Pattern], ...]): (group name,
+            keyword pattern, case-sensitive keyword pattern for lowercased
+            ASCII text) for each context lookahead.
+        context_only (bool): True when every alternative needs context.
+        line_local (bool): True when no match can span a line break, so lines
+            without a keyword can be scanned with the fallback alone.
+        prefilter (Optional[Pattern]): Characters the text must contain.
+    """
+    pii_type: str
+    candidates: Pattern
+    fallback: Pattern
+    contexts: Tuple[Tuple[str, Pattern, Pattern], ...]
+    context_only: bool
+    line_local: bool
+    prefilter: Optional[Pattern]
+
+
+class PIIPatternEngine:
+    """
+    Linear-time scanner over a set of PII patterns.
+
+    The patterns keep their exact matching semantics, but a ``(?=.*keyword)``
+    lookahead, which rescans the rest of the line at every candidate, becomes
+    a lookup in keyword positions found once per document. Only lines holding
+    a keyword are scanned for context candidates; a candidate whose keyword
+    does not follow it is rejected and the remaining alternatives are tried
+    at the same position, just as the regex engine would after the lookahead
+    failed. Patterns whose prefilter characters are absent from the text, and
+    context-only patterns whose keywords are absent, are not run at all.
+    """
+
+    def __init__(self, patterns: Dict[str, Pattern]):
+        self.patterns = [self._compile(pii_type, pattern) for pii_type, pattern in patterns.items()]
+
+    @staticmethod
+    def _compile(pii_type: str, pattern: Pattern) -> CompiledPIIPattern:
+        source = pattern.pattern
+        contexts = []
+
+        def mark_context(lookahead):
+            name = f"_context{len(contexts)}"
+            keyword = lookahead.group(1)
+            contexts.append((
+                name,
+                re.compile(keyword, pattern.flags),
+                # Case-insensitive alternations lose the literal fast path
+                re.compile(keyword.lower(), pattern.flags & ~re.IGNORECASE),
+            ))
+            return f"(?P<{name}>)"
+
+        candidates = re.compile(CONTEXT_LOOKAHEAD.sub(mark_context, source), pattern.flags)
+        fallback = re.compile(CONTEXT_LOOKAHEAD.sub("(?!)", source), pattern.flags)
+        without_context = CONTEXT_LOOKAHEAD.sub("", source)
+        prefilter = PATTERN_PREFILTERS.get(pii_type)
+        return CompiledPIIPattern(
+            pii_type=pii_type,
+            candidates=candidates,
+            fallback=fallback,
+            contexts=tuple(contexts),
+            context_only=bool(contexts) and "|" not in without_context,
+            # Conservative: no whitespace class, dot, negated class or DOTALL
+            line_local=not (pattern.flags & re.DOTALL) and not re.search(r"\\s|\\S|\[\^|(?<!\\)\.", without_context),
+            prefilter=re.compile(f"[{re.escape(prefilter)}]") if prefilter else None,
+        )
+
+    def scan(self, text: str) -> Iterator[Tuple[str, "re.Match"]]:
+        """
+        Yield (pii_type, match) pairs in the order per-pattern ``finditer``
+        passes over the original patterns would produce them.
+        """
+        keyword_positions: Dict[str, List[int]] = {}
+        prefilter_hits: Dict[str, bool] = {}
+        lowered: List[str] = []
+
+        def keywords(keyword: Pattern, lowercase_keyword: Pattern) -> List[int]:
+            positions = keyword_positions.get(keyword.pattern)
+            if positions is None:
+                # For ASCII text, lowercasing is exactly IGNORECASE matching
+                if keyword.flags & re.IGNORECASE and text.isascii():
+                    if not lowered:
+                        lowered.append(text.lower())
+                    positions = self._keyword_starts(lowercase_keyword, lowered[0])
+                else:
+                    positions = self._keyword_starts(keyword, text)
+                keyword_positions[keyword.pattern] = positions
+            return positions
+
+        for compiled in self.patterns:
+            if compiled.prefilter is not None:
+                present = prefilter_hits.get(compiled.prefilter.pattern)
+                if present is None:
+                    present = prefilter_hits[compiled.prefilter.pattern] = compiled.prefilter.search(text) is not None
+                if not present:
+                    continue
+
+            if not compiled.contexts:
+                for match in compiled.candidates.finditer(text):
+                    yield compiled.pii_type, match
+                continue
+
+            contexts = [(name, keywords(keyword, lowercase_keyword))
+                        for name, keyword, lowercase_keyword in compiled.contexts]
+            if not any(positions for _, positions in contexts):
+                if not compiled.context_only:
+                    for match in compiled.fallback.finditer(text):
+                        yield compiled.pii_type, match
+                continue
+
+            if not compiled.line_local:
+                for match in self._scan_with_context(compiled, text, contexts, 0, len(text)):
+                    yield compiled.pii_type, match
+                continue
+
+            # Lines without a keyword can only hold non-context matches
+            cursor = 0
+            for line_start, line_end in self._keyword_lines(text, contexts):
+                if not compiled.context_only and cursor < line_start:
+                    for match in compiled.fallback.finditer(text, cursor, line_start):
+                        yield compiled.pii_type, match
+                for match in self._scan_with_context(compiled, text, contexts, line_start, line_end):
+                    yield compiled.pii_type, match
+                cursor = line_end
+            if not compiled.context_only and cursor < len(text):
+                for match in compiled.fallback.finditer(text, cursor):
+                    yield compiled.pii_type, match
+
+    @staticmethod
+    def _keyword_starts(keyword: Pattern, text: str) -> List[int]:
+        """Every position a keyword match starts at, overlapping ones included."""
+        positions = []
+        for match in keyword.finditer(text):
+            positions.append(match.start())
+            # finditer skips occurrences starting inside this one
+            positions.extend(
+                start for start in range(match.start() + 1, match.end()) if keyword.match(text, start)
+            )
+        return positions
+
+    @staticmethod
+    def _keyword_lines(text: str, contexts: List[Tuple[str, List[int]]]) -> List[Tuple[int, int]]:
+        """(start, end) of each line holding a keyword, in order; end excludes the newline."""
+        lines = []
+        for position in sorted(set().union(*(positions for _, positions in contexts))):
+            if lines and position < lines[-1][1]:
+                continue
+            line_end = text.find("\n", position)
+            lines.append((text.rfind("\n", 0, position) + 1, len(text) if line_end == -1 else line_end))
+        return lines
+
+    @staticmethod
+    def _scan_with_context(
+        compiled: CompiledPIIPattern,
+        text: str,
+        contexts: List[Tuple[str, List[int]]],
+        start: int,
+        end: int
+    ) -> Iterator["re.Match"]:
+        position = start
+        while True:
+            match = compiled.candidates.search(text, position, end)
+            if match is None:
+                return
+            rejected = False
+            for name, positions in contexts:
+                if match.group(name) is None:
+                    continue
+                # The keyword must start after the candidate, before the line ends
+                line_end = text.find("\n", match.end(), end)
+                if line_end == -1:
+                    line_end = end
+                index = bisect_left(positions, match.end())
+                rejected = index == len(positions) or positions[index] >= line_end
+                break
+            if not rejected:
+                yield match
+                position = match.end()
+                continue
+            # The lookahead failed: the regex engine would try the remaining
+            # alternatives here, then move on one character
+            retry = compiled.fallback.match(text, match.start(), end)
+            if retry is not None:
+                yield retry
+                position = retry.end()
+            else:
+                position = match.start() + 1
+
+
+class PIIDetectionCache:
+    """
+    Thread-safe LRU of detection results keyed by content hash.
+
+    Keys are (content hash, detector fingerprint, language, min_confidence);
+    values are tuples of PIIEntity, which are immutable, so hits are safe to
+    share between callers. The text itself is never stored.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[PIIEntity, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple["PIIEntity", ...]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Tuple["PIIEntity", ...]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def purge_values(self, values: AbstractSet[str]) -> int:
+        """Drop every cached result that detected one of ``values``; returns the number dropped."""
+        with self._lock:
+            stale = [
+                key for key, entities in self._entries.items()
+                if any(entity.text in values for entity in entities)
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Default cache shared by every detector in the process
+SHARED_DETECTION_CACHE = PIIDetectionCache()
+
+
 class PIIEntity(NamedTuple):
     """
     Represents a detected piece of Personally Identifiable Information.
@@ -219,15 +527,22 @@ class PIIDetector:
         supported_languages (List[str]): Supported language codes (default: ["en"])
         regex_pii_patterns (Dict): Enhanced regex patterns for PII detection
         confidence_thresholds (Dict): Per-type confidence thresholds for accuracy
+        cache (PIIDetectionCache): Memoized detection results
+        fingerprint (str): Hash of the detection rules, part of every cache key
     """
 
-    def __init__(self, languages: Optional[List[str]] = None):
+    # Bump when detection logic changes in ways the patterns do not capture
+    VERSION = 2
+
+    def __init__(self, languages: Optional[List[str]] = None, cache: Optional[PIIDetectionCache] = None):
         """
         Initializes the enhanced PIIDetector with improved patterns and validation.
 
         Args:
             languages (Optional[List[str]]): A list of language codes to support.
                                              Defaults to ["en"] if None.
+            cache (Optional[PIIDetectionCache]): Detection result cache. Defaults
+                                                 to the process-wide shared cache.
         
         Features:
             - Enhanced regex patterns with international format support
@@ -237,6 +552,7 @@ class PIIDetector:
         """
         self.supported_languages = languages if languages else ["en"]
         self.regex_pii_patterns = PII_PATTERNS
+        self.pattern_engine = PIIPatternEngine(self.regex_pii_patterns)
         
         # Enhanced confidence scoring based on pattern complexity and context
         self.confidence_thresholds = {
@@ -260,6 +576,18 @@ class PIIDetector:
             "CRYPTO_ADDRESS": 0.95,      # High for crypto patterns
         }
 
+        self.cache = cache if cache is not None else SHARED_DETECTION_CACHE
+        self.fingerprint = self._compute_fingerprint()
+
+    def _compute_fingerprint(self) -> str:
+        """Identify the detection rules, so detectors configured differently never share cache entries."""
+        rules = repr((
+            self.VERSION,
+            [(pii_type, pattern.pattern, pattern.flags) for pii_type, pattern in self.regex_pii_patterns.items()],
+            sorted(self.confidence_thresholds.items()),
+        ))
+        return hashlib.sha256(rules.encode("utf-8")).hexdigest()[:16]
+
     def _calculate_confidence_score(self, pii_type: str, text: str, context: str = "") -> float:
         """
         Calculate confidence score based on pattern match and context.
@@ -282,12 +610,12 @@ class PIIDetector:
         
         elif pii_type == "PHONE_NUMBER":
             # Higher confidence for properly formatted numbers
-            if re.search(r'\(\d{3}\)\s?\d{3}-\d{4}', text):
+            if FORMATTED_PHONE.search(text):
                 return min(base_confidence + 0.10, 1.0)
         
         elif pii_type == "CREDIT_CARD_NUMBER":
             # Basic validation for credit card length
-            clean_num = re.sub(r'[-\s]', '', text)
+            clean_num = CARD_SEPARATORS.sub('', text)
             if len(clean_num) in [13, 14, 15, 16, 17, 18, 19]:
                 return min(base_confidence + 0.05, 1.0)
         
@@ -317,16 +645,14 @@ class PIIDetector:
         
         # Check for invalid credit card numbers
         if pii_type == "CREDIT_CARD_NUMBER":
-            # Remove separators
-            clean_num = re.sub(r'[-\s]', '', text)
             # Check if followed by invalid suffix
-            if re.search(r'[A-Za-z]', text):
+            if ANY_LETTER.search(text):
                 return False
         
         # Check for invalid SSNs
         if pii_type == "US_SSN":
             # Check if followed by letter (like meeting room numbers)
-            if re.search(r'\d{3}-\d{2}-\d{4}[A-Za-z]', text):
+            if SSN_WITH_LETTER_SUFFIX.search(text):
                 return False
         
         # Enhanced phone number validation for accuracy tests
@@ -393,6 +719,9 @@ class PIIDetector:
         """
         Detects PII using enhanced regular expressions with confidence scoring.
 
+        Matches come from the compiled pattern engine in one linear pass per
+        pattern, in the same order as running each pattern's ``finditer``.
+
         Args:
             text (str): The text to scan for PII.
 
@@ -401,37 +730,36 @@ class PIIDetector:
         """
         found_pii: List[PIIEntity] = []
         
-        for pii_type, pattern in self.regex_pii_patterns.items():
-            for match in pattern.finditer(text):
-                # Get context around the match for validation
-                start_context = max(0, match.start() - 50)
-                end_context = min(len(text), match.end() + 50)
-                context = text[start_context:end_context]
-                
-                # Extract the correct text and positions
-                if pii_type == "PHONE_NUMBER":
-                    extracted_text, start_pos, end_pos = self._extract_phone_number(match, text)
-                else:
-                    extracted_text = match.group(0)
-                    start_pos = match.start()
-                    end_pos = match.end()
-                
-                # Validate the detection
-                if not self._is_valid_detection(pii_type, extracted_text, context):
-                    continue
-                
-                confidence = self._calculate_confidence_score(pii_type, extracted_text, context)
-                
-                found_pii.append(
-                    PIIEntity(
-                        text=extracted_text,
-                        entity_type=pii_type,
-                        start_char=start_pos,
-                        end_char=end_pos,
-                        confidence_score=confidence,
-                        detection_method="ENHANCED_REGEX"
-                    )
+        for pii_type, match in self.pattern_engine.scan(text):
+            # Get context around the match for validation
+            start_context = max(0, match.start() - 50)
+            end_context = min(len(text), match.end() + 50)
+            context = text[start_context:end_context]
+            
+            # Extract the correct text and positions
+            if pii_type == "PHONE_NUMBER":
+                extracted_text, start_pos, end_pos = self._extract_phone_number(match, text)
+            else:
+                extracted_text = match.group(0)
+                start_pos = match.start()
+                end_pos = match.end()
+            
+            # Validate the detection
+            if not self._is_valid_detection(pii_type, extracted_text, context):
+                continue
+            
+            confidence = self._calculate_confidence_score(pii_type, extracted_text, context)
+            
+            found_pii.append(
+                PIIEntity(
+                    text=extracted_text,
+                    entity_type=pii_type,
+                    start_char=start_pos,
+                    end_char=end_pos,
+                    confidence_score=confidence,
+                    detection_method="ENHANCED_REGEX"
                 )
+            )
         
         return found_pii
 
@@ -497,10 +825,17 @@ class PIIDetector:
             - Processes large texts in <1 second
             - 37/37 tests passing with comprehensive validation
             - Balanced precision vs recall for enterprise use
+            - Repeated texts are answered from the detection cache
         """
         if language not in self.supported_languages:
             raise ValueError(f"Language '{language}' is not supported. Supported: {self.supported_languages}")
 
+        digest = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+        cache_key = (digest, self.fingerprint, language, min_confidence)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         # Enhanced regex-based detection (fast first pass)
         all_detected_pii = self._detect_with_regex(text)
         
@@ -514,6 +849,7 @@ class PIIDetector:
         # TODO: Add Transformer-based detection when implemented
         # TODO: Add confidence reconciliation for multiple detection methods
         
+        self.cache.put(cache_key, tuple(merged_pii))
         return merged_pii
 
     def get_detection_stats(self, detections: List[PIIEntity]) -> Dict[str, Any]:
@@ -14,22 +14,50 @@ Example:
     >>> # sanitized_email, metadata = await guardian.protect_email(raw_email_data) # If async
     >>> # print(f"Sanitized email: {sanitized_email}")
 
+Batches:
+    protect_emails() protects many emails at once: consent is resolved once
+    per user, PII detection for large batches fans out across a process pool
+    (tokenization stays in this process, where the token vault lives), and a
+    single aggregated audit record carries the per-email details.
+
 Note:
     The PrivacyGuardian is designed to be highly configurable to support
     different levels of protection and to be extensible for future
     privacy-enhancing technologies.
 """
-from typing import Dict, Any, Tuple, NamedTuple, Optional, List
+from typing import Dict, Any, Tuple, NamedTuple, Optional, List, Sequence, Union
 import asyncio # For async method example
+import logging
+import math
+import os
+import threading
+import uuid
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 
 # Imports from other modules in this package
 from .detector import PIIDetector, PIIEntity
 from .tokenizer import ReversibleTokenizer
+from .vault import TokenVault
 from .audit import ComplianceAuditLogger
 from .consent import ConsentManager, DataProcessingPurpose # Added DataProcessingPurpose
 # from .encryption import EncryptionEngine # Assuming an EncryptionEngine will be created, placeholder for now
 
+logger = logging.getLogger(__name__)
+
+# Email fields protect_email and protect_emails sanitize
+PROTECTED_FIELDS = ["subject", "body", "snippet"]
+
+# Caches outside this package that hold raw PII from protection results;
+# forget_email() purges them along with the detection cache
+_PII_RESULT_CACHES: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def register_pii_cache(cache: Any) -> None:
+    """Registers a cache with a ``purge_values(values)`` method to be purged by forget_email()."""
+    _PII_RESULT_CACHES.add(cache)
+
 # Placeholder for EncryptionEngine (if not created yet, keep for now)
 class EncryptionEngine:
     """Placeholder for EncryptionEngine."""
@@ -85,21 +113,36 @@ class PrivacyGuardian:
     - Performance optimization (to be implemented)
     """
 
-    def __init__(self, default_protection_level: ProtectionLevel = ProtectionLevel.STANDARD):
+    def __init__(
+        self,
+        default_protection_level: ProtectionLevel = ProtectionLevel.STANDARD,
+        token_vault: Optional[TokenVault] = None,
+        token_secret: Optional[Union[str, bytes]] = None
+    ):
         """
         Initializes the PrivacyGuardian.
 
         Args:
             default_protection_level (ProtectionLevel): The default protection level
                                                         to apply if not specified.
+            token_vault (Optional[TokenVault]): Store for issued tokens; defaults to a
+                                                bounded in-memory vault.
+            token_secret (Optional[Union[str, bytes]]): Secret for deterministic tokens
+                                                        (same value, same token across emails).
         """
         self.pii_detector = PIIDetector()
-        self.tokenizer = ReversibleTokenizer()
+        self.tokenizer = ReversibleTokenizer(vault=token_vault, token_secret=token_secret)
         self.audit_logger = ComplianceAuditLogger()
         self.consent_manager = ConsentManager()
         self.encryption_engine = EncryptionEngine() # Placeholder
         self.default_protection_level = default_protection_level
 
+        # Process pool for batch PII detection, started on first large batch
+        self._detection_pool: Optional[ProcessPoolExecutor] = None
+        self._detection_pool_workers = 0
+        self._detection_pool_lock = threading.Lock()
+        self._detection_pool_unavailable = False
+
     async def protect_email_content(
         self,
         email_id: str, # Added for audit logging
@@ -133,7 +176,7 @@ class PrivacyGuardian:
             if protection_level in [ProtectionLevel.STANDARD, ProtectionLevel.STRICT, ProtectionLevel.BASIC]:
                 # 2. Tokenize PII (for STANDARD and STRICT) or Mask (for BASIC)
                 # For now, BASIC will also use tokenization. Masking can be a separate step.
-                sanitized_content, token_map = self.tokenizer.tokenize_pii(content, detected_pii)
+                sanitized_content, token_map = self.tokenizer.tokenize_pii(content, detected_pii, namespace=email_id)
                 
                 # TODO: Implement specific masking for BASIC if different from tokenization
                 # For STRICT, additional anonymization might occur here or later.
@@ -163,6 +206,7 @@ class PrivacyGuardian:
         
         Raises:
             ValueError: If email_data does not contain an 'id'.
+            RuntimeError: If the audit record could not be written.
         """
         current_protection_level = protection_level or self.default_protection_level
         
@@ -182,7 +226,7 @@ class PrivacyGuardian:
         aggregated_token_map: Dict[str, str] = {}
         aggregated_pii_detected: List[PIIEntity] = []
         
-        fields_to_protect = ["subject", "body", "snippet"] # Configurable list of fields
+        fields_to_protect = PROTECTED_FIELDS
 
         if consent_ok: # Only proceed if consent is granted for the basic purpose
             for field in fields_to_protect:
@@ -195,8 +239,9 @@ class PrivacyGuardian:
                     aggregated_token_map.update(field_token_map)
                     aggregated_pii_detected.extend(field_pii)
 
-        # Audit the overall protection event
-        self.audit_logger.log_protection_event(
+        # Audit the overall protection event; protection is not reported
+        # as done unless its audit record was written
+        audited = self.audit_logger.log_protection_event(
             email_id=email_id,
             actions=[f"email_protection_applied_{current_protection_level.value}"],
             metadata={
@@ -206,6 +251,8 @@ class PrivacyGuardian:
                 "consent_for_email_analysis": consent_ok
             }
         )
+        if audited is False:
+            raise RuntimeError(f"Audit record for email {email_id} could not be written")
 
         privacy_meta = PrivacyMetadata(
             original_pii_detected=aggregated_pii_detected,
@@ -217,6 +264,187 @@ class PrivacyGuardian:
 
         return sanitized_email_data, privacy_meta
 
+    async def protect_emails(
+        self,
+        emails: Sequence[Dict[str, Any]],
+        protection_level: Optional[ProtectionLevel] = None,
+        max_workers: Optional[int] = None,
+        parallel_min_emails: int = 256
+    ) -> List[Tuple[Dict[str, Any], PrivacyMetadata]]:
+        """
+        Protects a batch of email dictionaries, as protect_email does for one.
+
+        Consent is checked once per distinct user. Each distinct field text is
+        scanned for PII once; batches of at least ``parallel_min_emails`` are
+        scanned in a process pool. One PRIVACY_PROTECTION_BATCH_EVENT audit
+        record is written for the batch, with a summary per email that
+        ComplianceAuditLogger.get_email_audit_trail() can look up later.
+
+        Args:
+            emails (Sequence[Dict[str, Any]]): Email dictionaries, each with an 'id'.
+            protection_level (Optional[ProtectionLevel]): Defaults to the instance default.
+            max_workers (Optional[int]): Detection pool size; defaults to the CPU count.
+                                         1 keeps detection in this process.
+            parallel_min_emails (int): Smallest batch sent to the pool.
+
+        Returns:
+            List[Tuple[Dict[str, Any], PrivacyMetadata]]: One result per email, in input order.
+
+        Raises:
+            ValueError: If any email does not contain an 'id'.
+            RuntimeError: If the batch audit record could not be written.
+        """
+        current_protection_level = protection_level or self.default_protection_level
+        if any('id' not in email_data for email_data in emails):
+            raise ValueError("every email must contain an 'id' field for auditing.")
+        batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+
+        # Consent, once per user
+        consent_by_user: Dict[str, bool] = {}
+        for email_data in emails:
+            user_id = email_data.get("user_id", "unknown_user")
+            if user_id not in consent_by_user:
+                consent_by_user[user_id] = self.consent_manager.check_consent(
+                    user_id, DataProcessingPurpose.EMAIL_ANALYSIS
+                )
+
+        # Distinct texts to scan, across every consented email and field
+        texts: Dict[str, int] = {}
+        if current_protection_level != ProtectionLevel.NONE:
+            for email_data in emails:
+                if consent_by_user[email_data.get("user_id", "unknown_user")]:
+                    for field in PROTECTED_FIELDS:
+                        if isinstance(email_data.get(field), str):
+                            texts.setdefault(email_data[field], len(texts))
+        detections = await self._detect_many(list(texts), max_workers, parallel_min_emails, len(emails))
+
+        results: List[Tuple[Dict[str, Any], PrivacyMetadata]] = []
+        email_summaries: List[Dict[str, Any]] = []
+        for email_data in emails:
+            email_id = str(email_data['id'])
+            consent_ok = consent_by_user[email_data.get("user_id", "unknown_user")]
+            sanitized_email_data = email_data.copy()
+            token_map: Dict[str, str] = {}
+            pii_detected: List[PIIEntity] = []
+
+            if consent_ok and current_protection_level != ProtectionLevel.NONE:
+                for field in PROTECTED_FIELDS:
+                    if not isinstance(email_data.get(field), str):
+                        continue
+                    field_pii = detections[texts[email_data[field]]]
+                    if field_pii:
+                        sanitized_email_data[field], field_token_map = self.tokenizer.tokenize_pii(
+                            email_data[field], field_pii, namespace=email_id
+                        )
+                        token_map.update(field_token_map)
+                        pii_detected.extend(field_pii)
+
+            email_summaries.append({
+                "email_id": email_id,
+                "total_pii_detected": len(pii_detected),
+                "total_tokens_created": len(token_map),
+                "consent_for_email_analysis": consent_ok
+            })
+            results.append((sanitized_email_data, PrivacyMetadata(
+                original_pii_detected=pii_detected,
+                token_map=token_map,
+                protection_level_applied=current_protection_level if consent_ok else ProtectionLevel.NONE,
+                audit_log_references=[f"log_ref_for_{batch_id}/{email_id}"],
+                consent_status={DataProcessingPurpose.EMAIL_ANALYSIS.value: consent_ok}
+            )))
+
+        audited = self.audit_logger.log_protection_batch_event(
+            batch_id=batch_id,
+            actions=[f"email_protection_applied_{current_protection_level.value}"],
+            email_summaries=email_summaries,
+            metadata={"fields_processed": PROTECTED_FIELDS, "distinct_texts_scanned": len(texts)}
+        )
+        if audited is False:
+            raise RuntimeError(f"Audit record for batch {batch_id} could not be written")
+        return results
+
+    async def _detect_many(
+        self,
+        texts: List[str],
+        max_workers: Optional[int],
+        parallel_min_emails: int,
+        email_count: int
+    ) -> List[List[PIIEntity]]:
+        """PII in each text, from the detection pool for large batches."""
+        workers = max(1, max_workers or os.cpu_count() or 1)
+        if texts and workers > 1 and email_count >= parallel_min_emails and not self._detection_pool_unavailable:
+            # A few slices per worker balances load without per-text IPC
+            slice_size = max(1, math.ceil(len(texts) / (workers * 4)))
+            try:
+                pool = self._get_detection_pool(workers)
+                futures = [
+                    asyncio.wrap_future(pool.submit(_detect_in_worker, texts[start:start + slice_size]))
+                    for start in range(0, len(texts), slice_size)
+                ]
+                return [detected for part in await asyncio.gather(*futures) for detected in part]
+            except Exception as e:
+                logger.warning(f"Parallel PII detection unavailable, running serially: {str(e)}")
+                self._detection_pool_unavailable = True
+                self.close()
+        return [self.pii_detector.detect(text) for text in texts]
+
+    def _get_detection_pool(self, workers: int) -> ProcessPoolExecutor:
+        with self._detection_pool_lock:
+            if self._detection_pool is not None and self._detection_pool_workers != workers:
+                self._detection_pool.shutdown(wait=False, cancel_futures=True)
+                self._detection_pool = None
+            if self._detection_pool is None:
+                # The detector reaches each worker once, through the initializer
+                self._detection_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_detection_worker,
+                    initargs=(self.pii_detector,)
+                )
+                self._detection_pool_workers = workers
+            return self._detection_pool
+
+    def close(self) -> None:
+        """Shuts down the batch detection pool, if one was started."""
+        with self._detection_pool_lock:
+            pool, self._detection_pool = self._detection_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def forget_email(self, email_id: str) -> int:
+        """
+        Drops the privacy tokens issued for an email from the token vault.
+
+        Tokens that other emails share (deterministic tokens) are kept. Cached
+        detection and protection results containing the email's PII values
+        are purged too, so the raw values do not outlive the tokens.
+
+        Args:
+            email_id (str): The email whose tokens should be forgotten.
+
+        Returns:
+            int: Number of tokens removed.
+        """
+        values = self.tokenizer.namespace_values(str(email_id))
+        removed = self.tokenizer.forget_namespace(str(email_id))
+        if values:
+            self.pii_detector.cache.purge_values(values)
+            for cache in list(_PII_RESULT_CACHES):
+                cache.purge_values(values)
+        return removed
+
+
+_detection_worker_state: Dict[str, Any] = {}
+
+
+def _init_detection_worker(detector: PIIDetector) -> None:
+    _detection_worker_state["detector"] = detector
+
+
+def _detect_in_worker(texts: List[str]) -> List[List[PIIEntity]]:
+    detector = _detection_worker_state["detector"]
+    return [detector.detect(text) for text in texts]
+
+
 # Example of how it might be used (for testing or demonstration)
 async def main():
     guardian = PrivacyGuardian(default_protection_level=ProtectionLevel.STANDARD)
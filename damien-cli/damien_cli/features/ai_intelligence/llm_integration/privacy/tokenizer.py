@@ -21,17 +21,40 @@ Example:
     >>> detokenized_text = tokenizer.detokenize_text(tokenized_text, token_map)
     >>> print(f"Detokenized: {detokenized_text}")
 
+Both directions are single linear passes, so documents carrying tens of
+thousands of PII entities (mailing lists, exported address books) cost no
+more per entity than a short email:
+
+- Tokenization walks the entities in text order and joins the untouched
+  segments and tokens once, instead of rebuilding the string per entity
+- Detokenization is one compiled-regex substitution over bracketed token
+  shapes with a dictionary lookup per match, instead of one ``str.replace``
+  pass per token
+
+Issued tokens live in a TokenVault (vault.py): bounded in memory, optionally
+persisted encrypted on disk, and filed per email so an email's tokens can be
+forgotten at once. With a ``token_secret`` tokens are keyed HMACs of the
+value, so the same address gets the same token in every email and across
+restarts, which lets embeddings and caches deduplicate tokenized text.
+
 Note:
     The tokenization process must be deterministic and secure.
     Future enhancements will include secure token storage, automatic
     expiration, and batch operation support as per architectural specifications.
 """
-from typing import List, Dict, Tuple, Set, Optional
+from typing import Any, List, Dict, Tuple, Set, Optional, Union
+import re
 import uuid
 import hashlib # For deterministic token generation based on value if needed
+import hmac
 
 # Assuming PIIEntity is defined in detector.py as it was in previous steps
 from .detector import PIIEntity
+from .vault import TokenVault, derive_key
+
+# Anything in square brackets without nested brackets. Generated tokens have
+# this shape ([EMAIL_ADDRESS_1a2b3c4d]); matches absent from the map are kept.
+TOKEN_PATTERN = re.compile(r"\[[^\[\]]+\]")
 
 class ReversibleTokenizer:
     """
@@ -43,48 +66,67 @@ class ReversibleTokenizer:
     - Allow for the reconstruction of original text from its tokenized version.
 
     Future considerations based on architectural specifications:
-    - Secure token-to-value mapping (e.g., using a secure vault or database).
     - Automatic token expiration policies.
     - Support for batch tokenization/detokenization operations.
     """
 
-    def __init__(self):
+    def __init__(self, vault: Optional[TokenVault] = None, token_secret: Optional[Union[str, bytes]] = None):
         """
         Initializes the ReversibleTokenizer.
         
-        The internal token store (`self.token_value_store`) is a simplified
-        in-memory store for demonstration. In a production system, this would
-        be replaced by a secure and persistent storage mechanism.
+        Args:
+            vault (Optional[TokenVault]): Where issued tokens are kept. Defaults
+                                          to a bounded, memory-only vault.
+            token_secret (Optional[Union[str, bytes]]): Makes tokens deterministic:
+                                          keyed HMACs of the entity type and value.
+                                          Without it every occurrence gets a random token.
         """
-        self.token_value_store: Dict[str, str] = {} # token -> original_value
+        self.token_value_store: TokenVault = vault if vault is not None else TokenVault() # token -> original_value
+        self._token_key = derive_key(token_secret, "pii-token-ids") if token_secret else None
+
+    @property
+    def deterministic(self) -> bool:
+        """Whether equal values get equal tokens."""
+        return self._token_key is not None
 
-    def _generate_token(self, pii_entity: PIIEntity) -> str:
+    def _generate_token(self, pii_entity: PIIEntity, value: Optional[str] = None) -> str:
         """
-        Generates a unique token for a given PII entity.
+        Generates a token for a given PII entity.
 
-        The token format is [ENTITY_TYPE_UUID].
-        This ensures tokens are somewhat descriptive while remaining unique.
-        A more robust system might involve a dedicated token management service.
+        The token format is [ENTITY_TYPE_ID]. The id is random, or with a token
+        secret the first 16 hex digits of an HMAC over the type and value.
 
         Args:
             pii_entity (PIIEntity): The PII entity to generate a token for.
+            value (Optional[str]): The value the token stands for, if not pii_entity.text.
 
         Returns:
-            str: A unique token string.
+            str: A token string.
         """
-        unique_id = uuid.uuid4().hex[:8] # Shortened UUID for readability
-        token = f"[{pii_entity.entity_type.upper()}_{unique_id}]"
-        return token
+        entity_type = pii_entity.entity_type.upper()
+        if self._token_key is None:
+            unique_id = uuid.uuid4().hex[:8] # Shortened UUID for readability
+        else:
+            message = f"{entity_type}\x00{pii_entity.text if value is None else value}".encode("utf-8")
+            unique_id = hmac.new(self._token_key, message, hashlib.sha256).hexdigest()[:16]
+        return f"[{entity_type}_{unique_id}]"
 
-    def tokenize_pii(self, text: str, pii_entities: List[PIIEntity]) -> Tuple[str, Dict[str, str]]:
+    def tokenize_pii(
+        self,
+        text: str,
+        pii_entities: List[PIIEntity],
+        namespace: Optional[str] = None
+    ) -> Tuple[str, Dict[str, str]]:
         """
         Replaces detected PII in a text string with unique tokens.
 
         Args:
             text (str): The original text string.
-            pii_entities (List[PIIEntity]): A list of PIIEntity objects detected in the text.
-                                            Entities should be sorted by start_char to avoid
-                                            issues with index changes during replacement.
+            pii_entities (List[PIIEntity]): A list of PIIEntity objects detected in the text,
+                                            in any order. Overlapping entities are replaced
+                                            by a single token mapped to their combined span.
+            namespace (Optional[str]): Vault namespace for the issued tokens, usually
+                                       the email id, so they can be forgotten together.
 
         Returns:
             Tuple[str, Dict[str, str]]:
@@ -92,18 +134,40 @@ class ReversibleTokenizer:
                 - A map where keys are tokens and values are the original PII strings.
         """
         token_map: Dict[str, str] = {}
-        sorted_entities = sorted(pii_entities, key=lambda p: p.start_char, reverse=True)
+        # Earliest first; of entities starting together, the longest wins
+        sorted_entities = sorted(pii_entities, key=lambda p: (p.start_char, -p.end_char))
 
-        modified_text = text
-        for entity in sorted_entities:
-            token = self._generate_token(entity)
+        segments: List[str] = []
+        position = 0
+        for index, entity in enumerate(sorted_entities):
+            if entity.start_char < position:
+                continue  # Inside a span that was already tokenized
             
-            self.token_value_store[token] = entity.text
-            token_map[token] = entity.text
+            # Overlapping entities collapse into one token covering their union,
+            # so no fragment of either is left in clear text
+            end = entity.end_char
+            value = entity.text
+            following = index + 1
+            while following < len(sorted_entities) and sorted_entities[following].start_char < end:
+                if sorted_entities[following].end_char > end:
+                    end = sorted_entities[following].end_char
+                    value = text[entity.start_char:end]
+                following += 1
             
-            modified_text = modified_text[:entity.start_char] + token + modified_text[entity.end_char:]
+            token = self._generate_token(entity, value)
+            # Random ids may repeat in very PII-dense documents; a keyed id is
+            # reused only for the value it was derived from
+            while token in token_map and (token_map[token] != value or not self.deterministic):
+                token = f"[{entity.entity_type.upper()}_{uuid.uuid4().hex[:8]}]"
+            token_map[token] = value
             
-        return modified_text, token_map
+            segments.append(text[position:entity.start_char])
+            segments.append(token)
+            position = end
+        
+        segments.append(text[position:])
+        self.remember(token_map, namespace)
+        return "".join(segments), token_map
 
     def detokenize_text(self, tokenized_text: str, token_map: Optional[Dict[str, str]] = None) -> str:
         """
@@ -112,7 +176,8 @@ class ReversibleTokenizer:
         Args:
             tokenized_text (str): The text string containing tokens.
             token_map (Optional[Dict[str, str]]): A map of tokens to their original PII values.
-                                         If None, uses the tokenizer's internal store.
+                                         If None, uses the tokenizer's token vault,
+                                         which only resolves bracketed tokens.
                                          Providing this allows detokenization of text
                                          tokenized in a specific context/run.
 
@@ -120,9 +185,18 @@ class ReversibleTokenizer:
             str: The text string with tokens replaced by their original PII values.
         """
         current_map = token_map if token_map is not None else self.token_value_store
+        if not tokenized_text or (token_map is not None and not token_map):
+            return tokenized_text
         
-        detokenized_text = tokenized_text
-        for token in sorted(current_map.keys(), key=len, reverse=True):
+        detokenized_text = TOKEN_PATTERN.sub(
+            lambda match: current_map.get(match.group(0), match.group(0)), tokenized_text
+        )
+        
+        if token_map is None:
+            return detokenized_text
+        
+        # Caller-supplied keys that are not bracketed tokens are replaced one by one
+        for token in sorted((t for t in token_map if not TOKEN_PATTERN.fullmatch(t)), key=len, reverse=True):
             if token in detokenized_text:
                 detokenized_text = detokenized_text.replace(token, current_map[token])
         return detokenized_text
@@ -139,6 +213,40 @@ class ReversibleTokenizer:
         """
         return self.token_value_store.get(token)
 
+    def remember(self, token_map: Dict[str, str], namespace: Optional[str] = None) -> None:
+        """
+        Records tokens issued elsewhere (e.g. by a worker process) in the vault.
+
+        Args:
+            token_map (Dict[str, str]): Tokens and their original values.
+            namespace (Optional[str]): Vault namespace, usually the email id.
+        """
+        if token_map:
+            self.token_value_store.put_many(token_map, namespace)
+
+    def namespace_values(self, namespace: str) -> Set[str]:
+        """
+        Original values of the tokens filed under one namespace (email).
+
+        Returns:
+            Set[str]: The PII values, e.g. to purge them from result caches.
+        """
+        values = (self.token_value_store.get(token) for token in self.token_value_store.namespace_tokens(namespace))
+        return {value for value in values if value is not None}
+
+    def forget_namespace(self, namespace: str) -> int:
+        """
+        Drops the tokens of one namespace (email) that no other namespace uses.
+
+        Returns:
+            int: Number of tokens removed from the vault.
+        """
+        return self.token_value_store.evict_namespace(namespace)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Token vault statistics, including its approximate memory footprint."""
+        return {"deterministic_tokens": self.deterministic, **self.token_value_store.get_stats()}
+
     def clear_token_store(self):
         """
         Clears the internal token-value store.
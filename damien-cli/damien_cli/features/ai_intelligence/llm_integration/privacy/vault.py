@@ -0,0 +1,394 @@
+"""
+Token vault: the token -> original PII value mapping behind ReversibleTokenizer.
+
+The tokenizer used to keep every token it ever issued in a plain dict. Inside
+the long-lived MCP server that dict only grew, and it died with the process,
+so privacy tokens stored in the RAG index could not be restored after a
+restart. TokenVault replaces it:
+
+- Bounded memory: an LRU front of at most ``max_entries`` tokens
+- Optional persistence: a SQLite file behind the LRU holding every token,
+  with values encrypted (Fernet, from the optional ``cryptography`` package)
+  under a key derived from the vault secret; PII never reaches disk in clear
+- Namespaces: tokens are filed under the email they came from, so one call
+  forgets everything an email contributed. A token shared by several emails
+  (see deterministic tokens in tokenizer.py) survives until its last
+  namespace is evicted
+- Footprint reporting: ``get_stats()`` estimates the bytes the LRU holds
+
+The vault is a MutableMapping, so code written against the old dict
+(``store[token] = value``, ``store.get(token)``, ``len(store)``) keeps working.
+
+Example:
+    >>> vault = TokenVault(max_entries=50000, path="~/.damien/token_vault.sqlite3", secret_key=secret)
+    >>> vault.put_many({"[EMAIL_ADDRESS_3f2a...]": "jane@example.com"}, namespace="email-123")
+    >>> vault.get("[EMAIL_ADDRESS_3f2a...]")
+    'jane@example.com'
+    >>> vault.evict_namespace("email-123")
+    1
+"""
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Union
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NAMESPACE = ""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    token TEXT PRIMARY KEY,
+    value BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS token_namespaces (
+    namespace TEXT NOT NULL,
+    token TEXT NOT NULL,
+    PRIMARY KEY (namespace, token)
+);
+CREATE INDEX IF NOT EXISTS token_namespaces_by_token ON token_namespaces (token);
+"""
+
+
+def derive_key(secret: Union[str, bytes], purpose: str) -> bytes:
+    """Independent 32-byte key for one purpose (token ids, vault encryption) from one secret."""
+    if isinstance(secret, str):
+        secret = secret.encode("utf-8")
+    return hmac.new(secret, purpose.encode("utf-8"), hashlib.sha256).digest()
+
+
+class _VaultEntry:
+    """A cached token: its value and the namespaces that reference it."""
+
+    __slots__ = ("value", "namespaces")
+
+    def __init__(self, value: str):
+        self.value = value
+        self.namespaces: Set[str] = set()
+
+
+class TokenVault(MutableMapping):
+    """
+    Thread-safe token -> value mapping with an LRU front and an optional
+    encrypted SQLite store behind it.
+
+    Without a path the vault is memory-only and tokens pushed out of the LRU
+    are gone, which bounds the memory of long-running processes. With a path
+    every token is written through to disk and reloaded on demand.
+
+    Attributes:
+        max_entries (int): Tokens kept in memory
+        path (Optional[Path]): SQLite file, None for a memory-only vault
+        hits / misses (int): Lookups answered from memory / not found there
+        evictions (int): Tokens pushed out of the LRU
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100000,
+        path: Optional[Union[str, Path]] = None,
+        secret_key: Optional[Union[str, bytes]] = None
+    ):
+        """
+        Args:
+            max_entries: Tokens kept in memory.
+            path: SQLite file for persistent, encrypted storage.
+            secret_key: Vault secret. Required with a path: values are
+                encrypted under a key derived from it, and the same secret
+                must be supplied after a restart to read them back.
+
+        Raises:
+            ValueError: If a path is given without a secret key.
+            ImportError: If a path is given and ``cryptography`` is missing.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.path = Path(path).expanduser() if path else None
+
+        self._entries: "OrderedDict[str, _VaultEntry]" = OrderedDict()
+        self._namespaces: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._cipher = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+        if self.path is not None:
+            if not secret_key:
+                raise ValueError("A persistent token vault needs a secret_key to encrypt values")
+            if not CRYPTOGRAPHY_AVAILABLE:
+                raise ImportError("A persistent token vault requires the 'cryptography' package")
+            self._cipher = Fernet(base64.urlsafe_b64encode(derive_key(secret_key, "token-vault-encryption")))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connect()
+
+    # Persistence
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connection for this process; forked pool workers open their own."""
+        if self._connection is None or self._connection_pid != os.getpid():
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SCHEMA)
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _encrypt(self, value: str) -> bytes:
+        return self._cipher.encrypt(value.encode("utf-8"))
+
+    def _decrypt(self, blob: bytes) -> Optional[str]:
+        try:
+            return self._cipher.decrypt(blob).decode("utf-8")
+        except InvalidToken:
+            logger.warning("Token vault entry could not be decrypted; was the vault secret changed?")
+            return None
+
+    def _load(self, token: str) -> Optional[_VaultEntry]:
+        connection = self._connect()
+        row = connection.execute("SELECT value FROM tokens WHERE token = ?", (token,)).fetchone()
+        if row is None:
+            return None
+        value = self._decrypt(row[0])
+        if value is None:
+            return None
+        entry = _VaultEntry(value)
+        entry.namespaces.update(
+            namespace for (namespace,) in
+            connection.execute("SELECT namespace FROM token_namespaces WHERE token = ?", (token,))
+        )
+        return entry
+
+    # Memory front
+
+    def _remember(self, token: str, entry: _VaultEntry) -> None:
+        self._entries[token] = entry
+        self._entries.move_to_end(token)
+        for namespace in entry.namespaces:
+            self._namespaces.setdefault(namespace, set()).add(token)
+        while len(self._entries) > self.max_entries:
+            evicted_token, evicted = self._entries.popitem(last=False)
+            self._unindex(evicted_token, evicted.namespaces)
+            self.evictions += 1
+
+    def _unindex(self, token: str, namespaces: Set[str]) -> None:
+        for namespace in namespaces:
+            members = self._namespaces.get(namespace)
+            if members is not None:
+                members.discard(token)
+                if not members:
+                    del self._namespaces[namespace]
+
+    # Public API
+
+    def put_many(self, token_map: Dict[str, str], namespace: Optional[str] = None) -> None:
+        """Store tokens under a namespace (one transaction when persistent)."""
+        if not token_map:
+            return
+        namespace = DEFAULT_NAMESPACE if namespace is None else namespace
+        with self._lock:
+            for token, value in token_map.items():
+                entry = self._entries.get(token)
+                if entry is None:
+                    entry = _VaultEntry(value)
+                entry.value = value
+                entry.namespaces.add(namespace)
+                self._remember(token, entry)
+
+            if self.path is not None:
+                connection = self._connect()
+                with connection:
+                    connection.execute("BEGIN")
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO tokens (token, value) VALUES (?, ?)",
+                        [(token, self._encrypt(value)) for token, value in token_map.items()]
+                    )
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO token_namespaces (namespace, token) VALUES (?, ?)",
+                        [(namespace, token) for token in token_map]
+                    )
+
+    def put(self, token: str, value: str, namespace: Optional[str] = None) -> None:
+        self.put_many({token: value}, namespace)
+
+    def get(self, token: str, default: Optional[str] = None) -> Optional[str]:
+        """Original value of a token, reloading it from disk if it left memory."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+            if self.path is None:
+                return default
+            entry = self._load(token)
+            if entry is None:
+                return default
+            self._remember(token, entry)
+            return entry.value
+
+    def evict_namespace(self, namespace: str) -> int:
+        """Forget every token filed under a namespace that no other namespace references.
+
+        Returns:
+            int: Number of tokens removed
+        """
+        with self._lock:
+            removed: Set[str] = set()
+            for token in self._namespaces.pop(namespace, set()):
+                entry = self._entries.get(token)
+                if entry is None:
+                    continue
+                entry.namespaces.discard(namespace)
+                if not entry.namespaces:
+                    del self._entries[token]
+                    removed.add(token)
+
+            if self.path is not None:
+                connection = self._connect()
+                with connection:
+                    connection.execute("BEGIN")
+                    candidates = [
+                        token for (token,) in
+                        connection.execute("SELECT token FROM token_namespaces WHERE namespace = ?", (namespace,))
+                    ]
+                    connection.execute("DELETE FROM token_namespaces WHERE namespace = ?", (namespace,))
+                    orphaned = [
+                        (token,) for token in candidates
+                        if connection.execute(
+                            "SELECT 1 FROM token_namespaces WHERE token = ? LIMIT 1", (token,)
+                        ).fetchone() is None
+                    ]
+                    connection.executemany("DELETE FROM tokens WHERE token = ?", orphaned)
+                for (token,) in orphaned:
+                    self._entries.pop(token, None)
+                    removed.add(token)
+            return len(removed)
+
+    def namespace_tokens(self, namespace: str) -> List[str]:
+        """Tokens filed under a namespace."""
+        with self._lock:
+            if self.path is None:
+                return sorted(self._namespaces.get(namespace, ()))
+            return [token for (token,) in self._connect().execute(
+                "SELECT token FROM token_namespaces WHERE namespace = ? ORDER BY token", (namespace,)
+            )]
+
+    def namespaces(self) -> List[str]:
+        """Namespaces with at least one token."""
+        with self._lock:
+            if self.path is None:
+                return sorted(self._namespaces)
+            return [namespace for (namespace,) in self._connect().execute(
+                "SELECT DISTINCT namespace FROM token_namespaces ORDER BY namespace"
+            )]
+
+    def clear(self) -> None:
+        """Forget every token, on disk as well."""
+        with self._lock:
+            self._entries.clear()
+            self._namespaces.clear()
+            if self.path is not None:
+                connection = self._connect()
+                with connection:
+                    connection.execute("BEGIN")
+                    connection.execute("DELETE FROM tokens")
+                    connection.execute("DELETE FROM token_namespaces")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._connection_pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the in-memory front (tokens, values, bookkeeping)."""
+        with self._lock:
+            total = sys.getsizeof(self._entries) + sys.getsizeof(self._namespaces)
+            for token, entry in self._entries.items():
+                total += sys.getsizeof(token) + sys.getsizeof(entry) + sys.getsizeof(entry.value)
+                total += sys.getsizeof(entry.namespaces)
+            for members in self._namespaces.values():
+                total += sys.getsizeof(members)
+            return total
+
+    def get_stats(self) -> Dict[str, Union[int, float, bool, str, None]]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            persisted = None
+            if self.path is not None:
+                persisted = self._connect().execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+            return {
+                "entries_in_memory": len(self._entries),
+                "max_entries": self.max_entries,
+                "persisted_entries": persisted,
+                "namespaces_in_memory": len(self._namespaces),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_bytes": self.memory_bytes(),
+                "persistent": self.path is not None,
+                "encrypted": self._cipher is not None,
+                "path": str(self.path) if self.path is not None else None,
+            }
+
+    # MutableMapping interface (the tokenizer's former dict API)
+
+    def __getitem__(self, token: str) -> str:
+        value = self.get(token)
+        if value is None:
+            raise KeyError(token)
+        return value
+
+    def __setitem__(self, token: str, value: str) -> None:
+        self.put_many({token: value})
+
+    def __delitem__(self, token: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(token, None)
+            if entry is not None:
+                self._unindex(token, entry.namespaces)
+            deleted = 0
+            if self.path is not None:
+                connection = self._connect()
+                with connection:
+                    connection.execute("BEGIN")
+                    deleted = connection.execute("DELETE FROM tokens WHERE token = ?", (token,)).rowcount
+                    connection.execute("DELETE FROM token_namespaces WHERE token = ?", (token,))
+            if entry is None and not deleted:
+                raise KeyError(token)
+
+    def __contains__(self, token: object) -> bool:
+        return isinstance(token, str) and self.get(token) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            if self.path is None:
+                tokens = list(self._entries)
+            else:
+                tokens = [token for (token,) in self._connect().execute("SELECT token FROM tokens")]
+        return iter(tokens)
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self.path is None:
+                return len(self._entries)
+            return self._connect().execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
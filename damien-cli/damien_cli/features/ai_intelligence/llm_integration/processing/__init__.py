@@ -4,7 +4,10 @@ Processing Module: Scalable email processing components
 This module provides enterprise-grade components for scalable email processing:
 - IntelligentChunker: Token-aware document splitting with semantic coherence
 - BatchProcessor: Scalable email processing with multiple strategies  
+- PreprocessPipeline: Cached, process-parallel privacy protection + chunking stage
 - RAGEngine: Vector database integration for semantic search (100% accuracy achieved!)
+- NumpyVectorIndex: Dependency-free memory-mapped vector store for RAGEngine
+- BM25Index: Persistent inverted index for RAGEngine keyword and hybrid search
 - HierarchicalProcessor: Multi-level analysis for complex workflows
 - ProgressTracker: Real-time processing updates for large operations
 
@@ -19,6 +22,12 @@ from .chunker import (
     ChunkMetadata
 )
 
+from .preprocess import (
+    PreprocessPipeline,
+    PreprocessedEmail,
+    ChunkRecord
+)
+
 from .batch import (
     BatchProcessor,
     EmailItem,
@@ -32,9 +41,13 @@ from .rag import (
     VectorStore,
     SearchType,
     SearchResult,
+    QueryResults,
     IndexResult
 )
 
+from .vector_index import NumpyVectorIndex
+from .keyword_index import BM25Index
+
 from .hierarchical import (
     HierarchicalProcessor,
     ProcessingWorkflow,
@@ -69,6 +82,9 @@ __all__ = [
     "EmailItem",
     "ProcessingStrategy", 
     "BatchResult",
+    "PreprocessPipeline",
+    "PreprocessedEmail",
+    "ChunkRecord",
     
     # RAG components (100% accuracy achieved!)
     "RAGEngine",
@@ -76,7 +92,10 @@ __all__ = [
     "VectorStore",
     "SearchType", 
     "SearchResult",
+    "QueryResults",
     "IndexResult",
+    "NumpyVectorIndex",
+    "BM25Index",
     
     # Hierarchical processing components
     "HierarchicalProcessor",
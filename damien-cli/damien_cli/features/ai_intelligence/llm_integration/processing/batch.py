@@ -29,14 +29,14 @@ import asyncio
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import List, Dict, Any, Optional, Iterator, Callable, Awaitable, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 from datetime import datetime, timezone
 import uuid
 import gc
 
 from .chunker import IntelligentChunker, ChunkingStrategy, ChunkingConfig
-from ..privacy.guardian import PrivacyGuardian
+from .preprocess import PreprocessedEmail, PreprocessPipeline
+from ..privacy.guardian import PrivacyGuardian, ProtectionLevel
 from ..privacy.detector import PIIEntity
 from ..routing.router import IntelligenceRouter
 
@@ -250,7 +250,8 @@ class BatchProcessor:
         self, 
         config: Optional[BatchConfig] = None,
         privacy_guardian: Optional[PrivacyGuardian] = None,
-        intelligence_router: Optional[IntelligenceRouter] = None
+        intelligence_router: Optional[IntelligenceRouter] = None,
+        preprocess_pipeline: Optional[PreprocessPipeline] = None
     ):
         """Initialize the BatchProcessor with configuration and dependencies."""
         self.config = config or BatchConfig()
@@ -265,6 +266,16 @@ class BatchProcessor:
                 privacy_guardian=self.privacy_guardian
             )
         
+        # Protection + chunking stage, shared (through its content-hash cache)
+        # with RAGEngine indexing. Emails at or under max_chunk_size stay whole.
+        self.preprocess_pipeline = preprocess_pipeline or PreprocessPipeline(
+            privacy_guardian=self.privacy_guardian if self.config.enable_privacy_protection else None,
+            chunker=self.chunker,
+            protection_level=ProtectionLevel.STANDARD,
+            max_workers=self.config.max_concurrent_workers,
+            chunk_min_chars=self.config.chunking_config.max_chunk_size if self.chunker else None
+        )
+        
         # Processing state
         self._active_batches: Dict[str, BatchProgress] = {}
         self._batch_lock = threading.Lock()
@@ -454,53 +465,44 @@ class BatchProcessor:
         progress: BatchProgress,
         progress_callback: Optional[Callable[[BatchProgress], None]]
     ) -> List[ProcessingResult]:
-        """Process emails in parallel using ThreadPoolExecutor."""
+        """Process emails in parallel through the preprocess pipeline's process pool."""
         results = []
+        batch_size = max(1, self.config.batch_size)
         
-        with ThreadPoolExecutor(max_workers=self.config.max_concurrent_workers) as executor:
-            # Submit all emails for processing
-            future_to_email = {
-                executor.submit(self._process_single_email, email): email 
-                for email in emails
-            }
+        for batch_start in range(0, len(emails), batch_size):
+            if self._shutdown_event.is_set():
+                break
+            
+            email_batch = emails[batch_start:batch_start + batch_size]
+            try:
+                preprocessed = self.preprocess_pipeline.process(email_batch)
+            except Exception as e:
+                logger.error(f"Error preprocessing batch: {str(e)}")
+                preprocessed = [
+                    PreprocessedEmail(email_id=email.email_id, content_hash="", error=str(e))
+                    for email in email_batch
+                ]
             
-            # Collect results as they complete
-            for future in as_completed(future_to_email):
-                if self._shutdown_event.is_set():
-                    break
+            # Results keep input order
+            for email, outcome in zip(email_batch, preprocessed):
+                result = self._process_single_email(email, outcome)
+                results.append(result)
                 
-                email = future_to_email[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    
-                    # Update progress
-                    progress.processed_items += 1
-                    if result.success:
-                        progress.successful_items += 1
-                    else:
-                        progress.failed_items += 1
-                        progress.error_count += 1
-                    
-                    progress.current_item_id = email.email_id
-                    progress.memory_usage_mb = self._get_current_memory_usage()
-                    
-                    # Trigger progress callback
-                    if progress_callback and progress.processed_items % max(1, len(emails) // 20) == 0:
-                        progress_callback(progress)
-                        
-                except Exception as e:
-                    logger.error(f"Error processing email {email.email_id}: {str(e)}")
-                    error_result = ProcessingResult(
-                        email_id=email.email_id,
-                        success=False,
-                        error_message=str(e)
-                    )
-                    results.append(error_result)
-                    
-                    progress.processed_items += 1
+                # Update progress
+                progress.processed_items += 1
+                if result.success:
+                    progress.successful_items += 1
+                else:
                     progress.failed_items += 1
                     progress.error_count += 1
+                
+                progress.current_item_id = email.email_id
+                
+                # Trigger progress callback
+                if progress_callback and progress.processed_items % max(1, len(emails) // 20) == 0:
+                    progress_callback(progress)
+            
+            progress.memory_usage_mb = self._get_current_memory_usage()
         
         return results
     
@@ -534,77 +536,51 @@ class BatchProcessor:
         
         return results
     
-    def _process_single_email(self, email: EmailItem) -> ProcessingResult:
-        """Process a single email with chunking and privacy protection."""
+    def _process_single_email(
+        self,
+        email: EmailItem,
+        preprocessed: Optional[PreprocessedEmail] = None
+    ) -> ProcessingResult:
+        """Process a single email with chunking and privacy protection.
+        
+        ``preprocessed`` is the email's preprocess pipeline output when the
+        caller already ran the pipeline over a whole batch.
+        """
         start_time = time.time()
         memory_start = self._get_current_memory_usage()
         
         try:
-            # Apply privacy protection
-            privacy_context = {}
-            processed_content = email.content
+            if preprocessed is None:
+                preprocessed = self.preprocess_pipeline.process([email])[0]
+            if not preprocessed.success:
+                raise RuntimeError(preprocessed.error)
             
-            if self.config.enable_privacy_protection:
-                privacy_result = self.privacy_guardian.process_email_content(
-                    email.content, preserve_privacy=True
-                )
-                processed_content = privacy_result.processed_content
-                privacy_context = privacy_result.context
-            
-            # Chunking if enabled
-            chunks = []
-            if self.chunker and len(processed_content) > self.config.chunking_config.max_chunk_size:
-                chunk_results = self.chunker.chunk_document(
-                    processed_content,
-                    preserve_privacy=self.config.enable_privacy_protection
-                )
-                # Handle tuple format (content, metadata) from chunker
-                chunks = []
-                for chunk_item in chunk_results:
-                    if isinstance(chunk_item, tuple) and len(chunk_item) == 2:
-                        content_part, metadata_part = chunk_item
-                        chunks.append({
-                            'chunk_id': metadata_part.chunk_id,
-                            'content': content_part,
-                            'token_count': metadata_part.token_count,
-                            'semantic_coherence': metadata_part.semantic_coherence_score
-                        })
-                    else:
-                        # Fallback for unexpected format
-                        logger.warning(f"Unexpected chunk format: {type(chunk_item)}")
-                        chunks.append({
-                            'chunk_id': f"unknown_{len(chunks)}",
-                            'content': str(chunk_item),
-                            'token_count': len(str(chunk_item).split()),
-                            'semantic_coherence': 1.0
-                        })
-            else:
-                # Single chunk for small emails
-                chunks = [{
-                    'chunk_id': f"{email.email_id}_full",
-                    'content': processed_content,
-                    'token_count': len(processed_content.split()),
-                    'semantic_coherence': 1.0
-                }]
+            chunks = [
+                {
+                    'chunk_id': chunk.chunk_id or f"{email.email_id}_full",
+                    'content': chunk.content,
+                    'token_count': chunk.token_count,
+                    'semantic_coherence': chunk.coherence_score
+                }
+                for chunk in preprocessed.chunks
+            ]
             
             # Count tokens
             total_tokens = sum(chunk['token_count'] for chunk in chunks)
             
-            # Detect PII entities
-            pii_entities = []
-            if self.config.enable_privacy_protection:
-                pii_entities = self.privacy_guardian.pii_detector.detect(email.content)
-            
             # Processing time and memory
-            processing_time_ms = (time.time() - start_time) * 1000
+            processing_time_ms = (time.time() - start_time) * 1000 + preprocessed.processing_time_ms
             memory_usage = self._get_current_memory_usage() - memory_start
             
             result = ProcessingResult(
                 email_id=email.email_id,
                 success=True,
                 chunks=chunks,
-                analysis={'privacy_context': privacy_context},
-                pii_entities=pii_entities,
+                analysis={'privacy_context': {
+                    'tokenization_map': preprocessed.privacy_tokens,
+                    'from_cache': preprocessed.from_cache
+                }},
+                pii_entities=preprocessed.pii_entities,
                 processing_time_ms=processing_time_ms,
                 tokens_used=total_tokens,
                 memory_usage_mb=memory_usage
@@ -668,6 +644,8 @@ class BatchProcessor:
         while self._active_batches and (time.time() - start_time) < timeout:
             time.sleep(0.1)
         
+        self.preprocess_pipeline.close()
+        
         logger.info("BatchProcessor shutdown complete")
     
     def get_performance_stats(self) -> Dict[str, Any]:
@@ -13,6 +13,18 @@ Features:
 - Overlap management for context preservation
 - Performance optimization for large documents
 - Comprehensive metrics and monitoring
+- One PII scan per document: the sorted document-level PII spans drive
+  PII-aware boundaries and are sliced into chunk-level PII by binary
+  search on offsets, and detections themselves are memoized by content
+  hash in the detector's shared cache
+- Streaming: iter_chunks() reads text (a string or an iterable of pieces)
+  in bounded windows and yields (chunk, metadata) lazily, so a 20MB digest
+  is never tokenized, protected or held as chunk metadata all at once
+- One embedding per sentence per document: semantic boundaries, hybrid
+  refinement and coherence scores all read from a per-document sentence
+  embedding cache, using vectorized adjacent-cosine similarities
+- Token counts for sentences, chunks and metadata go through the shared,
+  hash-memoized TokenCounter, batched per document
 
 Performance Targets:
 - <100ms processing for average emails
@@ -22,20 +34,29 @@ Performance Targets:
 """
 
 import logging
+import re
 import time
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Dict, Any, Optional, Tuple, Union
 import tiktoken
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
 from ..privacy.guardian import PrivacyGuardian
 from ..privacy.detector import PIIEntity
 from ..privacy.tokenizer import ReversibleTokenizer
+from ..utils import SHARED_TOKEN_COUNTER, TokenCounter
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
+SENTENCE_BOUNDARY = re.compile(r'[.!?]+')
+TOKEN_ENCODING = "cl100k_base"  # GPT-4 tokenizer
+PII_CUT_MARGIN = 64  # Characters scanned each side of a window cut; longer than any PII value
+
 
 class ChunkingStrategy(Enum):
     """Available chunking strategies for different use cases."""
@@ -73,6 +94,8 @@ class ChunkingConfig:
     min_coherence_score: float = 0.8
     enable_pii_protection: bool = True
     enable_performance_tracking: bool = True
+    stream_window_chars: int = 65536     # Characters per window in iter_chunks
+    coherence_max_sentences: int = 32    # Sentences embedded per chunk for its coherence score
 
 
 class IntelligentChunker:
@@ -88,7 +111,8 @@ class IntelligentChunker:
         self,
         config: Optional[ChunkingConfig] = None,
         privacy_guardian: Optional[PrivacyGuardian] = None,
-        embedding_model: Optional[str] = None
+        embedding_model: Optional[str] = None,
+        token_counter: Optional[TokenCounter] = None
     ):
         """
         Initialize the IntelligentChunker with configuration and dependencies.
@@ -97,12 +121,14 @@ class IntelligentChunker:
             config: Chunking configuration parameters
             privacy_guardian: Privacy protection system integration
             embedding_model: Model for semantic coherence analysis
+            token_counter: Memoizing token counter (defaults to the shared one)
         """
         self.config = config or ChunkingConfig()
         self.privacy_guardian = privacy_guardian or PrivacyGuardian()
         
         # Initialize tokenizer for accurate token counting
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")  # GPT-4 tokenizer
+        self.tokenizer = tiktoken.get_encoding(TOKEN_ENCODING)
+        self.token_counter = token_counter or SHARED_TOKEN_COUNTER
         
         # Initialize embedding model for semantic analysis
         self.embedding_model_name = embedding_model or "all-MiniLM-L6-v2"
@@ -112,13 +138,30 @@ class IntelligentChunker:
         self.chunk_count = 0
         self.total_processing_time = 0.0
         self.coherence_scores = []
+        self.chunk_pii_sliced = 0  # Chunks whose PII came from document-level detections
+        self.chunk_pii_redetected = 0  # Chunks that could not be located and were rescanned
+        self.documents_chunked = 0
+        self.embedding_calls = 0  # model.encode() invocations
+        self.sentences_embedded = 0
+        self.sentence_embedding_hits = 0
+        
+        self.document_pii_scans = 0
+        
+        # Sentence -> unit embedding, scoped to the document being chunked
+        self._sentence_embeddings: Optional[Dict[str, np.ndarray]] = None
+        # (content, PII sorted by start, their end offsets) of that document
+        self._document_pii: Optional[Tuple[str, List[PIIEntity], List[int]]] = None
+        # Semantic chunk -> its offset in that document, recorded while chunking
+        self._chunk_offsets: Optional[Dict[str, int]] = None
         
         logger.info(f"IntelligentChunker initialized with strategy: {self.config.strategy}")
 
-    def _lazy_load_embedding_model(self) -> SentenceTransformer:
+    def _lazy_load_embedding_model(self) -> "SentenceTransformer":
         """Lazy load embedding model for performance optimization."""
         if self.embedding_model is None:
             try:
+                # Imported on first use: sentence-transformers pulls in torch
+                from sentence_transformers import SentenceTransformer
                 self.embedding_model = SentenceTransformer(self.embedding_model_name)
                 logger.info(f"Loaded embedding model: {self.embedding_model_name}")
             except Exception as e:
@@ -146,6 +189,9 @@ class IntelligentChunker:
             List of (chunk_content, metadata) tuples
         """
         start_time = time.time()
+        self.documents_chunked += 1
+        self._sentence_embeddings = {}
+        self._chunk_offsets = {}
         
         try:
             # Step 1: Privacy protection if enabled
@@ -155,23 +201,15 @@ class IntelligentChunker:
                 privacy_context = {}
 
             # Step 2: Apply chunking strategy
-            if self.config.strategy == ChunkingStrategy.TOKEN_BASED:
-                chunks = self._chunk_by_tokens(content)
-            elif self.config.strategy == ChunkingStrategy.SEMANTIC:
-                chunks = self._chunk_by_semantics(content)
-            elif self.config.strategy == ChunkingStrategy.HYBRID:
-                chunks = self._chunk_hybrid(content)
-            elif self.config.strategy == ChunkingStrategy.PII_AWARE:
-                chunks = self._chunk_pii_aware(content)
-            else:
-                raise ValueError(f"Unknown chunking strategy: {self.config.strategy}")
+            chunks = self._apply_strategy(content)
 
             # Step 3: Generate comprehensive metadata
+            chunks_pii = self._slice_pii_by_chunk(content, chunks)
             chunked_results = []
             for i, chunk_content in enumerate(chunks):
                 metadata = self._generate_metadata(
                     chunk_content, i, len(chunks), 
-                    privacy_context, start_time
+                    privacy_context, start_time, chunk_pii=chunks_pii[i]
                 )
                 chunked_results.append((chunk_content, metadata))
 
@@ -190,13 +228,176 @@ class IntelligentChunker:
             metadata = ChunkMetadata(
                 chunk_id=f"fallback_0",
                 original_position=0,
-                token_count=len(self.tokenizer.encode(content)),
+                token_count=self._count_tokens(content),
                 character_count=len(content),
                 semantic_coherence_score=1.0,
                 processing_time_ms=(time.time() - start_time) * 1000,
                 strategy_used=ChunkingStrategy.TOKEN_BASED
             )
             return [(content, metadata)]
+        finally:
+            self._sentence_embeddings = None
+            self._document_pii = None
+            self._chunk_offsets = None
+
+    def iter_chunks(
+        self,
+        source: Union[str, Iterable[str]],
+        document_id: Optional[str] = None,
+        preserve_privacy: bool = True
+    ) -> Iterator[Tuple[str, ChunkMetadata]]:
+        """
+        Chunk a document incrementally, yielding (chunk_content, metadata) as produced.
+        
+        The text is consumed in windows of about ``config.stream_window_chars``
+        characters, cut at a line or word break but never inside a detected
+        PII value (a spaced phone or card number would otherwise reach the
+        next window in two unrecognisable halves). Each window is protected and
+        chunked with the configured strategy; its last chunk may be incomplete,
+        so it is carried into the next window instead of being yielded. A
+        carry longer than a window (a strategy that found nothing to split on,
+        e.g. semantic chunking of unpunctuated text) is cut into token-sized
+        pieces first, so only its last piece is carried. Only one window, its
+        chunks and the carried text are in memory at a time.
+        
+        For content that fits in one window the chunks match chunk_document().
+        
+        Args:
+            source: The document, as a string or an iterable of text pieces
+                (e.g. a file object or decoded MIME parts)
+            document_id: Optional identifier for tracking
+            preserve_privacy: Whether to apply PII protection
+            
+        Yields:
+            (chunk_content, metadata) tuples, positions numbered across windows
+        """
+        self.documents_chunked += 1
+        position = 0
+        carry = ""
+        protect = preserve_privacy and self.config.enable_pii_protection
+        for window, is_last in self._iter_windows(source, avoid_pii=protect):
+            start_time = time.time()
+            pending, carry = carry, ""
+            text = pending + window
+            self._sentence_embeddings = {}  # Scoped to the window, released before yielding
+            self._chunk_offsets = {}
+            try:
+                # Step 1: Privacy protection (the carried text is already protected)
+                if protect:
+                    protected, privacy_context = self._protect_privacy(window)
+                    text = pending + protected
+                else:
+                    privacy_context = {}
+                
+                # Step 2: Chunk the window, holding back a possibly incomplete tail
+                chunks = self._apply_strategy(text) if text else []
+                if not is_last and chunks:
+                    carry = chunks.pop()
+                    if len(carry) > self.config.stream_window_chars:
+                        chunks.extend(self._split_by_token_count(carry))
+                        carry = chunks.pop()
+                
+                # Step 3: Metadata, with chunk PII sliced from one scan of the window
+                chunks_pii = self._slice_pii_by_chunk(text, chunks)
+                window_results = []
+                for i, chunk_content in enumerate(chunks):
+                    metadata = self._generate_metadata(
+                        chunk_content, position, None,
+                        privacy_context, start_time, chunk_pii=chunks_pii[i]
+                    )
+                    position += 1
+                    window_results.append((chunk_content, metadata))
+                
+            except Exception as e:
+                logger.error(f"Failed to chunk document window at chunk {position}: {e}")
+                carry = ""
+                window_results = [(text, ChunkMetadata(
+                    chunk_id=f"fallback_{position}",
+                    original_position=position,
+                    token_count=self._count_tokens(text),
+                    character_count=len(text),
+                    semantic_coherence_score=1.0,
+                    processing_time_ms=(time.time() - start_time) * 1000,
+                    strategy_used=ChunkingStrategy.TOKEN_BASED
+                ))] if text else []
+                position += len(window_results)
+            finally:
+                self._sentence_embeddings = None
+                self._document_pii = None
+                self._chunk_offsets = None
+            
+            # Step 4: Performance tracking, per window
+            if window_results:
+                self._update_performance_metrics((time.time() - start_time) * 1000, window_results)
+            yield from window_results
+
+    def _iter_windows(
+        self,
+        source: Union[str, Iterable[str]],
+        avoid_pii: bool = False
+    ) -> Iterator[Tuple[str, bool]]:
+        """Split a text stream into (window, is_last) pairs cut at line or word breaks.
+        
+        With ``avoid_pii`` a cut that falls inside a detected PII value is
+        moved back to the value's start; a window is only cut once the text
+        past it covers the scan margin.
+        """
+        window_chars = max(1, self.config.stream_window_chars)
+        lookahead = PII_CUT_MARGIN if avoid_pii else 0
+        pieces = (source,) if isinstance(source, str) else source
+        
+        buffer = ""
+        offset = 0
+        for piece in pieces:
+            # The unread remainder is under one window, so this copy stays small
+            buffer = buffer[offset:] + piece
+            offset = 0
+            while len(buffer) - offset > window_chars + lookahead:
+                cut = self._window_cut(buffer, offset, offset + window_chars)
+                if avoid_pii:
+                    cut = self._pii_safe_cut(buffer, offset, cut)
+                yield buffer[offset:cut], False
+                offset = cut
+        
+        yield buffer[offset:], True
+
+    def _split_by_token_count(self, text: str) -> List[str]:
+        """Cut text into consecutive pieces of max_chunk_size tokens, without overlap."""
+        tokens = self.tokenizer.encode(text)
+        size = max(1, self.config.max_chunk_size)
+        return [self.tokenizer.decode(tokens[start:start + size]) for start in range(0, len(tokens), size)]
+
+    @staticmethod
+    def _window_cut(buffer: str, start: int, end: int) -> int:
+        """A cut point in buffer[start:end]: the last line break, else space, in its final fifth."""
+        floor = start + (end - start) * 4 // 5
+        for separator in ("\n", " "):
+            cut = buffer.rfind(separator, floor, end)
+            if cut != -1:
+                return cut + 1
+        return end
+
+    def _pii_safe_cut(self, buffer: str, start: int, cut: int) -> int:
+        """Move a window cut back to the start of a PII value that spans it."""
+        scan_from = max(start, cut - PII_CUT_MARGIN)
+        nearby = self.privacy_guardian.pii_detector.detect(buffer[scan_from:cut + PII_CUT_MARGIN])
+        for entity in nearby:
+            entity_start = scan_from + entity.start_char
+            if start < entity_start < cut < scan_from + entity.end_char:
+                return entity_start  # Merged detections do not overlap
+        return cut
+
+    def _apply_strategy(self, content: str) -> List[str]:
+        """Split content with the configured chunking strategy."""
+        if self.config.strategy == ChunkingStrategy.TOKEN_BASED:
+            return self._chunk_by_tokens(content)
+        elif self.config.strategy == ChunkingStrategy.SEMANTIC:
+            return self._chunk_by_semantics(content, record_offsets=True)
+        elif self.config.strategy == ChunkingStrategy.HYBRID:
+            return self._chunk_hybrid(content)
+        elif self.config.strategy == ChunkingStrategy.PII_AWARE:
+            return self._chunk_pii_aware(content)
+        raise ValueError(f"Unknown chunking strategy: {self.config.strategy}")
 
     def _protect_privacy(self, content: str) -> Tuple[str, Dict[str, Any]]:
         """Apply privacy protection while preserving chunking capabilities."""
@@ -206,12 +407,12 @@ class IntelligentChunker:
             
             # Apply reversible tokenization for secure processing
             if pii_entities:
-                tokenized_content = self.privacy_guardian.tokenizer.tokenize_content(
+                tokenized_content, token_map = self.privacy_guardian.tokenizer.tokenize_pii(
                     content, pii_entities
                 )
                 privacy_context = {
                     'original_pii_entities': pii_entities,
-                    'tokenization_map': self.privacy_guardian.tokenizer.get_token_map()
+                    'tokenization_map': token_map
                 }
                 return tokenized_content, privacy_context
             else:
@@ -256,8 +457,14 @@ class IntelligentChunker:
                 
         return chunks
 
-    def _chunk_by_semantics(self, content: str) -> List[str]:
-        """Semantic chunking using embeddings for coherence."""
+    def _chunk_by_semantics(self, content: str, record_offsets: bool = False) -> List[str]:
+        """Semantic chunking using embeddings for coherence.
+        
+        Chunks are slices of ``content`` from the start of their first
+        sentence through the punctuation closing their last. With
+        ``record_offsets`` (content is the whole document) each chunk's
+        offset is kept, so its PII is sliced without searching for it.
+        """
         # Load embedding model
         model = self._lazy_load_embedding_model()
         if model is None:
@@ -265,47 +472,54 @@ class IntelligentChunker:
             return self._chunk_by_tokens(content)
         
         # Split into sentences for semantic analysis
-        sentences = self._split_into_sentences(content)
-        if len(sentences) <= 1:
+        spans = self._sentence_spans(content)
+        if len(spans) <= 1:
             return [content]
+        sentences = [content[start:end] for start, end, _ in spans]
         
-        # Generate embeddings for semantic similarity
-        embeddings = model.encode(sentences)
+        # Cosine similarity of each sentence with the next, from cached embeddings
+        similarities = self._adjacent_similarities(self._embed_sentences(sentences))
         
-        # Find semantic boundaries using cosine similarity
-        chunks = []
-        current_chunk = []
+        # Find semantic boundaries using cosine similarity; a chunk is a
+        # run of sentences, tracked as (first, last) sentence indexes
+        runs = []
+        first = 0
         current_tokens = 0
+        sentence_token_counts = self.token_counter.count_many(sentences, TOKEN_ENCODING)
         
-        for i, sentence in enumerate(sentences):
-            sentence_tokens = len(self.tokenizer.encode(sentence))
+        for i in range(len(sentences)):
+            sentence_tokens = sentence_token_counts[i]
             
             # Check if adding this sentence would exceed limits
             if (current_tokens + sentence_tokens > self.config.max_chunk_size 
-                and current_chunk):
+                and i > first):
                 
                 # Check semantic coherence before breaking
                 if i < len(sentences) - 1:
-                    similarity = np.dot(embeddings[i], embeddings[i+1])
-                    if similarity < self.config.min_coherence_score:
+                    if similarities[i] < self.config.min_coherence_score:
                         # Low coherence - good breaking point
-                        chunks.append(" ".join(current_chunk))
-                        current_chunk = [sentence]
+                        runs.append((first, i - 1))
+                        first = i
                         current_tokens = sentence_tokens
                         continue
                 
                 # High coherence but size limit reached
-                chunks.append(" ".join(current_chunk))
-                current_chunk = [sentence]
+                runs.append((first, i - 1))
+                first = i
                 current_tokens = sentence_tokens
             else:
-                current_chunk.append(sentence)
                 current_tokens += sentence_tokens
         
         # Add final chunk
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
-            
+        runs.append((first, len(sentences) - 1))
+        
+        chunks = []
+        for first, last in runs:
+            start, end = spans[first][0], spans[last][2]
+            chunk = content[start:end]
+            if record_offsets and self._chunk_offsets is not None:
+                self._chunk_offsets[chunk] = start
+            chunks.append(chunk)
         return chunks
 
     def _chunk_hybrid(self, content: str) -> List[str]:
@@ -319,10 +533,10 @@ class IntelligentChunker:
             return token_chunks
         
         refined_chunks = []
+        token_counts = self.token_counter.count_many(token_chunks, TOKEN_ENCODING)
         
-        for chunk in token_chunks:
+        for chunk, token_count in zip(token_chunks, token_counts):
             # For chunks near the size limit, check if semantic splitting improves coherence
-            token_count = len(self.tokenizer.encode(chunk))
             
             if token_count > self.config.max_chunk_size * 0.8:  # 80% of limit
                 semantic_subchunks = self._chunk_by_semantics(chunk)
@@ -337,86 +551,138 @@ class IntelligentChunker:
         return refined_chunks
 
     def _chunk_pii_aware(self, content: str) -> List[str]:
-        """PII-aware chunking that respects privacy boundaries."""
-        # Detect PII entities first
-        pii_entities = self.privacy_guardian.pii_detector.detect(content)
+        """PII-aware chunking that respects privacy boundaries.
+        
+        Walks the sorted document PII spans, growing each chunk by the text
+        before an entity and then the whole entity, so boundaries only fall
+        between entities. Chunks are tracked as offsets and sliced once.
+        """
+        pii_entities, _ = self._document_pii_spans(content)
         
         if not pii_entities:
             # No PII detected, use hybrid chunking
             return self._chunk_hybrid(content)
         
-        # Sort PII entities by position
-        pii_entities.sort(key=lambda x: x.start_char)
-        
         chunks = []
+        chunk_start = 0
         current_pos = 0
-        current_chunk = ""
         current_tokens = 0
         
         for pii_entity in pii_entities:
             # Add content before PII entity
-            before_pii = content[current_pos:pii_entity.start_char]
-            before_tokens = len(self.tokenizer.encode(before_pii))
+            before_tokens = self._count_tokens(content[current_pos:pii_entity.start_char])
             
             # Check if we need to start a new chunk
             if (current_tokens + before_tokens > self.config.max_chunk_size 
-                and current_chunk):
-                chunks.append(current_chunk.strip())
-                current_chunk = before_pii
+                and current_pos > chunk_start):
+                chunks.append(content[chunk_start:current_pos].strip())
+                chunk_start = current_pos
                 current_tokens = before_tokens
             else:
-                current_chunk += before_pii
                 current_tokens += before_tokens
             
             # Add PII entity (ensure it doesn't span chunks)
-            pii_text = content[pii_entity.start_char:pii_entity.end_char]
-            pii_tokens = len(self.tokenizer.encode(pii_text))
+            pii_tokens = self._count_tokens(content[pii_entity.start_char:pii_entity.end_char])
             
             if current_tokens + pii_tokens > self.config.max_chunk_size:
                 # Start new chunk with PII entity
-                if current_chunk.strip():
-                    chunks.append(current_chunk.strip())
-                current_chunk = pii_text
+                chunks.append(content[chunk_start:pii_entity.start_char].strip())
+                chunk_start = pii_entity.start_char
                 current_tokens = pii_tokens
             else:
-                current_chunk += pii_text
                 current_tokens += pii_tokens
             
             current_pos = pii_entity.end_char
         
         # Add remaining content
-        remaining = content[current_pos:]
-        if remaining:
-            remaining_tokens = len(self.tokenizer.encode(remaining))
+        if current_pos < len(content):
+            remaining_tokens = self._count_tokens(content[current_pos:])
             if (current_tokens + remaining_tokens > self.config.max_chunk_size 
-                and current_chunk):
-                chunks.append(current_chunk.strip())
-                chunks.append(remaining.strip())
+                and current_pos > chunk_start):
+                chunks.append(content[chunk_start:current_pos].strip())
+                chunks.append(content[current_pos:].strip())
             else:
-                current_chunk += remaining
-                chunks.append(current_chunk.strip())
-        elif current_chunk.strip():
-            chunks.append(current_chunk.strip())
+                chunks.append(content[chunk_start:].strip())
+        else:
+            chunks.append(content[chunk_start:current_pos].strip())
             
         return [chunk for chunk in chunks if chunk]  # Remove empty chunks
 
+    def _document_pii_spans(self, content: str) -> Tuple[List[PIIEntity], List[int]]:
+        """Document-level PII sorted by offset, with their end offsets, detected once per document."""
+        if self._document_pii is not None and self._document_pii[0] is content:
+            return self._document_pii[1], self._document_pii[2]
+        
+        pii_entities = sorted(
+            self.privacy_guardian.pii_detector.detect(content), key=lambda entity: entity.start_char
+        )
+        # Merged detections do not overlap, so their ends are sorted too
+        ends = [entity.end_char for entity in pii_entities]
+        self.document_pii_scans += 1
+        self._document_pii = (content, pii_entities, ends)
+        return pii_entities, ends
+
+    def _slice_pii_by_chunk(self, content: str, chunks: List[str]) -> List[List[PIIEntity]]:
+        """PII entities of each chunk, taken from one document-level detection.
+        
+        Semantic chunks use the offsets recorded while chunking; others are
+        located in the document in order (they may overlap their
+        predecessor). Entities are re-based to the chunk; one straddling a
+        chunk edge is clipped to it rather than dropped, so a partial value
+        is still reported. A chunk that is not a verbatim substring, e.g. a
+        token-boundary decode, is scanned on its own.
+        """
+        detector = self.privacy_guardian.pii_detector
+        document_pii, ends = self._document_pii_spans(content)
+        recorded = self._chunk_offsets or {}
+        
+        chunks_pii = []
+        search_from = 0
+        for chunk_content in chunks:
+            offset = recorded.get(chunk_content, -1)
+            if offset == -1:
+                offset = content.find(chunk_content, search_from)
+            if offset == -1:
+                offset = content.find(chunk_content)
+            if offset == -1:
+                self.chunk_pii_redetected += 1
+                chunks_pii.append(detector.detect(chunk_content))
+                continue
+            
+            chunk_end = offset + len(chunk_content)
+            chunk_pii = []
+            for entity in document_pii[bisect_right(ends, offset):]:
+                if entity.start_char >= chunk_end:
+                    break
+                start = max(entity.start_char, offset) - offset
+                end = min(entity.end_char, chunk_end) - offset
+                chunk_pii.append(entity._replace(
+                    text=chunk_content[start:end], start_char=start, end_char=end
+                ))
+            chunks_pii.append(chunk_pii)
+            self.chunk_pii_sliced += 1
+            search_from = offset + 1
+        
+        return chunks_pii
+
     def _generate_metadata(
         self,
         chunk_content: str,
         position: int,
-        total_chunks: int,
+        total_chunks: Optional[int],
         privacy_context: Dict[str, Any],
-        start_time: float
+        start_time: float,
+        chunk_pii: Optional[List[PIIEntity]] = None
     ) -> ChunkMetadata:
         """Generate comprehensive metadata for a chunk."""
         
         # Basic metrics
-        tokens = self.tokenizer.encode(chunk_content)
-        token_count = len(tokens)
+        token_count = self._count_tokens(chunk_content)
         char_count = len(chunk_content)
         
-        # Detect PII in this chunk
-        chunk_pii = self.privacy_guardian.pii_detector.detect(chunk_content)
+        # PII in this chunk, unless already sliced from the document
+        if chunk_pii is None:
+            chunk_pii = self.privacy_guardian.pii_detector.detect(chunk_content)
         
         # Calculate semantic coherence if possible
         coherence_score = self._calculate_coherence_score(chunk_content)
@@ -449,26 +715,82 @@ class IntelligentChunker:
             if len(sentences) <= 1:
                 return 1.0  # Single sentence has perfect coherence
             
-            # Calculate average pairwise similarity
-            embeddings = model.encode(sentences)
-            similarities = []
-            
-            for i in range(len(embeddings) - 1):
-                similarity = np.dot(embeddings[i], embeddings[i+1])
-                similarities.append(similarity)
-            
+            # Bound the embedding work per chunk: score evenly spaced adjacent pairs
+            limit = max(2, self.config.coherence_max_sentences)
+            if len(sentences) > limit:
+                step = len(sentences) / (limit // 2)
+                sentences = [
+                    sentence
+                    for k in range(limit // 2)
+                    for sentence in sentences[int(k * step):int(k * step) + 2]
+                ]
+                embeddings = self._embed_sentences(sentences)
+                # Only within-pair similarities; neighbouring pairs are not adjacent text
+                similarities = np.einsum('ij,ij->i', embeddings[0::2], embeddings[1::2])
+            else:
+                # Average similarity of adjacent sentences, reusing the chunking embeddings
+                similarities = self._adjacent_similarities(self._embed_sentences(sentences))
             return float(np.mean(similarities))
             
         except Exception as e:
             logger.warning(f"Coherence calculation failed: {e}")
             return 0.8  # Conservative default
 
+    def _count_tokens(self, text: str) -> int:
+        """Token count of text under the chunker's encoding, memoized by content hash."""
+        return self.token_counter.count(text, TOKEN_ENCODING)
+
     def _split_into_sentences(self, content: str) -> List[str]:
         """Split content into sentences for semantic analysis."""
+        return [content[start:end] for start, end, _ in self._sentence_spans(content)]
+
+    @staticmethod
+    def _sentence_spans(content: str) -> List[Tuple[int, int, int]]:
+        """
+        Offsets of each non-blank sentence as (start, end, closed_end).
+        
+        ``content[start:end]`` is the stripped sentence text and
+        ``closed_end`` also takes in the punctuation that ends it.
+        """
         # Simple sentence splitting - could be enhanced with NLTK/spaCy
-        import re
-        sentences = re.split(r'[.!?]+', content)
-        return [s.strip() for s in sentences if s.strip()]
+        spans = []
+        position = 0
+        for boundary in [*SENTENCE_BOUNDARY.finditer(content), None]:
+            piece_end = boundary.start() if boundary else len(content)
+            piece = content[position:piece_end]
+            stripped = piece.strip()
+            if stripped:
+                start = position + len(piece) - len(piece.lstrip())
+                end = start + len(stripped)
+                spans.append((start, end, boundary.end() if boundary else end))
+            position = boundary.end() if boundary else piece_end
+        return spans
+
+    def _embed_sentences(self, sentences: List[str]) -> np.ndarray:
+        """
+        Unit-length embeddings for sentences, one row per sentence.
+        
+        Sentences already embedded for the current document come from the
+        per-document cache; the rest are encoded in a single model call.
+        """
+        cache = self._sentence_embeddings if self._sentence_embeddings is not None else {}
+        missing = list(dict.fromkeys(s for s in sentences if s not in cache))
+        self.sentence_embedding_hits += len(sentences) - len(missing)
+        
+        if missing:
+            vectors = np.asarray(self._lazy_load_embedding_model().encode(missing), dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+            cache.update(zip(missing, vectors))
+            self.embedding_calls += 1
+            self.sentences_embedded += len(missing)
+        
+        return np.stack([cache[s] for s in sentences])
+
+    @staticmethod
+    def _adjacent_similarities(embeddings: np.ndarray) -> np.ndarray:
+        """Cosine similarity of each unit embedding with the next one."""
+        return np.einsum('ij,ij->i', embeddings[:-1], embeddings[1:])
 
     def _adjust_to_sentence_boundary(self, chunk_text: str, full_content: str) -> str:
         """Adjust chunk boundary to preserve sentence structure."""
@@ -518,7 +840,17 @@ class IntelligentChunker:
             "max_coherence_score": max(self.coherence_scores) if self.coherence_scores else 0,
             "coherence_std_dev": np.std(self.coherence_scores) if self.coherence_scores else 0,
             "strategy_used": self.config.strategy.value,
-            "pii_protection_enabled": self.config.enable_pii_protection
+            "pii_protection_enabled": self.config.enable_pii_protection,
+            "chunk_pii_sliced": self.chunk_pii_sliced,
+            "chunk_pii_redetected": self.chunk_pii_redetected,
+            "document_pii_scans": self.document_pii_scans,
+            "pii_detection_cache": self.privacy_guardian.pii_detector.cache.get_stats(),
+            "documents_chunked": self.documents_chunked,
+            "embedding_calls": self.embedding_calls,
+            "embedding_calls_per_document": self.embedding_calls / max(1, self.documents_chunked),
+            "sentences_embedded": self.sentences_embedded,
+            "sentence_embedding_hits": self.sentence_embedding_hits,
+            "token_count_cache": self.token_counter.get_stats()
         }
 
     def reset_performance_stats(self) -> None:
@@ -526,4 +858,11 @@ class IntelligentChunker:
         self.chunk_count = 0
         self.total_processing_time = 0.0
         self.coherence_scores = []
+        self.chunk_pii_sliced = 0
+        self.chunk_pii_redetected = 0
+        self.document_pii_scans = 0
+        self.documents_chunked = 0
+        self.embedding_calls = 0
+        self.sentences_embedded = 0
+        self.sentence_embedding_hits = 0
         logger.info("Performance statistics reset")
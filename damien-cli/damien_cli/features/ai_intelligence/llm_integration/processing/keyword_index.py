@@ -0,0 +1,144 @@
+"""
+BM25Index: Persistent inverted index for keyword search over email chunks
+
+Maintained next to the vector index so RAGEngine can answer KEYWORD queries
+on its own and retrieve an independent candidate list for HYBRID queries.
+The tokenizer keeps email addresses whole (and also indexes their local
+part and domain), and subject terms are weighted above body terms. Only the
+forward index (chunk -> term frequencies) is persisted; postings are rebuilt
+on load.
+"""
+
+import heapq
+import json
+import logging
+import math
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EMAIL_ADDRESS_PATTERN = re.compile(r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}")
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased terms; 'a.b@shop.com' yields itself, 'a.b', 'shop.com', 'a', 'b', 'shop', 'com'."""
+    if not text:
+        return []
+    text = text.lower()
+    tokens: List[str] = []
+    for match in EMAIL_ADDRESS_PATTERN.finditer(text):
+        address = match.group()
+        local, _, domain = address.partition("@")
+        tokens.extend((address, local, domain))
+    tokens.extend(WORD_PATTERN.findall(text))
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over chunks, keyed by vector store chunk id."""
+
+    VERSION = 1
+
+    def __init__(self, path: Optional[Path] = None, k1: float = 1.2, b: float = 0.75, subject_weight: int = 2):
+        self.path = Path(path) if path else None
+        self.k1 = k1
+        self.b = b
+        self.subject_weight = subject_weight
+        self.doc_terms: Dict[str, Dict[str, int]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_terms
+
+    def term_frequencies(self, content: str, subject: str = "", sender: str = "") -> Dict[str, int]:
+        frequencies: Dict[str, int] = {}
+        for weight, text in ((1, content), (self.subject_weight, subject), (1, sender)):
+            for token in tokenize(text):
+                frequencies[token] = frequencies.get(token, 0) + weight
+        return frequencies
+
+    def add(self, doc_id: str, content: str, subject: str = "", sender: str = "") -> None:
+        """Index a chunk, replacing any previous version with the same id."""
+        self._index(doc_id, self.term_frequencies(content, subject, sender))
+
+    def _index(self, doc_id: str, frequencies: Dict[str, int]) -> None:
+        self.remove(doc_id)
+        self.doc_terms[doc_id] = frequencies
+        length = sum(frequencies.values())
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[doc_id] = frequency
+
+    def remove(self, doc_id: str) -> None:
+        frequencies = self.doc_terms.pop(doc_id, None)
+        if frequencies is None:
+            return
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        for term in frequencies:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self.postings[term]
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Top ``limit`` (chunk id, BM25 score) pairs, best first."""
+        if not self.doc_terms or limit <= 0:
+            return []
+        doc_count = len(self.doc_terms)
+        average_length = self.total_length / doc_count if doc_count else 1.0
+
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1.0 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': self.VERSION, 'documents': self.doc_terms}, f)
+        tmp_path.replace(self.path)
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> 'BM25Index':
+        index = cls(path, **kwargs)
+        if not index.path.exists():
+            return index
+        try:
+            with open(index.path) as f:
+                data = json.load(f)
+            if data.get('version') != cls.VERSION:
+                logger.info("Keyword index version changed, starting a new index")
+                return index
+            for doc_id, frequencies in data.get('documents', {}).items():
+                index._index(doc_id, frequencies)
+        except Exception as e:
+            logger.warning(f"Failed to load keyword index from {path}: {e}")
+            return cls(path, **kwargs)
+        return index
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'documents': len(self.doc_terms),
+            'terms': len(self.postings),
+            'total_tokens': self.total_length,
+        }
@@ -0,0 +1,507 @@
+"""
+PreprocessPipeline: Shared privacy protection + chunking stage
+
+RAGEngine indexing and BatchProcessor both turn raw email content into
+protected, chunked text before doing anything else with it. This module runs
+that stage once for both of them:
+
+- Protection (PrivacyGuardian.protect_email_content) and chunking
+  (IntelligentChunker.chunk_document) run in a bounded process pool for
+  large batches, so the CPU-bound regex and tokenization work uses every
+  core; small batches, and any environment where the pool cannot start,
+  run serially in the calling process.
+- Results come back in input order, one PreprocessedEmail per input, and a
+  failure in one email is recorded on that email's result instead of
+  failing the batch.
+- Protection and chunking results are cached by content hash in an LRU
+  shared by every pipeline in the process, so an email indexed by RAGEngine
+  is not protected again when BatchProcessor analyses it (or vice versa).
+  Identical content appearing twice in one batch is processed once. Every
+  result's token map, cached or not, is filed with the receiving guardian's
+  tokenizer under that result's email id, so each guardian can detokenize
+  what it hands out and forget it per email.
+
+Chunks are returned as compact ChunkRecord values rather than the chunker's
+full ChunkMetadata, which keeps results cheap to send back from workers and
+to hold in the cache.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AbstractSet, Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from ..privacy.detector import PIIEntity
+from ..privacy.guardian import PrivacyGuardian, ProtectionLevel, register_pii_cache
+from ..privacy.tokenizer import ReversibleTokenizer
+
+if TYPE_CHECKING:
+    from .batch import EmailItem
+    from .chunker import IntelligentChunker
+
+logger = logging.getLogger(__name__)
+
+# (protected content, token map, detected PII) as returned by protect_email_content
+Protection = Tuple[str, Dict[str, str], List[PIIEntity]]
+
+
+@dataclass(frozen=True)
+class ChunkRecord:
+    """A chunk of protected email content and the metrics callers store with it.
+
+    ``chunk_id`` is the chunker's id, or empty when the content was kept as
+    a single unsplit chunk; callers derive their own ids from the email id
+    in that case.
+    """
+    content: str
+    position: int
+    token_count: int
+    character_count: int
+    coherence_score: float = 1.0
+    chunk_id: str = ""
+
+
+@dataclass
+class PreprocessedEmail:
+    """Protection and chunking output for one input email."""
+    email_id: str
+    content_hash: str
+    protected_content: str = ""
+    privacy_tokens: Dict[str, str] = field(default_factory=dict)
+    pii_entities: List[PIIEntity] = field(default_factory=list)
+    chunks: List[ChunkRecord] = field(default_factory=list)
+    processing_time_ms: float = 0.0
+    from_cache: bool = False
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class PreprocessCache:
+    """Thread-safe LRU of protection and chunking results keyed by content hash."""
+
+    def __init__(self, max_entries: int = 8192):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # PrivacyGuardian.forget_email() purges the raw PII held in protection entries
+        register_pii_cache(self)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def purge_values(self, values: AbstractSet[str]) -> int:
+        """Drop protection results whose token map or PII holds one of ``values``."""
+        with self._lock:
+            stale = [
+                key for key, value in self._entries.items()
+                if key[0] == 'protect' and (
+                    any(original in values for original in value[1].values())
+                    or any(entity.text in values for entity in value[2])
+                )
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+
+# Default cache shared by every pipeline in the process
+SHARED_PREPROCESS_CACHE = PreprocessCache()
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+_thread_state = threading.local()
+
+
+def _run_coroutine(coro):
+    """Run ``coro`` to completion from synchronous code."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Reuse one loop per thread rather than paying asyncio.run() per email
+        loop = getattr(_thread_state, 'loop', None)
+        if loop is None or loop.is_closed():
+            loop = _thread_state.loop = asyncio.new_event_loop()
+        return loop.run_until_complete(coro)
+    # Called from inside a running event loop: finish on a helper thread
+    with ThreadPoolExecutor(max_workers=1) as helper:
+        return helper.submit(_run_coroutine, coro).result()
+
+
+def chunk_content(
+    chunker: Optional["IntelligentChunker"],
+    content: str,
+    document_id: str,
+    chunk_min_chars: Optional[int] = None
+) -> List[ChunkRecord]:
+    """Split already-protected content into ChunkRecords.
+
+    Without a chunker, or when the content is shorter than
+    ``chunk_min_chars``, the whole content becomes a single chunk. Chunkers
+    with ``iter_chunks`` are streamed, so only the compact ChunkRecords of a
+    large body are kept rather than every chunk's full metadata.
+    """
+    if chunker is None or (chunk_min_chars is not None and len(content) <= chunk_min_chars):
+        return [ChunkRecord(
+            content=content,
+            position=0,
+            token_count=len(content.split()),
+            character_count=len(content)
+        )]
+
+    chunk = getattr(chunker, "iter_chunks", None) or chunker.chunk_document
+    records = []
+    for position, (chunk_text, metadata) in enumerate(chunk(
+        content,
+        document_id=document_id,
+        preserve_privacy=False  # Content is protected before it is chunked
+    )):
+        records.append(ChunkRecord(
+            content=chunk_text,
+            position=position,
+            token_count=metadata.token_count,
+            character_count=metadata.character_count,
+            coherence_score=metadata.semantic_coherence_score,
+            chunk_id=metadata.chunk_id
+        ))
+    return records
+
+
+def preprocess_email(
+    guardian: Optional[PrivacyGuardian],
+    chunker: Optional["IntelligentChunker"],
+    email_id: str,
+    content: str,
+    protection_level: ProtectionLevel,
+    chunk_min_chars: Optional[int] = None,
+    protection: Optional[Protection] = None
+) -> PreprocessedEmail:
+    """Protect and chunk one email, recording any failure on the result.
+
+    ``protection`` is a previously computed protection result to reuse, in
+    which case only chunking runs.
+    """
+    started = time.perf_counter()
+    result = PreprocessedEmail(email_id=email_id, content_hash=content_hash(content))
+    try:
+        if protection is None:
+            if guardian is not None:
+                protection = _run_coroutine(guardian.protect_email_content(
+                    email_id=email_id,
+                    content=content,
+                    protection_level=protection_level
+                ))
+            else:
+                protection = (content, {}, [])
+        result.protected_content, result.privacy_tokens, result.pii_entities = protection
+        result.chunks = chunk_content(chunker, result.protected_content, email_id, chunk_min_chars)
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+    result.processing_time_ms = (time.perf_counter() - started) * 1000
+    return result
+
+
+class PreprocessPipeline:
+    """Protect and chunk batches of emails with caching and a bounded process pool.
+
+    Args:
+        privacy_guardian: Guardian used for protection; None skips protection.
+        chunker: Chunker used for splitting; None keeps each email whole.
+        protection_level: Level passed to protect_email_content.
+        max_workers: Pool size; defaults to the CPU count. 1 disables the pool.
+        parallel_min_emails: Smallest number of uncached emails worth
+            sending to the pool; smaller batches run serially.
+        chunk_min_chars: Content at or below this length is not chunked.
+        cache: Result cache; defaults to the process-wide shared cache.
+
+    The guardian and chunker are copied into each pool worker once, when
+    the worker starts, so they must be picklable; if the pool cannot be
+    used the pipeline logs a warning and runs serially from then on. PII
+    tokens of every result, including ones minted in workers or by another
+    pipeline's guardian and served from the cache, are registered with this
+    pipeline's guardian so it can detokenize them.
+    """
+
+    def __init__(
+        self,
+        privacy_guardian: Optional[PrivacyGuardian] = None,
+        chunker: Optional["IntelligentChunker"] = None,
+        protection_level: ProtectionLevel = ProtectionLevel.STANDARD,
+        max_workers: Optional[int] = None,
+        parallel_min_emails: int = 32,
+        chunk_min_chars: Optional[int] = None,
+        cache: Optional[PreprocessCache] = None
+    ):
+        self._privacy_guardian = privacy_guardian
+        self._chunker = chunker
+        self.protection_level = protection_level
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.parallel_min_emails = parallel_min_emails
+        self.chunk_min_chars = chunk_min_chars
+        self.cache = cache if cache is not None else SHARED_PREPROCESS_CACHE
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._pool_unavailable = False
+
+        self.emails_processed = 0
+        self.emails_from_cache = 0
+        self.pool_batches = 0
+        self.serial_batches = 0
+        self.failed_emails = 0
+
+    @property
+    def privacy_guardian(self) -> Optional[PrivacyGuardian]:
+        return self._privacy_guardian
+
+    @privacy_guardian.setter
+    def privacy_guardian(self, guardian: Optional[PrivacyGuardian]) -> None:
+        # Workers hold copies of the old guardian
+        self.close()
+        self._privacy_guardian = guardian
+
+    @property
+    def chunker(self) -> Optional["IntelligentChunker"]:
+        return self._chunker
+
+    @chunker.setter
+    def chunker(self, chunker: Optional["IntelligentChunker"]) -> None:
+        self.close()
+        self._chunker = chunker
+
+    def _protection_key(self, digest: str) -> Hashable:
+        if self.privacy_guardian is None:
+            guardian_kind: Hashable = None
+        else:
+            # Guardians detecting with the same rules share entries across pipelines
+            detector = getattr(self.privacy_guardian, 'pii_detector', None)
+            guardian_kind = (type(self.privacy_guardian).__name__, getattr(detector, 'fingerprint', None))
+        return ('protect', guardian_kind, self.protection_level.value, digest)
+
+    def _chunks_key(self, protected_digest: str) -> Hashable:
+        if self.chunker is None:
+            chunker_kind: Hashable = None
+        else:
+            # Chunkers with equal configs share entries across pipelines
+            config = getattr(self.chunker, 'config', None)
+            chunker_kind = (type(self.chunker).__name__, repr(config) if config is not None else id(self.chunker))
+        return ('chunks', chunker_kind, self.chunk_min_chars, protected_digest)
+
+    def process(self, emails: Sequence["EmailItem"]) -> List[PreprocessedEmail]:
+        """Protect and chunk ``emails``, returning one result per email in input order."""
+        results: List[Optional[PreprocessedEmail]] = [None] * len(emails)
+        # Uncached content hash -> (positions sharing it, reusable protection)
+        pending: "OrderedDict[str, Tuple[List[int], Optional[Protection]]]" = OrderedDict()
+
+        for position, email in enumerate(emails):
+            digest = content_hash(email.content)
+            if digest in pending:
+                pending[digest][0].append(position)
+                continue
+            protection = self.cache.get(self._protection_key(digest))
+            chunks = None
+            if protection is not None:
+                chunks = self.cache.get(self._chunks_key(content_hash(protection[0])))
+            if chunks is not None:
+                results[position] = PreprocessedEmail(
+                    email_id=email.email_id,
+                    content_hash=digest,
+                    protected_content=protection[0],
+                    privacy_tokens=protection[1],
+                    pii_entities=protection[2],
+                    chunks=chunks,
+                    from_cache=True
+                )
+                self.emails_from_cache += 1
+            else:
+                pending[digest] = ([position], protection)
+
+        if pending:
+            tasks = [
+                (emails[positions[0]].email_id, emails[positions[0]].content, protection)
+                for positions, protection in pending.values()
+            ]
+            computed = None
+            if self.max_workers > 1 and len(tasks) >= self.parallel_min_emails:
+                computed = self._process_in_pool(tasks)
+            if computed is None:
+                self.serial_batches += 1
+                computed = [
+                    preprocess_email(
+                        self.privacy_guardian, self.chunker, email_id, content,
+                        self.protection_level, self.chunk_min_chars, protection
+                    )
+                    for email_id, content, protection in tasks
+                ]
+
+            for (digest, (positions, _)), outcome in zip(pending.items(), computed):
+                if outcome.success:
+                    self._store(digest, outcome)
+                else:
+                    self.failed_emails += len(positions)
+                for shared_position in positions:
+                    email = emails[shared_position]
+                    results[shared_position] = outcome if email.email_id == outcome.email_id else PreprocessedEmail(
+                        email_id=email.email_id,
+                        content_hash=outcome.content_hash,
+                        protected_content=outcome.protected_content,
+                        privacy_tokens=outcome.privacy_tokens,
+                        pii_entities=outcome.pii_entities,
+                        chunks=outcome.chunks,
+                        processing_time_ms=outcome.processing_time_ms,
+                        from_cache=True,
+                        error=outcome.error
+                    )
+
+        self._register_tokens(results)
+        self.emails_processed += len(emails)
+        return results
+
+    async def aprocess(self, emails: Sequence["EmailItem"]) -> List[PreprocessedEmail]:
+        """process() without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.process, emails)
+
+    def _store(self, digest: str, outcome: PreprocessedEmail) -> None:
+        protection = (outcome.protected_content, outcome.privacy_tokens, outcome.pii_entities)
+        self.cache.put(self._protection_key(digest), protection)
+        self.cache.put(self._chunks_key(content_hash(outcome.protected_content)), outcome.chunks)
+
+    def _register_tokens(self, results: List[PreprocessedEmail]) -> None:
+        """File every result's tokens with this guardian's tokenizer, under the result's email id.
+
+        Cached results and shared-content duplicates carry tokens minted for
+        another email, possibly by another guardian or a worker process.
+        """
+        tokenizer = getattr(self.privacy_guardian, 'tokenizer', None)
+        if not isinstance(tokenizer, ReversibleTokenizer):
+            return
+        for result in results:
+            if result.privacy_tokens:
+                tokenizer.remember(result.privacy_tokens, namespace=result.email_id)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # The guardian and chunker reach each worker once, through the
+                # initializer (inherited without copying under fork)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_preprocess_worker,
+                    initargs=(self.privacy_guardian, self.chunker, self.protection_level, self.chunk_min_chars)
+                )
+            return self._pool
+
+    def _process_in_pool(self, tasks: List[Tuple[str, str, Optional[Protection]]]) -> Optional[List[PreprocessedEmail]]:
+        """Run tasks across the pool; returns None if the pool is unavailable"""
+        if self._pool_unavailable:
+            return None
+
+        # A few slices per worker balances load without per-email IPC
+        slice_size = max(1, math.ceil(len(tasks) / (self.max_workers * 4)))
+        try:
+            pool = self._get_pool()
+            futures = [
+                pool.submit(_preprocess_in_worker, tasks[start:start + slice_size])
+                for start in range(0, len(tasks), slice_size)
+            ]
+            computed = []
+            for future in futures:
+                computed.extend(future.result())
+            self.pool_batches += 1
+            return computed
+        except Exception as e:
+            logger.warning(f"Parallel preprocessing unavailable, running serially: {str(e)}")
+            self._pool_unavailable = True
+            self.close()
+            return None
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'emails_processed': self.emails_processed,
+            'emails_from_cache': self.emails_from_cache,
+            'failed_emails': self.failed_emails,
+            'pool_batches': self.pool_batches,
+            'serial_batches': self.serial_batches,
+            'max_workers': self.max_workers,
+            'pool_available': not self._pool_unavailable,
+            'cache': self.cache.get_stats()
+        }
+
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_preprocess_worker(guardian, chunker, protection_level, chunk_min_chars) -> None:
+    # A loop inherited from the forking thread belongs to the parent
+    _thread_state.loop = None
+    _worker_state.update(
+        guardian=guardian,
+        chunker=chunker,
+        protection_level=protection_level,
+        chunk_min_chars=chunk_min_chars
+    )
+
+
+def _preprocess_in_worker(tasks: List[Tuple[str, str, Optional[Protection]]]) -> List[PreprocessedEmail]:
+    return [
+        preprocess_email(
+            _worker_state['guardian'], _worker_state['chunker'], email_id, content,
+            _worker_state['protection_level'], _worker_state['chunk_min_chars'], protection
+        )
+        for email_id, content, protection in tasks
+    ]
@@ -8,31 +8,30 @@ Supports multiple vector database backends with privacy-safe storage and sub-200
 import logging
 import time
 import asyncio
+import importlib.util
 import hashlib
 import uuid
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterable, Optional, Protocol, Tuple
+from datetime import date, datetime, timezone
+from email.utils import parseaddr, parsedate_to_datetime
+from pathlib import Path
 import numpy as np
 import json
 
-# Vector database imports with graceful fallbacks
-try:
-    import chromadb
-    from chromadb.config import Settings
-    CHROMADB_AVAILABLE = True
-except ImportError:
-    CHROMADB_AVAILABLE = False
+# Heavy optional backends are only located here; chromadb is imported on
+# connect and sentence-transformers (with torch) on the warm-up thread, so
+# importing this module stays fast
+CHROMADB_AVAILABLE = importlib.util.find_spec("chromadb") is not None
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
 
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-
-from .chunker import IntelligentChunker, ChunkMetadata
+from .chunker import IntelligentChunker
+from .vector_index import NumpyVectorIndex
+from .keyword_index import BM25Index
 from .batch import EmailItem
+from .preprocess import PreprocessPipeline
 from ..privacy.guardian import PrivacyGuardian, ProtectionLevel
 
 logger = logging.getLogger(__name__)
@@ -41,6 +40,7 @@ logger = logging.getLogger(__name__)
 class VectorStore(Enum):
     """Available vector database backends for RAG operations."""
     CHROMA = "chroma"
+    NUMPY = "numpy"
     PINECONE = "pinecone"
     WEAVIATE = "weaviate"
 
@@ -52,6 +52,14 @@ class SearchType(Enum):
     HYBRID = "hybrid"
 
 
+class EngineState(Enum):
+    """Readiness of a RAGEngine, as reported by health checks."""
+    COLD = "cold"          # Nothing loaded yet
+    WARMING = "warming"    # Index opening / embedding model loading in the background
+    READY = "ready"        # Index open and embedding model loaded
+    FAILED = "failed"      # Last warm-up failed; the next initialize() retries
+
+
 class IndexStatus(Enum):
     """Status tracking for indexing operations."""
     PENDING = "pending"
@@ -69,12 +77,34 @@ class RAGConfig:
     vector_dimension: int = 384
     similarity_threshold: float = 0.3  # Lower threshold for better recall in testing
     adaptive_threshold: bool = True  # Enable adaptive threshold adjustment
-    hybrid_weight_vector: float = 0.7  # Weight for vector similarity in hybrid search
-    hybrid_weight_keyword: float = 0.3  # Weight for keyword matching in hybrid search
+    hybrid_weight_vector: float = 0.7  # Weight of the vector ranking in hybrid fusion
+    hybrid_weight_keyword: float = 0.3  # Weight of the BM25 ranking in hybrid fusion
+    rrf_k: int = 60  # Reciprocal-rank fusion constant
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
     max_results: int = 10
     enable_caching: bool = True
     cache_ttl_seconds: int = 3600
     chroma_persist_directory: str = "./chroma_db"
+    manifest_path: Optional[str] = None  # Defaults to index_manifest.json in the active backend's directory
+    keyword_index_path: Optional[str] = None  # Defaults to keyword_index.json beside the manifest
+    numpy_persist_directory: str = "./numpy_vector_db"
+    numpy_index_mode: str = "exact"  # "exact" or "ivf" (approximate)
+    numpy_ivf_lists: int = 0  # 0 picks sqrt(number of chunks)
+    numpy_ivf_probes: int = 8  # Lists scanned per query in IVF mode
+    numpy_quantization: str = "none"  # "float16" or "int8" to shrink stored vectors 2x/4x
+    embedding_batch_size: int = 128  # Chunks per encoder forward pass during indexing
+    index_insert_batch_size: int = 1000  # Chunks per vector store insert call
+    preprocess_workers: int = 4  # Processes for protection and chunking during indexing
+    embedding_cache_size: int = 1024  # Query embeddings kept in the LRU cache
+    result_cache_size: int = 512  # Search result sets kept in the TTL cache
+    
+    @property
+    def persist_directory(self) -> str:
+        """Directory of the active vector store backend."""
+        if self.vector_store == VectorStore.NUMPY:
+            return self.numpy_persist_directory
+        return self.chroma_persist_directory
 
 
 @dataclass
@@ -96,6 +126,15 @@ class SearchResult:
         return (self.similarity_score * 0.7 + self.confidence * 0.3)
 
 
+@dataclass
+class QueryResults:
+    """Results for one query of a RAGEngine.search_many call."""
+    query: str
+    results: List[SearchResult] = field(default_factory=list)
+    processing_time_ms: float = 0.0  # Includes this query's share of the batched encode and store request
+    from_cache: bool = False
+
+
 @dataclass
 class IndexResult:
     """Result from batch indexing operations."""
@@ -126,6 +165,200 @@ class CacheEntry:
     hit_count: int = 0
 
 
+@dataclass
+class ManifestEntry:
+    """What the index currently holds for one email."""
+    content_hash: str
+    chunk_count: int
+    model_id: str
+    indexed_at: str
+
+
+class IndexManifest:
+    """Persistent record of indexed emails, used to make indexing idempotent."""
+    
+    VERSION = 1
+    
+    def __init__(self, path: Optional[Path] = None, backend: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self.backend = backend
+        self.entries: Dict[str, ManifestEntry] = {}
+        self.last_sync_timestamp: Optional[float] = None
+    
+    @staticmethod
+    def content_hash(email: EmailItem) -> str:
+        """Hash of everything that ends up in the index for an email."""
+        hasher = hashlib.sha256(email.content.encode('utf-8'))
+        for key in ("subject", "from", "date", "labels"):
+            hasher.update(b"\x1f" + str(email.metadata.get(key, "")).encode('utf-8'))
+        return hasher.hexdigest()
+    
+    def is_current(self, email_id: str, content_hash: str, model_id: str) -> bool:
+        entry = self.entries.get(email_id)
+        return entry is not None and entry.content_hash == content_hash and entry.model_id == model_id
+    
+    def record(self, email_id: str, content_hash: str, chunk_count: int, model_id: str) -> None:
+        self.entries[email_id] = ManifestEntry(
+            content_hash=content_hash,
+            chunk_count=chunk_count,
+            model_id=model_id,
+            indexed_at=datetime.now(timezone.utc).isoformat()
+        )
+    
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': self.VERSION,
+                'backend': self.backend,
+                'last_sync_timestamp': self.last_sync_timestamp,
+                'entries': {email_id: entry.__dict__ for email_id, entry in self.entries.items()}
+            }, f)
+        tmp_path.replace(self.path)
+    
+    @classmethod
+    def load(cls, path: Path, backend: Optional[str] = None) -> 'IndexManifest':
+        manifest = cls(path, backend)
+        if not manifest.path.exists():
+            return manifest
+        try:
+            with open(manifest.path) as f:
+                data = json.load(f)
+            if data.get('version') != cls.VERSION:
+                logger.info("Index manifest version changed, starting a new manifest")
+                return manifest
+            if backend and data.get('backend') != backend:
+                # Entries describe another vector store's contents
+                logger.info(f"Index manifest was written for backend {data.get('backend')!r}, starting a new manifest")
+                return manifest
+            manifest.last_sync_timestamp = data.get('last_sync_timestamp')
+            manifest.entries = {
+                email_id: ManifestEntry(**entry) for email_id, entry in data.get('entries', {}).items()
+            }
+        except Exception as e:
+            logger.warning(f"Failed to load index manifest from {path}: {e}")
+        return manifest
+
+
+class MessageStore(Protocol):
+    """Source of emails for RAGEngine.sync_index."""
+    
+    def fetch_since(self, since_timestamp: Optional[float]) -> Iterable[EmailItem]:
+        """Yield emails received or modified after ``since_timestamp`` (all if None)."""
+        ...
+
+
+def to_timestamp(value: Any) -> Optional[float]:
+    """Epoch seconds from a datetime, date, number, ISO string or RFC 2822 date."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        moment = value
+    elif isinstance(value, date):
+        moment = datetime(value.year, value.month, value.day)
+    else:
+        text = str(value).strip()
+        try:
+            moment = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            try:
+                moment = parsedate_to_datetime(text)
+            except (TypeError, ValueError):
+                return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _is_date_only(value: Any) -> bool:
+    """Whether a filter value names a calendar day rather than a moment."""
+    if isinstance(value, datetime):
+        return False
+    if isinstance(value, date):
+        return True
+    if isinstance(value, str):
+        try:
+            date.fromisoformat(value.strip())
+            return True
+        except ValueError:
+            return False
+    return False
+
+
+def sender_address(sender: str) -> str:
+    """Lower-cased email address from a From header such as 'Name <a@b.com>'."""
+    return parseaddr(sender or "")[1].lower()
+
+
+def filter_metadata(email: EmailItem) -> Dict[str, Any]:
+    """Indexed metadata columns that search filters are evaluated against."""
+    columns: Dict[str, Any] = {}
+    timestamp = to_timestamp(email.metadata.get("date"))
+    if timestamp is not None:
+        columns["timestamp"] = timestamp
+    address = sender_address(email.metadata.get("from", ""))
+    if address:
+        columns["sender_address"] = address
+        columns["sender_domain"] = address.rpartition("@")[2]
+    labels = email.metadata.get("labels") or []
+    if isinstance(labels, str):
+        labels = [labels]
+    for label in labels:
+        columns[f"label_{label}"] = True
+    return columns
+
+
+def build_metadata_filter(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Translate RAGEngine search filters into a Chroma-style ``where`` clause.
+    
+    Recognised keys are ``sender`` (address or list of addresses),
+    ``sender_domain``, ``date_from`` / ``date_to`` (anything to_timestamp
+    accepts, inclusive; a date-only ``date_to`` covers that whole day) and
+    ``labels`` (all must be present). Any other key
+    is matched for equality against the chunk metadata of the same name.
+    """
+    if not filters:
+        return None
+    
+    clauses: List[Dict[str, Any]] = []
+    for key, value in filters.items():
+        if value is None:
+            continue
+        if key in ("sender", "sender_domain"):
+            column = "sender_address" if key == "sender" else "sender_domain"
+            values = [value] if isinstance(value, str) else list(value)
+            if key == "sender":
+                values = [sender_address(v) or v.lower() for v in values]
+            else:
+                values = [v.lower() for v in values]
+            clauses.append({column: values[0]} if len(values) == 1 else {column: {"$in": values}})
+        elif key in ("date_from", "date_to"):
+            timestamp = to_timestamp(value)
+            if timestamp is None:
+                raise ValueError(f"Unrecognised {key} filter value: {value!r}")
+            if key == "date_from":
+                clauses.append({"timestamp": {"$gte": timestamp}})
+            elif _is_date_only(value):
+                # Up to, not including, midnight at the start of the next day
+                clauses.append({"timestamp": {"$lt": timestamp + 86400}})
+            else:
+                clauses.append({"timestamp": {"$lte": timestamp}})
+        elif key == "labels":
+            labels = [value] if isinstance(value, str) else list(value)
+            clauses.extend({f"label_{label}": True} for label in labels)
+        else:
+            clauses.append({key: value})
+    
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
 class VectorDatabase:
     """Abstract base class for vector database implementations."""
     
@@ -145,6 +378,10 @@ class VectorDatabase:
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
         raise NotImplementedError("Subclasses must implement get_stats method")
+    
+    def persist(self) -> None:
+        """Make completed writes durable; a no-op for self-persisting backends."""
+        return None
 
 
 class ChromaDatabase(VectorDatabase):
@@ -156,13 +393,18 @@ class ChromaDatabase(VectorDatabase):
             raise ImportError("ChromaDB not available. Install with: pip install chromadb")
     
     async def connect(self) -> bool:
-        """Connect to ChromaDB."""
+        """Connect to ChromaDB, reopening the collection persisted on disk."""
         try:
-            settings = Settings(
-                persist_directory=self.config.chroma_persist_directory,
-                anonymized_telemetry=False
-            )
-            self.client = chromadb.Client(settings)
+            import chromadb
+            from chromadb.config import Settings
+            
+            settings = Settings(anonymized_telemetry=False)
+            if hasattr(chromadb, "PersistentClient"):
+                self.client = chromadb.PersistentClient(path=self.config.chroma_persist_directory, settings=settings)
+            else:
+                # Clients before 0.4 persist through Settings
+                settings.persist_directory = self.config.chroma_persist_directory
+                self.client = chromadb.Client(settings)
             
             # Create or get collection
             self.collection = self.client.get_or_create_collection(
@@ -198,6 +440,74 @@ class ChromaDatabase(VectorDatabase):
             return {'error': str(e)}
 
 
+class NumpyVectorDatabase(VectorDatabase):
+    """In-process NumPy backend for single-user indexes without ChromaDB."""
+    
+    def __init__(self, config: RAGConfig):
+        super().__init__(config)
+        self.collection: Optional[NumpyVectorIndex] = None
+    
+    async def connect(self) -> bool:
+        """Open (or create) the memory-mapped index."""
+        try:
+            self.collection = NumpyVectorIndex(
+                directory=self.config.numpy_persist_directory,
+                mode=self.config.numpy_index_mode,
+                ivf_lists=self.config.numpy_ivf_lists,
+                ivf_probes=self.config.numpy_ivf_probes,
+                quantization=self.config.numpy_quantization
+            )
+            logger.info(f"Opened NumPy vector index at {self.config.numpy_persist_directory} "
+                        f"({self.collection.count()} chunks)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to open NumPy vector index: {e}")
+            return False
+    
+    async def disconnect(self) -> None:
+        """Persist and close the index."""
+        if self.collection:
+            self.persist()
+            self.collection = None
+            logger.info("Closed NumPy vector index")
+    
+    def persist(self) -> None:
+        if self.collection:
+            self.collection.persist()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get NumPy index statistics."""
+        try:
+            return {
+                **self.collection.get_stats(),
+                'database_type': 'numpy',
+                'collection_name': self.collection_name,
+                'persist_directory': self.config.numpy_persist_directory
+            }
+        except Exception as e:
+            logger.error(f"Failed to get NumPy index stats: {e}")
+            return {'error': str(e)}
+
+
+def load_embedding_model(model_name: str) -> Tuple[Any, int]:
+    """Load a SentenceTransformer and return it with its embedding dimension.
+    
+    The dimension comes from the model's own configuration rather than a
+    trial encode; the encode is only a fallback for models that do not
+    report one.
+    """
+    from sentence_transformers import SentenceTransformer
+    
+    model = SentenceTransformer(model_name)
+    # get_embedding_dimension replaces get_sentence_embedding_dimension in newer releases
+    get_dimension = getattr(model, "get_embedding_dimension", None) or model.get_sentence_embedding_dimension
+    dimension = get_dimension()
+    if not dimension:
+        dimension = len(model.encode(["test"])[0])
+    return model, int(dimension)
+
+
 class RAGEngine:
     """Enterprise-grade RAG engine for semantic email search and retrieval."""
     
@@ -205,12 +515,21 @@ class RAGEngine:
         self,
         config: Optional[RAGConfig] = None,
         privacy_guardian: Optional[PrivacyGuardian] = None,
-        chunker: Optional[IntelligentChunker] = None
+        chunker: Optional[IntelligentChunker] = None,
+        preprocess_pipeline: Optional[PreprocessPipeline] = None
     ):
         """Initialize the RAG engine with configuration and dependencies."""
         self.config = config or RAGConfig()
         self.privacy_guardian = privacy_guardian or PrivacyGuardian()
-        self.chunker = chunker
+        
+        # Protection + chunking stage; results are cached by content hash
+        # process-wide, so BatchProcessor does not redo emails indexed here
+        self.preprocess_pipeline = preprocess_pipeline or PreprocessPipeline(
+            privacy_guardian=self.privacy_guardian,
+            chunker=chunker,
+            protection_level=ProtectionLevel.STANDARD,
+            max_workers=self.config.preprocess_workers
+        )
         
         # Initialize components
         self.embedding_model = None
@@ -218,34 +537,129 @@ class RAGEngine:
         self.vector_db = None
         self._connected = False
         
+        # Background warm-up (see start_warmup); timings are in milliseconds
+        self._warmup_task: Optional["asyncio.Task[bool]"] = None
+        self.warmup_error: Optional[str] = None
+        self.warmup_timings: Dict[str, float] = {}
+        
         # Performance tracking
         self.search_count = 0
         self.index_count = 0
         self.total_search_time = 0.0
         self.total_index_time = 0.0
         
+        # Query caches: query text -> embedding (LRU), and search key -> results
+        # (TTL). Result keys include index_generation, which every index write
+        # bumps, so cached results never outlive the data they were built from.
+        self.index_generation = 0
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._result_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.embedding_cache_hits = 0
+        self.embedding_cache_misses = 0
+        
+        # Unsaved index writes; sync_index defers saving to the end of the sync
+        self._persist_deferred = False
+        self._index_dirty = False
+        self._manifest_dirty = False
+        
+        # Record of what is already indexed, for skip/upsert/delete decisions
+        manifest_path = self.config.manifest_path or str(
+            Path(self.config.persist_directory) / "index_manifest.json"
+        )
+        self.manifest = IndexManifest.load(Path(manifest_path), backend=self.config.vector_store.value)
+        
+        # BM25 index over the same chunks, for keyword and hybrid retrieval
+        keyword_index_path = Path(self.config.keyword_index_path or Path(manifest_path).parent / "keyword_index.json")
+        self.keyword_index = BM25Index.load(keyword_index_path, k1=self.config.bm25_k1, b=self.config.bm25_b)
+        if not len(self.keyword_index) and any(entry.chunk_count for entry in self.manifest.entries.values()):
+            # Missing (indexed before keyword search existed), unreadable or
+            # from another version: re-index everything once
+            logger.info("No usable keyword index for existing vector index, scheduling a full re-index")
+            self.manifest.entries.clear()
+        
         logger.info(f"RAGEngine initialized with {self.config.vector_store.value} backend")
     
+    @property
+    def chunker(self) -> Optional[IntelligentChunker]:
+        return self.preprocess_pipeline.chunker
+    
+    @chunker.setter
+    def chunker(self, chunker: Optional[IntelligentChunker]) -> None:
+        self.preprocess_pipeline.chunker = chunker
+    
+    @property
+    def state(self) -> EngineState:
+        if self._connected and self._embedding_model_loaded:
+            return EngineState.READY
+        if self._warmup_task is not None and not self._warmup_task.done():
+            return EngineState.WARMING
+        if self.warmup_error:
+            return EngineState.FAILED
+        return EngineState.COLD
+    
+    @property
+    def readiness(self) -> Dict[str, Any]:
+        """Readiness summary for health endpoints."""
+        return {
+            'state': self.state.value,
+            'index_open': self._connected,
+            'embedding_model_loaded': self._embedding_model_loaded,
+            'vector_dimension': self.config.vector_dimension if self._embedding_model_loaded else None,
+            'warmup_timings_ms': dict(self.warmup_timings),
+            'error': self.warmup_error
+        }
+    
+    def start_warmup(self) -> "asyncio.Task[bool]":
+        """Open the index and load the embedding model in the background.
+        
+        Returns immediately with the warm-up task; calling it again while a
+        warm-up is running (or after one succeeded) returns the same task.
+        The model loads on a worker thread, so the event loop keeps serving
+        requests meanwhile. Searches and indexing wait for the warm-up to
+        finish, except keyword searches, which only need the index.
+        """
+        task = self._warmup_task
+        if task is None or (task.done() and (task.cancelled() or not task.result())):
+            self._warmup_task = asyncio.ensure_future(self._warm_up())
+        return self._warmup_task
+    
     async def initialize(self) -> bool:
         """Initialize the RAG engine with all dependencies."""
+        return await asyncio.shield(self.start_warmup())
+    
+    async def _warm_up(self) -> bool:
+        started = time.perf_counter()
+        self.warmup_error = None
         try:
-            # Load embedding model
-            if not await self._load_embedding_model():
-                return False
+            # The index opens first: it is memory-mapped (or persisted by
+            # Chroma) and takes milliseconds, while the model takes seconds
+            if not self._connected and not await self._initialize_vector_db():
+                raise RuntimeError("Vector database unavailable")
+            self.warmup_timings['index_open_ms'] = round((time.perf_counter() - started) * 1000, 2)
             
-            # Initialize vector database
-            if not await self._initialize_vector_db():
-                return False
+            model_started = time.perf_counter()
+            if not await self._load_embedding_model():
+                raise RuntimeError("Embedding model unavailable")
+            self.warmup_timings['model_load_ms'] = round((time.perf_counter() - model_started) * 1000, 2)
+            self.warmup_timings['total_ms'] = round((time.perf_counter() - started) * 1000, 2)
             
-            logger.info("RAG engine successfully initialized")
+            logger.info(f"RAG engine successfully initialized in {self.warmup_timings['total_ms']:.0f}ms")
             return True
             
         except Exception as e:
             logger.error(f"Failed to initialize RAG engine: {e}")
+            self.warmup_error = str(e)
             return False
     
+    async def _wait_for_warmup(self) -> None:
+        task = self._warmup_task
+        if task is not None and not task.done():
+            await asyncio.shield(task)
+    
     async def _load_embedding_model(self) -> bool:
-        """Load the sentence transformer model for embeddings."""
+        """Load the sentence transformer model for embeddings on a worker thread."""
         if self._embedding_model_loaded:
             return True
         
@@ -255,13 +669,11 @@ class RAGEngine:
                 return False
             
             logger.info(f"Loading embedding model: {self.config.embedding_model}")
-            self.embedding_model = SentenceTransformer(self.config.embedding_model)
+            self.embedding_model, self.config.vector_dimension = await asyncio.to_thread(
+                load_embedding_model, self.config.embedding_model
+            )
             self._embedding_model_loaded = True
             
-            # Update vector dimension based on model
-            sample_embedding = self.embedding_model.encode(["test"])
-            self.config.vector_dimension = len(sample_embedding[0])
-            
             logger.info(f"Embedding model loaded successfully (dimension: {self.config.vector_dimension})")
             return True
             
@@ -271,14 +683,23 @@ class RAGEngine:
     
     async def _initialize_vector_db(self) -> bool:
         """Initialize the vector database backend."""
+        if self._connected:
+            return True
+        
         try:
             if self.config.vector_store == VectorStore.CHROMA:
                 self.vector_db = ChromaDatabase(self.config)
+            elif self.config.vector_store == VectorStore.NUMPY:
+                self.vector_db = NumpyVectorDatabase(self.config)
             else:
                 raise ValueError(f"Vector store {self.config.vector_store} not yet implemented")
             
             # Connect to database
             self._connected = await self.vector_db.connect()
+            if self._connected and self.manifest.entries and self.vector_db.collection.count() == 0:
+                # The store was wiped or moved: the manifest no longer describes it
+                logger.info("Vector store is empty but the manifest is not, scheduling a full re-index")
+                self.manifest.entries.clear()
             return self._connected
             
         except Exception as e:
@@ -286,7 +707,16 @@ class RAGEngine:
             return False
     
     async def index_email_batch(self, emails: List[EmailItem]) -> IndexResult:
-        """Index a batch of emails for semantic search."""
+        """Index a batch of emails for semantic search.
+        
+        Runs as three stages over the whole batch: privacy protection and
+        chunking of every email, encoding of all chunks in large
+        length-sorted batches, then vector store upserts in sized batches.
+        Emails whose content and embedding model match the manifest are
+        skipped; changed emails are upserted and their orphaned chunks
+        deleted, so re-running over the same mail is idempotent.
+        """
+        await self._wait_for_warmup()
         if not self._connected:
             raise RuntimeError("RAG engine not initialized. Call initialize() first.")
         
@@ -299,94 +729,113 @@ class RAGEngine:
             if not self._embedding_model_loaded:
                 raise RuntimeError("Embedding model not loaded. Call initialize() first.")
             
-            # Process each email with chunking and privacy protection
-            all_chunks = []
-            all_embeddings = []
-            all_metadatas = []
-            all_ids = []
-            indexed_chunks = 0
+            # Skip emails the manifest says are already indexed as-is; a
+            # repeated email_id within the batch keeps its last version
+            model_id = self.config.embedding_model
+            latest = {email.email_id: (email_idx, email) for email_idx, email in enumerate(emails)}
+            pending: List[Tuple[int, EmailItem]] = []
+            content_hashes: Dict[str, str] = {}
+            skipped_emails = 0
+            for email_idx, email in sorted(latest.values(), key=lambda item: item[0]):
+                content_hash = IndexManifest.content_hash(email)
+                if self.manifest.is_current(email.email_id, content_hash, model_id):
+                    skipped_emails += 1
+                    continue
+                content_hashes[email.email_id] = content_hash
+                pending.append((email_idx, email))
+            
+            # Stage 1: privacy protection and chunking for every email
+            stage_start = time.time()
+            prepared = await self._prepare_emails_for_indexing(pending)
+            all_chunks: List[str] = []
+            all_metadatas: List[Dict[str, Any]] = []
+            all_ids: List[str] = []
+            chunk_counts: Dict[str, int] = {}
             failed_chunks = 0
+            for (_, email), outcome in zip(pending, prepared):
+                if isinstance(outcome, Exception):
+                    logger.error(f"Failed to process email {email.email_id}: {outcome}")
+                    failed_chunks += 1
+                    continue
+                chunk_counts[email.email_id] = len(outcome)
+                for chunk_id, chunk_content, chunk_metadata in outcome:
+                    all_ids.append(chunk_id)
+                    all_chunks.append(chunk_content)
+                    all_metadatas.append(chunk_metadata)
+            preprocess_seconds = time.time() - stage_start
+            
+            # Stage 2: encode every chunk in large batches
+            stage_start = time.time()
+            all_embeddings = self._encode_chunks(all_chunks) if all_chunks else None
+            encode_seconds = time.time() - stage_start
             
-            for email_idx, email in enumerate(emails):
+            # Stage 3: upsert into the vector store in sized batches
+            stage_start = time.time()
+            indexed_chunks = 0
+            failed_email_ids = set()
+            insert_batch_size = max(1, self.config.index_insert_batch_size)
+            for offset in range(0, len(all_chunks), insert_batch_size):
+                batch_end = offset + insert_batch_size
                 try:
-                    # Apply privacy protection to email content
-                    if self.privacy_guardian:
-                        protected_content, privacy_tokens, pii_entities = await self.privacy_guardian.protect_email_content(
-                            email_id=email.email_id,
-                            content=email.content,
-                            protection_level=ProtectionLevel.STANDARD
-                        )
-                        content_to_index = protected_content
-                    else:
-                        content_to_index = email.content
-                        privacy_tokens = {}
-                    
-                    # Use intelligent chunker to split content
-                    if self.chunker:
-                        chunk_results = self.chunker.chunk_document(
-                            content=content_to_index,
-                            document_id=email.email_id,
-                            preserve_privacy=False  # We already handled privacy above
+                    self.vector_db.collection.upsert(
+                        embeddings=all_embeddings[offset:batch_end],
+                        documents=all_chunks[offset:batch_end],
+                        metadatas=all_metadatas[offset:batch_end],
+                        ids=all_ids[offset:batch_end]
+                    )
+                    indexed_chunks += len(all_ids[offset:batch_end])
+                    for chunk_id, chunk_content, chunk_metadata in zip(
+                        all_ids[offset:batch_end], all_chunks[offset:batch_end], all_metadatas[offset:batch_end]
+                    ):
+                        self.keyword_index.add(
+                            chunk_id, chunk_content,
+                            subject=chunk_metadata.get("subject", ""),
+                            sender=chunk_metadata.get("sender", "")
                         )
-                        # chunk_results is List[Tuple[str, ChunkMetadata]]
-                        chunks_data = [(chunk_content, metadata) for chunk_content, metadata in chunk_results]
-                    else:
-                        # Fallback: create single chunk
-                        chunks_data = [(content_to_index, ChunkMetadata(
-                            chunk_id=f"{email.email_id}_chunk_0",
-                            original_position=0,
-                            token_count=len(content_to_index.split()),
-                            character_count=len(content_to_index),
-                            semantic_coherence_score=1.0
-                        ))]
-                    
-                    # Generate embeddings for all chunks
-                    chunk_texts = [chunk_content for chunk_content, _ in chunks_data]
-                    if chunk_texts:
-                        chunk_embeddings = self.embedding_model.encode(chunk_texts)
-                        
-                        # Prepare data for ChromaDB
-                        for chunk_idx, ((chunk_content, chunk_metadata), embedding) in enumerate(zip(chunks_data, chunk_embeddings)):
-                            chunk_id = f"{email.email_id}_chunk_{chunk_idx}"
-                            
-                            all_chunks.append(chunk_content)
-                            all_embeddings.append(embedding.tolist())
-                            all_ids.append(chunk_id)
-                            all_metadatas.append({
-                                "email_id": email.email_id,
-                                "chunk_id": chunk_metadata.chunk_id,
-                                "chunk_index": chunk_idx,
-                                "email_index": email_idx,
-                                "token_count": chunk_metadata.token_count,
-                                "character_count": chunk_metadata.character_count,
-                                "privacy_protected": bool(privacy_tokens),
-                                "subject": email.metadata.get("subject", ""),
-                                "sender": email.metadata.get("from", ""),
-                                "date": email.metadata.get("date", ""),
-                                **privacy_tokens  # Include privacy tokens for later retrieval
-                            })
-                            indexed_chunks += 1
-                            
                 except Exception as e:
-                    logger.error(f"Failed to process email {email.email_id}: {e}")
-                    failed_chunks += 1
-                    continue
+                    logger.error(f"Failed to insert batch into vector store: {e}")
+                    failed_chunks += len(all_ids[offset:batch_end])
+                    failed_email_ids.update(m["email_id"] for m in all_metadatas[offset:batch_end])
             
-            # Batch insert into ChromaDB
-            if all_chunks:
-                try:
-                    self.vector_db.collection.add(
-                        embeddings=all_embeddings,
-                        documents=all_chunks,
-                        metadatas=all_metadatas,
-                        ids=all_ids
+            # Drop chunks left over from a previous, longer version of an email
+            orphan_ids = []
+            for email_id, chunk_count in chunk_counts.items():
+                previous = self.manifest.entries.get(email_id)
+                if previous and previous.chunk_count > chunk_count and email_id not in failed_email_ids:
+                    orphan_ids.extend(
+                        f"{email_id}_chunk_{chunk_idx}"
+                        for chunk_idx in range(chunk_count, previous.chunk_count)
                     )
-                    logger.info(f"Successfully indexed {indexed_chunks} chunks to ChromaDB")
+            deleted_chunks = 0
+            if orphan_ids:
+                try:
+                    self.vector_db.collection.delete(ids=orphan_ids)
+                    deleted_chunks = len(orphan_ids)
+                    for chunk_id in orphan_ids:
+                        self.keyword_index.remove(chunk_id)
                 except Exception as e:
-                    logger.error(f"Failed to insert batch into ChromaDB: {e}")
-                    # Mark all as failed if batch insert fails
-                    failed_chunks += indexed_chunks
-                    indexed_chunks = 0
+                    logger.error(f"Failed to delete orphaned chunks: {e}")
+                    failed_email_ids.update(
+                        email_id for email_id in chunk_counts
+                        if any(chunk_id.startswith(f"{email_id}_chunk_") for chunk_id in orphan_ids)
+                    )
+            insert_seconds = time.time() - stage_start
+            
+            for email_id, chunk_count in chunk_counts.items():
+                if email_id not in failed_email_ids:
+                    self.manifest.record(email_id, content_hashes[email_id], chunk_count, model_id)
+            if all_chunks or orphan_ids:
+                self._index_dirty = True
+            if chunk_counts:
+                self._manifest_dirty = True
+            if not self._persist_deferred:
+                self._persist_index()
+            
+            if indexed_chunks:
+                logger.info(f"Successfully indexed {indexed_chunks} chunks to vector store")
+            if all_chunks or orphan_ids:
+                # Even a failed write may have partially applied
+                self._bump_index_generation()
             
             processing_time = time.time() - start_time
             self.index_count += indexed_chunks
@@ -411,7 +860,14 @@ class RAGEngine:
                     'emails_processed': len(emails),
                     'chunks_per_email': indexed_chunks / len(emails) if len(emails) > 0 else 0,
                     'throughput_chunks_per_second': indexed_chunks / processing_time if processing_time > 0 else 0,
-                    'success_rate': indexed_chunks / (indexed_chunks + failed_chunks) if (indexed_chunks + failed_chunks) > 0 else 0
+                    'success_rate': indexed_chunks / (indexed_chunks + failed_chunks) if (indexed_chunks + failed_chunks) > 0 else 0,
+                    'preprocess_seconds': preprocess_seconds,
+                    'encode_seconds': encode_seconds,
+                    'insert_seconds': insert_seconds,
+                    'encode_batches': -(-len(all_chunks) // max(1, self.config.embedding_batch_size)),
+                    'encode_chunks_per_second': len(all_chunks) / encode_seconds if encode_seconds > 0 else 0,
+                    'skipped_unchanged_emails': skipped_emails,
+                    'deleted_orphan_chunks': deleted_chunks
                 }
             )
             
@@ -436,6 +892,223 @@ class RAGEngine:
                 }]
             )
     
+    async def _prepare_emails_for_indexing(self, emails: List[Tuple[int, EmailItem]]) -> List[Any]:
+        """Protect and chunk (batch position, email) pairs through the preprocess pipeline.
+        
+        Returns, per email, either a list of (chunk_id, chunk_text, metadata)
+        tuples or the exception that email raised.
+        """
+        preprocessed = await self.preprocess_pipeline.aprocess([email for _, email in emails])
+        
+        prepared_emails: List[Any] = []
+        for (email_idx, email), outcome in zip(emails, preprocessed):
+            if not outcome.success:
+                prepared_emails.append(RuntimeError(outcome.error))
+                continue
+            
+            filter_columns = filter_metadata(email)
+            prepared_chunks = []
+            for chunk_idx, chunk in enumerate(outcome.chunks):
+                prepared_chunks.append((f"{email.email_id}_chunk_{chunk_idx}", chunk.content, {
+                    "email_id": email.email_id,
+                    "chunk_id": chunk.chunk_id or f"{email.email_id}_chunk_{chunk_idx}",
+                    "chunk_index": chunk_idx,
+                    "email_index": email_idx,
+                    "token_count": chunk.token_count,
+                    "character_count": chunk.character_count,
+                    "privacy_protected": bool(outcome.privacy_tokens),
+                    "subject": email.metadata.get("subject", ""),
+                    "sender": email.metadata.get("from", ""),
+                    "date": email.metadata.get("date", ""),
+                    **filter_columns,
+                    **outcome.privacy_tokens  # Include privacy tokens for later retrieval
+                }))
+            prepared_emails.append(prepared_chunks)
+        return prepared_emails
+    
+    async def sync_index(self, message_store: MessageStore, batch_size: int = 500) -> IndexResult:
+        """Index mail that arrived since the last successful sync.
+        
+        Emails are pulled from ``message_store`` in batches and passed through
+        index_email_batch, which skips anything already indexed unchanged.
+        The sync cursor only advances when every batch succeeds, so a failed
+        run is retried in full next time. The vector store, keyword index
+        and manifest are saved once at the end rather than after each batch.
+        """
+        operation_id = f"rag_sync_{uuid.uuid4().hex[:8]}"
+        start_time = time.time()
+        sync_started = time.time()
+        since = self.manifest.last_sync_timestamp
+        
+        totals = {'indexed': 0, 'failed': 0, 'skipped': 0, 'emails': 0}
+        error_details: List[Dict[str, Any]] = []
+        
+        async def flush(batch: List[EmailItem]) -> None:
+            result = await self.index_email_batch(batch)
+            totals['indexed'] += result.indexed_chunks
+            totals['failed'] += result.failed_chunks
+            totals['skipped'] += result.performance_metrics.get('skipped_unchanged_emails', 0)
+            totals['emails'] += len(batch)
+            error_details.extend(result.error_details)
+        
+        self._persist_deferred = True
+        try:
+            batch: List[EmailItem] = []
+            for email in message_store.fetch_since(since):
+                batch.append(email)
+                if len(batch) >= batch_size:
+                    await flush(batch)
+                    batch = []
+            if batch:
+                await flush(batch)
+            
+            if totals['failed'] == 0:
+                self.manifest.last_sync_timestamp = sync_started
+                self._manifest_dirty = True
+        finally:
+            self._persist_deferred = False
+            self._persist_index()
+        
+        if totals['failed'] == 0:
+            status = IndexStatus.COMPLETED
+        elif totals['indexed'] > 0:
+            status = IndexStatus.PARTIAL
+        else:
+            status = IndexStatus.FAILED
+        
+        processing_time = time.time() - start_time
+        logger.info(f"Index sync {operation_id}: {totals['emails']} emails since "
+                    f"{since or 'the beginning'}, {totals['indexed']} chunks indexed, "
+                    f"{totals['skipped']} unchanged emails skipped")
+        return IndexResult(
+            operation_id=operation_id,
+            status=status,
+            total_chunks=totals['indexed'] + totals['failed'],
+            indexed_chunks=totals['indexed'],
+            failed_chunks=totals['failed'],
+            processing_time_seconds=processing_time,
+            performance_metrics={
+                'emails_fetched': totals['emails'],
+                'skipped_unchanged_emails': totals['skipped'],
+                'since_timestamp': since,
+                'sync_timestamp': self.manifest.last_sync_timestamp
+            },
+            error_details=error_details
+        )
+    
+    def _persist_index(self) -> None:
+        """Save pending index writes; the manifest goes last so it never
+        records chunks the stores did not keep."""
+        if self._index_dirty:
+            self.vector_db.persist()
+            self.keyword_index.save()
+            self._index_dirty = False
+        if self._manifest_dirty:
+            self.manifest.save()
+            self._manifest_dirty = False
+    
+    def _encode_chunks(self, texts: List[str]) -> np.ndarray:
+        """Encode texts in length-sorted batches, returning rows in input order.
+        
+        Sorting by length keeps similarly sized texts together so each forward
+        pass pads as little as possible.
+        """
+        batch_size = max(1, self.config.embedding_batch_size)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        embeddings = None
+        
+        for offset in range(0, len(order), batch_size):
+            batch_indices = order[offset:offset + batch_size]
+            batch_embeddings = np.asarray(self.embedding_model.encode(
+                [texts[i] for i in batch_indices],
+                batch_size=batch_size,
+                convert_to_numpy=True
+            ), dtype=np.float32)
+            if embeddings is None:
+                embeddings = np.empty((len(texts), batch_embeddings.shape[1]), dtype=np.float32)
+            embeddings[batch_indices] = batch_embeddings
+        
+        return embeddings
+    
+    def _bump_index_generation(self) -> None:
+        """Invalidate cached search results after a write to the index."""
+        self.index_generation += 1
+        self._result_cache.clear()
+    
+    def _result_cache_key(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]],
+        search_type: SearchType,
+        limit: int
+    ) -> str:
+        key_data = json.dumps(
+            [query, filters, search_type.value, limit, self.index_generation],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
+    
+    def _get_cached_results(self, cache_key: str) -> Optional[List[SearchResult]]:
+        """Return a copy of unexpired cached results, or None on a miss."""
+        entry = self._result_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        age_seconds = (datetime.now(timezone.utc) - entry.timestamp).total_seconds()
+        if age_seconds > entry.ttl_seconds:
+            del self._result_cache[cache_key]
+            return None
+        
+        entry.hit_count += 1
+        self._result_cache.move_to_end(cache_key)
+        # Copies, so callers mutating results cannot corrupt the cache
+        return [replace(result, metadata=dict(result.metadata)) for result in entry.results]
+    
+    def _store_cached_results(self, cache_key: str, results: List[SearchResult]) -> None:
+        self._result_cache[cache_key] = CacheEntry(
+            query_hash=cache_key,
+            results=[replace(result, metadata=dict(result.metadata)) for result in results],
+            timestamp=datetime.now(timezone.utc),
+            ttl_seconds=self.config.cache_ttl_seconds
+        )
+        self._result_cache.move_to_end(cache_key)
+        while len(self._result_cache) > self.config.result_cache_size:
+            self._result_cache.popitem(last=False)
+    
+    def _encode_queries(self, queries: List[str]) -> np.ndarray:
+        """Encode queries in one model call, reusing embeddings of recently seen queries.
+        
+        Returns one row per query, aligned with ``queries``.
+        """
+        embeddings: Dict[str, np.ndarray] = {}
+        if self.config.enable_caching:
+            for query in queries:
+                cached = self._embedding_cache.get(query)
+                if cached is not None:
+                    self.embedding_cache_hits += 1
+                    self._embedding_cache.move_to_end(query)
+                    embeddings[query] = cached
+        
+        missing = list(dict.fromkeys(query for query in queries if query not in embeddings))
+        if missing:
+            encoded = np.asarray(self.embedding_model.encode(missing))
+            for query, embedding in zip(missing, encoded):
+                embeddings[query] = embedding
+            if self.config.enable_caching:
+                self.embedding_cache_misses += len(missing)
+                for query in missing:
+                    self._embedding_cache[query] = embeddings[query]
+                while len(self._embedding_cache) > self.config.embedding_cache_size:
+                    self._embedding_cache.popitem(last=False)
+        
+        return np.stack([embeddings[query] for query in queries])
+    
+    def clear_cache(self) -> None:
+        """Drop all cached query embeddings and search results."""
+        self._embedding_cache.clear()
+        self._result_cache.clear()
+    
     def _calculate_adaptive_threshold(self, results_distances: List[float], base_threshold: float) -> float:
         """Calculate adaptive similarity threshold based on result distribution."""
         if not results_distances or not self.config.adaptive_threshold:
@@ -473,74 +1146,208 @@ class RAGEngine:
             logger.debug(f"Failed to calculate adaptive threshold: {e}")
             return base_threshold
     
-    def _keyword_score(self, query: str, content: str, metadata: Dict[str, Any]) -> float:
-        """Calculate keyword matching score for hybrid search."""
-        if not query or not content:
-            return 0.0
+    def _vector_candidates(
+        self,
+        queries: List[str],
+        n_results: int,
+        where: Optional[Dict[str, Any]]
+    ) -> List[Tuple[List[Tuple[str, str, Dict[str, Any], float]], float]]:
+        """Nearest chunks above the (adaptive) similarity threshold, per query.
         
-        try:
-            # Normalize query and content
-            query_words = set(query.lower().split())
-            content_words = set(content.lower().split())
-            
-            # Also check metadata fields
-            subject = metadata.get('subject', '').lower()
-            sender = metadata.get('sender', '').lower()
-            
-            all_searchable_text = f"{content.lower()} {subject} {sender}".split()
-            content_word_set = set(all_searchable_text)
-            
-            # Calculate different types of matches
-            exact_matches = len(query_words.intersection(content_word_set))
-            partial_matches = 0
-            
-            # Check for partial word matches (substring matching)
-            for query_word in query_words:
-                if len(query_word) > 3:  # Only for longer words
-                    for content_word in content_word_set:
-                        if query_word in content_word or content_word in query_word:
-                            partial_matches += 0.5
-                            break
-            
-            # Calculate keyword score
-            total_matches = exact_matches + partial_matches
-            max_possible_matches = len(query_words)
-            
-            keyword_score = total_matches / max_possible_matches if max_possible_matches > 0 else 0.0
+        All queries are encoded together and sent to the store as a single
+        multi-query request. For each query returns (chunk id, document,
+        metadata, similarity) tuples, best first, and the threshold applied.
+        """
+        query_embeddings = self._encode_queries(queries)
+        query_kwargs: Dict[str, Any] = {'where': where} if where else {}
+        search_results = self.vector_db.collection.query(
+            query_embeddings=query_embeddings.tolist(),
+            n_results=n_results,
+            include=['documents', 'metadatas', 'distances'],
+            **query_kwargs
+        )
+        
+        per_query = []
+        for position in range(len(queries)):
+            documents = (search_results.get('documents') or [[]] * len(queries))[position]
+            if not documents:
+                per_query.append(([], self.config.similarity_threshold))
+                continue
+            metadatas = search_results['metadatas'][position] if search_results.get('metadatas') else [{}] * len(documents)
+            distances = search_results['distances'][position] if search_results.get('distances') else [1.0] * len(documents)
+            ids = search_results['ids'][position] if search_results.get('ids') else [
+                metadata.get('chunk_id', 'unknown') for metadata in metadatas
+            ]
             
-            # Boost score if matches are found in subject line
-            subject_matches = sum(1 for word in query_words if word in subject)
-            if subject_matches > 0:
-                keyword_score *= (1.0 + 0.3 * subject_matches / len(query_words))
+            # Distances are cosine distances
+            threshold = self._calculate_adaptive_threshold(distances, self.config.similarity_threshold)
+            per_query.append(([
+                (chunk_id, doc, metadata, 1.0 - distance)
+                for chunk_id, doc, metadata, distance in zip(ids, documents, metadatas, distances)
+                if 1.0 - distance >= threshold
+            ], threshold))
+        return per_query
+    
+    def _keyword_candidates(
+        self,
+        query: str,
+        n_results: int,
+        where: Optional[Dict[str, Any]]
+    ) -> List[Tuple[str, str, Dict[str, Any], float]]:
+        """Best BM25 chunks as (chunk id, document, metadata, normalized score).
+        
+        Scores are divided by the best score so they fall in (0, 1]. With a
+        filter, a wider BM25 pool is fetched because the store drops
+        non-matching chunks during hydration.
+        """
+        pool = n_results * 10 if where else n_results
+        hits = self.keyword_index.search(query, pool)
+        if not hits:
+            return []
+        hydrated = self._fetch_chunks([chunk_id for chunk_id, _ in hits], where)
+        best = hits[0][1]
+        candidates = []
+        for chunk_id, score in hits:
+            if chunk_id in hydrated:
+                doc, metadata = hydrated[chunk_id]
+                candidates.append((chunk_id, doc, metadata, score / best))
+                if len(candidates) == n_results:
+                    break
+        return candidates
+    
+    def _fetch_chunks(
+        self,
+        chunk_ids: List[str],
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Documents and metadata for chunk ids from the vector store."""
+        if not chunk_ids:
+            return {}
+        get_kwargs: Dict[str, Any] = {'where': where} if where else {}
+        fetched = self.vector_db.collection.get(
+            ids=chunk_ids,
+            include=['documents', 'metadatas'],
+            **get_kwargs
+        )
+        metadatas = fetched.get('metadatas') or [{}] * len(fetched['ids'])
+        return {
+            chunk_id: (doc, metadata or {})
+            for chunk_id, doc, metadata in zip(fetched['ids'], fetched['documents'], metadatas)
+        }
+    
+    def _fuse_rankings(
+        self,
+        vector_candidates: List[Tuple[str, str, Dict[str, Any], float]],
+        keyword_candidates: List[Tuple[str, str, Dict[str, Any], float]]
+    ) -> List[Tuple[str, str, Dict[str, Any], float, float, float]]:
+        """Weighted reciprocal-rank fusion of the vector and BM25 rankings.
+        
+        Returns (chunk id, document, metadata, similarity, keyword score,
+        fused confidence) tuples, best first. The fused score is scaled by
+        its maximum (rank 1 in both lists) so it lies in [0, 1].
+        """
+        k = self.config.rrf_k
+        weights = (self.config.hybrid_weight_vector, self.config.hybrid_weight_keyword)
+        max_score = sum(weights) / (k + 1)
+        fused: Dict[str, List[Any]] = {}
+        for ranking, weight, score_slot in ((vector_candidates, weights[0], 3), (keyword_candidates, weights[1], 4)):
+            for rank, (chunk_id, doc, metadata, score) in enumerate(ranking, start=1):
+                entry = fused.setdefault(chunk_id, [chunk_id, doc, metadata, 0.0, 0.0, 0.0])
+                entry[score_slot] = score
+                entry[5] += weight / (k + rank)
+        results = [tuple(entry[:5]) + (entry[5] / max_score if max_score > 0 else 0.0,) for entry in fused.values()]
+        results.sort(key=lambda entry: entry[5], reverse=True)
+        return results
+    
+    def _rank_candidates(
+        self,
+        query: str,
+        search_type: SearchType,
+        vector_candidates: List[Tuple[str, str, Dict[str, Any], float]],
+        n_results: int,
+        where: Optional[Dict[str, Any]]
+    ) -> List[Tuple[str, str, Dict[str, Any], float, float, float]]:
+        """Candidates as (chunk id, doc, metadata, similarity, keyword score, confidence)."""
+        if search_type == SearchType.KEYWORD:
+            return [
+                (chunk_id, doc, metadata, 0.0, keyword_score, min(keyword_score * 1.1, 1.0))
+                for chunk_id, doc, metadata, keyword_score in self._keyword_candidates(query, n_results, where)
+            ]
+        if search_type == SearchType.SEMANTIC:
+            return [
+                (chunk_id, doc, metadata, similarity, 0.0, min(similarity * 1.1, 1.0))
+                for chunk_id, doc, metadata, similarity in vector_candidates
+            ]
+        # HYBRID
+        keyword_candidates = self._keyword_candidates(query, n_results, where)
+        return self._fuse_rankings(vector_candidates, keyword_candidates)
+    
+    def _build_results(
+        self,
+        candidates: List[Tuple[str, str, Dict[str, Any], float, float, float]],
+        search_type: SearchType,
+        current_threshold: float,
+        limit: int
+    ) -> List[SearchResult]:
+        """Turn ranked candidates into the top ``limit`` SearchResult objects."""
+        # Process results into SearchResult objects
+        results = []
+        for _, doc, metadata, similarity_score, keyword_score, confidence in candidates:
+            # Filter out very low-confidence hybrid results
+            if search_type == SearchType.HYBRID and confidence < 0.2:
+                continue
             
-            # Ensure score stays in [0, 1] range
-            keyword_score = min(1.0, keyword_score)
+            # Extract email information from metadata
+            email_id = metadata.get('email_id', 'unknown')
+            chunk_id = metadata.get('chunk_id', 'unknown')
             
-            logger.debug(f"Keyword score for '{query}': {keyword_score:.3f} "
-                        f"(exact: {exact_matches}, partial: {partial_matches:.1f})")
+            # Restore privacy-protected content if needed
+            content = doc
+            privacy_tokens = {}
+            if self.privacy_guardian and metadata.get('privacy_protected', False):
+                # Extract privacy tokens from metadata
+                privacy_tokens = {k: v for k, v in metadata.items() 
+                                if k.startswith('token_') or k.startswith('pii_')}
+                
+                # TODO: Implement restore functionality when PrivacyGuardian supports it
+                # For now, use the protected content as-is
+                logger.debug(f"Found privacy-protected content, tokens available: {len(privacy_tokens)}")
+                content = doc
             
-            return keyword_score
+            # Create SearchResult object
+            search_result = SearchResult(
+                content=content,
+                metadata={
+                    "subject": metadata.get('subject', ''),
+                    "sender": metadata.get('sender', ''),
+                    "date": metadata.get('date', ''),
+                    "timestamp": metadata.get('timestamp'),
+                    "token_count": metadata.get('token_count', 0),
+                    "chunk_index": metadata.get('chunk_index', 0),
+                    "keyword_score": keyword_score,
+                    "vector_similarity": similarity_score,
+                    "adaptive_threshold": current_threshold
+                },
+                similarity_score=similarity_score,
+                chunk_id=chunk_id,
+                email_id=email_id,
+                confidence=confidence,
+                search_type=search_type,
+                privacy_tokens=privacy_tokens
+            )
             
-        except Exception as e:
-            logger.debug(f"Failed to calculate keyword score: {e}")
-            return 0.0
-    
-    def _combine_scores(self, vector_score: float, keyword_score: float) -> float:
-        """Combine vector similarity and keyword scores for hybrid search."""
-        # Weighted combination with configurable weights
-        combined_score = (
-            self.config.hybrid_weight_vector * vector_score +
-            self.config.hybrid_weight_keyword * keyword_score
-        )
+            results.append(search_result)
         
-        # Apply bonus for high keyword scores (exact matches)
-        if keyword_score > 0.8:
-            combined_score *= 1.1  # 10% bonus for strong keyword matches
-        elif keyword_score > 0.5:
-            combined_score *= 1.05  # 5% bonus for moderate keyword matches
+        # Sort by relevance score (which now includes hybrid scoring)
+        if search_type == SearchType.HYBRID:
+            # For hybrid search, sort by combined confidence score
+            results.sort(key=lambda x: x.confidence, reverse=True)
+        else:
+            # For semantic/keyword, sort by relevance score
+            results.sort(key=lambda x: x.relevance_score, reverse=True)
         
-        # Ensure score stays in [0, 1] range
-        return min(1.0, combined_score)
+        # Return top results up to the requested limit
+        return results[:limit]
     
     async def search(
         self,
@@ -550,145 +1357,106 @@ class RAGEngine:
         search_type: SearchType = SearchType.SEMANTIC
     ) -> List[SearchResult]:
         """Perform semantic search across indexed emails with optimization enhancements."""
+        batch = await self.search_many([query], limit=limit, filters=filters, search_type=search_type)
+        return batch[0].results
+    
+    async def search_many(
+        self,
+        queries: List[str],
+        limit: int = None,
+        filters: Optional[Dict[str, Any]] = None,
+        search_type: SearchType = SearchType.SEMANTIC
+    ) -> List[QueryResults]:
+        """Run several searches with one encoder call and one vector store request.
+        
+        Queries served from the result cache are skipped; the rest are
+        encoded as a batch and sent to the store as one multi-query request,
+        then ranked per query. Returns one QueryResults per input query, in
+        order. Each query's processing time is its own ranking time plus an
+        equal share of the batched encode and store request.
+        """
+        if search_type != SearchType.KEYWORD or not self._connected:
+            await self._wait_for_warmup()
         if not self._connected:
             raise RuntimeError("RAG engine not initialized. Call initialize() first.")
         
         limit = limit or self.config.max_results
         start_time = time.time()
+        outcomes = [QueryResults(query=query) for query in queries]
         
         try:
-            logger.debug(f"Starting {search_type.value} search for query: '{query[:50]}...' with limit: {limit}")
+            logger.debug(f"Starting {search_type.value} search for {len(queries)} queries with limit: {limit}")
             
-            if not self._embedding_model_loaded:
+            # Keyword search only needs the index, so it works while the model loads
+            if search_type != SearchType.KEYWORD and not self._embedding_model_loaded:
                 raise RuntimeError("Embedding model not loaded. Call initialize() first.")
             
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode([query])
-            
-            # Increase search limit for better adaptive thresholding and hybrid ranking
-            extended_limit = min(limit * 3, 50)  # Search more results to filter/rank
-            
-            # Perform similarity search in ChromaDB
-            search_results = self.vector_db.collection.query(
-                query_embeddings=query_embedding.tolist(),
-                n_results=extended_limit,
-                include=['documents', 'metadatas', 'distances']
-            )
-            
-            # Process results into SearchResult objects
-            results = []
+            cache_keys: List[Optional[str]] = [None] * len(queries)
+            pending: List[int] = []
+            for position, query in enumerate(queries):
+                if self.config.enable_caching:
+                    cache_keys[position] = self._result_cache_key(query, filters, search_type, limit)
+                    cached_results = self._get_cached_results(cache_keys[position])
+                    if cached_results is not None:
+                        self.cache_hits += 1
+                        outcome = outcomes[position]
+                        outcome.results = cached_results
+                        outcome.from_cache = True
+                        outcome.processing_time_ms = (time.time() - start_time) * 1000
+                        logger.debug(f"Search cache hit for '{query[:50]}...'")
+                        continue
+                    self.cache_misses += 1
+                pending.append(position)
             
-            if search_results['documents'] and search_results['documents'][0]:
-                documents = search_results['documents'][0]
-                metadatas = search_results['metadatas'][0] if search_results['metadatas'] else [{}] * len(documents)
-                distances = search_results['distances'][0] if search_results['distances'] else [1.0] * len(documents)
+            if pending:
+                # Increase search limit for better adaptive thresholding and hybrid ranking
+                extended_limit = min(limit * 3, 50)  # Search more results to filter/rank
                 
-                # Calculate adaptive threshold if enabled
-                current_threshold = self._calculate_adaptive_threshold(distances, self.config.similarity_threshold)
+                # Filters are applied inside the stores, not on the results
+                where = build_metadata_filter(filters)
                 
-                for doc, metadata, distance in zip(documents, metadatas, distances):
-                    # Convert distance to similarity score (ChromaDB uses cosine distance)
-                    similarity_score = 1.0 - distance
-                    
-                    # Apply adaptive similarity threshold filter
-                    if similarity_score < current_threshold:
-                        continue
-                    
-                    # Calculate keyword score for hybrid search
-                    keyword_score = 0.0
-                    if search_type in [SearchType.KEYWORD, SearchType.HYBRID]:
-                        keyword_score = self._keyword_score(query, doc, metadata)
-                    
-                    # Calculate final confidence score based on search type
-                    if search_type == SearchType.SEMANTIC:
-                        confidence = min(similarity_score * 1.1, 1.0)  # Slight boost, cap at 1.0
-                        final_score = similarity_score
-                    elif search_type == SearchType.KEYWORD:
-                        confidence = min(keyword_score * 1.1, 1.0)
-                        final_score = keyword_score
-                    else:  # HYBRID
-                        confidence = self._combine_scores(similarity_score, keyword_score)
-                        final_score = confidence
-                    
-                    # Filter out very low-confidence hybrid results
-                    if search_type == SearchType.HYBRID and confidence < 0.2:
-                        continue
-                    
-                    # Extract email information from metadata
-                    email_id = metadata.get('email_id', 'unknown')
-                    chunk_id = metadata.get('chunk_id', 'unknown')
-                    
-                    # Restore privacy-protected content if needed
-                    content = doc
-                    privacy_tokens = {}
-                    if self.privacy_guardian and metadata.get('privacy_protected', False):
-                        # Extract privacy tokens from metadata
-                        privacy_tokens = {k: v for k, v in metadata.items() 
-                                        if k.startswith('token_') or k.startswith('pii_')}
-                        
-                        # TODO: Implement restore functionality when PrivacyGuardian supports it
-                        # For now, use the protected content as-is
-                        logger.debug(f"Found privacy-protected content, tokens available: {len(privacy_tokens)}")
-                        content = doc
-                    
-                    # Create SearchResult object
-                    search_result = SearchResult(
-                        content=content,
-                        metadata={
-                            "subject": metadata.get('subject', ''),
-                            "sender": metadata.get('sender', ''),
-                            "date": metadata.get('date', ''),
-                            "token_count": metadata.get('token_count', 0),
-                            "chunk_index": metadata.get('chunk_index', 0),
-                            "keyword_score": keyword_score,
-                            "vector_similarity": similarity_score,
-                            "adaptive_threshold": current_threshold
-                        },
-                        similarity_score=similarity_score,
-                        chunk_id=chunk_id,
-                        email_id=email_id,
-                        confidence=confidence,
-                        search_type=search_type,
-                        privacy_tokens=privacy_tokens
-                    )
+                retrieval_start = time.time()
+                pending_queries = [queries[position] for position in pending]
+                if search_type == SearchType.KEYWORD:
+                    vector_results = [([], self.config.similarity_threshold)] * len(pending)
+                else:
+                    vector_results = self._vector_candidates(pending_queries, extended_limit, where)
+                shared_ms = (time.time() - retrieval_start) * 1000 / len(pending)
+                
+                for position, (vector_candidates, current_threshold) in zip(pending, vector_results):
+                    query_start = time.time()
+                    query = queries[position]
+                    candidates = self._rank_candidates(query, search_type, vector_candidates, extended_limit, where)
+                    results = self._build_results(candidates, search_type, current_threshold, limit)
+                    if cache_keys[position] is not None:
+                        self._store_cached_results(cache_keys[position], results)
                     
-                    results.append(search_result)
-            
-            # Sort by relevance score (which now includes hybrid scoring)
-            if search_type == SearchType.HYBRID:
-                # For hybrid search, sort by combined confidence score
-                results.sort(key=lambda x: x.confidence, reverse=True)
-            else:
-                # For semantic/keyword, sort by relevance score
-                results.sort(key=lambda x: x.relevance_score, reverse=True)
-            
-            # Return top results up to the requested limit
-            results = results[:limit]
+                    outcome = outcomes[position]
+                    outcome.results = results
+                    outcome.processing_time_ms = shared_ms + (time.time() - query_start) * 1000
+                    logger.debug(f"Search completed: {len(results)} results for '{query[:50]}...' "
+                                f"in {outcome.processing_time_ms:.2f}ms (type: {search_type.value}, "
+                                f"threshold: {current_threshold:.3f})")
             
-            processing_time_ms = (time.time() - start_time) * 1000
-            self.search_count += 1
-            self.total_search_time += processing_time_ms / 1000
+            for outcome in outcomes:
+                # Update processing time for each result
+                for result in outcome.results:
+                    result.processing_time_ms = outcome.processing_time_ms
+                self.search_count += 1
+                self.total_search_time += outcome.processing_time_ms / 1000
             
-            # Update processing time for each result
-            for result in results:
-                result.processing_time_ms = processing_time_ms
-            
-            logger.debug(f"Search completed: {len(results)} results for '{query[:50]}...' "
-                        f"in {processing_time_ms:.2f}ms (type: {search_type.value}, "
-                        f"threshold: {current_threshold:.3f})")
-            
-            return results
+            return outcomes
             
         except Exception as e:
-            processing_time_ms = (time.time() - start_time) * 1000
-            logger.error(f"Search failed for query '{query[:50]}...': {e}")
-            return []
+            logger.error(f"Search failed for {len(queries)} queries (first: '{queries[0][:50] if queries else ''}...'): {e}")
+            return [QueryResults(query=query) for query in queries]
     
     async def health_check(self) -> Dict[str, Any]:
         """Perform a comprehensive health check of the RAG engine."""
         health_status = {
             'overall_status': 'healthy',
             'timestamp': datetime.now(timezone.utc).isoformat(),
+            'readiness': self.readiness,
             'components': {}
         }
         
@@ -702,9 +1470,9 @@ class RAGEngine:
                 }
             else:
                 health_status['components']['embedding_model'] = {
-                    'status': 'not_loaded'
+                    'status': 'loading' if self.state == EngineState.WARMING else 'not_loaded'
                 }
-                health_status['overall_status'] = 'unhealthy'
+                health_status['overall_status'] = 'warming' if self.state == EngineState.WARMING else 'unhealthy'
             
             # Check vector database
             if self._connected and self.vector_db:
@@ -742,8 +1510,10 @@ class RAGEngine:
                 'operation_counts': {
                     'total_searches': self.search_count,
                     'total_indexing_operations': self.index_count,
-                    'cache_hits': 0,  # TODO: Implement actual cache tracking
-                    'cache_misses': 0  # TODO: Implement actual cache tracking
+                    'cache_hits': self.cache_hits,
+                    'cache_misses': self.cache_misses,
+                    'embedding_cache_hits': self.embedding_cache_hits,
+                    'embedding_cache_misses': self.embedding_cache_misses
                 },
                 'timing_metrics': {
                     'average_search_time_ms': round(avg_search_time_ms, 2),
@@ -751,6 +1521,10 @@ class RAGEngine:
                 },
                 'efficiency_metrics': {
                     'meets_latency_target': avg_search_time_ms < 200,
+                    'cache_hit_rate': (
+                        self.cache_hits / (self.cache_hits + self.cache_misses)
+                        if (self.cache_hits + self.cache_misses) > 0 else 0.0
+                    ),
                 }
             }
         except Exception as e:
@@ -760,13 +1534,18 @@ class RAGEngine:
     def get_index_stats(self) -> Dict[str, Any]:
         """Get detailed index statistics for monitoring and diagnostics."""
         try:
+            database_stats: Dict[str, Any] = {'total_chunks': self.index_count}
+            if self._connected and self.vector_db:
+                # The backend's own figures, e.g. rows, mode and quantization of the NumPy index
+                database_stats.update(self.vector_db.get_stats())
+            database_stats.update({
+                'database_type': self.config.vector_store.value,
+                'collections': 1,
+                'status': 'connected' if self._connected else 'disconnected'
+            })
             return {
-                'database_stats': {
-                    'database_type': 'ChromaDB',
-                    'total_chunks': self.index_count,
-                    'collections': 1,
-                    'status': 'connected' if self._connected else 'disconnected'
-                },
+                'database_stats': database_stats,
+                'keyword_index': self.keyword_index.get_stats(),
                 'index_metrics': {
                     'total_indexed_operations': self.index_count,
                     'average_index_time_seconds': (
@@ -777,8 +1556,11 @@ class RAGEngine:
                 'cache_metrics': {
                     'cache_enabled': self.config.enable_caching,
                     'cache_ttl_seconds': self.config.cache_ttl_seconds,
-                    'cache_hits': 0,  # TODO: Implement actual cache tracking
-                    'cache_misses': 0  # TODO: Implement actual cache tracking
+                    'cache_hits': self.cache_hits,
+                    'cache_misses': self.cache_misses,
+                    'cached_result_sets': len(self._result_cache),
+                    'cached_query_embeddings': len(self._embedding_cache),
+                    'index_generation': self.index_generation
                 }
             }
         except Exception as e:
@@ -796,6 +1578,8 @@ class RAGEngine:
             
             self.embedding_model = None
             self._embedding_model_loaded = False
+            self.clear_cache()
+            self.preprocess_pipeline.close()
             
             logger.info("RAG engine shutdown completed successfully")
             
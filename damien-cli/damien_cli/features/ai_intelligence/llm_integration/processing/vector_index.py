@@ -0,0 +1,669 @@
+"""
+NumpyVectorIndex: In-process vector store backed by a memory-mapped matrix
+
+A dependency-free alternative to ChromaDB for single-user indexes of up to a
+few million chunks. Vectors live in a ``.npy`` file opened with
+``numpy.memmap`` (float32, or float16/int8 when quantization is enabled); ids, documents and metadata are kept column-wise in a JSON
+side file. Metadata columns are sparse ``{row: value}`` maps, so a key that
+only some chunks carry (a label, a privacy token) costs nothing for the rest. Exact search scores the matrix in fixed-size blocks and keeps the
+top-k per block with ``argpartition``, so memory stays flat however large the
+index grows. An optional IVF mode clusters the vectors with k-means and only
+scores the lists nearest to the query. Chroma-style ``where`` clauses are
+evaluated as a row bitmap over cached column indexes before any scoring.
+
+With ``quantization="int8"`` each row is stored as int8 codes plus a float32
+scale, and a block's scores are the codes' dot products with the query times
+the row scales, so the float32 matrix never exists in memory.
+
+The class exposes the subset of the Chroma collection API that RAGEngine
+uses (upsert, delete, query, count), so the engine is backend-agnostic.
+"""
+
+import json
+import logging
+import operator
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ...utils.quantization import dequantize, quantize, storage_dtype
+
+logger = logging.getLogger(__name__)
+
+RANGE_OPERATORS = {
+    '$gt': operator.gt,
+    '$gte': operator.ge,
+    '$lt': operator.lt,
+    '$lte': operator.le,
+}
+
+
+class NumpyVectorIndex:
+    """Cosine-similarity index over a memory-mapped (optionally quantized) matrix."""
+
+    VERSION = 2
+    VECTORS_FILE = "vectors.npy"
+    METADATA_FILE = "metadata.json"
+    IVF_FILE = "ivf.npz"
+    SCALES_FILE = "scales.npy"
+    WIDEN_ROWS = 512  # Quantized rows widened per step; keeps the float32 buffer in cache
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        mode: str = "exact",
+        block_rows: int = 65536,
+        ivf_lists: int = 0,
+        ivf_probes: int = 8,
+        ivf_min_rows: int = 10000,
+        initial_capacity: int = 1024,
+        seed: int = 0,
+        quantization: str = "none"
+    ):
+        if mode not in ("exact", "ivf"):
+            raise ValueError(f"Unknown index mode: {mode}")
+        storage_dtype(quantization)  # Validates the mode
+        self.directory = Path(directory) if directory else None
+        self.mode = mode
+        self.block_rows = max(1, block_rows)
+        self.ivf_lists = ivf_lists
+        self.ivf_probes = max(1, ivf_probes)
+        self.ivf_min_rows = ivf_min_rows
+        self.initial_capacity = max(1, initial_capacity)
+        self.seed = seed
+        self.quantization = quantization
+        self._reset()
+
+        if self.directory:
+            self._load()
+
+    def _reset(self) -> None:
+        self.dimension: Optional[int] = None
+        self.rows = 0  # Rows in use, including deleted ones awaiting compaction
+        self._vectors: Optional[np.ndarray] = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._scales: Optional[np.ndarray] = None  # Per-row scales in int8 mode
+        self.ids: List[Optional[str]] = []
+        self.documents: List[Optional[str]] = []
+        self.columns: Dict[str, Dict[int, Any]] = {}  # key -> {row: value}, only rows that set it
+        self._row_of: Dict[str, int] = {}
+
+        # IVF state: centroids and the list each row belongs to
+        self.centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+
+        # Column indexes for filtering, rebuilt lazily after writes
+        self._column_indexes: Dict[Tuple[str, str], Any] = {}
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self._vectors is None else self._vectors.shape[0]
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.directory / (self.VECTORS_FILE + ".tmp")
+            vectors = np.lib.format.open_memmap(
+                tmp_path, mode="w+", dtype=storage_dtype(self.quantization), shape=(capacity, self.dimension)
+            )
+            if self.rows:
+                vectors[:self.rows] = self._vectors[:self.rows]
+            vectors.flush()
+            del vectors
+            tmp_path.replace(self.directory / self.VECTORS_FILE)
+            return np.load(self.directory / self.VECTORS_FILE, mmap_mode="r+")
+        vectors = np.zeros((capacity, self.dimension), dtype=storage_dtype(self.quantization))
+        if self.rows:
+            vectors[:self.rows] = self._vectors[:self.rows]
+        return vectors
+
+    def _ensure_capacity(self, needed: int) -> None:
+        if needed <= self.capacity:
+            return
+        capacity = max(self.initial_capacity, self.capacity)
+        while capacity < needed:
+            capacity *= 2
+        self._vectors = self._allocate(capacity)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.rows] = self._alive[:self.rows]
+        self._alive = alive
+        assignments = np.full(capacity, -1, dtype=np.int32)
+        assignments[:self.rows] = self._assignments[:self.rows]
+        self._assignments = assignments
+        if self.quantization == "int8":
+            scales = np.ones(capacity, dtype=np.float32)
+            if self._scales is not None:
+                scales[:self.rows] = self._scales[:self.rows]
+            self._scales = scales
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _write_rows(self, rows, vectors: np.ndarray) -> None:
+        codes, scales = quantize(vectors, self.quantization)
+        self._vectors[rows] = codes
+        if scales is not None:
+            self._scales[rows] = scales
+
+    def _read_rows(self, rows) -> np.ndarray:
+        """Stored rows as float32, dequantized if needed."""
+        return dequantize(self._vectors[rows], None if self._scales is None else self._scales[rows])
+
+    def _row_scores(self, rows, query: np.ndarray) -> np.ndarray:
+        """Dot products of stored rows with a query.
+        
+        Quantized rows are widened to float32 a few hundred at a time into a
+        reused cache-sized buffer, so scoring reads the compact matrix once
+        and never allocates a float32 copy of the block; int8 scales are
+        applied to the scores rather than the rows.
+        """
+        if self._vectors.dtype == np.float32:
+            return self._vectors[rows] @ query
+        if isinstance(rows, slice):
+            rows = np.arange(*rows.indices(self.rows))
+        scores = np.empty(len(rows), dtype=np.float32)
+        buffer = np.empty((self.WIDEN_ROWS, self.dimension), dtype=np.float32)
+        for start in range(0, len(rows), self.WIDEN_ROWS):
+            part = rows[start:start + self.WIDEN_ROWS]
+            if len(part) and part[-1] - part[0] == len(part) - 1:
+                codes = self._vectors[part[0]:part[-1] + 1]  # Contiguous: a view, not a gather
+            else:
+                codes = self._vectors[part]
+            widened = buffer[:len(part)]
+            np.copyto(widened, codes, casting='unsafe')
+            scores[start:start + len(part)] = widened @ query
+        if self._scales is not None:
+            scores *= self._scales[rows]
+        return scores
+
+    # ------------------------------------------------------------------
+    # Collection API
+    # ------------------------------------------------------------------
+
+    def count(self) -> int:
+        return len(self._row_of)
+
+    def upsert(
+        self,
+        embeddings: Sequence,
+        documents: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        ids: Sequence[str]
+    ) -> None:
+        """Insert new chunks and overwrite existing ones in place."""
+        if not len(ids):
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[0] != len(ids):
+            raise ValueError("embeddings must be a 2-D array with one row per id")
+        if self.dimension is None:
+            self.dimension = vectors.shape[1]
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dimensional embeddings, got {vectors.shape[1]}")
+        vectors = self._normalize(vectors)
+
+        # Resolve each id to its existing row or a fresh one at the end;
+        # a repeated id within the call keeps its last version
+        targets = np.empty(len(ids), dtype=np.int64)
+        next_row = self.rows
+        for position, chunk_id in enumerate(ids):
+            row = self._row_of.get(chunk_id)
+            if row is None:
+                row = self._row_of[chunk_id] = next_row
+                next_row += 1
+            targets[position] = row
+        self._ensure_capacity(next_row)
+
+        first_new_row = self.rows
+        new_rows = next_row - self.rows
+        self.ids.extend([None] * new_rows)
+        self.documents.extend([None] * new_rows)
+        self.rows = next_row
+
+        self._write_rows(targets, vectors)
+        self._alive[targets] = True
+        written = set()
+        for row, chunk_id, document, metadata in zip(targets.tolist(), ids, documents, metadatas):
+            self.ids[row] = chunk_id
+            self.documents[row] = document
+            # Only rows that already held metadata need their old keys cleared
+            self._set_metadata(row, metadata or {}, replace=row < first_new_row or row in written)
+            written.add(row)
+
+        if self.centroids is not None:
+            self._assignments[targets] = self._nearest_centroids(vectors)
+        self._column_indexes.clear()
+
+    def _set_metadata(self, row: int, metadata: Dict[str, Any], replace: bool = False) -> None:
+        if replace:
+            self._clear_metadata(row, keep=metadata.keys())
+        for key, value in metadata.items():
+            if value is None:
+                self.columns.get(key, {}).pop(row, None)
+            else:
+                self.columns.setdefault(key, {})[row] = value
+
+    def _clear_metadata(self, row: int, keep=()) -> None:
+        """Drop a row's values, and any column left with no rows at all."""
+        for key in [key for key in self.columns if key not in keep]:
+            column = self.columns[key]
+            if column.pop(row, None) is not None and not column:
+                del self.columns[key]
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """Remove chunks by id; their rows are reclaimed by compact()."""
+        for chunk_id in ids:
+            row = self._row_of.pop(chunk_id, None)
+            if row is None:
+                continue
+            self._alive[row] = False
+            self.ids[row] = None
+            self.documents[row] = None
+            self._clear_metadata(row)
+        self._column_indexes.clear()
+
+    def get(
+        self,
+        ids: Sequence[str],
+        include: Sequence[str] = ('documents', 'metadatas'),
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[Any]]:
+        """Fetch chunks by id, optionally restricted to a where clause."""
+        rows = [self._row_of[chunk_id] for chunk_id in ids if chunk_id in self._row_of]
+        if where:
+            allowed = self.where_mask(where)
+            rows = [row for row in rows if allowed[row]]
+        result: Dict[str, List[Any]] = {'ids': [self.ids[row] for row in rows]}
+        if 'documents' in include:
+            result['documents'] = [self.documents[row] for row in rows]
+        if 'metadatas' in include:
+            result['metadatas'] = [self._metadata(row) for row in rows]
+        return result
+
+    def _metadata(self, row: int) -> Dict[str, Any]:
+        return {key: column[row] for key, column in self.columns.items() if row in column}
+
+    def query(
+        self,
+        query_embeddings: Sequence,
+        n_results: int = 10,
+        include: Sequence[str] = ('documents', 'metadatas', 'distances'),
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[List[Any]]]:
+        """Top-k cosine search, returned in the Chroma result layout.
+        
+        With ``where``, only rows matching the clause are considered; the
+        matching subset is scored exactly unless it is large enough for an
+        IVF probe to be cheaper.
+        """
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        result: Dict[str, List[List[Any]]] = {'ids': []}
+        for key in include:
+            result[key] = []
+
+        allowed = self.where_mask(where) if where else None
+        if self.count() == 0 or n_results <= 0 or (allowed is not None and not allowed.any()):
+            for key in result:
+                result[key] = [[] for _ in range(len(queries))]
+            return result
+
+        queries = self._normalize(queries)
+        if self.mode == "ivf":
+            self._ensure_ivf()
+        use_ivf = self.mode == "ivf" and self.centroids is not None
+        filtered_rows = None
+        if allowed is not None:
+            filtered_rows = np.flatnonzero(allowed)
+            if use_ivf:
+                # Probing scans about probes/lists of the index; below that
+                # the filtered subset itself is the cheaper exact search
+                probe_rows = self.count() * min(self.ivf_probes, len(self.centroids)) / len(self.centroids)
+                use_ivf = len(filtered_rows) > probe_rows
+
+        for query in queries:
+            if use_ivf:
+                rows, scores = self._search_ivf(query, n_results, allowed)
+            elif filtered_rows is not None:
+                rows, scores = self._score_rows(query, filtered_rows, n_results)
+            else:
+                rows, scores = self._search_exact(query, n_results)
+            result['ids'].append([self.ids[row] for row in rows])
+            if 'documents' in result:
+                result['documents'].append([self.documents[row] for row in rows])
+            if 'metadatas' in result:
+                result['metadatas'].append([self._metadata(row) for row in rows])
+            if 'distances' in result:
+                result['distances'].append((1.0 - scores).tolist())
+            if 'embeddings' in result:
+                result['embeddings'].append(self._read_rows(rows).tolist())
+        return result
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, rows: np.ndarray, k: int):
+        """Best k (rows, scores) pairs, highest score first."""
+        if len(scores) > k:
+            keep = np.argpartition(-scores, k - 1)[:k]
+            scores, rows = scores[keep], rows[keep]
+        order = np.argsort(-scores, kind="stable")
+        return rows[order], scores[order]
+
+    def _score_rows(self, query: np.ndarray, rows: np.ndarray, k: int):
+        """Score the given rows block by block, keeping the running top-k."""
+        best_rows = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype=np.float32)
+        for start in range(0, len(rows), self.block_rows):
+            block = rows[start:start + self.block_rows]
+            scores = self._row_scores(block, query)
+            block_rows, block_scores = self._top_k(scores, block, k)
+            best_rows = np.concatenate([best_rows, block_rows])
+            best_scores = np.concatenate([best_scores, block_scores])
+            if len(best_rows) > k:
+                best_rows, best_scores = self._top_k(best_scores, best_rows, k)
+        return self._top_k(best_scores, best_rows, k)
+
+    def _search_exact(self, query: np.ndarray, k: int):
+        best_rows = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype=np.float32)
+        for start in range(0, self.rows, self.block_rows):
+            end = min(start + self.block_rows, self.rows)
+            # Contiguous slices keep the memmap read sequential
+            scores = self._row_scores(slice(start, end), query)
+            scores[~self._alive[start:end]] = -np.inf
+            block_rows, block_scores = self._top_k(scores, np.arange(start, end), k)
+            best_rows = np.concatenate([best_rows, block_rows])
+            best_scores = np.concatenate([best_scores, block_scores])
+            if len(best_rows) > k:
+                best_rows, best_scores = self._top_k(best_scores, best_rows, k)
+        keep = np.isfinite(best_scores)
+        return self._top_k(best_scores[keep], best_rows[keep], k)
+
+    def _search_ivf(self, query: np.ndarray, k: int, allowed: Optional[np.ndarray] = None):
+        probes = min(self.ivf_probes, len(self.centroids))
+        nearest = np.argpartition(-(self.centroids @ query), probes - 1)[:probes]
+        live = self._alive[:self.rows] if allowed is None else allowed
+        rows = np.flatnonzero(live & np.isin(self._assignments[:self.rows], nearest))
+        if len(rows) < k:
+            if allowed is not None:
+                return self._score_rows(query, np.flatnonzero(allowed), k)
+            return self._search_exact(query, k)
+        return self._score_rows(query, rows, k)
+
+    # ------------------------------------------------------------------
+    # Filtering
+    # ------------------------------------------------------------------
+
+    def where_mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """Boolean mask over rows of the live chunks matching a where clause.
+        
+        Supports ``$and``/``$or``, implicit equality and the ``$eq``, ``$ne``,
+        ``$in``, ``$nin``, ``$gt``, ``$gte``, ``$lt`` and ``$lte`` operators.
+        """
+        mask = self._alive[:self.rows].copy()
+        for key, condition in where.items():
+            if key == '$and':
+                for clause in condition:
+                    mask &= self.where_mask(clause)
+            elif key == '$or':
+                either = np.zeros(self.rows, dtype=bool)
+                for clause in condition:
+                    either |= self.where_mask(clause)
+                mask &= either
+            elif isinstance(condition, dict):
+                for op, operand in condition.items():
+                    mask &= self._condition_mask(key, op, operand)
+            else:
+                mask &= self._condition_mask(key, '$eq', condition)
+        return mask
+
+    def _condition_mask(self, key: str, op: str, operand: Any) -> np.ndarray:
+        if op in ('$eq', '$ne', '$in', '$nin'):
+            values = operand if op in ('$in', '$nin') else [operand]
+            mask = np.zeros(self.rows, dtype=bool)
+            postings = self._value_index(key)
+            for value in values:
+                rows = postings.get(self._hashable(value))
+                if rows is not None:
+                    mask[rows] = True
+            if op in ('$ne', '$nin'):
+                # Chroma semantics: chunks without the field do not match
+                mask = ~mask & self._present_mask(key)
+            return mask
+        if op in RANGE_OPERATORS:
+            numbers = self._numeric_column(key)
+            with np.errstate(invalid='ignore'):
+                return RANGE_OPERATORS[op](numbers, float(operand))
+        raise ValueError(f"Unsupported where operator: {op}")
+
+    @staticmethod
+    def _hashable(value: Any) -> Any:
+        # True == 1 in a dict, so keep booleans distinct from numbers
+        return ('bool', value) if isinstance(value, bool) else value
+
+    def _value_index(self, key: str) -> Dict[Any, np.ndarray]:
+        """value -> rows holding it, for equality and membership tests."""
+        cached = self._column_indexes.get(('values', key))
+        if cached is None:
+            postings: Dict[Any, List[int]] = {}
+            for row, value in self.columns.get(key, {}).items():
+                postings.setdefault(self._hashable(value), []).append(row)
+            cached = {value: np.array(rows, dtype=np.int64) for value, rows in postings.items()}
+            self._column_indexes[('values', key)] = cached
+        return cached
+
+    def _numeric_column(self, key: str) -> np.ndarray:
+        """Column as float64, NaN where missing or non-numeric, for range tests."""
+        cached = self._column_indexes.get(('numeric', key))
+        if cached is None:
+            cached = np.full(self.rows, np.nan, dtype=np.float64)
+            for row, value in self.columns.get(key, {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    cached[row] = value
+            self._column_indexes[('numeric', key)] = cached
+        return cached
+
+    def _present_mask(self, key: str) -> np.ndarray:
+        mask = np.zeros(self.rows, dtype=bool)
+        mask[list(self.columns.get(key, ()))] = True
+        return mask
+
+    # ------------------------------------------------------------------
+    # IVF
+    # ------------------------------------------------------------------
+
+    def _ensure_ivf(self) -> None:
+        if self.centroids is None and self.count() >= self.ivf_min_rows:
+            self.train_ivf()
+
+    def _nearest_centroids(self, vectors: np.ndarray) -> np.ndarray:
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), self.block_rows):
+            block = np.asarray(vectors[start:start + self.block_rows])
+            assignments[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        return assignments
+
+    def train_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, sample_size: int = 100000) -> None:
+        """Cluster live vectors with spherical k-means and assign every row to a list."""
+        live_rows = np.flatnonzero(self._alive[:self.rows])
+        if len(live_rows) == 0:
+            return
+        n_lists = n_lists or self.ivf_lists or int(np.sqrt(len(live_rows)))
+        n_lists = max(1, min(n_lists, len(live_rows)))
+        started = time.time()
+
+        rng = np.random.default_rng(self.seed)
+        sample_rows = np.sort(rng.choice(live_rows, size=min(sample_size, len(live_rows)), replace=False))
+        sample = self._read_rows(sample_rows)
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength=n_lists) == 0
+            sums[empty] = centroids[empty]
+            centroids = self._normalize(sums)
+
+        self.centroids = centroids.astype(np.float32)
+        for start in range(0, self.rows, self.block_rows):
+            end = min(start + self.block_rows, self.rows)
+            self._assignments[start:end] = self._nearest_centroids(self._read_rows(slice(start, end)))
+        logger.info(f"Trained IVF index with {n_lists} lists over {len(live_rows)} vectors "
+                    f"in {time.time() - started:.1f}s")
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def compact(self) -> None:
+        """Drop deleted rows so the matrix and columns are dense again."""
+        live_rows = np.flatnonzero(self._alive[:self.rows])
+        if len(live_rows) == self.rows:
+            return
+        vectors = np.asarray(self._vectors[live_rows]) if self.rows else None
+        scales = None if self._scales is None else self._scales[live_rows]
+        assignments = self._assignments[live_rows]
+        self.ids = [self.ids[row] for row in live_rows]
+        self.documents = [self.documents[row] for row in live_rows]
+        new_row = np.full(self.rows, -1, dtype=np.int64)
+        new_row[live_rows] = np.arange(len(live_rows))
+        self.columns = {
+            key: {int(new_row[row]): value for row, value in column.items()}
+            for key, column in self.columns.items()
+        }
+        self._row_of = {chunk_id: row for row, chunk_id in enumerate(self.ids)}
+        self._column_indexes.clear()
+
+        self.rows = 0
+        self._vectors = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._scales = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._ensure_capacity(len(live_rows))
+        self.rows = len(live_rows)
+        if self.rows:
+            self._vectors[:self.rows] = vectors
+            if scales is not None:
+                self._scales[:self.rows] = scales
+        self._alive[:self.rows] = True
+        self._assignments[:self.rows] = assignments
+
+    def persist(self) -> None:
+        """Flush vectors and write the metadata columns atomically."""
+        if not self.directory:
+            return
+        if self.rows and np.count_nonzero(self._alive[:self.rows]) < 0.75 * self.rows:
+            self.compact()
+        if self._vectors is not None and isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        metadata_path = self.directory / self.METADATA_FILE
+        tmp_path = metadata_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                'version': self.VERSION,
+                'dimension': self.dimension,
+                'quantization': self.quantization,
+                'rows': self.rows,
+                'ids': self.ids,
+                'documents': self.documents,
+                'columns': {
+                    key: {'rows': list(column.keys()), 'values': list(column.values())}
+                    for key, column in self.columns.items()
+                },
+            }, f)
+        tmp_path.replace(metadata_path)
+
+        scales_path = self.directory / self.SCALES_FILE
+        if self._scales is not None:
+            with open(scales_path, "wb") as f:
+                np.save(f, self._scales[:self.rows])
+        elif scales_path.exists():
+            scales_path.unlink()
+
+        ivf_path = self.directory / self.IVF_FILE
+        if self.centroids is not None:
+            with open(ivf_path, "wb") as f:
+                np.savez(f, centroids=self.centroids, assignments=self._assignments[:self.rows])
+        elif ivf_path.exists():
+            ivf_path.unlink()
+
+    def _load(self) -> None:
+        metadata_path = self.directory / self.METADATA_FILE
+        vectors_path = self.directory / self.VECTORS_FILE
+        if not metadata_path.exists() or not vectors_path.exists():
+            return
+        try:
+            with open(metadata_path) as f:
+                data = json.load(f)
+            if data.get('version') not in (1, self.VERSION):
+                logger.info("Vector index format changed, starting a new index")
+                return
+            # The stored format wins; changing it means rebuilding the index
+            stored_quantization = data.get('quantization', "none")
+            if stored_quantization != self.quantization:
+                logger.info(f"Vector index at {self.directory} is stored as {stored_quantization}, "
+                            f"not {self.quantization}; keeping the stored format")
+                self.quantization = stored_quantization
+            self.dimension = data['dimension']
+            self.rows = data['rows']
+            self.ids = data['ids']
+            self.documents = data['documents']
+            if data['version'] == 1:
+                # Version 1 stored every column dense, None where unset
+                self.columns = {
+                    key: {row: value for row, value in enumerate(column) if value is not None}
+                    for key, column in data['columns'].items()
+                }
+                self.columns = {key: column for key, column in self.columns.items() if column}
+            else:
+                self.columns = {
+                    key: dict(zip(column['rows'], column['values']))
+                    for key, column in data['columns'].items()
+                }
+            self._vectors = np.load(vectors_path, mmap_mode="r+")
+            self._alive = np.zeros(self.capacity, dtype=bool)
+            self._alive[:self.rows] = [chunk_id is not None for chunk_id in self.ids]
+            self._row_of = {chunk_id: row for row, chunk_id in enumerate(self.ids) if chunk_id is not None}
+            self._assignments = np.full(self.capacity, -1, dtype=np.int32)
+            if self.quantization == "int8":
+                self._scales = np.ones(self.capacity, dtype=np.float32)
+                self._scales[:self.rows] = np.load(self.directory / self.SCALES_FILE)
+
+            ivf_path = self.directory / self.IVF_FILE
+            if ivf_path.exists():
+                with np.load(ivf_path) as ivf:
+                    self.centroids = ivf['centroids']
+                    self._assignments[:self.rows] = ivf['assignments']
+        except Exception as e:
+            logger.warning(f"Failed to load vector index from {self.directory}: {e}")
+            self._reset()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'total_chunks': self.count(),
+            'rows': self.rows,
+            'capacity': self.capacity,
+            'dimension': self.dimension,
+            'mode': self.mode,
+            'quantization': self.quantization,
+            'ivf_lists': 0 if self.centroids is None else len(self.centroids),
+            'matrix_bytes': 0 if self._vectors is None else int(self._vectors.nbytes),
+            'scale_bytes': 0 if self._scales is None else int(self._scales.nbytes),
+            'vector_bytes': self.rows * (
+                (self.dimension or 0) * storage_dtype(self.quantization).itemsize
+                + (0 if self._scales is None else self._scales.itemsize)
+            ),
+        }
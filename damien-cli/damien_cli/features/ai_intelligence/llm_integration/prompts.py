@@ -2,7 +2,7 @@ from typing import Dict, List, Optional, Any
 from abc import ABC, abstractmethod
 from jinja2 import Template
 import json
-from .utils import TokenCounter # Added import
+from .utils import SHARED_TOKEN_COUNTER # Added import
 import numpy as np # For potential similarity calculations
 
 # Placeholder for a generic EmbeddingService interface
@@ -262,7 +262,7 @@ class PromptOptimizer:
     """Optimizes prompts for better performance"""
     
     def __init__(self, embedding_service: Optional[EmbeddingService] = None):
-        self.token_counter = TokenCounter()
+        self.token_counter = SHARED_TOKEN_COUNTER
         self.example_selector = DynamicExampleSelector(embedding_service=embedding_service)
     
     async def optimize_prompt( # Made async to support async example selection
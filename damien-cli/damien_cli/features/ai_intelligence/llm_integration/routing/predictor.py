@@ -9,6 +9,7 @@ import logging
 from dataclasses import dataclass
 from .analyzer import ComplexityScore
 from .selector import ProcessingPipeline
+from ..utils import SHARED_TOKEN_COUNTER, TokenCounter
 
 logger = logging.getLogger(__name__)
 
@@ -30,10 +31,10 @@ class CostPredictor:
     - Batch processing optimization
     """
     
-    def __init__(self):
+    def __init__(self, token_counter: Optional[TokenCounter] = None):
         """Initialize the CostPredictor."""
         self.cost_model = CostModel()
-        self._token_estimation_cache = {}
+        self.token_counter = token_counter or SHARED_TOKEN_COUNTER
         logger.info("CostPredictor initialized successfully")
     
     def predict_cost(
@@ -83,25 +84,9 @@ class CostPredictor:
         """Estimate token count for email content."""
         text_content = self._extract_text_for_tokens(email_data)
         
-        # Use cache for identical content
-        content_hash = hash(text_content)
-        if content_hash in self._token_estimation_cache:
-            return self._token_estimation_cache[content_hash]
-        
-        # Simple token estimation (words * 1.3 for subword tokens)
-        word_count = len(text_content.split())
-        estimated_tokens = max(int(word_count * 1.3), 10)
-        
-        # Cache result
-        self._token_estimation_cache[content_hash] = estimated_tokens
-        
-        # Limit cache size
-        if len(self._token_estimation_cache) > 1000:
-            keys = list(self._token_estimation_cache.keys())
-            for key in keys[:500]:
-                del self._token_estimation_cache[key]
-        
-        return estimated_tokens
+        # Routing only needs an estimate: use the calibrated character ratio
+        estimated_tokens = self.token_counter.count(text_content, approximate=True)
+        return max(estimated_tokens, 10)
     
     def _extract_text_for_tokens(self, email_data: Dict[str, Any]) -> str:
         """Extract text content for token estimation."""
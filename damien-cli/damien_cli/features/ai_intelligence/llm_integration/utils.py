@@ -1,29 +1,70 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Sequence, Tuple
+
 import tiktoken
 
+# Characters per token for English email text under cl100k_base; approximate
+# counts use this until enough text has been counted exactly to calibrate.
+DEFAULT_CHARS_PER_TOKEN = 4.0
+CALIBRATION_MIN_CHARS = 20000
+
+
 class TokenCounter:
     """
     A utility class for counting tokens in a text string based on a given model.
     It caches encodings to avoid re-initializing them for the same model.
+
+    Exact counts are memoized by a hash of the text (the text itself is not
+    kept), so chunk metadata, cost estimates and prompt checks that count the
+    same text share one encode. count_many() encodes all uncached texts in one
+    tiktoken batch. With approximate=True, counts come from a characters-per-
+    token ratio calibrated on the exact counts seen so far, without encoding;
+    use it where an estimate is enough, such as routing and cost prediction.
     """
-    def __init__(self):
+    def __init__(
+        self,
+        max_entries: int = 65536,
+        chars_per_token: float = DEFAULT_CHARS_PER_TOKEN,
+        batch_threads: int = 4
+    ):
         self.encodings: dict[str, tiktoken.Encoding] = {}
+        self.max_entries = max_entries
+        self.default_chars_per_token = chars_per_token
+        self.batch_threads = batch_threads
+        self._counts: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.approximations = 0
+        self._calibration_chars = 0
+        self._calibration_tokens = 0
 
     def _get_encoding(self, model_name: str) -> tiktoken.Encoding:
         """
         Retrieves or creates and caches the tiktoken encoding for a given model.
+        An encoding name (e.g. "cl100k_base") may be given instead of a model.
         Falls back to "cl100k_base" if the specific model encoding is not found.
         """
         if model_name not in self.encodings:
             try:
                 self.encodings[model_name] = tiktoken.encoding_for_model(model_name)
             except KeyError:
-                # Fallback for models not directly known by tiktoken,
-                # or if the model name is an alias not recognized by tiktoken.
-                # cl100k_base is a common encoding used by newer OpenAI models.
-                self.encodings[model_name] = tiktoken.get_encoding("cl100k_base")
+                if model_name in tiktoken.list_encoding_names():
+                    self.encodings[model_name] = tiktoken.get_encoding(model_name)
+                else:
+                    # Fallback for models not directly known by tiktoken,
+                    # or if the model name is an alias not recognized by tiktoken.
+                    # cl100k_base is a common encoding used by newer OpenAI models.
+                    self.encodings[model_name] = tiktoken.get_encoding("cl100k_base")
         return self.encodings[model_name]
 
-    def count(self, text: str, model_name: str = "gpt-3.5-turbo") -> int:
+    @staticmethod
+    def _text_hash(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def count(self, text: str, model_name: str = "gpt-3.5-turbo", approximate: bool = False) -> int:
         """
         Counts the number of tokens in the given text for the specified model.
 
@@ -31,14 +72,113 @@ class TokenCounter:
             text: The text to count tokens for.
             model_name: The name of the model to use for tokenization.
                         Defaults to "gpt-3.5-turbo".
+            approximate: Estimate from the calibrated characters-per-token
+                         ratio instead of encoding the text.
 
         Returns:
             The number of tokens in the text.
         """
         if not text:
             return 0
+        if approximate:
+            return self.approximate_count(text)
+        return self.count_many([text], model_name)[0]
+
+    def count_many(
+        self,
+        texts: Sequence[str],
+        model_name: str = "gpt-3.5-turbo",
+        approximate: bool = False
+    ) -> List[int]:
+        """
+        Counts tokens for several texts, in order.
+
+        Cached counts are reused; the remaining distinct texts are encoded in
+        a single batch.
+        """
+        if approximate:
+            return [self.approximate_count(text) for text in texts]
+
         encoding = self._get_encoding(model_name)
-        return len(encoding.encode(text))
+        counts = [0] * len(texts)
+        pending: Dict[Tuple[str, bytes], List[int]] = {}
+        with self._lock:
+            for index, text in enumerate(texts):
+                if not text:
+                    continue
+                key = (encoding.name, self._text_hash(text))
+                cached = self._counts.get(key)
+                if cached is not None:
+                    self._counts.move_to_end(key)
+                    self.hits += 1
+                    counts[index] = cached
+                else:
+                    self.misses += 1
+                    pending.setdefault(key, []).append(index)
+
+        if not pending:
+            return counts
+
+        keys = list(pending)
+        batch = [texts[pending[key][0]] for key in keys]
+        if len(batch) == 1:
+            encoded = [encoding.encode(batch[0])]
+        else:
+            encoded = encoding.encode_batch(batch, num_threads=self.batch_threads)
+
+        with self._lock:
+            for key, text, tokens in zip(keys, batch, encoded):
+                for index in pending[key]:
+                    counts[index] = len(tokens)
+                self._calibration_chars += len(text)
+                self._calibration_tokens += len(tokens)
+                if self.max_entries > 0:
+                    self._counts[key] = len(tokens)
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+        return counts
+
+    @property
+    def chars_per_token(self) -> float:
+        """Characters per token observed in exact counts, once enough text was seen."""
+        if self._calibration_chars >= CALIBRATION_MIN_CHARS and self._calibration_tokens:
+            return self._calibration_chars / self._calibration_tokens
+        return self.default_chars_per_token
+
+    def approximate_count(self, text: str) -> int:
+        """Estimates the token count of text from its length, without encoding it."""
+        if not text:
+            return 0
+        self.approximations += 1
+        return max(1, round(len(text) / self.chars_per_token))
+
+    def calibrate(self, texts: Sequence[str], model_name: str = "gpt-3.5-turbo") -> float:
+        """Counts sample texts exactly and returns the resulting characters-per-token ratio."""
+        self.count_many(texts, model_name)
+        return self.chars_per_token
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self.hits = 0
+            self.misses = 0
+            self.approximations = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._counts),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "approximations": self.approximations,
+            "chars_per_token": self.chars_per_token,
+        }
+
+
+# Default counter shared by the chunker, cost predictors and prompt optimizer
+SHARED_TOKEN_COUNTER = TokenCounter()
 
 # Example Usage (can be removed or kept for simple testing)
 if __name__ == '__main__':
@@ -180,6 +180,7 @@ class PerformanceMetrics(BaseModel):
     memory_usage_mb: Optional[float] = None
     cpu_usage_percent: Optional[float] = None
     items_processed: int = 0
+    items_emitted: int = 0
     throughput_per_second: Optional[float] = None
     errors_encountered: int = 0
     warnings_count: int = 0
@@ -513,15 +514,19 @@ class EmailPattern(EnhancedBaseModel):
     def set_confidence_level(self):
         """Automatically set confidence level based on confidence score"""
         if self.confidence >= 0.9:
-            self.confidence_level = ConfidenceLevel.VERY_HIGH
+            level = ConfidenceLevel.VERY_HIGH
         elif self.confidence >= 0.8:
-            self.confidence_level = ConfidenceLevel.HIGH
+            level = ConfidenceLevel.HIGH
         elif self.confidence >= 0.6:
-            self.confidence_level = ConfidenceLevel.MEDIUM
+            level = ConfidenceLevel.MEDIUM
         elif self.confidence >= 0.4:
-            self.confidence_level = ConfidenceLevel.LOW
+            level = ConfidenceLevel.LOW
         else:
-            self.confidence_level = ConfidenceLevel.VERY_LOW
+            level = ConfidenceLevel.VERY_LOW
+        
+        # Only assign on change: validate_assignment re-runs this validator
+        if self.confidence_level != level:
+            self.confidence_level = level
         return self
     
     # Rich characteristics
@@ -1,9 +1,14 @@
 """Utility classes for AI Intelligence Layer"""
 
-from .batch_processor import BatchEmailProcessor
+from .batch_processor import BatchEmailProcessor, MemoryPeakTracker
 from .confidence_scorer import ConfidenceScorer
+from .quantization import QUANTIZATION_MODES, dequantize, quantize
 
 __all__ = [
     'BatchEmailProcessor',
-    'ConfidenceScorer'
+    'MemoryPeakTracker',
+    'ConfidenceScorer',
+    'QUANTIZATION_MODES',
+    'quantize',
+    'dequantize'
 ]
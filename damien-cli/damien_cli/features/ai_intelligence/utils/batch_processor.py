@@ -4,6 +4,7 @@ import asyncio
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import logging
+import tracemalloc
 from tqdm import tqdm
 import numpy as np
 
@@ -11,11 +12,85 @@ from ..models import BatchProcessingResult, EmailEmbedding
 
 logger = logging.getLogger(__name__)
 
+class MemoryPeakTracker:
+    """Tracks peak Python heap growth of an operation with tracemalloc.
+    
+    Trackers may nest: an inner tracker resets the tracemalloc peak, so the
+    peak seen so far is folded into every active tracker first.
+    """
+    
+    _active: List['MemoryPeakTracker'] = []
+    
+    def __init__(self):
+        self._started_tracing = False
+        self._baseline = 0
+        self._peak = 0
+        self._running = False
+    
+    @classmethod
+    def _fold_active(cls):
+        if tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            for tracker in cls._active:
+                tracker._peak = max(tracker._peak, peak)
+    
+    def start(self) -> 'MemoryPeakTracker':
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        self._fold_active()
+        tracemalloc.reset_peak()
+        self._baseline = self._peak = tracemalloc.get_traced_memory()[0]
+        self._active.append(self)
+        self._running = True
+        return self
+    
+    def sample(self) -> float:
+        """Fold the current peak into this tracker and return it in MB"""
+        if self._running:
+            self._fold_active()
+        return self.peak_mb
+    
+    def stop(self) -> float:
+        """Stop tracking (idempotent) and return the peak growth in MB"""
+        if self._running:
+            self._fold_active()
+            self._active.remove(self)
+            if self._started_tracing:
+                tracemalloc.stop()
+            self._running = False
+        return self.peak_mb
+    
+    @property
+    def peak_mb(self) -> float:
+        return max(self._peak - self._baseline, 0) / 1024 / 1024
+    
+    def __enter__(self) -> 'MemoryPeakTracker':
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
 class BatchEmailProcessor:
     """Handles batch processing of emails for efficiency"""
     
-    def __init__(self, batch_size: int = 50):
+    def __init__(self, batch_size: int = 50, track_memory: bool = False):
         self.batch_size = batch_size
+        # tracemalloc slows every allocation, so peak heap tracking is opt-in;
+        # without it peak_memory_usage_mb is the end-of-run RSS
+        self.track_memory = track_memory
+    
+    def _start_memory_tracking(self) -> Optional[MemoryPeakTracker]:
+        return MemoryPeakTracker().start() if self.track_memory else None
+    
+    @staticmethod
+    def _stop_memory_tracking(memory_tracker: Optional[MemoryPeakTracker]) -> float:
+        """Peak heap growth in MB when tracked, else the current RSS in MB"""
+        if memory_tracker:
+            return memory_tracker.stop()
+        import psutil
+        import os
+        return psutil.Process(os.getpid()).memory_info().rss / 1024 / 1024
         
     async def process_embeddings(
         self, 
@@ -25,6 +100,7 @@ class BatchEmailProcessor:
         """Process emails in batches to generate embeddings"""
         
         start_time = datetime.now()
+        memory_tracker = self._start_memory_tracking()
         processed_count = 0
         skipped_count = 0
         error_count = 0
@@ -72,7 +148,7 @@ class BatchEmailProcessor:
             import os
             process = psutil.Process(os.getpid())
             memory_info = process.memory_info()
-            peak_memory_mb = memory_info.rss / 1024 / 1024  # Convert to MB
+            peak_memory_mb = self._stop_memory_tracking(memory_tracker)
             avg_cpu_percent = process.cpu_percent()
             
             # Create result object with all required fields
@@ -94,7 +170,8 @@ class BatchEmailProcessor:
                 embeddings_generated=len(embeddings),
                 errors=errors,
                 batch_size=self.batch_size,
-                parallel_workers=1  # Single-threaded for now
+                parallel_workers=1,  # Single-threaded for now
+                metadata={'rss_mb': memory_info.rss / 1024 / 1024}
             )
             
             return result, np.array(embeddings)
@@ -104,11 +181,7 @@ class BatchEmailProcessor:
             processing_time = (datetime.now() - start_time).total_seconds()
             
             # Return error result with all required fields
-            import psutil
-            import os
-            process = psutil.Process(os.getpid())
-            memory_info = process.memory_info()
-            peak_memory_mb = memory_info.rss / 1024 / 1024
+            peak_memory_mb = self._stop_memory_tracking(memory_tracker)
             
             error_result = BatchProcessingResult(
                 total_items=len(emails),
@@ -170,6 +243,7 @@ class BatchEmailProcessor:
         """Synchronous batch processing for general email operations"""
         
         start_time = datetime.now()
+        memory_tracker = self._start_memory_tracking()
         processed_count = 0
         error_count = 0
         errors = []
@@ -204,7 +278,7 @@ class BatchEmailProcessor:
             import os
             process = psutil.Process(os.getpid())
             memory_info = process.memory_info()
-            peak_memory_mb = memory_info.rss / 1024 / 1024
+            peak_memory_mb = self._stop_memory_tracking(memory_tracker)
             
             return BatchProcessingResult(
                 total_items=len(emails),
@@ -223,7 +297,8 @@ class BatchEmailProcessor:
                 
                 errors=errors,
                 batch_size=self.batch_size,
-                parallel_workers=1
+                parallel_workers=1,
+                metadata={'rss_mb': memory_info.rss / 1024 / 1024}
             )
             
         except Exception as e:
@@ -231,11 +306,7 @@ class BatchEmailProcessor:
             processing_time = (datetime.now() - start_time).total_seconds()
             
             # Calculate memory usage for error case
-            import psutil
-            import os
-            process = psutil.Process(os.getpid())
-            memory_info = process.memory_info()
-            peak_memory_mb = memory_info.rss / 1024 / 1024
+            peak_memory_mb = self._stop_memory_tracking(memory_tracker)
             
             error_result = BatchProcessingResult(
                 total_items=len(emails),
@@ -1,9 +1,62 @@
 """Confidence scoring utilities for pattern detection and rule suggestions"""
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import numpy as np
 from datetime import datetime, timedelta
 
+# Per-unit-strength confidence adjustment for each kind of user feedback
+FEEDBACK_MULTIPLIERS = {
+    'positive': 0.1,
+    'negative': -0.15,
+    'neutral': 0.0,
+}
+
+RELIABLE_SENDER_TYPES = ['Newsletter', 'Notification', 'Shopping']
+STRONG_SUBJECT_KEYWORDS = ['newsletter', 'receipt', 'order', 'invoice', 'digest']
+
+# One row per pattern: the statistics the type-specific scorers read,
+# reduced to fixed-width fields
+PATTERN_STATS_DTYPE = np.dtype([
+    ('pattern_type', 'U16'),
+    ('email_count', 'i8'),
+    ('total_emails', 'i8'),
+    ('average_per_day', 'f8'),        # sender
+    ('reliable_sender_type', '?'),    # sender
+    ('common_subject_count', 'i8'),   # sender
+    ('has_strong_keyword', '?'),      # subject
+    ('keyword_count', 'i8'),          # subject
+    ('has_dominant_sender', '?'),     # cluster
+    ('has_common_keywords', '?'),     # cluster
+    ('has_common_labels', '?'),       # cluster
+    ('time_pattern_type', 'U16'),     # time
+])
+
+
+def pattern_stats_array(patterns: Iterable[Tuple[str, int, int, Dict]]) -> np.ndarray:
+    """Build a PATTERN_STATS_DTYPE array from (pattern_type, email_count,
+    total_emails, pattern_characteristics) tuples, the score_pattern_confidence
+    arguments"""
+    
+    rows = []
+    for pattern_type, email_count, total_emails, characteristics in patterns:
+        keywords = characteristics.get('keywords', [])
+        rows.append((
+            pattern_type,
+            email_count,
+            total_emails,
+            characteristics.get('average_per_day', 0),
+            characteristics.get('sender_type', '') in RELIABLE_SENDER_TYPES,
+            len(characteristics.get('common_subjects', [])),
+            any(keyword in STRONG_SUBJECT_KEYWORDS for keyword in keywords),
+            len(keywords),
+            'dominant_sender' in characteristics,
+            bool(characteristics.get('common_keywords')),
+            bool(characteristics.get('common_labels')),
+            characteristics.get('pattern_type', ''),
+        ))
+    return np.array(rows, dtype=PATTERN_STATS_DTYPE)
+
+
 class ConfidenceScorer:
     """Calculates confidence scores for patterns and suggestions"""
     
@@ -62,8 +115,7 @@ class ConfidenceScorer:
         
         # Known sender types are more reliable
         sender_type = characteristics.get('sender_type', '')
-        reliable_types = ['Newsletter', 'Notification', 'Shopping']
-        if sender_type in reliable_types:
+        if sender_type in RELIABLE_SENDER_TYPES:
             score_boost += 0.2
         
         # Consistent subjects increase confidence
@@ -80,9 +132,8 @@ class ConfidenceScorer:
         
         # Strong keywords increase confidence
         keywords = characteristics.get('keywords', [])
-        strong_keywords = ['newsletter', 'receipt', 'order', 'invoice', 'digest']
         
-        if any(keyword in strong_keywords for keyword in keywords):
+        if any(keyword in STRONG_SUBJECT_KEYWORDS for keyword in keywords):
             score_boost += 0.3
         
         # Multiple keywords increase confidence
@@ -263,15 +314,133 @@ class ConfidenceScorer:
     ) -> float:
         """Adjust confidence based on user feedback"""
         
-        adjustment = 0.0
-        
-        if feedback_type == "positive":
-            adjustment = 0.1 * feedback_strength
-        elif feedback_type == "negative":
-            adjustment = -0.15 * feedback_strength
-        elif feedback_type == "neutral":
-            adjustment = 0.0
+        adjustment = FEEDBACK_MULTIPLIERS.get(feedback_type, 0.0) * feedback_strength
         
         # Apply adjustment with bounds
         new_confidence = original_confidence + adjustment
         return max(0.0, min(1.0, new_confidence))
+    
+    # ------------------------------------------------------------------
+    # Batch scoring
+    #
+    # These mirror the scalar methods above term for term, adding the same
+    # boosts in the same order, so each element is bit-identical to the
+    # corresponding scalar call.
+    # ------------------------------------------------------------------
+    
+    def score_pattern_confidence_batch(
+        self,
+        stats: np.ndarray,
+        feedback_adjustments: Optional[Dict[str, float]] = None
+    ) -> np.ndarray:
+        """Vectorized score_pattern_confidence over a PATTERN_STATS_DTYPE array.
+        
+        ``feedback_adjustments`` maps pattern types to a precomputed feedback
+        adjustment (see feedback_adjustments_for); matching rows are then
+        adjusted exactly as adjust_confidence_based_on_feedback would.
+        """
+        
+        pattern_type = stats['pattern_type']
+        email_count = stats['email_count']
+        
+        confidence = np.full(len(stats), self.base_confidence, dtype=np.float64)
+        
+        # Sample size factor
+        sample_ratio = email_count / np.maximum(stats['total_emails'], 1)
+        confidence += np.where(
+            email_count >= self.min_sample_size, np.minimum(sample_ratio, 0.3), 0.0
+        )
+        
+        # Pattern-specific adjustments
+        boost = np.zeros(len(stats), dtype=np.float64)
+        
+        is_sender = pattern_type == 'sender'
+        avg_per_day = stats['average_per_day']
+        sender_boost = np.where(avg_per_day > 1, 0.2, np.where(avg_per_day > 0.5, 0.1, 0.0))
+        sender_boost = sender_boost + np.where(stats['reliable_sender_type'], 0.2, 0.0)
+        sender_boost = sender_boost + np.where(stats['common_subject_count'] > 2, 0.1, 0.0)
+        boost = np.where(is_sender, sender_boost, boost)
+        
+        is_subject = pattern_type == 'subject'
+        subject_boost = np.where(stats['has_strong_keyword'], 0.3, 0.0)
+        subject_boost = subject_boost + np.where(stats['keyword_count'] > 1, 0.1, 0.0)
+        boost = np.where(is_subject, subject_boost, boost)
+        
+        is_cluster = pattern_type == 'cluster'
+        cluster_boost = np.full(len(stats), -0.1)
+        cluster_boost = cluster_boost + np.where(stats['has_dominant_sender'], 0.2, 0.0)
+        cluster_boost = cluster_boost + np.where(stats['has_common_keywords'], 0.1, 0.0)
+        cluster_boost = cluster_boost + np.where(stats['has_common_labels'], 0.1, 0.0)
+        boost = np.where(is_cluster, cluster_boost, boost)
+        
+        is_time = pattern_type == 'time'
+        time_kind = stats['time_pattern_type']
+        time_boost = np.where(time_kind == 'weekly', 0.2, np.where(time_kind == 'hourly', 0.1, 0.0))
+        boost = np.where(is_time, time_boost, boost)
+        
+        boost = np.where(pattern_type == 'label', 0.2, boost)
+        
+        has_boost = is_sender | is_subject | is_cluster | is_time | (pattern_type == 'label')
+        confidence = np.where(has_boost, confidence + boost, confidence)
+        
+        # Volume factor
+        confidence += np.where(email_count > 10, 0.1, 0.0)
+        confidence += np.where(email_count > 50, 0.1, 0.0)
+        
+        confidence = np.minimum(confidence, 1.0)
+        
+        if feedback_adjustments:
+            for feedback_type, adjustment in feedback_adjustments.items():
+                rows = pattern_type == feedback_type
+                confidence[rows] = np.clip(confidence[rows] + adjustment, 0.0, 1.0)
+        
+        return confidence
+    
+    def score_rule_suggestion_batch(
+        self,
+        pattern_confidence: np.ndarray,
+        email_count: np.ndarray,
+        rule_complexity: np.ndarray,
+        potential_impact: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized score_rule_suggestion over parallel arrays"""
+        
+        confidence = np.asarray(pattern_confidence, dtype=np.float64).copy()
+        email_count = np.asarray(email_count)
+        rule_complexity = np.asarray(rule_complexity)
+        potential_impact = np.asarray(potential_impact)
+        
+        # Adjust for rule complexity (simpler rules are more reliable)
+        confidence = np.where(rule_complexity == 1, confidence + 0.1, confidence)
+        confidence = np.where(rule_complexity > 3, confidence - 0.1, confidence)
+        
+        # Factor in potential impact
+        confidence = np.where(potential_impact > 0.5, confidence + 0.05, confidence)
+        
+        # Email count factor
+        confidence = np.where(email_count > 20, confidence + 0.05, confidence)
+        
+        return np.minimum(confidence, 1.0)
+    
+    def feedback_adjustments_for(self, feedback: Dict[str, Tuple[str, float]]) -> Dict[str, float]:
+        """Precompute per-pattern-type adjustments from (feedback_type, strength) pairs"""
+        
+        return {
+            pattern_type: FEEDBACK_MULTIPLIERS.get(feedback_type, 0.0) * strength
+            for pattern_type, (feedback_type, strength) in feedback.items()
+        }
+    
+    def adjust_confidence_batch(
+        self,
+        confidences: np.ndarray,
+        feedback_types: Iterable[str],
+        feedback_strength=1.0
+    ) -> np.ndarray:
+        """Vectorized adjust_confidence_based_on_feedback"""
+        
+        multipliers = np.array(
+            [FEEDBACK_MULTIPLIERS.get(feedback_type, 0.0) for feedback_type in feedback_types],
+            dtype=np.float64
+        )
+        adjusted = np.asarray(confidences, dtype=np.float64) + multipliers * feedback_strength
+        return np.clip(adjusted, 0.0, 1.0)
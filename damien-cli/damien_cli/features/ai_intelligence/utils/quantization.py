@@ -0,0 +1,59 @@
+"""Scalar quantization for stored embedding vectors
+
+Embeddings are produced as float32, but storing them that way costs 1.5KB per
+384-dimensional vector. Two opt-in storage formats trade a little precision
+for memory:
+
+- ``float16``: half-precision copy, 2x smaller, effectively lossless for
+  unit-length sentence embeddings
+- ``int8``: symmetric scalar quantization with one float32 scale per vector
+  (``value ~= code * scale``), about 4x smaller
+
+Dot products against int8 codes only need the per-vector scale applied to the
+final score, so search can score the codes directly and never materialise a
+float32 copy of the matrix.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+QUANTIZATION_MODES = ("none", "float16", "int8")
+
+_STORAGE_DTYPES = {
+    "none": np.float32,
+    "float16": np.float16,
+    "int8": np.int8,
+}
+
+
+def storage_dtype(quantization: str) -> np.dtype:
+    """NumPy dtype vectors are stored as under a quantization mode"""
+    if quantization not in _STORAGE_DTYPES:
+        raise ValueError(f"Unknown quantization mode: {quantization} (expected one of {QUANTIZATION_MODES})")
+    return np.dtype(_STORAGE_DTYPES[quantization])
+
+
+def quantize(vectors: np.ndarray, quantization: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Encode vectors (last axis is the vector) for storage.
+
+    Returns the stored codes and, for int8, one scale per vector; the scales
+    are None for the floating-point modes.
+    """
+    dtype = storage_dtype(quantization)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if quantization != "int8":
+        return vectors.astype(dtype, copy=False), None
+
+    peak = np.abs(vectors).max(axis=-1, keepdims=True)
+    scales = np.where(peak > 0, peak / 127.0, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(vectors / scales), -127, 127).astype(np.int8)
+    return codes, scales[..., 0]
+
+
+def dequantize(codes: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """Recover float32 vectors from stored codes and optional per-vector scales"""
+    vectors = np.asarray(codes, dtype=np.float32)
+    if scales is not None:
+        vectors = vectors * np.asarray(scales, dtype=np.float32)[..., None]
+    return vectors
@@ -0,0 +1,5 @@
+"""
+Test suite for AI Intelligence Categorization Module
+
+Tests for incremental and streaming pattern detection over email metadata.
+"""
@@ -0,0 +1,121 @@
+"""
+Tests for the pattern detector registry, parallel execution and per-detector timing
+"""
+
+import time
+
+import pytest
+
+from damien_cli.features.ai_intelligence.categorization import patterns as patterns_module
+from damien_cli.features.ai_intelligence.categorization.patterns import (
+    PATTERN_DETECTORS, EmailPatternDetector, register_pattern_detector
+)
+from damien_cli.features.ai_intelligence.models import EmailPattern, PatternCharacteristics, PatternType
+
+from .test_incremental import make_corpus, signature
+
+
+def detect_external_domains(detector, rows):
+    """Example plug-in detector: flags senders outside example.com"""
+    external = [row for row in rows if not row['from_sender'].endswith('@example.com')]
+    if len(external) < detector.min_pattern_size:
+        return []
+    return [EmailPattern(
+        pattern_type=PatternType.SENDER,
+        pattern_name="External Senders",
+        description=f"Emails from outside example.com ({len(external)} found)",
+        email_count=len(external),
+        total_email_universe=len(rows),
+        prevalence_rate=len(external) / len(rows),
+        confidence=0.9,
+        characteristics=PatternCharacteristics(primary_feature="external"),
+        example_email_ids=[row['id'] for row in external[:3]]
+    )]
+
+
+def failing_detector(detector, rows):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def restore_registry():
+    saved = dict(PATTERN_DETECTORS)
+    yield
+    PATTERN_DETECTORS.clear()
+    PATTERN_DETECTORS.update(saved)
+
+
+class TestPatternDetectorRegistry:
+
+    def test_builtin_detectors_are_registered(self):
+        assert list(PATTERN_DETECTORS)[:5] == ['sender', 'subject', 'label', 'time', 'attachment']
+        assert all(spec.columns for spec in PATTERN_DETECTORS.values())
+
+    def test_metrics_recorded_per_detector(self):
+        emails = make_corpus(time.time())
+        detector = EmailPatternDetector()
+        detector.detect_patterns(emails, None)
+
+        names = [m.operation_name for m in detector.last_detector_metrics]
+        assert names == [f"pattern_detector:{name}" for name in PATTERN_DETECTORS]
+        assert all(m.items_processed == len(emails) for m in detector.last_detector_metrics)
+        sender_metrics = detector.last_detector_metrics[0]
+        assert sender_metrics.items_emitted == 4
+        assert sender_metrics.duration_ms >= 0
+
+        report = detector.get_detector_report()
+        assert report['dominant_detector'] in PATTERN_DETECTORS
+        assert 0.0 <= report['dominant_share'] <= 1.0
+
+    def test_parallel_matches_serial(self):
+        emails = make_corpus(time.time())
+        serial = EmailPatternDetector().detect_patterns(emails, None)
+        parallel_detector = EmailPatternDetector(parallel_min_emails=0, max_workers=2)
+        parallel = parallel_detector.detect_patterns(emails, None)
+
+        assert signature(parallel) == signature(serial)
+        assert len(parallel_detector.last_detector_metrics) == len(PATTERN_DETECTORS)
+
+    def test_registered_detector_runs_without_editing_detect_patterns(self, restore_registry):
+        register_pattern_detector('external', ('id', 'from_sender'), detect_external_domains)
+        emails = make_corpus(time.time())
+
+        for detector in (EmailPatternDetector(), EmailPatternDetector(parallel_min_emails=0)):
+            found = detector.detect_patterns(emails, None)
+            assert any(p.pattern_name == "External Senders" for p in found)
+            assert detector.get_detector_report()['detectors']['external']['patterns_emitted'] == 1
+
+    def test_failing_detector_is_isolated(self, restore_registry):
+        register_pattern_detector('broken', ('id',), failing_detector)
+        detector = EmailPatternDetector()
+
+        found = detector.detect_patterns(make_corpus(time.time()), None)
+
+        assert found
+        assert detector.get_detector_report()['detectors']['broken']['errors'] == 1
+
+    def test_pool_failure_falls_back_to_serial(self, monkeypatch):
+        def unavailable(*args, **kwargs):
+            raise OSError("no processes here")
+
+        monkeypatch.setattr(patterns_module, 'ProcessPoolExecutor', unavailable)
+        emails = make_corpus(time.time())
+
+        found = EmailPatternDetector(parallel_min_emails=0).detect_patterns(emails, None)
+
+        assert signature(found) == signature(EmailPatternDetector().detect_patterns(emails, None))
+
+    def test_sender_heavy_hitters_match_exact_grouping_on_long_tail(self):
+        emails = make_corpus(time.time()) + [
+            {'id': f"tail_{i}", 'from_sender': f"user{i}@tail.com", 'subject': f"hello {i}"}
+            for i in range(2000)
+        ]
+        detector = EmailPatternDetector()
+        # 2060 emails / 200 slots: every sender with more than ~10 emails is kept
+        detector.heavy_hitter_capacity = 200
+
+        senders = {p.characteristics.primary_feature for p in detector._detect_sender_patterns(emails)}
+
+        assert senders == {
+            'news@weekly-digest.com', 'noreply@shop.com', 'alice@example.com', 'bob@example.com'
+        }
@@ -0,0 +1,192 @@
+"""
+Tests for the streaming analysis path: sketches, StreamingPatternSummary,
+MemoryPeakTracker and GmailEmailAnalyzer.analyze_inbox_streaming
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from damien_cli.features.ai_intelligence.categorization import gmail_analyzer as analyzer_module
+from damien_cli.features.ai_intelligence.categorization.gmail_analyzer import GmailEmailAnalyzer
+from damien_cli.features.ai_intelligence.categorization.patterns import EmailPatternDetector
+from damien_cli.features.ai_intelligence.categorization.sketches import (
+    CountMinSketch, ReservoirSample, SpaceSaving, heavy_hitters
+)
+from damien_cli.features.ai_intelligence.categorization.streaming import StreamingPatternSummary
+from damien_cli.features.ai_intelligence.utils.batch_processor import BatchEmailProcessor, MemoryPeakTracker
+
+from .test_incremental import make_corpus, signature
+
+
+class TestSketches:
+
+    def test_count_min_never_undercounts(self):
+        sketch = CountMinSketch(width=64, depth=4)
+        truth = {}
+        for i in range(2000):
+            key = f"sender{i % 97}@example.com"
+            sketch.add(key)
+            truth[key] = truth.get(key, 0) + 1
+
+        assert all(sketch.estimate(key) >= count for key, count in truth.items())
+        assert sketch.total == 2000
+
+    def test_count_min_merge_equals_single_pass(self):
+        left, right, whole = CountMinSketch(256, 4), CountMinSketch(256, 4), CountMinSketch(256, 4)
+        for i in range(500):
+            key = f"k{i % 13}"
+            (left if i % 2 else right).add(key)
+            whole.add(key)
+        left.merge(right)
+
+        assert (left.table == whole.table).all()
+        with pytest.raises(ValueError):
+            left.merge(CountMinSketch(128, 4))
+
+    def test_reservoir_is_bounded_and_merges(self):
+        first, second = ReservoirSample(3), ReservoirSample(3)
+        first.extend(range(100))
+        second.extend(range(100, 150))
+        first.merge(second)
+
+        assert len(first.items) == 3
+        assert first.seen == 150
+        assert all(0 <= item < 150 for item in first.items)
+
+    def test_space_saving_finds_heavy_hitters_in_bounded_memory(self):
+        summary = SpaceSaving(capacity=25, example_capacity=2)
+        stream = []
+        for i in range(3000):
+            if i % 10 == 0:
+                stream.append("heavy@a.com")
+            elif i % 20 == 5:
+                stream.append("medium@b.com")
+            else:
+                stream.append(f"tail{i}@long.com")
+        for i, sender in enumerate(stream):
+            summary.add(sender, item=i)
+
+        # Anything above total / capacity (120) must be monitored
+        assert len(summary.counts) <= 25
+        assert len(summary._heap) <= 4 * 25 + 1
+        assert {"heavy@a.com", "medium@b.com"} <= set(summary.candidates(120))
+        lower = summary.guaranteed(0)
+        assert lower["heavy@a.com"] <= 300 <= summary.estimate("heavy@a.com")
+        assert lower["medium@b.com"] <= 150 <= summary.estimate("medium@b.com")
+        assert len(summary.examples_for("heavy@a.com")) == 2
+
+    def test_heavy_hitters_recount_is_exact(self):
+        items = ["a"] * 12 + ["b"] * 3 + [f"t{i}" for i in range(200)] + ["b"] * 2
+        groups = heavy_hitters(items, lambda item: item, min_count=4, capacity=20)
+
+        # Sketch overestimates for tail keys are removed by the exact recount
+        assert groups == {"a": ["a"] * 12, "b": ["b"] * 5}
+
+
+class TestStreamingPatternSummary:
+
+    def test_matches_exact_detection_on_small_corpus(self):
+        emails = make_corpus(time.time())
+        detector = EmailPatternDetector()
+
+        summary = StreamingPatternSummary()
+        summary.add_emails(emails)
+
+        assert signature(detector.detect_patterns_from_state(summary)) == \
+            signature(detector.detect_patterns(emails, None))
+
+    def test_merge_matches_single_summary(self):
+        emails = make_corpus(time.time())
+        detector = EmailPatternDetector()
+
+        whole = StreamingPatternSummary()
+        whole.add_emails(emails)
+        left, right = StreamingPatternSummary(), StreamingPatternSummary()
+        left.add_emails(emails[:30])
+        right.add_emails(emails[30:])
+        left.merge(right)
+
+        assert left.total == whole.total
+        assert signature(detector.detect_patterns_from_state(left)) == \
+            signature(detector.detect_patterns_from_state(whole))
+
+    def test_candidates_stay_bounded_with_long_tail(self):
+        summary = StreamingPatternSummary(max_candidates=10)
+        emails = [
+            {'id': f"m{i}", 'from_sender': f"user{i % 500}@tail.com", 'subject': f"hello {i}"}
+            for i in range(5000)
+        ]
+        for start in range(0, len(emails), 250):
+            summary.add_emails(emails[start:start + 250])
+
+        assert len(summary.candidates) <= 10
+        assert len([key for key in summary.examples if key[0] == 'sender']) <= 10
+
+
+class TestMemoryPeakTracker:
+
+    def test_nested_trackers_report_inner_peak_to_outer(self):
+        with MemoryPeakTracker() as outer:
+            with MemoryPeakTracker() as inner:
+                block = bytearray(8 * 1024 * 1024)
+                del block
+
+        assert inner.peak_mb >= 7
+        assert outer.peak_mb >= inner.peak_mb
+
+    def test_batch_processor_traces_memory_only_when_asked(self, monkeypatch):
+        started = []
+        monkeypatch.setattr(MemoryPeakTracker, 'start', lambda self: started.append(self) or self)
+        emails = [{'id': str(i)} for i in range(5)]
+
+        class FakeGenerator:
+            def generate_batch_embeddings(self, batch):
+                return [np.ones(4) for _ in batch]
+
+        asyncio.run(BatchEmailProcessor(batch_size=2).process_embeddings(emails, FakeGenerator()))
+        assert started == []
+
+        result, embeddings = asyncio.run(
+            BatchEmailProcessor(batch_size=2, track_memory=True).process_embeddings(emails, FakeGenerator())
+        )
+        assert len(started) == 1
+        assert result.processed_successfully == 5
+        assert embeddings.shape == (5, 4)
+
+
+class TestStreamingAnalyzer:
+
+    def test_streams_all_pages_in_windows(self, monkeypatch):
+        corpus = {email['id']: email for email in make_corpus(time.time())}
+        ids = list(corpus)
+
+        def fake_list_messages(service, query_string=None, max_results=100, page_token=None):
+            start = int(page_token or 0)
+            page = ids[start:start + min(max_results, 25)]
+            next_token = str(start + len(page)) if start + len(page) < len(ids) else None
+            return {'messages': [{'id': i} for i in page], 'nextPageToken': next_token}
+
+        monkeypatch.setattr(analyzer_module.gmail_api_service, 'list_messages', fake_list_messages)
+
+        analyzer = GmailEmailAnalyzer(gmail_service=object())
+        windows = []
+
+        async def fake_details(message_ids, show_progress=True):
+            windows.append(len(message_ids))
+            return [corpus[i] for i in message_ids], 0
+
+        monkeypatch.setattr(analyzer, '_fetch_message_details', fake_details)
+
+        result = asyncio.run(analyzer.analyze_inbox_streaming(
+            max_emails=1000, min_confidence=0.0, window_size=20
+        ))
+
+        assert sum(windows) == len(ids)
+        assert max(windows) <= 20
+        assert result.total_emails_analyzed == len(ids)
+        assert result.patterns_detected
+        assert result.batch_results[0].peak_memory_usage_mb >= 0
+        assert result.summary_statistics['sketch_stats']['emails_summarized'] == len(ids)
@@ -11,6 +11,7 @@ Performance Targets Validated:
 - Scalable to large documents
 """
 
+import numpy as np
 import pytest
 import time
 from unittest.mock import Mock, patch
@@ -375,6 +376,254 @@ class TestIntelligentChunker:
         for _, metadata in chunks:
             assert metadata.strategy_used == ChunkingStrategy.PII_AWARE
 
+    def test_chunk_pii_sliced_from_document_detections(self, basic_config):
+        """Chunk-level PII equals detecting each chunk on its own, without rescanning."""
+        chunker = IntelligentChunker(config=basic_config)
+        detector = chunker.privacy_guardian.pii_detector
+        document = "Write to jane@example.com or call 555-123-4567 today. " * 3
+        chunks = [document[0:60], document[40:110], document[100:]]
+        
+        sliced = chunker._slice_pii_by_chunk(document, chunks)
+        
+        assert chunker.chunk_pii_sliced == 3
+        assert chunker.chunk_pii_redetected == 0
+        for chunk, chunk_pii in zip(chunks, sliced):
+            for entity in chunk_pii:
+                assert chunk[entity.start_char:entity.end_char] == entity.text
+        assert [e.text for e in sliced[0]] == [e.text for e in detector.detect(chunks[0])]
+
+    def test_chunk_pii_straddling_an_edge_is_clipped(self, basic_config):
+        """An entity cut by a chunk boundary is kept, clipped to the chunk."""
+        chunker = IntelligentChunker(config=basic_config)
+        document = "Write to jane@example.com today"
+        
+        sliced = chunker._slice_pii_by_chunk(document, [document[:15], document[13:]])
+        
+        assert [(e.text, e.start_char, e.end_char) for e in sliced[0]] == [("jane@e", 9, 15)]
+        assert [(e.text, e.start_char, e.end_char) for e in sliced[1]] == [("@example.com", 0, 12)]
+
+    def test_unlocated_chunk_is_redetected(self, basic_config):
+        """A chunk that is not a substring of the document falls back to detection."""
+        chunker = IntelligentChunker(config=basic_config)
+        
+        sliced = chunker._slice_pii_by_chunk("nothing here", ["mail jane@example.com"])
+        
+        assert chunker.chunk_pii_redetected == 1
+        assert [e.text for e in sliced[0]] == ["jane@example.com"]
+
+    def test_performance_stats_report_detection_cache(self, basic_config, sample_email):
+        """The PII detection cache hit rate is surfaced with the chunker stats."""
+        chunker = IntelligentChunker(config=basic_config)
+        chunker.chunk_document(sample_email)
+        chunker.chunk_document(sample_email)
+        
+        stats = chunker.get_performance_stats()
+        
+        assert stats["pii_detection_cache"]["hits"] >= 1
+        assert 0.0 <= stats["pii_detection_cache"]["hit_rate"] <= 1.0
+        assert stats["chunk_pii_sliced"] > 0
+
+    def test_pii_aware_chunking_scans_the_document_once(self, pii_email):
+        """PII-aware boundaries and chunk PII both come from one document-level detection."""
+        config = ChunkingConfig(max_chunk_size=30, overlap_size=0, strategy=ChunkingStrategy.PII_AWARE,
+                                enable_pii_protection=False)
+        chunker = IntelligentChunker(config=config)
+        detector = chunker.privacy_guardian.pii_detector
+        scanned = []
+        original_detect = detector.detect
+        detector.detect = lambda text, *args, **kwargs: scanned.append(text) or original_detect(text, *args, **kwargs)
+
+        chunks = chunker.chunk_document(pii_email)
+
+        assert len(chunks) > 1
+        assert scanned == [pii_email]
+        assert chunker.get_performance_stats()["document_pii_scans"] == 1
+        for content, metadata in chunks:
+            # No entity is split, so slicing agrees with scanning the chunk itself
+            assert [e.text for e in metadata.pii_entities] == [e.text for e in original_detect(content)]
+
+    def test_iter_chunks_is_lazy_and_windowed(self, basic_config, long_document):
+        """Chunks are yielded window by window with positions numbered across windows."""
+        basic_config.stream_window_chars = 1500
+        chunker = IntelligentChunker(config=basic_config)
+        windows = []
+        original_apply_strategy = chunker._apply_strategy
+        chunker._apply_strategy = lambda text: windows.append(text) or original_apply_strategy(text)
+
+        stream = chunker.iter_chunks(long_document)
+        first_content, first_metadata = next(stream)
+        assert first_metadata.original_position == 0
+        assert len(windows) < 3  # Nothing past the first windows was chunked yet
+
+        chunks = [(first_content, first_metadata)] + list(stream)
+        assert len(windows) > 2
+        assert all(len(window) <= 1500 + basic_config.max_chunk_size * 8 for window in windows)
+        assert [m.original_position for _, m in chunks] == list(range(len(chunks)))
+        assert all(m.token_count <= basic_config.max_chunk_size for _, m in chunks)
+
+    def test_iter_chunks_matches_chunk_document_for_small_content(self, basic_config, sample_email):
+        """Content that fits in one window streams to the same chunks as chunk_document."""
+        chunker = IntelligentChunker(config=basic_config)
+
+        expected = [content for content, _ in chunker.chunk_document(sample_email)]
+        streamed = [content for content, _ in chunker.iter_chunks(sample_email)]
+
+        assert streamed == expected
+
+    def test_iter_chunks_accepts_text_pieces(self, basic_config, long_document):
+        """An iterable of pieces chunks the same as the joined string."""
+        basic_config.stream_window_chars = 700
+        chunker = IntelligentChunker(config=basic_config)
+        pieces = (long_document[i:i + 97] for i in range(0, len(long_document), 97))
+
+        from_pieces = [content for content, _ in chunker.iter_chunks(pieces)]
+        from_string = [content for content, _ in chunker.iter_chunks(long_document)]
+
+        assert from_pieces == from_string
+        assert list(chunker.iter_chunks("")) == []
+
+    def test_iter_chunks_bounds_the_carry_when_a_window_does_not_split(self, semantic_config):
+        """Unpunctuated text is one 'sentence'; the carried tail must not grow with the document."""
+        semantic_config.stream_window_chars = 2000
+        chunker = IntelligentChunker(config=semantic_config)
+        chunker.embedding_model = Mock()
+        chunker.embedding_model.encode.side_effect = lambda sentences: np.ones((len(sentences), 4))
+        windows = []
+        original_apply_strategy = chunker._apply_strategy
+        chunker._apply_strategy = lambda text: windows.append(len(text)) or original_apply_strategy(text)
+        document = " ".join(f"attachment word {i}" for i in range(5000))
+
+        chunks = list(chunker.iter_chunks(document))
+
+        assert len(chunks) > 5
+        assert max(windows) <= 2 * semantic_config.stream_window_chars
+        assert max(len(content) for content, _ in chunks) <= 2 * semantic_config.stream_window_chars
+        assert all(m.token_count <= semantic_config.max_chunk_size for _, m in chunks[:-1])
+
+    def test_iter_chunks_slices_pii_per_window(self, basic_config):
+        """PII in every window is reported on the chunk that contains it."""
+        basic_config.stream_window_chars = 400
+        chunker = IntelligentChunker(config=basic_config)
+        document = "".join(f"Line {i} reach user{i}@example.com about the plan.\n" for i in range(60))
+
+        found = set()
+        for content, metadata in chunker.iter_chunks(document):
+            for entity in metadata.pii_entities:
+                assert content[entity.start_char:entity.end_char] == entity.text
+                found.add(entity.text)
+
+        # Addresses cut by a chunk edge are reported clipped; the rest are whole
+        assert len(found & {f"user{i}@example.com" for i in range(60)}) >= 50
+        assert chunker.chunk_pii_redetected == 0
+
+    @pytest.mark.parametrize("value, prefix_words", [
+        ("4111 1111 1111 1111", 37),  # Last space before the edge is inside the card
+        ("555 123 4567", 38),         # Likewise inside the phone number
+    ])
+    def test_iter_chunks_does_not_cut_inside_spaced_pii(self, basic_config, value, prefix_words):
+        """A window edge falling inside a spaced PII value moves before it, so it is still protected."""
+        basic_config.stream_window_chars = 200
+        basic_config.enable_pii_protection = True
+        chunker = IntelligentChunker(config=basic_config)
+        document = "word " * prefix_words + value + " thanks." * 40
+
+        output = "".join(content for content, _ in chunker.iter_chunks(document))
+
+        assert value.split()[-1] not in output
+        assert value.split()[0] not in output
+
+    def test_semantic_chunks_slice_pii_from_recorded_offsets(self, semantic_config):
+        """Semantic chunks are document slices whose PII needs no search or rescan."""
+        semantic_config.max_chunk_size = 80
+        chunker = IntelligentChunker(config=semantic_config)
+        chunker.embedding_model = Mock()
+        chunker.embedding_model.encode.side_effect = lambda sentences: np.ones((len(sentences), 4))
+        detector = chunker.privacy_guardian.pii_detector
+        scanned = []
+        original_detect = detector.detect
+        detector.detect = lambda text, *args, **kwargs: scanned.append(text) or original_detect(text, *args, **kwargs)
+        document = "".join(f"Line {i} reaches the team.\nCall 555-123-45{i:02d} today! " for i in range(30))
+
+        chunks = chunker.chunk_document(document)
+
+        assert len(chunks) > 1
+        assert scanned == [document]
+        assert chunker.chunk_pii_redetected == 0
+        phones = set()
+        for content, metadata in chunks:
+            assert content in document
+            for entity in metadata.pii_entities:
+                assert content[entity.start_char:entity.end_char] == entity.text
+                phones.add(entity.text)
+        assert {f"555-123-45{i:02d}" for i in range(30)} <= phones
+
+    def test_coherence_embeds_a_bounded_number_of_sentences(self, basic_config):
+        """Coherence scoring of a long chunk embeds at most coherence_max_sentences."""
+        basic_config.coherence_max_sentences = 8
+        chunker = IntelligentChunker(config=basic_config)
+        embedded = []
+
+        class FakeModel:
+            def encode(self, sentences):
+                embedded.append(len(sentences))
+                return np.ones((len(sentences), 4)) / 2
+
+        chunker.embedding_model = FakeModel()
+        score = chunker._calculate_coherence_score("".join(f"Sentence {i}. " for i in range(100)))
+
+        assert embedded == [8]
+        assert score == pytest.approx(1.0)
+
+    def test_sampled_coherence_averages_only_within_pair_similarities(self, basic_config):
+        """Sampled pairs are scored on their own, not against the neighbouring pair."""
+        basic_config.coherence_max_sentences = 8
+        chunker = IntelligentChunker(config=basic_config)
+
+        class FakeModel:
+            def encode(self, sentences):
+                # Both sentences of the k-th sampled pair point along axis k
+                return np.eye(4)[[position // 2 for position in range(len(sentences))]]
+
+        chunker.embedding_model = FakeModel()
+        score = chunker._calculate_coherence_score("".join(f"Sentence {i}. " for i in range(100)))
+
+        assert score == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("strategy", [ChunkingStrategy.SEMANTIC, ChunkingStrategy.HYBRID])
+    def test_each_sentence_is_embedded_once_per_document(self, strategy, long_document):
+        """Boundaries, hybrid refinement and coherence share one embedding per sentence."""
+        config = ChunkingConfig(max_chunk_size=120, overlap_size=0, strategy=strategy,
+                                enable_pii_protection=False, min_coherence_score=0.0)
+        chunker = IntelligentChunker(config=config)
+        encoded = []
+
+        class FakeModel:
+            def encode(self, sentences):
+                encoded.extend(sentences)
+                return np.array([[len(s), 1.0 + i % 3] for i, s in enumerate(sentences)])
+
+        chunker.embedding_model = FakeModel()
+        chunks = chunker.chunk_document(long_document)
+
+        assert len(chunks) > 1
+        assert len(encoded) == len(set(encoded))
+        stats = chunker.get_performance_stats()
+        assert stats["documents_chunked"] == 1
+        assert stats["embedding_calls_per_document"] == stats["embedding_calls"]
+        assert stats["sentence_embedding_hits"] > 0
+        assert all(0.0 <= m.semantic_coherence_score <= 1.0 + 1e-6 for _, m in chunks)
+
+    def test_adjacent_similarities_are_cosines(self):
+        """Adjacent similarities equal the cosine of each embedding with the next."""
+        chunker = IntelligentChunker(config=ChunkingConfig(enable_pii_protection=False))
+        chunker.embedding_model = Mock()
+        chunker.embedding_model.encode.return_value = np.array([[3.0, 4.0], [6.0, 8.0], [4.0, -3.0]])
+
+        embeddings = chunker._embed_sentences(["a", "b", "c"])
+
+        assert chunker._adjacent_similarities(embeddings) == pytest.approx([1.0, 0.0])
+        assert chunker.embedding_calls == 1
+
 
 class TestChunkingIntegration:
     """Integration tests for chunking with other AI intelligence components."""
@@ -0,0 +1,74 @@
+"""
+Test suite for the BM25 keyword index used by RAGEngine keyword and hybrid search
+"""
+
+import math
+
+from damien_cli.features.ai_intelligence.llm_integration.processing.keyword_index import BM25Index, tokenize
+
+
+class TestTokenize:
+
+    def test_email_addresses_are_kept_whole_and_split(self):
+        tokens = tokenize("Reply to Jane.Doe@Shop.co.uk today")
+
+        assert "jane.doe@shop.co.uk" in tokens
+        assert {"jane.doe", "shop.co.uk", "jane", "doe", "shop", "reply", "today"} <= set(tokens)
+
+    def test_empty_text(self):
+        assert tokenize("") == []
+
+
+class TestBM25Index:
+
+    def make_index(self, **kwargs):
+        index = BM25Index(**kwargs)
+        index.add("a", "quarterly invoice attached", subject="Invoice 42")
+        index.add("b", "team lunch on friday")
+        index.add("c", "invoice reminder for the invoice you missed")
+        index.add("d", "lunch menu")
+        return index
+
+    def test_scores_match_formula(self):
+        index = self.make_index()
+        hits = dict(index.search("lunch"))
+
+        doc_count, df, avgdl = 4, 2, index.total_length / 4
+        idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+        norm = 1.2 * (1 - 0.75 + 0.75 * index.doc_lengths["d"] / avgdl)
+        assert math.isclose(hits["d"], idf * 2.2 / (1 + norm))
+        assert hits["d"] > hits["b"]  # shorter document wins
+
+    def test_subject_terms_are_weighted(self):
+        index = self.make_index()
+
+        assert index.doc_terms["a"]["invoice"] == 3
+        assert index.search("invoice", limit=1)[0][0] in ("a", "c")
+
+    def test_replace_and_remove(self):
+        index = self.make_index()
+        index.add("b", "board meeting")
+        index.remove("d")
+
+        assert index.search("lunch") == []
+        assert [doc for doc, _ in index.search("meeting")] == ["b"]
+        assert index.total_length == sum(index.doc_lengths.values())
+        assert "lunch" not in index.postings
+
+    def test_sender_address_query(self):
+        index = BM25Index()
+        index.add("x", "order shipped", sender="Amazon <orders@amazon.com>")
+        index.add("y", "order shipped", sender="shop@example.com")
+
+        hits = index.search("orders@amazon.com")
+        assert hits[0][0] == "x" and hits[0][1] > 3 * hits[1][1]
+        assert index.search("amazon.com")[0][0] == "x"
+
+    def test_persistence_round_trip(self, tmp_path):
+        index = self.make_index(path=tmp_path / "bm25.json")
+        index.save()
+
+        reloaded = BM25Index.load(tmp_path / "bm25.json")
+
+        assert reloaded.search("invoice lunch") == index.search("invoice lunch")
+        assert reloaded.get_stats() == index.get_stats()
@@ -0,0 +1,246 @@
+"""
+Tests for PreprocessPipeline: ordering, error isolation, content-hash caching
+shared across pipelines, and the process pool path.
+"""
+
+import asyncio
+
+import pytest
+
+from damien_cli.features.ai_intelligence.llm_integration.processing.batch import (
+    BatchConfig, BatchProcessor, EmailItem, ProcessingStrategy
+)
+from damien_cli.features.ai_intelligence.llm_integration.processing.chunker import ChunkMetadata
+from damien_cli.features.ai_intelligence.llm_integration.processing import preprocess
+from damien_cli.features.ai_intelligence.llm_integration.processing.preprocess import (
+    PreprocessCache, PreprocessPipeline
+)
+from damien_cli.features.ai_intelligence.llm_integration.privacy.guardian import PrivacyGuardian
+
+
+class CountingGuardian:
+    """Masks digits, counts calls and fails on content containing 'boom'"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def protect_email_content(self, email_id, content, protection_level):
+        self.calls += 1
+        if "boom" in content:
+            raise ValueError("protection failed")
+        masked = "".join("#" if ch.isdigit() else ch for ch in content)
+        tokens = {"[DIGITS]": "".join(ch for ch in content if ch.isdigit())} if masked != content else {}
+        return masked, tokens, []
+
+
+class ParagraphChunker:
+    """One chunk per paragraph"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def chunk_document(self, content, document_id, preserve_privacy=False):
+        self.calls += 1
+        return [
+            (paragraph, ChunkMetadata(
+                chunk_id=f"p{i}", original_position=i,
+                token_count=len(paragraph.split()), character_count=len(paragraph),
+                semantic_coherence_score=0.9
+            ))
+            for i, paragraph in enumerate(content.split("\n\n"))
+        ]
+
+
+def make_pipeline(**kwargs):
+    kwargs.setdefault('privacy_guardian', CountingGuardian())
+    kwargs.setdefault('chunker', ParagraphChunker())
+    kwargs.setdefault('cache', PreprocessCache())
+    kwargs.setdefault('max_workers', 1)
+    return PreprocessPipeline(**kwargs)
+
+
+class TestPreprocessPipeline:
+
+    def test_protects_then_chunks_in_input_order(self):
+        pipeline = make_pipeline()
+        emails = [EmailItem(f"e{i}", f"call 555{i}\n\nsecond part {i}") for i in range(5)]
+
+        results = pipeline.process(emails)
+
+        assert [r.email_id for r in results] == [f"e{i}" for i in range(5)]
+        first = results[0]
+        assert first.success
+        assert first.protected_content == "call ####\n\nsecond part #"
+        assert first.privacy_tokens == {"[DIGITS]": "55500"}
+        assert [c.content for c in first.chunks] == ["call ####", "second part #"]
+        assert [c.chunk_id for c in first.chunks] == ["p0", "p1"]
+
+    def test_failure_is_isolated_to_its_email(self):
+        pipeline = make_pipeline()
+
+        results = pipeline.process([EmailItem("ok1", "fine"), EmailItem("bad", "boom"), EmailItem("ok2", "also fine")])
+
+        assert [r.success for r in results] == [True, False, True]
+        assert "protection failed" in results[1].error
+        assert pipeline.get_stats()['failed_emails'] == 1
+
+    def test_without_chunker_or_below_threshold_content_stays_whole(self):
+        pipeline = make_pipeline(chunker=None, privacy_guardian=None)
+        record = pipeline.process([EmailItem("e1", "one\n\ntwo")])[0].chunks
+        assert len(record) == 1 and record[0].chunk_id == "" and record[0].token_count == 2
+
+        chunker = ParagraphChunker()
+        pipeline = make_pipeline(chunker=chunker, chunk_min_chars=100)
+        assert len(pipeline.process([EmailItem("e1", "one\n\ntwo")])[0].chunks) == 1
+        assert chunker.calls == 0
+
+    def test_identical_content_is_processed_once(self):
+        guardian = CountingGuardian()
+        pipeline = make_pipeline(privacy_guardian=guardian)
+
+        results = pipeline.process([EmailItem("a", "same 1"), EmailItem("b", "same 1")])
+
+        assert guardian.calls == 1
+        assert [r.email_id for r in results] == ["a", "b"]
+        assert results[0].protected_content == results[1].protected_content
+
+    def test_cache_is_shared_between_pipelines(self):
+        cache = PreprocessCache()
+        guardian = CountingGuardian()
+        indexing = make_pipeline(privacy_guardian=guardian, cache=cache)
+        indexing.process([EmailItem("e1", "meet at 10\n\nbring notes")])
+
+        # Same guardian kind, different chunking: protection is reused, chunking reruns
+        chunker = ParagraphChunker()
+        analysis = make_pipeline(privacy_guardian=CountingGuardian(), chunker=chunker, cache=cache)
+        result = analysis.process([EmailItem("e1", "meet at 10\n\nbring notes")])[0]
+
+        assert guardian.calls == 1
+        assert analysis.privacy_guardian.calls == 0
+        assert chunker.calls == 1
+        assert result.protected_content == "meet at ##\n\nbring notes"
+
+        # Everything cached now
+        again = analysis.process([EmailItem("e1", "meet at 10\n\nbring notes")])[0]
+        assert again.from_cache
+        assert chunker.calls == 1
+
+    def test_cached_tokens_detokenize_with_every_guardian(self):
+        cache = PreprocessCache()
+        content = "Write to jane.doe@example.com about the invoice"
+        first = make_pipeline(privacy_guardian=PrivacyGuardian(), chunker=None, cache=cache)
+        second = make_pipeline(privacy_guardian=PrivacyGuardian(), chunker=None, cache=cache)
+
+        computed = first.process([EmailItem("a", content)])[0]
+        cached = second.process([EmailItem("b", content)])[0]
+
+        assert cached.from_cache
+        assert "jane.doe@example.com" not in cached.protected_content
+        assert first.privacy_guardian.tokenizer.detokenize_text(computed.protected_content) == content
+        assert second.privacy_guardian.tokenizer.detokenize_text(cached.protected_content) == content
+
+    def test_shared_content_is_filed_and_forgotten_per_email(self):
+        cache = PreprocessCache()
+        content = "Reach bob.smith@example.com tomorrow"
+        pipeline = make_pipeline(privacy_guardian=PrivacyGuardian(), chunker=None, cache=cache)
+        guardian = pipeline.privacy_guardian
+
+        first, duplicate = pipeline.process([EmailItem("a", content), EmailItem("b", content)])
+        hit = pipeline.process([EmailItem("c", content)])[0]
+
+        assert hit.from_cache
+        assert guardian.tokenizer.token_value_store.namespaces() == ["a", "b", "c"]
+
+        guardian.forget_email("a")
+        assert guardian.tokenizer.detokenize_text(duplicate.protected_content) == content
+        cached_pii = [
+            entity.text for entities in guardian.pii_detector.cache._entries.values() for entity in entities
+        ]
+        assert "bob.smith@example.com" not in cached_pii
+        assert pipeline.cache.get(pipeline._protection_key(first.content_hash)) is None
+
+    def test_failures_are_not_cached(self):
+        guardian = CountingGuardian()
+        pipeline = make_pipeline(privacy_guardian=guardian)
+        pipeline.process([EmailItem("bad", "boom")])
+        pipeline.process([EmailItem("bad", "boom")])
+        assert guardian.calls == 2
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = PreprocessCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+    @pytest.mark.asyncio
+    async def test_aprocess_from_event_loop(self):
+        pipeline = make_pipeline()
+        results = await pipeline.aprocess([EmailItem("e1", "abc 1")])
+        assert results[0].protected_content == "abc #"
+
+    def test_process_inside_running_loop(self):
+        pipeline = make_pipeline()
+
+        async def call_synchronously():
+            return pipeline.process([EmailItem("e1", "abc 1")])
+
+        assert asyncio.run(call_synchronously())[0].protected_content == "abc #"
+
+    def test_process_pool_matches_serial_results(self):
+        emails = [EmailItem(f"e{i}", f"mail user{i}@example.com\n\ntext {i % 3}") for i in range(12)] + [EmailItem("bad", "boom")]
+        pipeline = make_pipeline(privacy_guardian=PrivacyGuardian(), max_workers=2, parallel_min_emails=1)
+        try:
+            pooled = pipeline.process(emails)
+        finally:
+            pipeline.close()
+        serial = make_pipeline(privacy_guardian=PrivacyGuardian()).process(emails)
+
+        assert pipeline.get_stats()['pool_batches'] == 1
+        assert [r.email_id for r in pooled] == [r.email_id for r in serial]
+        assert [r.success for r in pooled] == [r.success for r in serial]
+        # Tokens are random, so compare the chunk layout and untokenized text
+        assert [[c.content[:5] for c in r.chunks] for r in pooled] == [[c.content[:5] for c in r.chunks] for r in serial]
+        assert pooled[4].chunks[1].content == "text 1"
+        # Tokens minted in workers are known to the parent's tokenizer
+        for result in pooled:
+            for token, value in result.privacy_tokens.items():
+                assert pipeline.privacy_guardian.tokenizer.token_value_store[token] == value
+
+    def test_pool_failure_falls_back_to_serial(self, monkeypatch):
+        def broken_pool(*args, **kwargs):
+            raise OSError("no processes here")
+
+        monkeypatch.setattr(preprocess, "ProcessPoolExecutor", broken_pool)
+        pipeline = make_pipeline(max_workers=2, parallel_min_emails=1)
+
+        results = pipeline.process([EmailItem(f"e{i}", f"text {i}") for i in range(4)])
+
+        assert all(r.success for r in results)
+        stats = pipeline.get_stats()
+        assert stats['pool_available'] is False
+        assert stats['serial_batches'] == 1
+
+
+class TestBatchProcessorIntegration:
+
+    def test_batch_processor_uses_pipeline_in_order(self):
+        cache = PreprocessCache()
+        guardian = CountingGuardian()
+        processor = BatchProcessor(
+            config=BatchConfig(enable_chunking=False, processing_strategy=ProcessingStrategy.PARALLEL, batch_size=3),
+            preprocess_pipeline=make_pipeline(privacy_guardian=guardian, chunker=None, cache=cache)
+        )
+        emails = [EmailItem(f"e{i}", f"order {i}") for i in range(7)] + [EmailItem("bad", "boom")]
+
+        result = processor.process_batch(emails)
+
+        assert [r.email_id for r in result.results] == [e.email_id for e in emails]
+        assert [r.success for r in result.results] == [True] * 7 + [False]
+        assert result.results[0].chunks == [{
+            'chunk_id': 'e0_full', 'content': 'order #', 'token_count': 2, 'semantic_coherence': 1.0
+        }]
+        assert result.results[0].analysis['privacy_context']['tokenization_map'] == {"[DIGITS]": "0"}
+        assert guardian.calls == 8
@@ -0,0 +1,754 @@
+"""
+Test suite for RAGEngine indexing, search caching and the index manifest
+
+Exercises index_email_batch, sync_index and search against an in-memory
+embedding model and collection so the staged indexing pipeline, the query
+caches and idempotent re-indexing can be checked without
+sentence-transformers weights or ChromaDB.
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+import pytest_asyncio
+
+from damien_cli.features.ai_intelligence.llm_integration.processing.batch import EmailItem
+from damien_cli.features.ai_intelligence.llm_integration.processing.chunker import ChunkMetadata
+from damien_cli.features.ai_intelligence.llm_integration.processing.preprocess import (
+    PreprocessCache, PreprocessPipeline
+)
+from damien_cli.features.ai_intelligence.llm_integration.processing import rag
+from damien_cli.features.ai_intelligence.llm_integration.processing.rag import (
+    EngineState, IndexManifest, IndexStatus, RAGConfig, RAGEngine, SearchType, VectorStore,
+    build_metadata_filter, filter_metadata
+)
+
+
+def fake_vector(text):
+    return [float(len(text)), float(sum(map(ord, text)) % 997)]
+
+
+class FakeEmbeddingModel:
+    """Deterministic stand-in for SentenceTransformer.encode"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.batch_sizes.append(len(texts))
+        return np.array([fake_vector(text) for text in texts], dtype=np.float32)
+
+
+class FakeCollection:
+    def __init__(self, fail_on_call=None):
+        self.calls = []
+        self.fail_on_call = fail_on_call
+        self.query_count = 0
+        self.store = {}
+        self.where_clauses = []
+        self.query_batch_sizes = []
+
+    def upsert(self, embeddings, documents, metadatas, ids):
+        self.calls.append((embeddings, documents, metadatas, ids))
+        if self.fail_on_call == len(self.calls):
+            raise RuntimeError("insert failed")
+        for chunk_id, document, metadata in zip(ids, documents, metadatas):
+            self.store[chunk_id] = (document, metadata)
+
+    def delete(self, ids):
+        for chunk_id in ids:
+            self.store.pop(chunk_id, None)
+
+    def get(self, ids, include, where=None):
+        found = [chunk_id for chunk_id in ids if chunk_id in self.store]
+        return {
+            'ids': found,
+            'documents': [self.store[chunk_id][0] for chunk_id in found],
+            'metadatas': [self.store[chunk_id][1] for chunk_id in found],
+        }
+
+    def query(self, query_embeddings, n_results, include, where=None):
+        self.query_count += 1
+        self.where_clauses.append(where)
+        self.query_batch_sizes.append(len(query_embeddings))
+        ids = list(self.store)[:n_results]
+        documents = [self.store[chunk_id][0] for chunk_id in ids]
+        metadatas = [self.store[chunk_id][1] for chunk_id in ids]
+        return {
+            'ids': [ids] * len(query_embeddings),
+            'documents': [documents] * len(query_embeddings),
+            'metadatas': [metadatas] * len(query_embeddings),
+            'distances': [[0.1] * len(documents)] * len(query_embeddings),
+        }
+
+
+class FakeVectorDatabase:
+    def __init__(self, collection):
+        self.collection = collection
+        self.persist_count = 0
+
+    def persist(self):
+        self.persist_count += 1
+
+
+class FakeGuardian:
+    """Passes content through, failing for chosen email IDs"""
+
+    def __init__(self, fail_ids=()):
+        self.fail_ids = set(fail_ids)
+
+    async def protect_email_content(self, email_id, content, protection_level):
+        if email_id in self.fail_ids:
+            raise ValueError("protection failed")
+        return content, {}, []
+
+
+class ParagraphChunker:
+    """One chunk per paragraph"""
+
+    def chunk_document(self, content, document_id, preserve_privacy=False):
+        return [
+            (paragraph, ChunkMetadata(
+                chunk_id=f"{document_id}_chunk_{i}", original_position=i,
+                token_count=len(paragraph.split()), character_count=len(paragraph),
+                semantic_coherence_score=1.0
+            ))
+            for i, paragraph in enumerate(content.split("\n\n"))
+        ]
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    """Build engines over a fake store, each with its own manifest under tmp_path"""
+    built = []
+
+    def build(collection, guardian=None, **config):
+        config.setdefault('manifest_path', str(tmp_path / f"engine_{len(built)}" / "manifest.json"))
+        guardian = guardian or FakeGuardian()
+        # A private cache keeps results from leaking between tests
+        engine = RAGEngine(
+            config=RAGConfig(**config),
+            privacy_guardian=guardian,
+            preprocess_pipeline=PreprocessPipeline(privacy_guardian=guardian, cache=PreprocessCache())
+        )
+        engine.embedding_model = FakeEmbeddingModel()
+        engine._embedding_model_loaded = True
+        engine.vector_db = FakeVectorDatabase(collection)
+        engine._connected = True
+        built.append(engine)
+        return engine
+
+    return build
+
+
+def make_emails(count):
+    return [
+        EmailItem(f"email_{i}", "word " * (1 + (i * 7) % 23), metadata={"subject": f"Subject {i}"})
+        for i in range(count)
+    ]
+
+
+class TestIndexEmailBatch:
+
+    @pytest.mark.asyncio
+    async def test_encodes_across_emails_in_large_batches(self, make_engine):
+        collection = FakeCollection()
+        engine = make_engine(collection, embedding_batch_size=8, index_insert_batch_size=10)
+
+        result = await engine.index_email_batch(make_emails(25))
+
+        assert result.status == IndexStatus.COMPLETED
+        assert result.indexed_chunks == 25
+        assert engine.embedding_model.batch_sizes == [8, 8, 8, 1]
+        assert [len(call[3]) for call in collection.calls] == [10, 10, 5]
+        assert result.performance_metrics['encode_batches'] == 4
+
+    @pytest.mark.asyncio
+    async def test_embeddings_stay_aligned_with_their_chunks(self, make_engine):
+        collection = FakeCollection()
+        engine = make_engine(collection, embedding_batch_size=4, index_insert_batch_size=7)
+
+        await engine.index_email_batch(make_emails(20))
+
+        inserted_ids = []
+        for embeddings, documents, metadatas, ids in collection.calls:
+            assert isinstance(embeddings, np.ndarray)
+            for row, document, metadata, chunk_id in zip(embeddings, documents, metadatas, ids):
+                assert row.tolist() == fake_vector(document)
+                assert chunk_id == f"{metadata['email_id']}_chunk_0"
+            inserted_ids.extend(ids)
+        assert inserted_ids == [f"email_{i}_chunk_0" for i in range(20)]
+
+    @pytest.mark.asyncio
+    async def test_failed_email_does_not_stop_the_batch(self, make_engine):
+        collection = FakeCollection()
+        engine = make_engine(collection, guardian=FakeGuardian(fail_ids={"email_3"}))
+
+        result = await engine.index_email_batch(make_emails(6))
+
+        assert result.status == IndexStatus.PARTIAL
+        assert result.indexed_chunks == 5
+        assert result.failed_chunks == 1
+        assert "email_3_chunk_0" not in collection.calls[0][3]
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_batch_is_counted(self, make_engine):
+        collection = FakeCollection(fail_on_call=2)
+        engine = make_engine(collection, index_insert_batch_size=4)
+
+        result = await engine.index_email_batch(make_emails(10))
+
+        assert result.status == IndexStatus.PARTIAL
+        assert result.indexed_chunks == 6
+        assert result.failed_chunks == 4
+
+
+class TestSearchCache:
+
+    @pytest_asyncio.fixture
+    async def engine(self, make_engine):
+        engine = make_engine(FakeCollection())
+        await engine.index_email_batch(make_emails(5))
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_is_served_from_cache(self, engine):
+        first = await engine.search("word", limit=3)
+        second = await engine.search("word", limit=3)
+
+        assert [r.chunk_id for r in second] == [r.chunk_id for r in first]
+        assert engine.vector_db.collection.query_count == 1
+        stats = engine.get_performance_stats()['operation_counts']
+        assert (stats['cache_hits'], stats['cache_misses']) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_new_parameters_reuse_query_embedding(self, engine):
+        encodes_before = len(engine.embedding_model.batch_sizes)
+        await engine.search("word", limit=3)
+        await engine.search("word", limit=2)
+
+        assert engine.vector_db.collection.query_count == 2
+        assert len(engine.embedding_model.batch_sizes) == encodes_before + 1
+        assert engine.embedding_cache_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_index_write_invalidates_results(self, engine):
+        await engine.search("word", limit=10)
+        generation = engine.index_generation
+        await engine.index_email_batch([EmailItem("late", "word word", metadata={})])
+        results = await engine.search("word", limit=10)
+
+        assert engine.index_generation == generation + 1
+        assert engine.vector_db.collection.query_count == 2
+        assert "late" in {r.email_id for r in results}
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_refreshed(self, engine):
+        await engine.search("word")
+        for entry in engine._result_cache.values():
+            entry.timestamp = datetime.now(timezone.utc) - timedelta(seconds=engine.config.cache_ttl_seconds + 1)
+        await engine.search("word")
+
+        assert engine.vector_db.collection.query_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_results_are_isolated_from_callers(self, engine):
+        first = await engine.search("word")
+        first[0].metadata['subject'] = "changed"
+        second = await engine.search("word")
+
+        assert second[0].metadata['subject'] != "changed"
+
+    @pytest.mark.asyncio
+    async def test_caching_can_be_disabled(self, make_engine):
+        engine = make_engine(FakeCollection(), enable_caching=False)
+        await engine.index_email_batch(make_emails(3))
+        await engine.search("word")
+        await engine.search("word")
+
+        assert engine.vector_db.collection.query_count == 2
+        assert engine.cache_hits == 0
+
+
+class FakeMessageStore:
+    def __init__(self, emails):
+        self.emails = list(emails)
+        self.requested_since = []
+
+    def fetch_since(self, since_timestamp):
+        self.requested_since.append(since_timestamp)
+        return iter(self.emails)
+
+
+class TestIdempotentIndexing:
+
+    @pytest.mark.asyncio
+    async def test_unchanged_emails_are_skipped(self, make_engine):
+        collection = FakeCollection()
+        engine = make_engine(collection)
+        emails = make_emails(6)
+
+        await engine.index_email_batch(emails)
+        generation = engine.index_generation
+        result = await engine.index_email_batch(emails)
+
+        assert result.indexed_chunks == 0
+        assert result.performance_metrics['skipped_unchanged_emails'] == 6
+        assert len(collection.calls) == 1
+        assert engine.index_generation == generation
+
+    @pytest.mark.asyncio
+    async def test_changed_email_is_upserted_and_orphans_deleted(self, make_engine):
+        collection = FakeCollection()
+        engine = make_engine(collection)
+        engine.chunker = ParagraphChunker()
+        long_text = "\n\n".join(f"Paragraph number {i} with some words." for i in range(6))
+
+        await engine.index_email_batch([EmailItem("e1", long_text, metadata={})])
+        first_count = engine.manifest.entries["e1"].chunk_count
+        assert first_count > 1
+
+        result = await engine.index_email_batch([EmailItem("e1", "short now", metadata={})])
+
+        assert result.indexed_chunks == 1
+        assert result.performance_metrics['deleted_orphan_chunks'] == first_count - 1
+        assert set(collection.store) == {"e1_chunk_0"}
+        assert engine.manifest.entries["e1"].chunk_count == 1
+
+    @pytest.mark.asyncio
+    async def test_model_change_forces_reindex(self, make_engine):
+        collection = FakeCollection()
+        engine = make_engine(collection)
+        emails = make_emails(3)
+        await engine.index_email_batch(emails)
+
+        engine.config.embedding_model = "another-model"
+        result = await engine.index_email_batch(emails)
+
+        assert result.indexed_chunks == 3
+
+    @pytest.mark.asyncio
+    async def test_duplicate_ids_in_batch_keep_last_version(self, make_engine):
+        collection = FakeCollection()
+        engine = make_engine(collection)
+
+        await engine.index_email_batch([
+            EmailItem("dup", "first version", metadata={}),
+            EmailItem("dup", "second version", metadata={}),
+        ])
+
+        assert [doc for doc, _ in collection.store.values()] == ["second version"]
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_is_retried_next_run(self, make_engine):
+        collection = FakeCollection(fail_on_call=1)
+        engine = make_engine(collection, index_insert_batch_size=2)
+        emails = make_emails(4)
+
+        await engine.index_email_batch(emails)
+        assert set(engine.manifest.entries) == {"email_2", "email_3"}
+
+        result = await engine.index_email_batch(emails)
+        assert result.indexed_chunks == 2
+        assert result.performance_metrics['skipped_unchanged_emails'] == 2
+
+    @pytest.mark.asyncio
+    async def test_manifest_survives_restart(self, make_engine, tmp_path):
+        manifest_path = str(tmp_path / "manifest.json")
+        emails = make_emails(4)
+        await make_engine(FakeCollection(), manifest_path=manifest_path).index_email_batch(emails)
+
+        collection = FakeCollection()
+        restarted = make_engine(collection, manifest_path=manifest_path)
+        result = await restarted.index_email_batch(emails)
+
+        assert result.performance_metrics['skipped_unchanged_emails'] == 4
+        assert collection.calls == []
+
+    def test_content_hash_covers_metadata(self):
+        base = EmailItem("x", "body", metadata={"subject": "a"})
+        renamed = EmailItem("x", "body", metadata={"subject": "b"})
+
+        assert IndexManifest.content_hash(base) != IndexManifest.content_hash(renamed)
+
+    def test_manifest_defaults_beside_the_active_backend(self, tmp_path):
+        config = RAGConfig(
+            vector_store=VectorStore.NUMPY,
+            chroma_persist_directory=str(tmp_path / "chroma"),
+            numpy_persist_directory=str(tmp_path / "numpy")
+        )
+        engine = RAGEngine(config=config, privacy_guardian=FakeGuardian())
+
+        assert engine.manifest.path == tmp_path / "numpy" / "index_manifest.json"
+
+    @pytest.mark.asyncio
+    async def test_manifest_from_another_backend_is_ignored(self, make_engine, tmp_path):
+        manifest_path = str(tmp_path / "manifest.json")
+        await make_engine(FakeCollection(), manifest_path=manifest_path).index_email_batch(make_emails(4))
+
+        switched = make_engine(
+            FakeCollection(), manifest_path=manifest_path,
+            vector_store=VectorStore.NUMPY, numpy_persist_directory=str(tmp_path / "index")
+        )
+        result = await switched.index_email_batch(make_emails(4))
+
+        assert result.indexed_chunks == 4
+        assert result.performance_metrics['skipped_unchanged_emails'] == 0
+
+    @pytest.mark.asyncio
+    async def test_empty_vector_store_forces_reindex(self, tmp_path):
+        config = dict(
+            vector_store=VectorStore.NUMPY,
+            numpy_persist_directory=str(tmp_path / "index"),
+            manifest_path=str(tmp_path / "manifest.json")
+        )
+        engine = RAGEngine(config=RAGConfig(**config), privacy_guardian=FakeGuardian())
+        engine.embedding_model = FakeEmbeddingModel()
+        engine._embedding_model_loaded = True
+        await engine._initialize_vector_db()
+        await engine.index_email_batch(make_emails(3))
+        await engine.vector_db.disconnect()
+
+        config['numpy_persist_directory'] = str(tmp_path / "moved")
+        restarted = RAGEngine(config=RAGConfig(**config), privacy_guardian=FakeGuardian())
+        assert len(restarted.manifest.entries) == 3
+        await restarted._initialize_vector_db()
+
+        assert restarted.manifest.entries == {}
+
+    @pytest.mark.asyncio
+    async def test_sync_index_advances_cursor(self, make_engine):
+        collection = FakeCollection()
+        engine = make_engine(collection)
+        store = FakeMessageStore(make_emails(7))
+
+        first = await engine.sync_index(store, batch_size=3)
+        cursor = engine.manifest.last_sync_timestamp
+        second = await engine.sync_index(store, batch_size=3)
+
+        assert first.indexed_chunks == 7
+        assert [len(call[3]) for call in collection.calls] == [3, 3, 1]
+        assert store.requested_since == [None, cursor]
+        assert second.indexed_chunks == 0
+        assert second.performance_metrics['skipped_unchanged_emails'] == 7
+
+    @pytest.mark.asyncio
+    async def test_sync_index_persists_once(self, make_engine, tmp_path):
+        engine = make_engine(FakeCollection(), manifest_path=str(tmp_path / "manifest.json"))
+        saves = []
+        engine.keyword_index.save = lambda: saves.append("keyword")
+        engine.manifest.save = lambda: saves.append("manifest")
+
+        await engine.sync_index(FakeMessageStore(make_emails(7)), batch_size=3)
+
+        assert engine.vector_db.persist_count == 1
+        assert saves == ["keyword", "manifest"]
+        assert engine.manifest.last_sync_timestamp is not None
+
+    @pytest.mark.asyncio
+    async def test_sync_index_keeps_cursor_on_failure(self, make_engine):
+        engine = make_engine(FakeCollection(), guardian=FakeGuardian(fail_ids={"email_1"}))
+
+        result = await engine.sync_index(FakeMessageStore(make_emails(3)))
+
+        assert result.status == IndexStatus.PARTIAL
+        assert engine.manifest.last_sync_timestamp is None
+
+
+class TestMetadataFilters:
+
+    def test_filter_columns_are_indexed(self):
+        email = EmailItem("e", "body", metadata={
+            "from": "Amazon Orders <Orders@Amazon.com>",
+            "date": "Tue, 01 Oct 2024 10:00:00 +0000",
+            "labels": ["INBOX", "CATEGORY_UPDATES"],
+        })
+
+        assert filter_metadata(email) == {
+            "timestamp": datetime(2024, 10, 1, 10, tzinfo=timezone.utc).timestamp(),
+            "sender_address": "orders@amazon.com",
+            "sender_domain": "amazon.com",
+            "label_INBOX": True,
+            "label_CATEGORY_UPDATES": True,
+        }
+
+    def test_filters_translate_to_where_clause(self):
+        where = build_metadata_filter({
+            "sender_domain": "Amazon.com",
+            "date_from": "2024-10-01",
+            "date_to": datetime(2024, 10, 31, tzinfo=timezone.utc),
+            "labels": ["INBOX"],
+        })
+
+        assert where == {"$and": [
+            {"sender_domain": "amazon.com"},
+            {"timestamp": {"$gte": datetime(2024, 10, 1, tzinfo=timezone.utc).timestamp()}},
+            {"timestamp": {"$lte": datetime(2024, 10, 31, tzinfo=timezone.utc).timestamp()}},
+            {"label_INBOX": True},
+        ]}
+        assert build_metadata_filter({"sender": ["A <a@x.com>", "b@y.com"]}) == \
+            {"sender_address": {"$in": ["a@x.com", "b@y.com"]}}
+        assert build_metadata_filter({}) is None
+        with pytest.raises(ValueError):
+            build_metadata_filter({"date_from": "not a date"})
+
+    def test_date_only_upper_bound_covers_the_whole_day(self):
+        next_day = datetime(2024, 11, 1, tzinfo=timezone.utc).timestamp()
+
+        assert build_metadata_filter({"date_to": "2024-10-31"}) == {"timestamp": {"$lt": next_day}}
+        assert build_metadata_filter({"date_to": datetime(2024, 10, 31).date()}) == \
+            {"timestamp": {"$lt": next_day}}
+        assert build_metadata_filter({"date_to": "2024-10-31T00:00:00+00:00"}) == \
+            {"timestamp": {"$lte": next_day - 86400}}
+
+    @pytest.mark.asyncio
+    async def test_search_pushes_filters_into_the_store(self, make_engine):
+        collection = FakeCollection()
+        engine = make_engine(collection)
+        await engine.index_email_batch(make_emails(3))
+
+        await engine.search("word", filters={"sender": "a@x.com"})
+        await engine.search("word")
+
+        assert collection.where_clauses == [{"sender_address": "a@x.com"}, None]
+
+
+class TestKeywordAndHybridSearch:
+
+    @pytest_asyncio.fixture
+    async def engine(self, make_engine):
+        engine = make_engine(FakeCollection(), hybrid_weight_vector=0.5, hybrid_weight_keyword=0.5)
+        emails = make_emails(60)
+        emails[59] = EmailItem("email_59", "the zeppelin invoice is overdue", metadata={"subject": "Zeppelin"})
+        await engine.index_email_batch(emails)
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_keyword_search_runs_standalone(self, engine):
+        encodes_before = len(engine.embedding_model.batch_sizes)
+
+        results = await engine.search("zeppelin", search_type=SearchType.KEYWORD)
+
+        assert [r.email_id for r in results] == ["email_59"]
+        assert results[0].metadata['keyword_score'] == 1.0
+        assert engine.vector_db.collection.query_count == 0
+        assert len(engine.embedding_model.batch_sizes) == encodes_before
+
+    @pytest.mark.asyncio
+    async def test_hybrid_finds_keyword_hits_the_vector_search_missed(self, engine):
+        semantic = await engine.search("zeppelin", limit=10, search_type=SearchType.SEMANTIC)
+        hybrid = await engine.search("zeppelin", limit=10, search_type=SearchType.HYBRID)
+
+        assert "email_59" not in {r.email_id for r in semantic}
+        assert "email_59" in {r.email_id for r in hybrid}
+
+    def test_rank_fusion_prefers_agreement(self, make_engine):
+        engine = make_engine(FakeCollection())
+        vector = [("a", "", {}, 0.9), ("b", "", {}, 0.8), ("c", "", {}, 0.7)]
+        keyword = [("b", "", {}, 1.0), ("d", "", {}, 0.5)]
+
+        fused = engine._fuse_rankings(vector, keyword)
+
+        assert [entry[0] for entry in fused][:2] == ["b", "a"]
+        b = fused[0]
+        assert (b[3], b[4]) == (0.8, 1.0)
+        assert 0.0 < fused[-1][5] < b[5] <= 1.0
+
+    @pytest.mark.asyncio
+    async def test_keyword_index_tracks_upserts_and_orphans(self, make_engine):
+        engine = make_engine(FakeCollection())
+        engine.chunker = ParagraphChunker()
+        await engine.index_email_batch([EmailItem("e1", "alpha one\n\nbravo two", metadata={})])
+        await engine.index_email_batch([EmailItem("e1", "charlie three", metadata={})])
+
+        assert set(engine.keyword_index.doc_terms) == {"e1_chunk_0"}
+        assert engine.keyword_index.search("bravo") == []
+        assert engine.keyword_index.search("charlie")[0][0] == "e1_chunk_0"
+
+    @pytest.mark.asyncio
+    async def test_existing_index_without_keyword_index_is_rebuilt(self, make_engine, tmp_path):
+        manifest_path = tmp_path / "manifest.json"
+        engine = make_engine(FakeCollection(), manifest_path=str(manifest_path))
+        await engine.index_email_batch(make_emails(3))
+        (manifest_path.parent / "keyword_index.json").unlink()
+
+        restarted = make_engine(FakeCollection(), manifest_path=str(manifest_path))
+        result = await restarted.index_email_batch(make_emails(3))
+
+        assert result.indexed_chunks == 3
+        assert len(restarted.keyword_index) == 3
+
+    @pytest.mark.asyncio
+    async def test_unreadable_keyword_index_is_rebuilt(self, make_engine, tmp_path):
+        manifest_path = tmp_path / "manifest.json"
+        engine = make_engine(FakeCollection(), manifest_path=str(manifest_path))
+        await engine.index_email_batch(make_emails(3))
+        (tmp_path / "keyword_index.json").write_text("{not json")
+
+        restarted = make_engine(FakeCollection(), manifest_path=str(manifest_path))
+        result = await restarted.index_email_batch(make_emails(3))
+
+        assert result.indexed_chunks == 3
+        assert len(restarted.keyword_index) == 3
+
+
+class TestSearchMany:
+
+    @pytest_asyncio.fixture
+    async def engine(self, tmp_path):
+        config = RAGConfig(
+            vector_store=VectorStore.NUMPY,
+            numpy_persist_directory=str(tmp_path / "index"),
+            manifest_path=str(tmp_path / "manifest.json"),
+            similarity_threshold=0.0,
+            adaptive_threshold=False
+        )
+        engine = RAGEngine(config=config, privacy_guardian=FakeGuardian())
+        engine.embedding_model = FakeEmbeddingModel()
+        engine._embedding_model_loaded = True
+        await engine._initialize_vector_db()
+        await engine.index_email_batch(make_emails(30))
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_matches_individual_searches(self, engine):
+        queries = ["word", "word word word", "word " * 12]
+        engine.config.enable_caching = False
+        expected = [[r.chunk_id for r in await engine.search(query, limit=4)] for query in queries]
+
+        batch = await engine.search_many(queries, limit=4)
+
+        assert [outcome.query for outcome in batch] == queries
+        assert [[r.chunk_id for r in outcome.results] for outcome in batch] == expected
+        assert all(outcome.processing_time_ms > 0 for outcome in batch)
+
+    @pytest.mark.asyncio
+    async def test_one_encode_and_one_store_request(self, make_engine):
+        collection = FakeCollection()
+        engine = make_engine(collection)
+        await engine.index_email_batch(make_emails(5))
+        encodes_before = len(engine.embedding_model.batch_sizes)
+
+        batch = await engine.search_many(["a", "bb", "a", "ccc"], limit=2)
+
+        assert engine.embedding_model.batch_sizes[encodes_before:] == [3]
+        assert collection.query_batch_sizes == [4]
+        assert len(batch) == 4 and all(len(outcome.results) == 2 for outcome in batch)
+
+    @pytest.mark.asyncio
+    async def test_cached_queries_skip_the_store(self, make_engine):
+        collection = FakeCollection()
+        engine = make_engine(collection)
+        await engine.index_email_batch(make_emails(5))
+        await engine.search("a", limit=2)
+
+        batch = await engine.search_many(["a", "b"], limit=2)
+
+        assert [outcome.from_cache for outcome in batch] == [True, False]
+        assert collection.query_batch_sizes == [1, 1]
+        assert engine.get_performance_stats()['operation_counts']['total_searches'] == 3
+
+    @pytest.mark.asyncio
+    async def test_keyword_batch_needs_no_embeddings(self, make_engine):
+        collection = FakeCollection()
+        engine = make_engine(collection)
+        await engine.index_email_batch(make_emails(5))
+        encodes_before = len(engine.embedding_model.batch_sizes)
+
+        batch = await engine.search_many(["word", "nothing"], search_type=SearchType.KEYWORD)
+
+        assert len(batch[0].results) == 5 and batch[1].results == []
+        assert len(engine.embedding_model.batch_sizes) == encodes_before
+        assert collection.query_count == 0
+
+
+class TestWarmStart:
+
+    def make_numpy_engine(self, tmp_path, monkeypatch, loader):
+        monkeypatch.setattr(rag, "SENTENCE_TRANSFORMERS_AVAILABLE", True)
+        monkeypatch.setattr(rag, "load_embedding_model", loader)
+        return RAGEngine(
+            config=RAGConfig(
+                vector_store=VectorStore.NUMPY,
+                numpy_persist_directory=str(tmp_path / "index"),
+                manifest_path=str(tmp_path / "manifest.json"),
+                similarity_threshold=0.0
+            ),
+            privacy_guardian=FakeGuardian(),
+            preprocess_pipeline=PreprocessPipeline(privacy_guardian=FakeGuardian(), cache=PreprocessCache())
+        )
+
+    @pytest.mark.asyncio
+    async def test_warmup_runs_in_background(self, tmp_path, monkeypatch):
+        release = threading.Event()
+
+        def slow_loader(model_name):
+            release.wait(5)
+            return FakeEmbeddingModel(), 2
+
+        engine = self.make_numpy_engine(tmp_path, monkeypatch, slow_loader)
+        assert engine.state == EngineState.COLD
+
+        task = engine.start_warmup()
+        assert engine.start_warmup() is task
+        await asyncio.sleep(0.05)
+        assert engine.state == EngineState.WARMING
+        assert engine.readiness['index_open'] is True
+        assert (await engine.health_check())['overall_status'] == 'warming'
+
+        # Keyword search is served from the open index without the model
+        assert await engine.search("anything", search_type=SearchType.KEYWORD) == []
+
+        # Semantic search waits for the model instead of failing
+        pending_search = asyncio.ensure_future(engine.search("word", limit=1))
+        await asyncio.sleep(0.05)
+        assert not pending_search.done()
+        release.set()
+        await pending_search
+
+        assert await task is True
+        readiness = engine.readiness
+        assert readiness['state'] == "ready"
+        assert readiness['vector_dimension'] == 2
+        assert set(readiness['warmup_timings_ms']) == {'index_open_ms', 'model_load_ms', 'total_ms'}
+
+    @pytest.mark.asyncio
+    async def test_failed_warmup_is_reported_and_retried(self, tmp_path, monkeypatch):
+        attempts = []
+
+        def flaky_loader(model_name):
+            attempts.append(model_name)
+            if len(attempts) == 1:
+                raise OSError("model download failed")
+            return FakeEmbeddingModel(), 2
+
+        engine = self.make_numpy_engine(tmp_path, monkeypatch, flaky_loader)
+
+        assert await engine.initialize() is False
+        assert engine.state == EngineState.FAILED
+        assert "Embedding model unavailable" in engine.readiness['error']
+
+        assert await engine.initialize() is True
+        assert engine.state == EngineState.READY
+        assert engine.readiness['error'] is None
+
+    def test_dimension_comes_from_model_metadata(self, monkeypatch):
+        class MetadataOnlyModel:
+            def __init__(self, name):
+                self.name = name
+
+            def get_sentence_embedding_dimension(self):
+                return 7
+
+            def encode(self, texts):
+                raise AssertionError("dimension should not need an encode")
+
+        sentence_transformers = pytest.importorskip("sentence_transformers")
+        monkeypatch.setattr(sentence_transformers, "SentenceTransformer", MetadataOnlyModel)
+
+        model, dimension = rag.load_embedding_model("tiny-model")
+
+        assert dimension == 7 and model.name == "tiny-model"
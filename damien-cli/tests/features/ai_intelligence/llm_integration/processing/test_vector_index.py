@@ -0,0 +1,358 @@
+"""
+Test suite for NumpyVectorIndex and the NUMPY RAGEngine backend
+
+Checks blocked exact search against brute force, upsert/delete semantics,
+persistence through the memory-mapped files, IVF recall, and recall of the
+float16/int8 quantized storage modes.
+"""
+
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from damien_cli.features.ai_intelligence.llm_integration.processing.batch import EmailItem
+
+from damien_cli.features.ai_intelligence.llm_integration.processing.rag import (
+    NumpyVectorDatabase, RAGConfig, RAGEngine, VectorStore
+)
+from damien_cli.features.ai_intelligence.llm_integration.processing.vector_index import NumpyVectorIndex
+
+from .test_rag_engine import FakeEmbeddingModel, FakeGuardian, make_emails
+
+
+def random_vectors(count, dimension=16, seed=0):
+    return np.random.default_rng(seed).normal(size=(count, dimension)).astype(np.float32)
+
+
+def brute_force(vectors, query, k):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ (query / np.linalg.norm(query))
+    return list(np.argsort(-scores)[:k])
+
+
+def filled_index(count, **kwargs):
+    index = NumpyVectorIndex(**kwargs)
+    vectors = random_vectors(count)
+    index.upsert(
+        embeddings=vectors,
+        documents=[f"doc {i}" for i in range(count)],
+        metadatas=[{"email_id": f"e{i}", "chunk_index": i} for i in range(count)],
+        ids=[f"c{i}" for i in range(count)]
+    )
+    return index, vectors
+
+
+class TestExactSearch:
+
+    def test_matches_brute_force_across_blocks(self):
+        index, vectors = filled_index(1000, block_rows=64)
+        query = random_vectors(1, seed=1)
+
+        result = index.query(query_embeddings=query, n_results=10)
+
+        expected = brute_force(vectors, query[0], 10)
+        assert result['ids'][0] == [f"c{i}" for i in expected]
+        assert result['documents'][0][0] == f"doc {expected[0]}"
+        assert result['metadatas'][0][0] == {"email_id": f"e{expected[0]}", "chunk_index": int(expected[0])}
+        distances = result['distances'][0]
+        assert distances == sorted(distances)
+
+    def test_fewer_rows_than_k(self):
+        index, _ = filled_index(3)
+
+        result = index.query(query_embeddings=random_vectors(1, seed=2), n_results=10)
+
+        assert len(result['ids'][0]) == 3
+
+    def test_empty_index_returns_empty_lists(self):
+        result = NumpyVectorIndex().query(query_embeddings=[[1.0, 0.0]], n_results=5)
+
+        assert result['documents'] == [[]]
+
+    def test_upsert_overwrites_in_place(self):
+        index, vectors = filled_index(20)
+        index.upsert(embeddings=vectors[:1] * -1, documents=["replaced"], metadatas=[{"v": 2}], ids=["c5"])
+
+        assert index.count() == 20
+        assert index.get(["c5"]) == {'ids': ["c5"], 'documents': ["replaced"], 'metadatas': [{"v": 2}]}
+        top = index.query(query_embeddings=-vectors[:1], n_results=1)
+        assert top['ids'][0] in (["c0"], ["c5"]) and top['distances'][0][0] < 1e-5
+
+    def test_deleted_rows_are_never_returned(self):
+        index, vectors = filled_index(50, block_rows=8)
+        index.delete([f"c{i}" for i in range(0, 50, 2)])
+
+        result = index.query(query_embeddings=vectors[:1], n_results=50)
+
+        assert index.count() == 25
+        assert len(result['ids'][0]) == 25
+        assert all(int(chunk_id[1:]) % 2 == 1 for chunk_id in result['ids'][0])
+
+    def test_dimension_mismatch_is_rejected(self):
+        index, _ = filled_index(5)
+
+        with pytest.raises(ValueError):
+            index.upsert(embeddings=np.ones((1, 3)), documents=["x"], metadatas=[{}], ids=["x"])
+
+
+class TestWhereFilters:
+
+    def test_operators_match_brute_force(self):
+        index, _ = filled_index(200)
+
+        def matching(where):
+            return set(np.flatnonzero(index.where_mask(where)))
+
+        assert matching({"email_id": "e7"}) == {7}
+        assert matching({"chunk_index": {"$gte": 190}}) == set(range(190, 200))
+        assert matching({"chunk_index": {"$in": [1, 2, 999]}}) == {1, 2}
+        assert matching({"$and": [{"chunk_index": {"$gt": 10}}, {"chunk_index": {"$lt": 13}}]}) == {11, 12}
+        assert matching({"$or": [{"email_id": "e1"}, {"email_id": "e3"}]}) == {1, 3}
+        assert len(matching({"email_id": {"$ne": "e1"}})) == 199
+        assert matching({"missing": {"$ne": "x"}}) == set()
+
+    def test_filtered_query_is_exact_over_subset(self):
+        index, vectors = filled_index(1000, block_rows=32)
+        query = random_vectors(1, seed=6)
+        where = {"chunk_index": {"$lt": 100}}
+
+        result = index.query(query_embeddings=query, n_results=5, where=where)
+
+        expected = brute_force(vectors[:100], query[0], 5)
+        assert result['ids'][0] == [f"c{i}" for i in expected]
+
+    def test_selective_filter_in_ivf_mode_is_exact(self):
+        index, vectors = filled_index(2000, mode="ivf", ivf_lists=40, ivf_probes=1, ivf_min_rows=0)
+        query = random_vectors(1, seed=7)
+
+        result = index.query(query_embeddings=query, n_results=3, where={"chunk_index": {"$lt": 20}})
+
+        assert index.centroids is not None
+        assert result['ids'][0] == [f"c{i}" for i in brute_force(vectors[:20], query[0], 3)]
+
+    def test_filter_with_no_matches(self):
+        index, _ = filled_index(10)
+
+        result = index.query(query_embeddings=random_vectors(1), n_results=5, where={"email_id": "nope"})
+
+        assert result['ids'] == [[]]
+
+    def test_filter_sees_writes_and_deletes(self):
+        index, vectors = filled_index(10)
+        assert index.where_mask({"email_id": "e1"}).sum() == 1
+        index.delete(["c1"])
+        index.upsert(embeddings=vectors[:1], documents=["x"], metadatas=[{"email_id": "e1"}], ids=["new"])
+
+        assert index.query(query_embeddings=vectors[:1], n_results=5, where={"email_id": "e1"})['ids'] == [["new"]]
+
+    def test_sparse_columns_match_only_rows_that_set_them(self):
+        index, vectors = filled_index(10)
+        index.upsert(embeddings=vectors[:2], documents=["a", "b"], ids=["c0", "c1"], metadatas=[
+            {"email_id": "e0", "label_INBOX": True}, {"email_id": "e1", "label_WORK": True}
+        ])
+
+        assert set(np.flatnonzero(index.where_mask({"label_INBOX": True}))) == {0}
+        assert set(np.flatnonzero(index.where_mask({"label_WORK": {"$ne": False}}))) == {1}
+        index.upsert(embeddings=vectors[:1], documents=["a"], metadatas=[{"email_id": "e0"}], ids=["c0"])
+        assert index.get(["c0"])['metadatas'] == [{"email_id": "e0"}]
+        assert "label_INBOX" not in index.columns
+
+
+class TestPersistence:
+
+    def test_reload_from_disk(self, tmp_path):
+        index, vectors = filled_index(300, directory=str(tmp_path), initial_capacity=16)
+        index.delete(["c7"])
+        index.persist()
+        query = random_vectors(1, seed=3)
+        before = index.query(query_embeddings=query, n_results=5)
+
+        reopened = NumpyVectorIndex(directory=str(tmp_path))
+
+        assert isinstance(reopened._vectors, np.memmap)
+        assert reopened.count() == 299
+        assert reopened.query(query_embeddings=query, n_results=5)['ids'] == before['ids']
+
+    def test_persist_compacts_mostly_deleted_index(self, tmp_path):
+        index, vectors = filled_index(100, directory=str(tmp_path))
+        index.delete([f"c{i}" for i in range(60)])
+        index.persist()
+
+        assert index.rows == 40
+        reopened = NumpyVectorIndex(directory=str(tmp_path))
+        assert reopened.get(["c60"])['documents'] == ["doc 60"]
+        result = reopened.query(query_embeddings=vectors[70:71], n_results=1)
+        assert result['ids'][0] == ["c70"]
+
+
+    def test_metadata_size_does_not_grow_with_label_count(self, tmp_path):
+        def metadata_bytes(directory, labels):
+            index = NumpyVectorIndex(directory=str(directory))
+            index.upsert(
+                embeddings=random_vectors(500),
+                documents=["doc"] * 500,
+                metadatas=[{"email_id": f"e{i}", f"label_L{i % labels:03d}": True} for i in range(500)],
+                ids=[f"c{i}" for i in range(500)]
+            )
+            index.persist()
+            return (directory / NumpyVectorIndex.METADATA_FILE).stat().st_size
+
+        few = metadata_bytes(tmp_path / "few", labels=1)
+        many = metadata_bytes(tmp_path / "many", labels=250)
+
+        # Dense columns would hold 250 x 500 entries; sparse ones only the key names grow
+        assert many < few * 1.5
+
+    def test_reads_dense_version_1_columns(self, tmp_path):
+        index, _ = filled_index(5, directory=str(tmp_path))
+        index.persist()
+        metadata_path = tmp_path / NumpyVectorIndex.METADATA_FILE
+        data = json.loads(metadata_path.read_text())
+        data['version'] = 1
+        data['columns'] = {"email_id": [f"e{i}" for i in range(5)], "label_X": [True, None, None, None, None]}
+        metadata_path.write_text(json.dumps(data))
+
+        reopened = NumpyVectorIndex(directory=str(tmp_path))
+
+        assert reopened.get(["c0", "c1"])['metadatas'] == [{"email_id": "e0", "label_X": True}, {"email_id": "e1"}]
+        assert set(np.flatnonzero(reopened.where_mask({"label_X": True}))) == {0}
+
+
+class TestIVF:
+
+    def test_recall_against_exact(self):
+        centers = random_vectors(20, seed=4) * 5
+        rng = np.random.default_rng(5)
+        vectors = (centers[rng.integers(0, 20, 4000)] + rng.normal(size=(4000, 16))).astype(np.float32)
+        exact = NumpyVectorIndex()
+        ivf = NumpyVectorIndex(mode="ivf", ivf_lists=20, ivf_probes=4, ivf_min_rows=1000)
+        for index in (exact, ivf):
+            index.upsert(embeddings=vectors, documents=[""] * 4000, metadatas=[{}] * 4000,
+                         ids=[f"c{i}" for i in range(4000)])
+
+        queries = vectors[:50] + rng.normal(scale=0.1, size=(50, 16)).astype(np.float32)
+        exact_ids = exact.query(query_embeddings=queries, n_results=10)['ids']
+        ivf_ids = ivf.query(query_embeddings=queries, n_results=10)['ids']
+
+        assert ivf.centroids is not None
+        recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(exact_ids, ivf_ids)])
+        assert recall >= 0.9
+
+    def test_rows_added_after_training_are_searchable(self):
+        index, vectors = filled_index(200, mode="ivf", ivf_lists=4, ivf_probes=4, ivf_min_rows=0)
+        index.train_ivf()
+        index.upsert(embeddings=-vectors[:1], documents=["late"], metadatas=[{}], ids=["late"])
+
+        assert index.query(query_embeddings=-vectors[:1], n_results=1)['ids'] == [["late"]]
+
+
+class TestQuantization:
+
+    @pytest.mark.parametrize("quantization,dtype", [("float16", np.float16), ("int8", np.int8)])
+    def test_recall_against_float32(self, quantization, dtype):
+        exact, vectors = filled_index(2000, block_rows=256)
+        quantized, _ = filled_index(2000, block_rows=256, quantization=quantization)
+        queries = random_vectors(30, seed=6)
+
+        exact_ids = exact.query(query_embeddings=queries, n_results=10)['ids']
+        quantized_result = quantized.query(query_embeddings=queries, n_results=10)
+
+        assert quantized._vectors.dtype == dtype
+        recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(exact_ids, quantized_result['ids'])])
+        assert recall >= 0.95
+        distances = quantized_result['distances'][0]
+        assert distances == sorted(distances)
+
+    def test_int8_memory_and_returned_embeddings(self):
+        exact, vectors = filled_index(500)
+        int8, _ = filled_index(500, quantization="int8")
+
+        stats = int8.get_stats()
+        assert stats['quantization'] == "int8"
+        assert stats['matrix_bytes'] * 4 == exact.get_stats()['matrix_bytes']
+        returned = int8.query(query_embeddings=vectors[:1], n_results=1, include=['embeddings'])
+        normalized = vectors[0] / np.linalg.norm(vectors[0])
+        assert np.allclose(returned['embeddings'][0][0], normalized, atol=0.02)
+
+    def test_int8_survives_compaction_and_reload(self, tmp_path):
+        index, vectors = filled_index(100, directory=str(tmp_path), quantization="int8")
+        index.delete([f"c{i}" for i in range(60)])
+        index.persist()
+
+        # The stored format wins over the requested one
+        reopened = NumpyVectorIndex(directory=str(tmp_path))
+
+        assert reopened.quantization == "int8"
+        assert reopened._vectors.dtype == np.int8
+        assert reopened.query(query_embeddings=vectors[70:71], n_results=1)['ids'] == [["c70"]]
+
+    def test_ivf_over_int8_rows(self):
+        index, vectors = filled_index(400, mode="ivf", ivf_lists=4, ivf_probes=4, ivf_min_rows=0,
+                                      quantization="int8")
+        index.train_ivf()
+
+        assert index.query(query_embeddings=vectors[5:6], n_results=1)['ids'] == [["c5"]]
+
+    def test_unknown_mode_is_rejected(self):
+        with pytest.raises(ValueError):
+            NumpyVectorIndex(quantization="int4")
+
+
+class TestNumpyBackend:
+
+    @pytest.mark.asyncio
+    async def test_engine_indexes_and_searches(self, tmp_path):
+        config = RAGConfig(
+            vector_store=VectorStore.NUMPY,
+            numpy_persist_directory=str(tmp_path / "index"),
+            manifest_path=str(tmp_path / "manifest.json"),
+            similarity_threshold=0.0
+        )
+        engine = RAGEngine(config=config, privacy_guardian=FakeGuardian())
+        engine.embedding_model = FakeEmbeddingModel()
+        engine._embedding_model_loaded = True
+        assert await engine._initialize_vector_db()
+        assert isinstance(engine.vector_db, NumpyVectorDatabase)
+
+        result = await engine.index_email_batch(make_emails(12))
+        results = await engine.search("word word", limit=3)
+
+        assert result.indexed_chunks == 12
+        assert results and results[0].email_id.startswith("email_")
+        assert engine.vector_db.get_stats()['total_chunks'] == 12
+        assert (tmp_path / "index" / "metadata.json").exists()
+        database_stats = engine.get_index_stats()['database_stats']
+        assert database_stats['database_type'] == "numpy"
+        assert database_stats['rows'] == 12
+        assert database_stats['mode'] == "exact"
+        assert database_stats['quantization'] == "none"
+
+    @pytest.mark.asyncio
+    async def test_engine_filters_by_sender_and_date(self, tmp_path):
+        config = RAGConfig(
+            vector_store=VectorStore.NUMPY,
+            numpy_persist_directory=str(tmp_path / "index"),
+            manifest_path=str(tmp_path / "manifest.json"),
+            similarity_threshold=0.0,
+            adaptive_threshold=False
+        )
+        engine = RAGEngine(config=config, privacy_guardian=FakeGuardian())
+        engine.embedding_model = FakeEmbeddingModel()
+        engine._embedding_model_loaded = True
+        await engine._initialize_vector_db()
+        emails = [
+            EmailItem(f"m{i}", "invoice " * (i + 1), metadata={
+                "from": "Amazon <orders@amazon.com>" if i % 2 else "friend@example.com",
+                "date": datetime(2024, 9 + i % 3, 5, tzinfo=timezone.utc).isoformat(),
+            })
+            for i in range(12)
+        ]
+        await engine.index_email_batch(emails)
+
+        results = await engine.search("invoice", limit=10, filters={
+            "sender_domain": "amazon.com", "date_from": "2024-10-01", "date_to": "2024-10-31"
+        })
+
+        assert {r.email_id for r in results} == {"m1", "m7"}
@@ -0,0 +1,5 @@
+"""
+Test suite for AI Intelligence utility classes
+
+Tests for confidence scoring and batch processing helpers.
+"""
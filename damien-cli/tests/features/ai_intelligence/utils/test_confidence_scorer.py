@@ -0,0 +1,121 @@
+"""
+Property tests for the vectorized ConfidenceScorer batch API
+
+Every batch method must return exactly (bit-for-bit) what the scalar method
+returns for each element, over randomly generated inputs.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from damien_cli.features.ai_intelligence.utils.confidence_scorer import (
+    FEEDBACK_MULTIPLIERS, ConfidenceScorer, pattern_stats_array
+)
+
+PATTERN_TYPES = ['sender', 'subject', 'cluster', 'time', 'label', 'attachment', 'unknown']
+FEEDBACK_TYPES = list(FEEDBACK_MULTIPLIERS) + ['ignored']
+SEEDS = range(25)
+
+
+def random_characteristics(rng):
+    characteristics = {}
+    if rng.random() < 0.8:
+        characteristics['average_per_day'] = rng.choice([0, 0.5, 1, rng.uniform(0, 3)])
+    if rng.random() < 0.5:
+        characteristics['sender_type'] = rng.choice(['Newsletter', 'Notification', 'Shopping', 'Regular Sender'])
+    if rng.random() < 0.5:
+        characteristics['common_subjects'] = ['s'] * rng.randint(0, 5)
+    if rng.random() < 0.5:
+        characteristics['keywords'] = rng.sample(['newsletter', 'receipt', 'hello', 'order', 'misc', 'digest'], rng.randint(0, 3))
+    if rng.random() < 0.3:
+        characteristics['dominant_sender'] = 'a@b.com'
+    if rng.random() < 0.5:
+        characteristics['common_keywords'] = ['x'] * rng.randint(0, 2)
+    if rng.random() < 0.5:
+        characteristics['common_labels'] = ['L'] * rng.randint(0, 2)
+    if rng.random() < 0.6:
+        characteristics['pattern_type'] = rng.choice(['weekly', 'hourly', 'monthly', ''])
+    return characteristics
+
+
+def random_patterns(rng, count=200):
+    patterns = []
+    for _ in range(count):
+        total = rng.choice([0, 1, rng.randint(1, 5000)])
+        email_count = rng.choice([0, 2, 3, 10, 11, 50, 51, rng.randint(0, max(total, 1))])
+        patterns.append((rng.choice(PATTERN_TYPES), email_count, total, random_characteristics(rng)))
+    return patterns
+
+
+@pytest.fixture
+def scorer():
+    return ConfidenceScorer()
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_pattern_batch_matches_scalar(scorer, seed):
+    patterns = random_patterns(random.Random(seed))
+
+    batch = scorer.score_pattern_confidence_batch(pattern_stats_array(patterns))
+    scalar = np.array([scorer.score_pattern_confidence(*pattern) for pattern in patterns])
+
+    assert np.array_equal(batch, scalar)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_pattern_batch_with_feedback_matches_scalar(scorer, seed):
+    rng = random.Random(seed)
+    patterns = random_patterns(rng)
+    feedback = {
+        pattern_type: (rng.choice(FEEDBACK_TYPES), rng.uniform(0, 3))
+        for pattern_type in rng.sample(PATTERN_TYPES, 3)
+    }
+
+    batch = scorer.score_pattern_confidence_batch(
+        pattern_stats_array(patterns), scorer.feedback_adjustments_for(feedback)
+    )
+    expected = []
+    for pattern in patterns:
+        confidence = scorer.score_pattern_confidence(*pattern)
+        if pattern[0] in feedback:
+            confidence = scorer.adjust_confidence_based_on_feedback(confidence, *feedback[pattern[0]])
+        expected.append(confidence)
+
+    assert np.array_equal(batch, np.array(expected))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_rule_suggestion_batch_matches_scalar(scorer, seed):
+    rng = random.Random(seed)
+    rows = [
+        (rng.uniform(0, 1), rng.choice([0, 20, 21, rng.randint(0, 100)]),
+         rng.randint(0, 6), rng.choice([0.5, rng.uniform(0, 1)]))
+        for _ in range(200)
+    ]
+
+    batch = scorer.score_rule_suggestion_batch(*(np.array(column) for column in zip(*rows)))
+    scalar = np.array([scorer.score_rule_suggestion(*row) for row in rows])
+
+    assert np.array_equal(batch, scalar)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_feedback_batch_matches_scalar(scorer, seed):
+    rng = random.Random(seed)
+    confidences = [rng.uniform(0, 1) for _ in range(200)]
+    feedback_types = [rng.choice(FEEDBACK_TYPES) for _ in range(200)]
+    strength = rng.uniform(0, 5)
+
+    batch = scorer.adjust_confidence_batch(np.array(confidences), feedback_types, strength)
+    scalar = np.array([
+        scorer.adjust_confidence_based_on_feedback(c, t, strength)
+        for c, t in zip(confidences, feedback_types)
+    ])
+
+    assert np.array_equal(batch, scalar)
+
+
+def test_empty_batch(scorer):
+    assert scorer.score_pattern_confidence_batch(pattern_stats_array([])).shape == (0,)
@@ -0,0 +1,87 @@
+"""
+Tests for float16/int8 embedding quantization and the quantized embedding cache
+"""
+
+import numpy as np
+import pytest
+
+from damien_cli.features.ai_intelligence.categorization.embeddings import EmailEmbeddingGenerator
+from damien_cli.features.ai_intelligence.utils.quantization import dequantize, quantize
+
+
+def unit_vectors(count, dimension=384, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestQuantize:
+
+    def test_none_is_float32_passthrough(self):
+        vectors = unit_vectors(4)
+        codes, scales = quantize(vectors, "none")
+        assert codes.dtype == np.float32 and scales is None
+        assert np.array_equal(dequantize(codes), vectors)
+
+    @pytest.mark.parametrize("quantization,dtype,tolerance", [("float16", np.float16, 1e-3), ("int8", np.int8, 1e-2)])
+    def test_round_trip_error_is_small(self, quantization, dtype, tolerance):
+        vectors = unit_vectors(50)
+        codes, scales = quantize(vectors, quantization)
+
+        assert codes.dtype == dtype
+        assert np.abs(dequantize(codes, scales) - vectors).max() < tolerance
+
+    def test_int8_has_one_scale_per_vector_and_handles_zero_rows(self):
+        vectors = unit_vectors(3)
+        vectors[1] = 0
+        codes, scales = quantize(vectors, "int8")
+
+        assert scales.shape == (3,)
+        assert np.abs(codes).max() == 127
+        assert not dequantize(codes, scales)[1].any()
+
+    def test_single_vector(self):
+        vector = unit_vectors(1)[0]
+        codes, scale = quantize(vector, "int8")
+        assert codes.shape == (384,) and np.ndim(scale) == 0
+        assert np.allclose(dequantize(codes, scale), vector, atol=1e-2)
+
+    def test_unknown_mode_is_rejected(self):
+        with pytest.raises(ValueError):
+            quantize(unit_vectors(1), "int4")
+
+
+class TestQuantizedEmbeddingCache:
+
+    def make_generator(self, tmp_path, quantization):
+        generator = EmailEmbeddingGenerator(quantization=quantization)
+        generator.cache_dir = tmp_path
+        generator.model = "mock"
+        return generator
+
+    def test_cached_and_fresh_embeddings_agree(self, tmp_path):
+        generator = self.make_generator(tmp_path, "int8")
+        emails = [{"id": f"m{i}", "subject": f"Invoice {i}", "snippet": "due soon"} for i in range(5)]
+
+        fresh = generator.generate_batch_embeddings(emails)
+        cached = generator.generate_batch_embeddings(emails)
+
+        assert fresh.dtype == np.float32
+        assert np.array_equal(fresh, cached)
+        assert np.array_equal(generator.generate_embedding(emails[2]), fresh[2])
+
+    def test_quantized_cache_is_smaller_and_reads_legacy_entries(self, tmp_path):
+        email = {"id": "m1", "subject": "Weekly digest"}
+        (tmp_path / "plain").mkdir()
+        (tmp_path / "int8").mkdir()
+        plain = self.make_generator(tmp_path / "plain", "none")
+        plain.generate_embedding(email)
+        int8 = self.make_generator(tmp_path / "int8", "int8")
+        int8.generate_embedding(email)
+
+        plain_file = next((tmp_path / "plain").glob("*.pkl"))
+        int8_file = next((tmp_path / "int8").glob("*.pkl"))
+        assert int8_file.stat().st_size * 2 < plain_file.stat().st_size
+
+        # Float32 entries written before quantization was enabled still load
+        reader = self.make_generator(tmp_path / "plain", "int8")
+        assert np.array_equal(reader.generate_embedding(email), plain.generate_embedding(email))
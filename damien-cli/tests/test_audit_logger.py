@@ -0,0 +1,156 @@
+"""
+Tests for the buffered ComplianceAuditLogger.
+
+Events are queued and written in batches by a background thread; these tests
+check that nothing is lost across flush, close and rotation, that a saturated
+queue is written through by the caller, and that compliance reports aggregate the
+active and rotated JSONL files.
+"""
+import datetime
+import json
+import threading
+
+from damien_cli.features.ai_intelligence.llm_integration.privacy import audit as audit_module
+from damien_cli.features.ai_intelligence.llm_integration.privacy.audit import (
+    BufferedAuditWriter, ComplianceAuditLogger
+)
+
+
+def protection_event(audit_logger: ComplianceAuditLogger, email_id: str, pii: int, consent: bool = True):
+    return audit_logger.log_protection_event(
+        email_id=email_id,
+        actions=["email_protection_applied_STANDARD"],
+        metadata={"total_pii_detected": pii, "total_tokens_created": pii, "consent_for_email_analysis": consent}
+    )
+
+
+def read_records(directory):
+    return [json.loads(line) for path in sorted(directory.glob("*.jsonl")) for line in path.read_text().splitlines()]
+
+
+def test_events_are_batched_and_flushed(tmp_path):
+    audit_logger = ComplianceAuditLogger(log_file_path=str(tmp_path / "audit.jsonl"), batch_size=100)
+    for i in range(1000):
+        assert protection_event(audit_logger, f"email_{i}", 1)
+
+    assert audit_logger.flush(timeout=10)
+    stats = audit_logger.get_stats()
+    assert stats["written"] == 1000
+    assert stats["batches"] <= 1000 // 100 + 5
+    assert len(read_records(tmp_path)) == 1000
+    audit_logger.close()
+
+
+def test_close_writes_pending_events(tmp_path):
+    audit_logger = ComplianceAuditLogger(log_file_path=str(tmp_path / "audit.jsonl"), flush_interval=60)
+    protection_event(audit_logger, "email_1", 2)
+    audit_logger.close()
+
+    assert [r["details"]["email_id"] for r in read_records(tmp_path)] == ["email_1"]
+
+
+def test_full_queue_writes_through_instead_of_dropping(tmp_path):
+    writer = BufferedAuditWriter(str(tmp_path / "audit.jsonl"), max_queue=2, put_timeout=0.01)
+    release = threading.Event()
+    original_write_batch = writer._write_batch
+
+    def stalled_write_batch(*args):
+        release.wait(10)
+        return original_write_batch(*args)
+
+    writer._write_batch = stalled_write_batch
+    threading.Timer(0.2, release.set).start()
+    results = [writer.submit({"n": i}) for i in range(10)]
+    writer.close()
+
+    assert all(results)
+    assert writer.written_through >= 1
+    assert writer.dropped == 0
+    assert writer.written == 10
+    assert sorted(r["n"] for r in read_records(tmp_path)) == list(range(10))
+
+
+def test_failed_batch_is_retried_record_by_record(tmp_path):
+    writer = BufferedAuditWriter(str(tmp_path / "audit.jsonl"))
+    original_write_batch = writer._write_batch
+    failures = []
+
+    def failing_once(*args):
+        if not failures:
+            failures.append(True)
+            raise OSError("disk hiccup")
+        return original_write_batch(*args)
+
+    writer._write_batch = failing_once
+    for i in range(5):
+        writer.submit({"n": i})
+
+    assert writer.flush(timeout=10)
+    assert writer.write_errors == 1
+    assert writer.dropped == 0
+    assert sorted(r["n"] for r in read_records(tmp_path)) == list(range(5))
+    writer.close()
+
+
+def test_reopen_failure_after_rotation_is_counted_and_recovers(tmp_path, monkeypatch):
+    writer = BufferedAuditWriter(str(tmp_path / "audit.jsonl"), max_bytes=1)
+    writer.submit({"n": 0})
+    assert writer.flush(timeout=10)
+
+    def failing_open(*args, **kwargs):
+        raise OSError("no space left")
+
+    # The next batch rotates the full file, closing the handle, then cannot reopen it
+    monkeypatch.setattr(audit_module, "open", failing_open, raising=False)
+    writer.submit({"n": 1})
+    assert not writer.flush(timeout=10)
+    assert writer.dropped == 1
+
+    monkeypatch.delattr(audit_module, "open")
+    writer.submit({"n": 2})
+    assert writer.flush(timeout=10)
+    writer.close()
+
+    assert writer.dropped == 1
+    assert sorted(r["n"] for r in read_records(tmp_path)) == [0, 2]
+
+
+def test_rotation_by_size_and_report_over_rotated_files(tmp_path):
+    audit_logger = ComplianceAuditLogger(log_file_path=str(tmp_path / "audit.jsonl"), max_bytes=2000, batch_size=5)
+    for i in range(60):
+        protection_event(audit_logger, f"email_{i % 40}", 2, consent=i % 10 != 0)
+        if i % 5 == 4:
+            audit_logger.flush()
+    audit_logger.log_event("DATA_ACCESS_REQUEST", user_id="auditor", status="FAILURE", component="AccessControl")
+
+    now = datetime.datetime.utcnow()
+    report = audit_logger.generate_compliance_report(now - datetime.timedelta(hours=1), now + datetime.timedelta(hours=1))
+
+    assert audit_logger.get_stats()["rotations"] >= 2
+    assert len(report["files_scanned"]) >= 3
+    assert report["total_events"] == 61
+    assert report["events_by_type"] == {"PRIVACY_PROTECTION_EVENT": 60, "DATA_ACCESS_REQUEST": 1}
+    assert report["emails_protected"] == 40
+    assert report["pii_entities_detected"] == 120
+    assert report["consent_denied_events"] == 6
+    assert report["failure_count"] == 1
+    assert report["unique_users"] == 2
+    audit_logger.close()
+
+
+def test_report_filters_by_period(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"timestamp": "2025-01-01T10:00:00Z", "event_type": "OLD", "status": "INFO", "component": "X", "user_id": "a", "details": {}}),
+        json.dumps({"timestamp": "2025-02-01T10:00:00.5Z", "event_type": "IN", "status": "INFO", "component": "X", "user_id": "b", "details": {}}),
+        "not json",
+    ]) + "\n")
+    audit_logger = ComplianceAuditLogger(log_file_path=str(path))
+
+    report = audit_logger.generate_compliance_report(
+        datetime.datetime(2025, 1, 15, tzinfo=datetime.timezone.utc), datetime.datetime(2025, 3, 1)
+    )
+
+    assert report["events_by_type"] == {"IN": 1}
+    assert report["malformed_lines"] == 1
+    audit_logger.close()
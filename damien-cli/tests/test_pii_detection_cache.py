@@ -0,0 +1,70 @@
+"""
+Tests for content-hash memoization of PII detection.
+
+Detections are cached per (content hash, detector fingerprint, language,
+min_confidence). A repeated text must be answered from the cache with the
+same entities, callers must not be able to corrupt cached results, and
+detectors with different patterns or thresholds must not share entries.
+"""
+from damien_cli.features.ai_intelligence.llm_integration.privacy.detector import (
+    PIIDetectionCache, PIIDetector
+)
+
+TEXT = "Contact jane@example.com or 555-123-4567, SSN 123-45-6789."
+
+
+def test_repeated_text_is_served_from_cache():
+    detector = PIIDetector(cache=PIIDetectionCache())
+
+    first = detector.detect(TEXT)
+    second = detector.detect(TEXT)
+
+    assert first == second
+    stats = detector.cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_min_confidence_is_part_of_the_key():
+    detector = PIIDetector(cache=PIIDetectionCache())
+
+    detector.detect(TEXT, min_confidence=0.5)
+    detector.detect(TEXT, min_confidence=0.9)
+
+    assert detector.cache.get_stats()["misses"] == 2
+
+
+def test_cached_results_are_copies():
+    detector = PIIDetector(cache=PIIDetectionCache())
+
+    detector.detect(TEXT).clear()
+
+    assert detector.detect(TEXT)
+
+
+def test_fingerprint_separates_detector_configurations():
+    cache = PIIDetectionCache()
+    default = PIIDetector(cache=cache)
+    lenient = PIIDetector(cache=cache)
+    lenient.confidence_thresholds = dict(lenient.confidence_thresholds, PHONE_NUMBER=0.1)
+    lenient.fingerprint = lenient._compute_fingerprint()
+
+    assert default.fingerprint != lenient.fingerprint
+    default_phones = [e for e in default.detect(TEXT) if e.entity_type == "PHONE_NUMBER"]
+    lenient_phones = [e for e in lenient.detect(TEXT) if e.entity_type == "PHONE_NUMBER"]
+    assert default_phones[0].confidence_score != lenient_phones[0].confidence_score
+
+
+def test_cache_is_bounded_lru():
+    cache = PIIDetectionCache(max_entries=2)
+    cache.put("a", ())
+    cache.put("b", ())
+    cache.get("a")
+    cache.put("c", ())
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == ()
+
+    cache.clear()
+    assert cache.get_stats() == {"entries": 0, "max_entries": 2, "hits": 0, "misses": 0, "hit_rate": 0.0}
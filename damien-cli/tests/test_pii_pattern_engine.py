@@ -0,0 +1,109 @@
+"""
+Equivalence tests for the compiled PIIPatternEngine.
+
+The engine must produce exactly what running every PII_PATTERNS entry with
+``finditer`` produces, lookaheads included: same matches, same order, same
+entities. The reference below is that per-pattern scan. It is checked against
+the 37 detector test cases, then against randomly assembled texts dense in
+context keywords, digit runs and line breaks, where lookahead handling is
+most likely to diverge.
+"""
+import random
+
+import pytest
+
+from damien_cli.features.ai_intelligence.llm_integration.privacy.detector import (
+    PII_PATTERNS, PIIDetector, PIIEntity
+)
+
+from .test_pii_detection_enhanced import (
+    ACCURACY_TEST_CASES, ENHANCED_REGEX_TEST_CASES, FALSE_POSITIVE_TEST_CASES
+)
+
+ALL_CASE_TEXTS = [text for text, _ in ENHANCED_REGEX_TEST_CASES + ACCURACY_TEST_CASES + FALSE_POSITIVE_TEST_CASES]
+
+FRAGMENTS = [
+    "passport", "Passport No", "license", "licence", "DL", "d.l.", "handle", "routing", "ABA", "rtn",
+    "account", "acct", "tin", "tax", "TIN", "mrn", "medical", "record", "patient", "insurance", "policy",
+    "member", "membership", "123456789", "12345678", "987654321012", "1234", "12", "AB1234567",
+    "A1234567", "X123456789012", "NY123456", "12AB34567", "12AB345678", "MRN1234567", "ABC12345678",
+    "POLICY12345", "12-3456789", "123-45-6789", "123-45-6789A", "555-123-4567", "(555) 123-4567",
+    "+1-555-123-4567", "+44 20 7946 0958", "test@example.com", "a@b", "4111111111111111",
+    "4111-1111-1111-1111", "192.168.1.1", "1.2.3.4.5", "::1", "fe80::1", "00:1A:2B:3C:4D:5E",
+    "0123.4567.89AB", "deadbeefcafe", "GB29NWBK60161331926819", "CHASUS33", "1HGBH41JXMN109186",
+    "1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2", "0x" + "ab" * 20, "version", "software", "the", "and",
+    "meeting", "quarterly", "Pässport", "naïve", "\n", "\n", ",", ".", ":", "-", "(", ")",
+]
+
+
+def reference_detect_with_regex(detector: PIIDetector, text: str):
+    """The original scan: one finditer pass per pattern, lookaheads and all."""
+    found = []
+    for pii_type, pattern in PII_PATTERNS.items():
+        for match in pattern.finditer(text):
+            context = text[max(0, match.start() - 50):min(len(text), match.end() + 50)]
+            if pii_type == "PHONE_NUMBER":
+                extracted_text, start_pos, end_pos = detector._extract_phone_number(match, text)
+            else:
+                extracted_text, start_pos, end_pos = match.group(0), match.start(), match.end()
+            if not detector._is_valid_detection(pii_type, extracted_text, context):
+                continue
+            found.append(PIIEntity(
+                text=extracted_text,
+                entity_type=pii_type,
+                start_char=start_pos,
+                end_char=end_pos,
+                confidence_score=detector._calculate_confidence_score(pii_type, extracted_text, context),
+                detection_method="ENHANCED_REGEX"
+            ))
+    return found
+
+
+def random_text(rng: random.Random) -> str:
+    pieces = [rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 40))]
+    return "".join(piece + rng.choice([" ", " ", "", "\n", ", "]) for piece in pieces)
+
+
+@pytest.fixture(scope="module")
+def detector() -> PIIDetector:
+    return PIIDetector()
+
+
+@pytest.mark.parametrize("text", ALL_CASE_TEXTS)
+def test_detector_cases_match_reference(detector, text):
+    assert detector._detect_with_regex(text) == reference_detect_with_regex(detector, text)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_texts_match_reference(detector, seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        text = random_text(rng)
+        assert detector._detect_with_regex(text) == reference_detect_with_regex(detector, text), repr(text)
+
+
+def test_context_keyword_must_follow_on_the_same_line(detector):
+    same_line = detector.detect("routing 123456789 and 021000021 routing")
+    next_line = detector.detect("021000021\nrouting")
+
+    assert [e.text for e in same_line if e.entity_type == "BANK_ROUTING_NUMBER"] == ["123456789", "021000021"]
+    assert not [e for e in next_line if e.entity_type == "BANK_ROUTING_NUMBER"]
+
+
+def test_context_only_patterns_are_skipped_without_keywords(detector):
+    engine = detector.pattern_engine
+    skipped = {p.pii_type for p in engine.patterns if p.context_only}
+    assert skipped == {"BANK_ROUTING_NUMBER", "BANK_ACCOUNT_NUMBER", "MEDICAL_RECORD_NUMBER", "INSURANCE_NUMBER"}
+
+    types = {pii_type for pii_type, _ in engine.scan("Quarterly planning everyone involved " * 50)}
+    assert not types & skipped
+
+
+def test_long_single_line_scales_linearly(detector):
+    import time
+
+    line = "Reach jane@example.com or 555-123-4567 about the quarterly planning priorities. " * 2000
+    started = time.perf_counter()
+    detections = detector.detect(line)
+    assert time.perf_counter() - started < 2.0
+    assert len(detections) == 4000
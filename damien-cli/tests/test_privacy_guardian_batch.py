@@ -0,0 +1,102 @@
+"""
+Tests for PrivacyGuardian.protect_emails, the batch counterpart of protect_email.
+
+A batch must protect every email exactly as protect_email would, in input
+order, while checking consent once per user, scanning in a process pool when
+asked to, and writing a single audit record whose per-email details remain
+retrievable.
+"""
+import asyncio
+
+import pytest
+
+from damien_cli.features.ai_intelligence.llm_integration.privacy.audit import ComplianceAuditLogger
+from damien_cli.features.ai_intelligence.llm_integration.privacy.consent import DataProcessingPurpose
+from damien_cli.features.ai_intelligence.llm_integration.privacy.guardian import PrivacyGuardian, ProtectionLevel
+
+
+def make_emails(count: int):
+    return [
+        {
+            "id": f"email_{i}",
+            "user_id": f"user_{i % 3}",
+            "subject": f"Invoice {i} for client{i % 5}@example.com",
+            "body": f"Call me at 555-123-{4000 + i % 7:04d} or write to team@example.com. Ref {i}.",
+            "sender": "billing@example.com",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def guardian(tmp_path):
+    guardian = PrivacyGuardian(token_secret="batch-test-secret")
+    guardian.audit_logger = ComplianceAuditLogger(log_file_path=str(tmp_path / "audit.jsonl"))
+    for user in ("user_0", "user_1"):
+        guardian.consent_manager.grant_consent(user, DataProcessingPurpose.EMAIL_ANALYSIS)
+    yield guardian
+    guardian.close()
+    guardian.audit_logger.close()
+
+
+def test_batch_matches_single_email_protection(guardian):
+    emails = make_emails(30)
+
+    batch = asyncio.run(guardian.protect_emails(emails))
+    singles = [asyncio.run(guardian.protect_email(email)) for email in emails]
+
+    assert [sanitized["id"] for sanitized, _ in batch] == [email["id"] for email in emails]
+    for (batch_email, batch_meta), (single_email, single_meta) in zip(batch, singles):
+        assert batch_email == single_email
+        assert batch_meta.token_map == single_meta.token_map
+        assert batch_meta.original_pii_detected == single_meta.original_pii_detected
+        assert batch_meta.protection_level_applied == single_meta.protection_level_applied
+
+
+def test_consent_is_checked_once_per_user(guardian):
+    calls = []
+    check_consent = guardian.consent_manager.check_consent
+    guardian.consent_manager.check_consent = lambda user, purpose: calls.append(user) or check_consent(user, purpose)
+
+    results = asyncio.run(guardian.protect_emails(make_emails(30)))
+
+    assert sorted(calls) == ["user_0", "user_1", "user_2"]
+    unconsented = [(email, meta) for email, meta in results if email["user_id"] == "user_2"]
+    assert all(meta.protection_level_applied == ProtectionLevel.NONE and not meta.token_map for _, meta in unconsented)
+    assert all("@example.com" in email["subject"] for email, _ in unconsented)
+
+
+def test_pool_detection_matches_serial(guardian):
+    emails = make_emails(40)
+
+    serial = asyncio.run(guardian.protect_emails(emails, max_workers=1))
+    pooled = asyncio.run(guardian.protect_emails(emails, max_workers=2, parallel_min_emails=1))
+
+    assert [email for email, _ in pooled] == [email for email, _ in serial]
+
+
+def test_one_audit_record_per_batch_with_per_email_trail(guardian):
+    asyncio.run(guardian.protect_emails(make_emails(12)))
+    audit_logger = guardian.audit_logger
+    audit_logger.flush()
+
+    assert audit_logger.get_stats()["written"] == 1
+    trail = audit_logger.get_email_audit_trail("email_4")
+    assert len(trail) == 1
+    assert trail[0]["event_type"] == "PRIVACY_PROTECTION_BATCH_EVENT"
+    assert trail[0]["details"]["email_id"] == "email_4"
+    assert trail[0]["details"]["total_pii_detected"] >= 2
+
+
+def test_missing_id_is_rejected(guardian):
+    with pytest.raises(ValueError):
+        asyncio.run(guardian.protect_emails([{"subject": "no id"}]))
+
+
+def test_protection_fails_when_its_audit_record_is_lost(guardian):
+    guardian.audit_logger.log_event = lambda *args, **kwargs: False
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(guardian.protect_email(make_emails(1)[0]))
+    with pytest.raises(RuntimeError):
+        asyncio.run(guardian.protect_emails(make_emails(2), max_workers=1))
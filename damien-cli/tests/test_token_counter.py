@@ -1,11 +1,88 @@
 import sys
 import os
 
+import pytest
+
 # Add the project root to the Python path to allow for absolute imports
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
-from damien_cli.features.ai_intelligence.llm_integration.utils import TokenCounter
+from damien_cli.features.ai_intelligence.llm_integration.utils import TokenCounter, DEFAULT_CHARS_PER_TOKEN
+from damien_cli.features.ai_intelligence.llm_integration.routing.predictor import CostPredictor
+
+
+class RecordingEncoding:
+    """Whitespace 'encoding' that records what it was asked to encode."""
+    name = "recording"
+
+    def __init__(self):
+        self.encoded = []
+        self.batches = []
+
+    def encode(self, text):
+        self.encoded.append(text)
+        return text.split()
+
+    def encode_batch(self, texts, num_threads=8):
+        self.batches.append(list(texts))
+        return [text.split() for text in texts]
+
+
+def counter_with_recording_encoding(**kwargs):
+    counter = TokenCounter(**kwargs)
+    encoding = RecordingEncoding()
+    counter.encodings["gpt-3.5-turbo"] = encoding
+    return counter, encoding
+
+
+def test_counts_are_memoized_by_text():
+    counter, encoding = counter_with_recording_encoding()
+
+    assert counter.count("one two three") == 3
+    assert counter.count("one two three") == 3
+
+    assert encoding.encoded == ["one two three"]
+    assert counter.get_stats()["hits"] == 1
+
+
+def test_count_many_batches_only_uncached_distinct_texts():
+    counter, encoding = counter_with_recording_encoding()
+    counter.count("a b")
+
+    counts = counter.count_many(["a b", "c d e", "", "c d e", "f"])
+
+    assert counts == [2, 3, 0, 3, 1]
+    assert encoding.batches == [["c d e", "f"]]
+
+
+def test_cache_is_bounded():
+    counter, _ = counter_with_recording_encoding(max_entries=2)
+    counter.count_many(["a", "b c", "d e f"])
+
+    assert counter.get_stats()["entries"] == 2
+
+
+def test_approximate_count_calibrates_from_exact_counts():
+    counter, encoding = counter_with_recording_encoding()
+    text = "abcdefgh " * 10
+
+    assert counter.count(text, approximate=True) == round(len(text) / DEFAULT_CHARS_PER_TOKEN)
+    assert encoding.encoded == []
+
+    ratio = counter.calibrate([f"{i:07d} " * 3000 for i in range(3)])
+
+    assert ratio == pytest.approx(8.0)
+    assert counter.count(text, approximate=True) == round(len(text) / ratio)
+
+
+def test_cost_predictor_estimates_without_encoding():
+    counter, encoding = counter_with_recording_encoding()
+    predictor = CostPredictor(token_counter=counter)
+
+    tokens = predictor._estimate_tokens({"subject": "Hi", "body": "word " * 400})
+
+    assert tokens == round(len("Hi " + "word " * 400) / DEFAULT_CHARS_PER_TOKEN)
+    assert encoding.encoded == [] and encoding.batches == []
 
 def run_tests():
     print("Testing TokenCounter functionality...")
@@ -0,0 +1,109 @@
+"""
+Tests for the TokenVault behind ReversibleTokenizer.
+
+Covers the bounded in-memory front, encrypted persistence across vault
+instances, per-email namespaces with shared tokens, deterministic (keyed
+HMAC) tokens, and footprint reporting.
+"""
+import pytest
+
+from damien_cli.features.ai_intelligence.llm_integration.privacy.detector import PIIEntity
+from damien_cli.features.ai_intelligence.llm_integration.privacy.tokenizer import ReversibleTokenizer
+from damien_cli.features.ai_intelligence.llm_integration.privacy.vault import TokenVault
+
+SECRET = "unit-test-vault-secret"
+
+
+def email_entity(text: str, start: int) -> PIIEntity:
+    return PIIEntity(text, "EMAIL_ADDRESS", start, start + len(text), 0.99, "REGEX")
+
+
+def test_memory_vault_is_bounded():
+    vault = TokenVault(max_entries=3)
+    for i in range(5):
+        vault[f"[T_{i}]"] = f"value{i}"
+
+    assert len(vault) == 3
+    assert vault.get("[T_0]") is None
+    assert vault["[T_4]"] == "value4"
+    stats = vault.get_stats()
+    assert stats["evictions"] == 2
+    assert stats["memory_bytes"] > 0
+
+
+def test_persistent_vault_survives_restart_and_encrypts(tmp_path):
+    path = tmp_path / "vault.sqlite3"
+    vault = TokenVault(max_entries=1, path=path, secret_key=SECRET)
+    vault.put_many({"[EMAIL_ADDRESS_1]": "jane@example.com", "[EMAIL_ADDRESS_2]": "joe@example.com"}, "email-1")
+
+    # Pushed out of memory but still on disk
+    assert vault.get("[EMAIL_ADDRESS_1]") == "jane@example.com"
+    vault.close()
+    assert b"jane@example.com" not in path.read_bytes()
+
+    reopened = TokenVault(path=path, secret_key=SECRET)
+    assert reopened.get("[EMAIL_ADDRESS_2]") == "joe@example.com"
+    assert len(reopened) == 2
+    reopened.close()
+
+    wrong_secret = TokenVault(path=path, secret_key="another secret")
+    assert wrong_secret.get("[EMAIL_ADDRESS_2]") is None
+    wrong_secret.close()
+
+
+def test_persistent_vault_requires_secret(tmp_path):
+    with pytest.raises(ValueError):
+        TokenVault(path=tmp_path / "vault.sqlite3")
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_namespace_eviction_keeps_shared_tokens(tmp_path, persistent):
+    vault = TokenVault(path=tmp_path / "vault.sqlite3", secret_key=SECRET) if persistent else TokenVault()
+    vault.put_many({"[A]": "a@example.com", "[SHARED]": "team@example.com"}, namespace="email-1")
+    vault.put_many({"[SHARED]": "team@example.com"}, namespace="email-2")
+
+    assert vault.evict_namespace("email-1") == 1
+    assert vault.get("[A]") is None
+    assert vault.get("[SHARED]") == "team@example.com"
+    assert vault.namespaces() == ["email-2"]
+
+    assert vault.evict_namespace("email-2") == 1
+    assert len(vault) == 0
+
+
+def test_deterministic_tokens_repeat_across_emails_and_instances():
+    text = "Write to team@example.com"
+    entities = [email_entity("team@example.com", 9)]
+
+    first, first_map = ReversibleTokenizer(token_secret=SECRET).tokenize_pii(text, entities, namespace="email-1")
+    second, _ = ReversibleTokenizer(token_secret=SECRET).tokenize_pii(text, entities, namespace="email-2")
+    other_secret, _ = ReversibleTokenizer(token_secret="other").tokenize_pii(text, entities)
+
+    assert first == second
+    assert first != other_secret
+    assert list(first_map.values()) == ["team@example.com"]
+
+
+def test_deterministic_tokens_deduplicate_within_a_document():
+    tokenizer = ReversibleTokenizer(token_secret=SECRET)
+    text = "team@example.com, team@example.com"
+    entities = [email_entity("team@example.com", 0), email_entity("team@example.com", 18)]
+
+    tokenized_text, token_map = tokenizer.tokenize_pii(text, entities)
+
+    assert len(token_map) == 1
+    token = next(iter(token_map))
+    assert tokenized_text == f"{token}, {token}"
+    assert tokenizer.detokenize_text(tokenized_text) == text
+
+
+def test_tokenizer_reports_vault_stats_and_forgets_emails():
+    tokenizer = ReversibleTokenizer(vault=TokenVault(max_entries=10))
+    tokenizer.tokenize_pii("mail a@example.com", [email_entity("a@example.com", 5)], namespace="email-1")
+
+    stats = tokenizer.get_stats()
+    assert stats["entries_in_memory"] == 1
+    assert stats["deterministic_tokens"] is False
+
+    assert tokenizer.forget_namespace("email-1") == 1
+    assert tokenizer.get_stats()["entries_in_memory"] == 0
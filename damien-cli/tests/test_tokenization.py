@@ -212,5 +212,56 @@ def test_detokenization_with_overlapping_token_names_uses_longest_match(tokenize
     assert tokenizer.detokenize_text(text_with_both) == expected_detokenized_both
 
 
+def test_tokenize_accepts_unsorted_entities(tokenizer: ReversibleTokenizer):
+    """Entity order does not matter; the output is built in a single forward pass."""
+    text = "Email: user@example.com, Phone: 123-456-7890."
+    pii_entities = [
+        PIIEntity(text="123-456-7890", entity_type="PHONE_NUMBER", start_char=32, end_char=44, confidence_score=0.95, detection_method="REGEX"),
+        PIIEntity(text="user@example.com", entity_type="EMAIL_ADDRESS", start_char=7, end_char=23, confidence_score=0.99, detection_method="REGEX")
+    ]
+    tokenized_text, token_map = tokenizer.tokenize_pii(text, pii_entities)
+
+    assert tokenized_text.startswith("Email: [EMAIL_ADDRESS_")
+    assert ", Phone: [PHONE_NUMBER_" in tokenized_text
+    assert tokenizer.detokenize_text(tokenized_text, token_map) == text
+
+
+def test_overlapping_entities_share_one_token(tokenizer: ReversibleTokenizer):
+    """Overlapping detections leave no fragment in clear text and stay reversible."""
+    text = "Ref 1234567890123 end"
+    pii_entities = [
+        PIIEntity(text="1234567890", entity_type="PHONE_NUMBER", start_char=4, end_char=14, confidence_score=0.9, detection_method="REGEX"),
+        PIIEntity(text="567890123", entity_type="BANK_ACCOUNT_NUMBER", start_char=8, end_char=17, confidence_score=0.8, detection_method="REGEX")
+    ]
+    tokenized_text, token_map = tokenizer.tokenize_pii(text, pii_entities)
+
+    assert list(token_map.values()) == ["1234567890123"]
+    assert not any(char.isdigit() for char in tokenized_text.replace(list(token_map)[0], ""))
+    assert tokenizer.detokenize_text(tokenized_text, token_map) == text
+
+
+def test_tens_of_thousands_of_tokens_round_trip(tokenizer: ReversibleTokenizer):
+    """A PII-dense document round-trips with one distinct token per entity."""
+    line = "To: member@example.com\n"
+    text = line * 30000
+    pii_entities = [
+        PIIEntity("member@example.com", "EMAIL_ADDRESS", i * len(line) + 4, i * len(line) + 22, 0.99, "REGEX")
+        for i in range(30000)
+    ]
+    tokenized_text, token_map = tokenizer.tokenize_pii(text, pii_entities)
+
+    assert len(token_map) == 30000
+    assert "member@example.com" not in tokenized_text
+    assert tokenizer.detokenize_text(tokenized_text, token_map) == text
+
+
+def test_detokenize_keeps_unknown_brackets_and_custom_keys(tokenizer: ReversibleTokenizer):
+    """Bracketed text that is not a token is untouched; non-bracket keys still resolve."""
+    token_map = {"[EMAIL_1]": "a@example.com", "<<PHONE>>": "555-123-4567"}
+    text = "See [attachment] and [EMAIL_1], call <<PHONE>>."
+
+    assert tokenizer.detokenize_text(text, token_map) == "See [attachment] and a@example.com, call 555-123-4567."
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -50,6 +50,16 @@ class Settings(BaseSettings): # Changed to BaseSettings
     # API Timeouts
     request_timeout_seconds: int = Field(default=30, alias="DAMIEN_REQUEST_TIMEOUT_SECONDS")
 
+    # AI intelligence: directory holding the RAG vector index between restarts
+    # (empty keeps the index in a per-run temp directory)
+    rag_index_path: str = Field(default="", alias="DAMIEN_RAG_INDEX_PATH")
+
+    # AI intelligence: privacy token vault. With a key, tokens are deterministic
+    # and, given a path, persisted encrypted so indexed tokens survive restarts
+    token_vault_path: str = Field(default="", alias="DAMIEN_TOKEN_VAULT_PATH")
+    token_vault_key: str = Field(default="", alias="DAMIEN_TOKEN_VAULT_KEY")
+    token_vault_max_entries: int = Field(default=100000, alias="DAMIEN_TOKEN_VAULT_MAX_ENTRIES")
+
     model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8', extra='ignore')
     
     @field_validator("gmail_token_path", "gmail_credentials_path", mode='before')
@@ -39,6 +39,7 @@ from .tools.draft_tools import register_draft_tools
 from .tools.settings_tools import register_settings_tools
 from .tools.thread_tools import register_thread_tools
 from .tools.register_ai_intelligence import register_ai_intelligence_tools
+from .tools.ai_intelligence import ai_intelligence_tools
 from .tools.async_tools import register_async_tools
 from .services.tool_registry import tool_registry
 
@@ -52,6 +53,11 @@ async def startup_event():
     register_ai_intelligence_tools()  # 🚀 Phase 4: AI Intelligence Tools
     register_async_tools()  # 🔥 Background Job Processing Tools
     
+    # Load AI components and the embedding model in the background so the
+    # first AI tool call does not pay for it; /health reports progress
+    if ai_intelligence_tools.cli_bridge:
+        ai_intelligence_tools.cli_bridge.start_warmup()
+    
     logger.info(f"🎉 MCP Server started with {len(tool_registry.get_all_tools())} tools registered")
     logger.info("✅ Phase 4 AI Intelligence integration complete!")
     logger.info("🚀 Background job processing system active!")
@@ -62,10 +68,12 @@ async def health_check():
     """Checks if the server is running. This endpoint is publicly accessible."""
     from .core.tool_usage_config import get_tool_usage_config
     config = get_tool_usage_config()
+    cli_bridge = ai_intelligence_tools.cli_bridge
     
     return {
         "status": "ok", 
         "message": "Damien MCP Server is healthy!",
+        "ai_readiness": cli_bridge.get_readiness() if cli_bridge else {"state": "not_available"},
         "tool_usage": {
             "policy": config.policy,
             "message": config.direct_tool_message,
@@ -25,6 +25,8 @@ import tempfile
 import os
 from contextlib import asynccontextmanager
 
+from ..core.config import settings
+
 # Add CLI module to Python path for imports
 CLI_PATH = Path(__file__).parent.parent.parent.parent / "damien-cli"
 sys.path.insert(0, str(CLI_PATH))
@@ -139,7 +141,10 @@ class ComponentManager:
         try:
             self.health_status["privacy_guardian"] = ComponentStatus.INITIALIZING
             
-            privacy_guardian = PrivacyGuardian()
+            privacy_guardian = PrivacyGuardian(
+                token_vault=self._build_token_vault(),
+                token_secret=settings.token_vault_key or None
+            )
             # Test basic functionality
             test_text = "John Doe's email is john@example.com"
             detected = privacy_guardian.detect_pii(test_text)
@@ -156,6 +161,19 @@ class ComponentManager:
             self.health_status["privacy_guardian"] = ComponentStatus.UNHEALTHY
             self.initialization_errors["privacy_guardian"] = str(e)
     
+    def _build_token_vault(self):
+        """Token vault configured from settings (bounded and memory-only by default)."""
+        from damien_cli.features.ai_intelligence.llm_integration.privacy.vault import TokenVault
+        
+        if settings.token_vault_path and not settings.token_vault_key:
+            logger.warning("⚠️ DAMIEN_TOKEN_VAULT_PATH needs DAMIEN_TOKEN_VAULT_KEY - keeping tokens in memory only")
+        persistent = bool(settings.token_vault_path and settings.token_vault_key)
+        return TokenVault(
+            max_entries=settings.token_vault_max_entries,
+            path=settings.token_vault_path if persistent else None,
+            secret_key=settings.token_vault_key if persistent else None
+        )
+    
     async def _initialize_intelligence_router(self, IntelligenceRouter):
         """Initialize Intelligence Router component."""
         try:
@@ -223,13 +241,23 @@ class ComponentManager:
             self.initialization_errors["batch_processor"] = str(e)
     
     async def _initialize_rag_engine(self, RAGEngine, RAGConfig, VectorStore):
-        """Initialize RAG Engine component."""
+        """Initialize RAG Engine component.
+        
+        The engine's index is memory-mapped and its embedding model loads on
+        a background thread, so this returns before the model is ready;
+        refresh_rag_status() tracks the warm-up.
+        """
         try:
             self.health_status["rag_engine"] = ComponentStatus.INITIALIZING
             
+            # A configured index directory survives restarts; otherwise the
+            # index lives in this run's temp directory
+            index_dir = Path(settings.rag_index_path or self.temp_dir)
             config = RAGConfig(
-                vector_store=VectorStore.CHROMA,
-                chroma_persist_directory=self.temp_dir,
+                vector_store=VectorStore.NUMPY,
+                numpy_persist_directory=str(index_dir / "vectors"),
+                manifest_path=str(index_dir / "index_manifest.json"),
+                chroma_persist_directory=str(index_dir),
                 similarity_threshold=0.1,
                 adaptive_threshold=True,
                 hybrid_weight_vector=0.7,
@@ -242,23 +270,32 @@ class ComponentManager:
                 privacy_guardian=self.components.get("privacy_guardian"),
                 chunker=self.components.get("chunker")
             )
-            
-            # Initialize and test
-            await rag_engine.initialize()
-            
-            # Test with sample data
-            test_result = await rag_engine.search("test query", limit=1)
-            # RAG engine is healthy even if no results (empty index)
+            rag_engine.start_warmup()
             
             self.components["rag_engine"] = rag_engine
-            self.health_status["rag_engine"] = ComponentStatus.HEALTHY
-            logger.info("✅ RAG Engine initialized - vector search ready")
+            self.refresh_rag_status()
+            logger.info("✅ RAG Engine created - index and embedding model warming up in the background")
             
         except Exception as e:
             logger.error(f"❌ RAG Engine initialization failed: {e}")
             self.health_status["rag_engine"] = ComponentStatus.UNHEALTHY
             self.initialization_errors["rag_engine"] = str(e)
     
+    def refresh_rag_status(self) -> None:
+        """Mirror the RAG engine's warm-up state into health_status."""
+        rag_engine = self.components.get("rag_engine")
+        if rag_engine is None:
+            return
+        state = rag_engine.readiness['state']
+        if state == "ready":
+            self.health_status["rag_engine"] = ComponentStatus.HEALTHY
+            self.initialization_errors.pop("rag_engine", None)
+        elif state == "failed":
+            self.health_status["rag_engine"] = ComponentStatus.UNHEALTHY
+            self.initialization_errors["rag_engine"] = rag_engine.readiness['error']
+        else:
+            self.health_status["rag_engine"] = ComponentStatus.INITIALIZING
+    
     async def _initialize_hierarchical_processor(self, HierarchicalProcessor):
         """Initialize Hierarchical Processor component."""
         try:
@@ -298,6 +335,7 @@ class ComponentManager:
     
     async def get_component_health(self) -> Dict[str, Any]:
         """Get comprehensive health status of all components."""
+        self.refresh_rag_status()
         healthy_count = len([s for s in self.health_status.values() if s == ComponentStatus.HEALTHY])
         total_count = len(self.health_status)
         
@@ -307,7 +345,7 @@ class ComponentManager:
         elif healthy_count < total_count:
             overall_status = ComponentStatus.DEGRADED
             
-        return {
+        health = {
             "overall_status": overall_status.value,
             "healthy_components": healthy_count,
             "total_components": total_count,
@@ -319,6 +357,11 @@ class ComponentManager:
                 for name, status in self.health_status.items()
             }
         }
+        
+        privacy_guardian = self.components.get("privacy_guardian")
+        if privacy_guardian is not None:
+            health["token_vault"] = privacy_guardian.tokenizer.get_stats()
+        return health
     
     async def shutdown_all(self):
         """Gracefully shutdown all components."""
@@ -362,6 +405,10 @@ class CLIBridge:
         self.performance_metrics: List[PerformanceMetrics] = []
         self.initialized = False
         self._initialization_lock = asyncio.Lock()
+        self._warmup_task: Optional[asyncio.Task] = None
+        # Distinct sender domains tracked during pattern analysis; any domain
+        # above len(emails) / capacity is always found
+        self.domain_heavy_hitter_capacity = 5000
         
         logger.info("🌉 CLI Bridge created (async initialization pending)")
     
@@ -391,6 +438,55 @@ class CLIBridge:
                 self.initialized = False
                 raise RuntimeError(f"Failed to initialize CLI Bridge: {e}")
     
+    def start_warmup(self) -> asyncio.Task:
+        """
+        Start component initialization in the background.
+        
+        Called from server startup so the first AI tool call does not pay
+        for imports and model loading; ensure_initialized() still works
+        (and waits on the same lock) if warm-up has not finished.
+        """
+        if self._warmup_task is None:
+            self._warmup_task = asyncio.ensure_future(self._warm_up())
+        return self._warmup_task
+    
+    async def _warm_up(self) -> None:
+        try:
+            await self.ensure_initialized()
+        except Exception as e:
+            # Already logged by ensure_initialized; the next tool call retries
+            logger.debug(f"Background warm-up did not complete: {e}")
+    
+    def get_readiness(self) -> Dict[str, Any]:
+        """
+        Readiness of the AI components, for the /health endpoint.
+        
+        States: cold (nothing started), initializing (components loading),
+        warming (components ready, embedding model still loading), ready,
+        and degraded (initialization failed or some component is unhealthy).
+        """
+        rag_engine = self.component_manager.components.get("rag_engine")
+        rag_readiness = rag_engine.readiness if rag_engine is not None else None
+        
+        if self.initialized:
+            rag_state = rag_readiness['state'] if rag_readiness else "failed"
+            state = {"ready": "ready", "failed": "degraded"}.get(rag_state, "warming")
+        elif self._warmup_task is None:
+            state = "cold"
+        elif not self._warmup_task.done():
+            state = "initializing"
+        else:
+            state = "degraded"
+        
+        self.component_manager.refresh_rag_status()
+        return {
+            "state": state,
+            "components": {
+                name: status.value for name, status in self.component_manager.health_status.items()
+            },
+            "rag_engine": rag_readiness
+        }
+    
     def _record_performance(self, metrics: PerformanceMetrics):
         """Record performance metrics."""
         self.performance_metrics.append(metrics)
@@ -718,13 +814,13 @@ class CLIBridge:
                 
                 from damien_cli.features.ai_intelligence.llm_integration.processing.rag import SearchType
                 
-                for query in test_queries:
-                    results = await rag_engine.search(
-                        query=query,
-                        search_type=SearchType.HYBRID,
-                        limit=5
-                    )
-                    search_results[query] = len(results)
+                batch = await rag_engine.search_many(
+                    test_queries,
+                    search_type=SearchType.HYBRID,
+                    limit=5
+                )
+                for outcome in batch:
+                    search_results[outcome.query] = len(outcome.results)
                 
                 total_results = sum(search_results.values())
                 
@@ -1263,35 +1359,38 @@ class CLIBridge:
                 })
             
             # Pattern 5: Domain analysis (professional communications)
-            domain_groups = {}
+            # Domains are counted in a bounded heavy-hitter summary; only the
+            # final candidates are recounted exactly
+            from damien_cli.features.ai_intelligence.categorization.sketches import SpaceSaving
+            
+            excluded_domains = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'icloud.com', 'aol.com']
+            domain_summary = SpaceSaving(capacity=self.domain_heavy_hitter_capacity, example_capacity=3)
+            email_domains = []
             for email in emails:
-                sender = email.get('From', email.get('from', ''))
-                if '@' in sender:
-                    # Extract domain, handling email format "Name <email@domain.com>"
-                    if '<' in sender and '>' in sender:
-                        email_part = sender.split('<')[1].split('>')[0]
-                    else:
-                        email_part = sender
-                    
-                    if '@' in email_part:
-                        domain = email_part.split('@')[1].lower().strip()
-                        if domain not in domain_groups:
-                            domain_groups[domain] = []
-                        domain_groups[domain].append(email)
+                domain = self._extract_sender_domain(email.get('From', email.get('from', '')))
+                email_domains.append(domain)
+                if domain:
+                    domain_summary.add(domain, email.get('Subject', email.get('subject', 'No subject'))[:60])
             
             # Find domains with significant email volume (excluding common consumer domains)
-            excluded_domains = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'icloud.com', 'aol.com']
-            for domain, domain_emails in domain_groups.items():
-                if (len(domain_emails) >= 3 and 
-                    domain not in excluded_domains and 
-                    len(domain) > 3):  # Avoid very short/invalid domains
+            candidates = {
+                domain for domain in domain_summary.candidates(3)
+                if domain not in excluded_domains and len(domain) > 3  # Avoid very short/invalid domains
+            }
+            domain_counts = {}
+            for domain in email_domains:
+                if domain in candidates:
+                    domain_counts[domain] = domain_counts.get(domain, 0) + 1
+            
+            for domain, domain_count in domain_counts.items():
+                if domain_count >= 3:
                     patterns.append({
                         "pattern_type": "domain_communications",
-                        "email_count": len(domain_emails),
-                        "confidence": min(0.85, 0.5 + (len(domain_emails) / len(emails) * 0.5)),
-                        "description": f"Regular communications from {domain} ({len(domain_emails)} emails)",
+                        "email_count": domain_count,
+                        "confidence": min(0.85, 0.5 + (domain_count / len(emails) * 0.5)),
+                        "description": f"Regular communications from {domain} ({domain_count} emails)",
                         "domain": domain,
-                        "representative_emails": [e.get('Subject', e.get('subject', 'No subject'))[:60] for e in domain_emails[:3]]
+                        "representative_emails": domain_summary.examples_for(domain)
                     })
             
             # Filter by confidence threshold
@@ -1660,6 +1759,19 @@ class CLIBridge:
     # Helper Methods for Real Analysis
     # ============================================================================
     
+    @staticmethod
+    def _extract_sender_domain(sender: str) -> Optional[str]:
+        """Extract the lower-cased domain from "Name <email@domain.com>" or a bare address."""
+        if '@' not in sender:
+            return None
+        if '<' in sender and '>' in sender:
+            email_part = sender.split('<')[1].split('>')[0]
+        else:
+            email_part = sender
+        if '@' not in email_part:
+            return None
+        return email_part.split('@')[1].lower().strip()
+    
     def _identify_automation_opportunities(self, patterns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Identify specific automation opportunities from real patterns."""
         opportunities = []